@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-call overhead of CircuitBreaker error-rate tracking.
+
+Drives breaker.call() with a no-op function on a simulated clock advancing at
+a fixed request rate (100k calls/s by default), so the check window holds
+rate * window calls. Compares the bucketed SlidingWindowCounter against a
+reference that keeps one timestamp per call in lists and trims them on every
+call (the previous behaviour).
+
+Usage:
+    python scripts/benchmark_circuit_breaker.py --calls 200000 --rate 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from agent_kit.monitoring.circuit_breaker import CircuitBreaker  # noqa: E402
+from agent_kit.monitoring.sliding_window import SlidingWindowCounter  # noqa: E402
+
+
+class SimulatedClock:
+    """Clock advancing by a fixed step on every read."""
+
+    def __init__(self, step: float):
+        self.step = step
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+class ListWindowBreaker:
+    """Reference: timestamps kept in lists, trimmed by comprehension per call."""
+
+    def __init__(self, window_seconds: float, threshold: float, clock: SimulatedClock):
+        self.window_seconds = window_seconds
+        self.threshold = threshold
+        self.clock = clock
+        self.errors: list[float] = []
+        self.successes: list[float] = []
+
+    def call(self, func):
+        try:
+            result = func()
+        except Exception:
+            now = self.clock()
+            self.errors.append(now)
+            cutoff = now - self.window_seconds
+            self.errors = [e for e in self.errors if e > cutoff]
+            self.successes = [e for e in self.successes if e > cutoff]
+            total = len(self.errors) + len(self.successes)
+            _ = len(self.errors) / total >= self.threshold
+            raise
+        now = self.clock()
+        self.successes.append(now)
+        cutoff = now - self.window_seconds
+        self.successes = [e for e in self.successes if e > cutoff]
+        return result
+
+
+def benchmark(name: str, breaker, calls: int) -> None:
+    """Time `calls` protected no-op calls and print per-call overhead."""
+    noop = int
+    start = time.perf_counter()
+    for _ in range(calls):
+        breaker.call(noop)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<28} {elapsed / calls * 1e6:>8.2f} us/call  "
+        f"{calls / elapsed:>10.0f} calls/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--rate", type=float, default=100_000.0)
+    parser.add_argument("--window", type=float, default=1.0, help="seconds")
+    args = parser.parse_args()
+
+    window_calls = int(args.rate * args.window)
+    print(
+        f"{args.calls} calls at a simulated {args.rate:.0f} calls/s "
+        f"(~{window_calls} calls in a {args.window:g}s window)"
+    )
+    print("-" * 64)
+
+    # Reference cost grows with the window: start it with a full window and
+    # run a bounded number of calls
+    reference = ListWindowBreaker(args.window, 0.05, SimulatedClock(1 / args.rate))
+    reference.successes = [reference.clock() for _ in range(window_calls)]
+    benchmark("list window (reference)", reference, min(args.calls, 500))
+
+    breaker = CircuitBreaker(clock=SimulatedClock(1 / args.rate))
+    # Sub-minute window, so replace the config-sized one
+    breaker.window = SlidingWindowCounter(args.window, clock=breaker.clock)
+    benchmark("bucketed ring window", breaker, args.calls)
+    print(f"{'':<28} calls in window={breaker.window.calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark session backend I/O under concurrent sessions.
+
+Simulates agent turns (get_session + append event + save_session) across many
+concurrent sessions and compares SqliteSessionBackend against a reference
+backend that opens a new connection per operation (the previous behaviour).
+
+Usage:
+    python scripts/benchmark_sessions.py --sessions 50 --turns 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from agent_kit.sessions import (  # noqa: E402
+    CachedSessionBackend,
+    SqliteSessionBackend,
+)
+
+
+class ConnectPerCallBackend:
+    """Reference backend: one sqlite3.connect() and commit per operation."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS sessions (
+                    session_id TEXT PRIMARY KEY, user_id TEXT, data TEXT NOT NULL,
+                    created_at REAL NOT NULL, updated_at REAL NOT NULL)"""
+            )
+
+    async def get_session(self, session_id: str) -> dict[str, Any]:
+        def _get() -> dict[str, Any]:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute(
+                    "SELECT data FROM sessions WHERE session_id = ?", (session_id,)
+                ).fetchone()
+                if row:
+                    return json.loads(row[0])
+                now = time.time()
+                session = {"id": session_id, "events": [], "metadata": {}}
+                conn.execute(
+                    "INSERT INTO sessions VALUES (?, ?, ?, ?, ?)",
+                    (session_id, None, json.dumps(session), now, now),
+                )
+                return session
+
+        return await asyncio.to_thread(_get)
+
+    async def save_session(self, session_id: str, session_data: dict[str, Any]) -> None:
+        def _save() -> None:
+            now = time.time()
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?)",
+                    (session_id, None, json.dumps(session_data), now, now),
+                )
+
+        await asyncio.to_thread(_save)
+
+
+async def run_session(backend: Any, session_id: str, turns: int) -> list[float]:
+    """Run one session's turns, returning per-turn latency in seconds."""
+    latencies = []
+    for turn in range(turns):
+        start = time.perf_counter()
+        session = await backend.get_session(session_id)
+        session.setdefault("events", []).append(
+            {"id": f"{session_id}-{turn}", "author": "agent", "content": "x" * 200}
+        )
+        await backend.save_session(session_id, session)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def benchmark(name: str, backend: Any, sessions: int, turns: int) -> None:
+    """Run all sessions concurrently and print throughput and latency."""
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(run_session(backend, f"session-{i}", turns) for i in range(sessions))
+    )
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(lat for session in results for lat in session)
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    total = sessions * turns
+    print(
+        f"{name:<32} {total / elapsed:>9.0f} turns/s  "
+        f"p50={p50:>7.2f}ms  p99={p99:>7.2f}ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{args.sessions} concurrent sessions x {args.turns} turns")
+    print("-" * 72)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+
+        reference = ConnectPerCallBackend(tmp_path / "reference.db")
+        await benchmark("connect-per-call", reference, args.sessions, args.turns)
+
+        for label, options in [
+            ("pooled WAL", {}),
+            ("pooled WAL + group commit 2ms", {"group_commit_ms": 2.0}),
+        ]:
+            backend = SqliteSessionBackend(
+                tmp_path / f"{label.replace(' ', '_')}.db", **options
+            )
+            await benchmark(label, backend, args.sessions, args.turns)
+            stats = backend.stats
+            print(
+                f"{'':<32} commits={stats['commits']} writes={stats['writes']} "
+                f"({stats['writes'] / max(stats['commits'], 1):.1f} writes/commit)"
+            )
+            backend.close()
+
+        for mode in ("write-through", "write-behind"):
+            inner = SqliteSessionBackend(tmp_path / f"cached_{mode}.db")
+            cached = CachedSessionBackend(inner, max_sessions=args.sessions, mode=mode)
+            await benchmark(
+                f"pooled WAL + LRU {mode}", cached, args.sessions, args.turns
+            )
+            await cached.close()
+            stats = cached.get_cache_stats()
+            print(
+                f"{'':<32} hit_rate={stats['hit_rate']:.2f} "
+                f"backend_writes={stats['backend_writes']}"
+            )
+            inner.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
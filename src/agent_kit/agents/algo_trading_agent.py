@@ -16,6 +16,7 @@ import numpy as np
 from pydantic import BaseModel
 
 from agent_kit.agents.grok_agent import GrokAgent, GrokConfig
+from agent_kit.backtesting.risk import align_returns, portfolio_risk
 from agent_kit.ontology.loader import OntologyLoader
 
 
@@ -49,9 +50,15 @@ class PortfolioMetrics(BaseModel):
     sharpe_ratio: float
     max_drawdown: float
     current_drawdown: float
-    var_95: float  # 95% Value at Risk
+    var_95: float  # 95% historical Value at Risk (one-period loss)
     correlation_matrix: dict[str, dict[str, float]] = {}  # Pairwise correlations
     total_exposure: float  # Sum of position sizes
+    volatility: float = 0.0  # Annualized portfolio volatility
+    cvar_95: float = 0.0  # 95% historical expected shortfall
+    parametric_var_95: float = 0.0  # Gaussian VaR
+    parametric_cvar_95: float = 0.0  # Gaussian expected shortfall
+    beta: float | None = None  # Against benchmark_returns, if given
+    risk_contributions: dict[str, float] = {}  # Share of volatility per ticker
 
 
 class TradingRecommendation(BaseModel):
@@ -236,16 +243,23 @@ Analyze market data, generate signals, and manage risk."""
         self,
         signals: list[TradingSignal],
         historical_returns: dict[str, list[float]] | None = None,
+        benchmark_returns: list[float] | None = None,
     ) -> PortfolioMetrics:
         """
         Calculate portfolio-level risk metrics.
 
+        Signals are weighted by position size (negative for SELL); tickers
+        without history carry no weight. Return series of different lengths
+        are aligned on their latest period.
+
         Args:
             signals: Current trading signals
-            historical_returns: Dict of ticker -> list of historical returns
+            historical_returns: Dict of ticker -> list of daily returns
+            benchmark_returns: Optional benchmark daily returns for beta,
+                aligned on the latest period like historical_returns
 
         Returns:
-            PortfolioMetrics with Sharpe, drawdown, correlation, etc.
+            PortfolioMetrics with Sharpe, VaR/CVaR, correlation, etc.
         """
         # Current drawdown (protect against division by zero)
         current_drawdown = (
@@ -257,43 +271,67 @@ Analyze market data, generate signals, and manage risk."""
         # Total exposure
         total_exposure = sum(sig.position_size for sig in signals)
 
-        # Calculate Sharpe ratio (stub - needs historical data)
-        sharpe_ratio = 0.0
-        if historical_returns:
-            # Simplified Sharpe calculation
-            # In production: use proper portfolio returns, risk-free rate
-            pass  # TODO: Implement with real data
-
-        # Calculate VaR (95% confidence)
-        var_95 = 0.0
-        if historical_returns:
-            # Simplified VaR
-            # In production: use parametric or historical VaR
-            pass  # TODO: Implement
-
-        # Calculate correlation matrix
+        if not historical_returns:
+            return PortfolioMetrics(
+                sharpe_ratio=0.0,
+                max_drawdown=self.risk_rules["max_drawdown"],
+                current_drawdown=current_drawdown,
+                var_95=0.0,
+                total_exposure=total_exposure,
+            )
+
+        # Signed weights aligned with the return matrix columns
+        series = dict(historical_returns)
+        if benchmark_returns is not None:
+            series["__benchmark__"] = benchmark_returns
+        tickers, matrix = align_returns(series)
+        benchmark = None
+        if benchmark_returns is not None:
+            tickers, matrix, benchmark = tickers[:-1], matrix[:, :-1], matrix[:, -1]
+        column = {ticker: i for i, ticker in enumerate(tickers)}
+        weights = np.zeros(len(tickers))
+        for sig in signals:
+            if sig.asset.ticker in column:
+                direction = {"BUY": 1.0, "SELL": -1.0}.get(sig.signal_type, 0.0)
+                weights[column[sig.asset.ticker]] += direction * sig.position_size
+
+        risk = portfolio_risk(
+            matrix,
+            weights,
+            confidence=0.95,
+            risk_free_rate=0.02,
+            benchmark=benchmark,
+        )
+
+        # Pairs without enough common history are left out
         correlation_matrix = {}
-        if historical_returns and len(historical_returns) > 1:
-            tickers = list(historical_returns.keys())
-            for ticker1 in tickers:
-                correlation_matrix[ticker1] = {}
-                for ticker2 in tickers:
-                    if ticker1 == ticker2:
-                        correlation_matrix[ticker1][ticker2] = 1.0
-                    else:
-                        returns1 = np.array(historical_returns[ticker1])
-                        returns2 = np.array(historical_returns[ticker2])
-                        if len(returns1) > 1 and len(returns2) > 1:
-                            corr = np.corrcoef(returns1, returns2)[0, 1]
-                            correlation_matrix[ticker1][ticker2] = float(corr)
+        if len(tickers) > 1:
+            for ticker, row in zip(tickers, risk.correlation.tolist(), strict=True):
+                correlation_matrix[ticker] = {
+                    other: corr
+                    for other, corr in zip(tickers, row, strict=True)
+                    if not np.isnan(corr)
+                }
 
         return PortfolioMetrics(
-            sharpe_ratio=sharpe_ratio,
+            sharpe_ratio=risk.sharpe_ratio,
             max_drawdown=self.risk_rules["max_drawdown"],
             current_drawdown=current_drawdown,
-            var_95=var_95,
+            var_95=risk.var,
             correlation_matrix=correlation_matrix,
             total_exposure=total_exposure,
+            volatility=risk.volatility,
+            cvar_95=risk.cvar,
+            parametric_var_95=risk.parametric_var,
+            parametric_cvar_95=risk.parametric_cvar,
+            beta=risk.beta,
+            risk_contributions={
+                ticker: float(share)
+                for ticker, share, weight in zip(
+                    tickers, risk.contribution_share, weights, strict=True
+                )
+                if weight != 0
+            },
         )
 
     def validate_risk_constraints(
@@ -328,15 +366,14 @@ Analyze market data, generate signals, and manage risk."""
                 f"max {self.risk_rules['max_drawdown']:.2%} - CIRCUIT BREAKER!"
             )
 
-        # Check correlations
+        # Check correlations between assets that both have signals
+        signal_tickers = {s.asset.ticker for s in signals}
         for ticker1, corrs in portfolio_metrics.correlation_matrix.items():
+            if ticker1 not in signal_tickers:
+                continue
             for ticker2, corr in corrs.items():
                 if ticker1 != ticker2 and corr > self.risk_rules["correlation_limit"]:
-                    # Check if both assets have signals
-                    has_both = any(s.asset.ticker == ticker1 for s in signals) and any(
-                        s.asset.ticker == ticker2 for s in signals
-                    )
-                    if has_both:
+                    if ticker2 in signal_tickers:
                         violations.append(
                             f"Correlation {ticker1}-{ticker2}: {corr:.2f} > "
                             f"limit {self.risk_rules['correlation_limit']:.2f}"
@@ -349,6 +386,7 @@ Analyze market data, generate signals, and manage risk."""
         assets: list[Asset],
         market_data: dict[str, Any],
         historical_returns: dict[str, list[float]] | None = None,
+        benchmark_returns: list[float] | None = None,
     ) -> TradingRecommendation:
         """
         Generate trading signals for assets.
@@ -357,6 +395,7 @@ Analyze market data, generate signals, and manage risk."""
             assets: List of assets to analyze
             market_data: Dict with indicator values, price history, etc.
             historical_returns: Historical returns for risk calculation
+            benchmark_returns: Optional benchmark returns for portfolio beta
 
         Returns:
             TradingRecommendation with validated signals
@@ -375,7 +414,7 @@ Analyze market data, generate signals, and manage risk."""
 
         # Calculate portfolio metrics
         portfolio_metrics = self.calculate_portfolio_metrics(
-            signals, historical_returns
+            signals, historical_returns, benchmark_returns
         )
 
         # Validate risk constraints
@@ -1,5 +1,56 @@
 """Backtesting module for agent strategies."""
 
 from .backtest_engine import BacktestEngine, BacktestMetrics, Trade
+from .ledger import TradeLedger
+from .market_store import MarketDataStore, get_market_store, set_market_store
+from .metrics import (
+    BootstrapResult,
+    bootstrap_returns,
+    bootstrap_trades,
+    performance_summary,
+)
+from .optimization import (
+    ParameterSweep,
+    SweepResult,
+    WalkForwardResult,
+    parameter_grid,
+    random_parameters,
+)
+from .portfolio import BarPanel, PortfolioResult, simulate_portfolio
+from .risk import PortfolioRisk, portfolio_risk
+from .simulation import (
+    BarContext,
+    BarSeries,
+    SimulationResult,
+    simulate_events,
+    simulate_targets,
+)
 
-__all__ = ["BacktestEngine", "BacktestMetrics", "Trade"]
+__all__ = [
+    "BacktestEngine",
+    "BacktestMetrics",
+    "Trade",
+    "TradeLedger",
+    "MarketDataStore",
+    "get_market_store",
+    "set_market_store",
+    "BootstrapResult",
+    "bootstrap_returns",
+    "bootstrap_trades",
+    "performance_summary",
+    "ParameterSweep",
+    "SweepResult",
+    "WalkForwardResult",
+    "parameter_grid",
+    "random_parameters",
+    "BarPanel",
+    "PortfolioResult",
+    "simulate_portfolio",
+    "PortfolioRisk",
+    "portfolio_risk",
+    "BarContext",
+    "BarSeries",
+    "SimulationResult",
+    "simulate_events",
+    "simulate_targets",
+]
@@ -6,17 +6,47 @@ Test agent strategies on historical data and calculate:
 - Unit economics (cost per trade, profit per customer)
 - Risk metrics (max drawdown, VaR)
 - Business viability (break-even analysis)
+
+Strategies are replayed bar by bar by agent_kit.backtesting.simulation, with
+positions, cash and equity kept in NumPy arrays.
 """
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Mapping, Sequence
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Any
 
 import numpy as np
 from pydantic import BaseModel
 
+from agent_kit.backtesting.ledger import TradeLedger
+from agent_kit.backtesting.metrics import (
+    BootstrapResult,
+    bootstrap_returns,
+    bootstrap_trades,
+    performance_summary,
+    returns_from_equity,
+)
+from agent_kit.backtesting.optimization import (
+    ParameterSweep,
+    SweepResult,
+    WalkForwardResult,
+)
+from agent_kit.backtesting.portfolio import (
+    BarPanel,
+    PortfolioResult,
+    per_symbol,
+    simulate_portfolio,
+)
+from agent_kit.backtesting.simulation import (
+    BarContext,
+    BarSeries,
+    simulate_events,
+    to_datetime64,
+)
+
 
 class Trade(BaseModel):
     """Single trade executed during backtest."""
@@ -65,7 +95,7 @@ class BacktestMetrics:
     # Risk
     sharpe_ratio: float
     max_drawdown: float
-    var_95: float  # 95% Value at Risk
+    var_95: float  # 95% historical Value at Risk (positive one-period loss fraction)
 
     # Trade stats
     num_trades: int
@@ -86,6 +116,44 @@ class BacktestMetrics:
     monthly_profit_potential: float
     roi_break_even_months: float
 
+    # Risk-adjusted (from the equity curve)
+    sortino_ratio: float = 0.0
+    calmar_ratio: float = 0.0
+    max_drawdown_duration: int = 0  # Bars from peak to recovery (or end)
+    turnover: float = 0.0  # Traded notional per year / average equity
+
+
+def _window_records(
+    bars: Sequence[dict], start: datetime | None, end: datetime | None
+) -> list[dict]:
+    """Bar dicts in timestamp order, limited to start <= timestamp <= end."""
+    if not bars or "timestamp" not in bars[0]:
+        return list(bars)
+    timestamps = to_datetime64([bar["timestamp"] for bar in bars])
+    order = np.argsort(timestamps, kind="stable")
+    timestamps = timestamps[order]
+    lo = 0 if start is None else np.searchsorted(timestamps, to_datetime64([start])[0])
+    hi = (
+        len(bars)
+        if end is None
+        else np.searchsorted(timestamps, to_datetime64([end])[0], side="right")
+    )
+    return [bars[i] for i in order[lo:hi].tolist()]
+
+
+def _to_series(
+    historical_data: dict[str, list[dict] | BarSeries],
+    start: datetime | None,
+    end: datetime | None,
+) -> dict[str, BarSeries]:
+    """Convert ticker -> bars (dicts or BarSeries) to BarSeries within the window."""
+    return {
+        ticker: (
+            bars if isinstance(bars, BarSeries) else BarSeries.from_bars(bars)
+        ).between(start, end)
+        for ticker, bars in historical_data.items()
+    }
+
 
 class BacktestEngine:
     """
@@ -107,6 +175,8 @@ class BacktestEngine:
         data_cost_per_month: float = 50.0,  # Data feed costs
         compute_cost_per_month: float = 100.0,  # Server costs
         api_cost_per_call: float = 0.001,  # API costs (e.g., Grok)
+        periods_per_year: int = 252,  # Bars per year (daily)
+        risk_free_rate: float = 0.02,  # Annual, for Sharpe/Sortino
     ):
         """
         Initialize backtest engine.
@@ -118,6 +188,8 @@ class BacktestEngine:
             data_cost_per_month: Monthly data costs
             compute_cost_per_month: Monthly compute costs
             api_cost_per_call: Cost per API call (e.g., LLM inference)
+            periods_per_year: Bars per year for annualizing (98_280 for minutes)
+            risk_free_rate: Annual risk-free rate
         """
         self.initial_capital = initial_capital
         self.commission_rate = commission_rate
@@ -125,12 +197,27 @@ class BacktestEngine:
         self.data_cost_per_month = data_cost_per_month
         self.compute_cost_per_month = compute_cost_per_month
         self.api_cost_per_call = api_cost_per_call
+        self.periods_per_year = periods_per_year
+        self.risk_free_rate = risk_free_rate
 
         # State
         self.capital = initial_capital
         self.peak_capital = initial_capital
-        self.trades: list[Trade] = []
-        self.equity_curve: list[tuple[datetime, float]] = []
+        self.ledger = TradeLedger()
+        self.result: PortfolioResult | None = None
+        self.timestamps = np.empty(0, dtype="datetime64[ns]")
+        self.equity = np.empty(0)
+
+    @property
+    def trades(self) -> list[Trade]:
+        """Round trips of the last run as Trade models (built from the ledger)."""
+        return self.ledger.to_trades()
+
+    @property
+    def equity_curve(self) -> list[tuple[datetime, float]]:
+        """Portfolio equity per bar of the last run as (timestamp, equity) pairs."""
+        timestamps = self.timestamps.astype("datetime64[us]").tolist()
+        return list(zip(timestamps, self.equity.tolist(), strict=True))
 
     def run_backtest(
         self,
@@ -138,9 +225,17 @@ class BacktestEngine:
         historical_data: dict[str, list[dict]],  # ticker -> list of OHLCV bars
         start_date: datetime,
         end_date: datetime,
+        signal_delay: int = 1,
+        fill_price: str = "open",
     ) -> BacktestMetrics:
         """
-        Run backtest on historical data.
+        Run backtest on historical data, calling the strategy at every bar.
+
+        The strategy sees the bars up to the current one and returns signal
+        dicts (``ticker``, ``signal_type`` BUY/SELL, ``position_size`` as a
+        fraction of capital). BUY opens a long when flat, SELL closes it.
+        Signals are turned into target weights and simulated by
+        simulate_portfolio(), so execution follows its timing rules.
 
         Args:
             strategy_func: Function that takes market data and returns signals
@@ -148,86 +243,293 @@ class BacktestEngine:
             historical_data: Dict of ticker -> OHLCV data
             start_date: Backtest start date
             end_date: Backtest end date
+            signal_delay: Bars between a signal and its execution
+            fill_price: "open" or "close" of the execution bar
 
         Returns:
             BacktestMetrics with performance statistics
         """
-        # Reset state
-        self.capital = self.initial_capital
-        self.peak_capital = self.initial_capital
-        self.trades = []
-        self.equity_curve = [(start_date, self.capital)]
-
-        # Track open positions
-        open_positions: dict[str, Trade] = {}
+        records = {
+            ticker: _window_records(bars, start_date, end_date)
+            for ticker, bars in historical_data.items()
+        }
+        panel = BarPanel.from_bars(records)
+        # Bars of each ticker seen by the time of each row
+        counts = np.cumsum(~np.isnan(panel.close), axis=0)
+        column = {ticker: j for j, ticker in enumerate(panel.symbols)}
+        targets = np.full((len(panel), panel.num_symbols), np.nan)
+        current = np.zeros(panel.num_symbols)
 
-        # Count API calls for cost calculation
         api_calls = 0
+        for row in range(len(panel)):
+            seen = counts[row].tolist()
+            history = {
+                ticker: records[ticker][: seen[j]] for ticker, j in column.items()
+            }
+            signals = strategy_func(history)
+            api_calls += 1
+
+            for signal in signals:
+                ticker = signal.get("ticker") or signal.get("asset", {}).get("ticker")
+                signal_type = signal.get("signal_type")
+                j = column.get(ticker)
+                if j is None or not seen[j]:
+                    continue
+                if signal_type == "BUY" and current[j] == 0:
+                    current[j] = signal.get("position_size", 0.0)
+                elif signal_type == "SELL" and current[j] != 0:
+                    current[j] = 0.0
+                else:
+                    continue
+                targets[row, j] = current[j]
+
+        result = self._simulate_panel(panel, targets, signal_delay, fill_price)
+        return self._finish(result, api_calls)
+
+    def run_vectorized(
+        self,
+        signal_func: Callable[[dict[str, BarSeries]], dict[str, np.ndarray]],
+        historical_data: dict[str, list[dict] | BarSeries],
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        signal_delay: int = 1,
+        fill_price: str = "open",
+    ) -> BacktestMetrics:
+        """
+        Run a vectorized backtest: one strategy call over the whole history.
+
+        Args:
+            signal_func: Takes ticker -> BarSeries and returns ticker -> array
+                of target portfolio weights per bar of that ticker
+                (NaN keeps the current target)
+            historical_data: Dict of ticker -> OHLCV bars or BarSeries
+            start_date: Optional backtest start
+            end_date: Optional backtest end
+            signal_delay: Bars between a signal and its execution
+            fill_price: "open" or "close" of the execution bar
 
-        # Simulate trading day by day
-        # (In production, use proper event-driven backtester with bar-by-bar iteration)
+        Returns:
+            BacktestMetrics with performance statistics
+        """
+        series = _to_series(historical_data, start_date, end_date)
+        weights = signal_func(series)
+        panel = BarPanel.from_series(series)
+        targets = np.full((len(panel), panel.num_symbols), np.nan)
+        for j, ticker in enumerate(panel.symbols):
+            if ticker in weights:
+                rows = np.searchsorted(panel.timestamps, series[ticker].timestamps)
+                targets[rows, j] = weights[ticker]
+        result = self._simulate_panel(panel, targets, signal_delay, fill_price)
+        return self._finish(result, api_calls=1)
+
+    def run_portfolio(
+        self,
+        weight_func: Callable[[BarPanel], np.ndarray],
+        data: BarPanel | dict[str, list[dict] | BarSeries],
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        signal_delay: int = 1,
+        fill_price: str = "open",
+        commission_rate: float | Sequence[float] | Mapping[str, float] | None = None,
+        slippage: float | Sequence[float] | Mapping[str, float] | None = None,
+    ) -> BacktestMetrics:
+        """
+        Run a multi-asset backtest on aligned (time x symbol) arrays.
 
-        # Generate signals
-        signals = strategy_func(historical_data)
-        api_calls += 1  # One call to generate signals
+        Args:
+            weight_func: Takes the BarPanel and returns a (T, N) array of
+                target portfolio weights (NaN keeps a symbol's target)
+            data: BarPanel (e.g. BarPanel.from_long(frame)) or ticker -> bars
+            start_date: Optional backtest start
+            end_date: Optional backtest end
+            signal_delay: Bars between a signal and its execution
+            fill_price: "open" or "close" of the execution bar
+            commission_rate: Per-symbol override (sequence or ticker -> rate)
+            slippage: Per-symbol override (sequence or ticker -> slippage)
 
-        # Execute signals
-        for signal in signals:
-            ticker = signal.get("ticker") or signal.get("asset", {}).get("ticker")
-            signal_type = signal.get("signal_type")
-            position_size = signal.get("position_size", 0.0)
+        Returns:
+            BacktestMetrics with performance statistics
+        """
+        if not isinstance(data, BarPanel):
+            data = BarPanel.from_series(_to_series(data, None, None))
+        panel = data.between(start_date, end_date)
+        result = self._simulate_panel(
+            panel,
+            weight_func(panel),
+            signal_delay,
+            fill_price,
+            commission_rate=commission_rate,
+            slippage=slippage,
+        )
+        return self._finish(result, api_calls=1)
 
-            if not ticker or not signal_type:
-                continue
+    def run_event_driven(
+        self,
+        on_bar: Callable[[BarContext], float | None],
+        historical_data: dict[str, list[dict] | BarSeries],
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        signal_delay: int = 1,
+        fill_price: str = "open",
+    ) -> BacktestMetrics:
+        """
+        Run an event-driven backtest: call ``on_bar`` at every bar of every ticker.
 
-            # Get current price (use latest bar)
-            if ticker not in historical_data:
-                continue
+        Each ticker is simulated on an equal share of the starting capital;
+        targets and the context's position, cash and equity refer to that share.
 
-            latest_bar = historical_data[ticker][-1]
-            current_price = latest_bar["close"]
+        Args:
+            on_bar: Takes a BarContext and returns a target weight or None
+            historical_data: Dict of ticker -> OHLCV bars or BarSeries
+            start_date: Optional backtest start
+            end_date: Optional backtest end
+            signal_delay: Bars between a signal and its execution
+            fill_price: "open" or "close" of the execution bar
 
-            # Apply slippage
-            execution_price = current_price * (
-                1 + self.slippage if signal_type == "BUY" else 1 - self.slippage
+        Returns:
+            BacktestMetrics with performance statistics
+        """
+        series = _to_series(historical_data, start_date, end_date)
+        capital = self.initial_capital / max(len(series), 1)
+        results = {
+            ticker: simulate_events(
+                bars,
+                on_bar,
+                initial_capital=capital,
+                commission_rate=self.commission_rate,
+                slippage=self.slippage,
+                signal_delay=signal_delay,
+                fill_price=fill_price,
+                ticker=ticker,
             )
+            for ticker, bars in series.items()
+        }
+        idle = self.initial_capital - capital * len(series)
+        return self._finish(
+            PortfolioResult.from_results(results, cash=idle),
+            api_calls=sum(map(len, series.values())),
+        )
+
+    def sweep(
+        self,
+        strategy: Callable[..., np.ndarray],
+        data: BarPanel | dict[str, list[dict] | BarSeries],
+        configs: Sequence[dict[str, Any]],
+        metric: str = "sharpe_ratio",
+        workers: int | None = None,
+        signal_delay: int = 1,
+        fill_price: str = "open",
+    ) -> SweepResult:
+        """
+        Score many parameter sets of ``strategy(panel, **params)`` in parallel.
+
+        Args:
+            strategy: Module-level function returning (T, N) target weights
+            data: BarPanel or ticker -> bars
+            configs: Parameter dicts (see parameter_grid / random_parameters)
+            metric: Ranking score (sharpe_ratio, total_return, max_drawdown)
+            workers: Processes (None = CPU count, 0 or 1 = in-process)
+            signal_delay: Bars between a signal and its execution
+            fill_price: "open" or "close" of the execution bar
 
-            # Calculate quantity
-            quantity = (self.capital * position_size) / execution_price
-
-            if signal_type == "BUY" and ticker not in open_positions:
-                # Open long position
-                trade = Trade(
-                    timestamp=datetime.now(),  # Use bar timestamp in production
-                    ticker=ticker,
-                    side="buy",
-                    quantity=quantity,
-                    entry_price=execution_price,
-                )
-                open_positions[ticker] = trade
-
-            elif signal_type == "SELL" and ticker in open_positions:
-                # Close long position
-                trade = open_positions[ticker]
-                trade.close_trade(execution_price, datetime.now(), self.commission_rate)
-                self.trades.append(trade)
-                self.capital += trade.pnl
-                del open_positions[ticker]
-
-        # Close any remaining positions at end date
-        for ticker, trade in open_positions.items():
-            if ticker in historical_data:
-                final_price = historical_data[ticker][-1]["close"]
-                trade.close_trade(final_price, end_date, self.commission_rate)
-                self.trades.append(trade)
-                self.capital += trade.pnl
-
-        # Calculate metrics
+        Returns:
+            SweepResult ranked best first
+        """
+        return self._parameter_sweep(
+            strategy, data, workers, signal_delay, fill_price
+        ).run(configs, metric)
+
+    def walk_forward(
+        self,
+        strategy: Callable[..., np.ndarray],
+        data: BarPanel | dict[str, list[dict] | BarSeries],
+        configs: Sequence[dict[str, Any]],
+        train_size: int,
+        test_size: int,
+        step: int | None = None,
+        metric: str = "sharpe_ratio",
+        workers: int | None = None,
+        signal_delay: int = 1,
+        fill_price: str = "open",
+    ) -> WalkForwardResult:
+        """
+        Walk-forward optimization: search on rolling in-sample windows and
+        score each winner on the following out-of-sample window.
+
+        Returns:
+            WalkForwardResult with per-fold parameters and scores
+        """
+        return self._parameter_sweep(
+            strategy, data, workers, signal_delay, fill_price
+        ).walk_forward(configs, train_size, test_size, step=step, metric=metric)
+
+    def _parameter_sweep(
+        self,
+        strategy: Callable[..., np.ndarray],
+        data: BarPanel | dict[str, list[dict] | BarSeries],
+        workers: int | None,
+        signal_delay: int,
+        fill_price: str,
+    ) -> ParameterSweep:
+        if not isinstance(data, BarPanel):
+            data = BarPanel.from_series(_to_series(data, None, None))
+        return ParameterSweep(
+            strategy,
+            data,
+            initial_capital=self.initial_capital,
+            commission_rate=self.commission_rate,
+            slippage=self.slippage,
+            signal_delay=signal_delay,
+            fill_price=fill_price,
+            periods_per_year=self.periods_per_year,
+            risk_free_rate=self.risk_free_rate,
+            workers=workers,
+        )
+
+    def _simulate_panel(
+        self,
+        panel: BarPanel,
+        targets: np.ndarray,
+        signal_delay: int,
+        fill_price: str,
+        commission_rate: float | Sequence[float] | Mapping[str, float] | None = None,
+        slippage: float | Sequence[float] | Mapping[str, float] | None = None,
+    ) -> PortfolioResult:
+        """Simulate with the engine's capital and costs (per-symbol overrides allowed)."""
+        return simulate_portfolio(
+            panel,
+            targets,
+            initial_capital=self.initial_capital,
+            commission_rate=per_symbol(
+                self.commission_rate if commission_rate is None else commission_rate,
+                panel.symbols,
+                self.commission_rate,
+            ),
+            slippage=per_symbol(
+                self.slippage if slippage is None else slippage,
+                panel.symbols,
+                self.slippage,
+            ),
+            signal_delay=signal_delay,
+            fill_price=fill_price,
+        )
+
+    def _finish(self, result: PortfolioResult, api_calls: int) -> BacktestMetrics:
+        """Keep portfolio state, build round-trip trades and compute metrics."""
+        self.result = result
+        self.timestamps = result.timestamps
+        self.equity = result.equity
+        self.ledger = TradeLedger.from_result(result)
+
+        self.capital = result.final_equity
+        self.peak_capital = (
+            float(self.equity.max()) if len(self.equity) else self.initial_capital
+        )
         return self._calculate_metrics(api_calls)
 
     def _calculate_metrics(self, api_calls: int) -> BacktestMetrics:
-        """Calculate performance metrics."""
-        if len(self.trades) == 0:
+        """Calculate performance metrics from the equity curve and trades."""
+        if len(self.ledger) == 0:
             return BacktestMetrics(
                 total_return=0.0,
                 annualized_return=0.0,
@@ -249,27 +551,34 @@ class BacktestEngine:
                 roi_break_even_months=0.0,
             )
 
-        # Returns
-        total_return = (self.capital - self.initial_capital) / self.initial_capital
-        annualized_return = total_return  # Simplified - assume 1 year backtest
+        num_trades = len(self.ledger)
+        pnl = self.ledger.pnl
+        commissions = self.ledger.commission
+        traded_value = (
+            float(np.abs(self.result.fill_quantity) @ self.result.fill_price)
+            if self.result is not None
+            else 0.0
+        )
+        summary = performance_summary(
+            self.equity,
+            periods_per_year=self.periods_per_year,
+            risk_free_rate=self.risk_free_rate,
+            traded_value=traded_value,
+            trade_pnl=pnl,
+        )
 
         # Trade stats
-        winning_trades = [t for t in self.trades if t.pnl > 0]
-        losing_trades = [t for t in self.trades if t.pnl < 0]
-
-        win_rate = len(winning_trades) / len(self.trades) if self.trades else 0.0
-        avg_win = np.mean([t.pnl for t in winning_trades]) if winning_trades else 0.0
-        avg_loss = (
-            np.mean([abs(t.pnl) for t in losing_trades]) if losing_trades else 0.0
+        wins = pnl[pnl > 0]
+        losses = -pnl[pnl < 0]
+        avg_win = float(wins.mean()) if len(wins) else 0.0
+        avg_loss = float(losses.mean()) if len(losses) else 0.0
+        profit_factor = (
+            float(wins.sum() / losses.sum()) if len(losses) else float("inf")
         )
 
-        total_wins = sum(t.pnl for t in winning_trades)
-        total_losses = sum(abs(t.pnl) for t in losing_trades)
-        profit_factor = total_wins / total_losses if total_losses > 0 else float("inf")
-
         # P&L
-        total_pnl = sum(t.pnl for t in self.trades)
-        total_commissions = sum(t.commission for t in self.trades)
+        total_pnl = float(pnl.sum())
+        total_commissions = float(commissions.sum())
 
         # Unit economics
         api_costs = api_calls * self.api_cost_per_call
@@ -279,8 +588,8 @@ class BacktestEngine:
         total_costs = total_commissions + api_costs + monthly_overhead
         net_profit = total_pnl - total_costs
 
-        avg_pnl_per_trade = total_pnl / len(self.trades)
-        cost_per_trade = total_costs / len(self.trades)
+        avg_pnl_per_trade = total_pnl / num_trades
+        cost_per_trade = total_costs / num_trades
 
         # Business metrics
         # How many trades needed per month to break even?
@@ -292,7 +601,7 @@ class BacktestEngine:
             break_even_trades = -1  # Not profitable
 
         # Monthly profit potential (assuming same win rate)
-        trades_per_month = len(self.trades)  # Assume backtest is 1 month
+        trades_per_month = num_trades  # Assume backtest is 1 month
         monthly_profit = (avg_pnl_per_trade - cost_per_trade) * trades_per_month
 
         # ROI break-even months (how long to recover initial capital)
@@ -301,20 +610,14 @@ class BacktestEngine:
         else:
             roi_months = float("inf")
 
-        # Risk metrics
-        returns = [t.pnl / self.initial_capital for t in self.trades]
-        sharpe_ratio = self._calculate_sharpe(returns)
-        max_drawdown = self._calculate_max_drawdown()
-        var_95 = np.percentile(returns, 5) if returns else 0.0
-
         return BacktestMetrics(
-            total_return=total_return,
-            annualized_return=annualized_return,
-            sharpe_ratio=sharpe_ratio,
-            max_drawdown=max_drawdown,
-            var_95=var_95,
-            num_trades=len(self.trades),
-            win_rate=win_rate,
+            total_return=(self.capital - self.initial_capital) / self.initial_capital,
+            annualized_return=summary["annualized_return"],
+            sharpe_ratio=summary["sharpe_ratio"],
+            max_drawdown=summary["max_drawdown"],
+            var_95=summary["var_95"],
+            num_trades=num_trades,
+            win_rate=summary["hit_rate"],
             avg_win=avg_win,
             avg_loss=avg_loss,
             profit_factor=profit_factor,
@@ -326,44 +629,52 @@ class BacktestEngine:
             break_even_trades_per_month=break_even_trades,
             monthly_profit_potential=monthly_profit,
             roi_break_even_months=roi_months,
+            sortino_ratio=summary["sortino_ratio"],
+            calmar_ratio=summary["calmar_ratio"],
+            max_drawdown_duration=summary["max_drawdown_duration"],
+            turnover=summary["turnover"],
         )
 
-    def _calculate_sharpe(
-        self, returns: list[float], risk_free_rate: float = 0.02
-    ) -> float:
-        """Calculate Sharpe ratio."""
-        if len(returns) < 2:
-            return 0.0
-
-        mean_return = np.mean(returns)
-        std_return = np.std(returns)
-
-        if std_return == 0:
-            return 0.0
-
-        # Annualize
-        annual_return = mean_return * 252
-        annual_std = std_return * np.sqrt(252)
-
-        return (annual_return - risk_free_rate) / annual_std
-
-    def _calculate_max_drawdown(self) -> float:
-        """Calculate maximum drawdown."""
-        if not self.equity_curve:
-            return 0.0
-
-        equity_values = [eq[1] for eq in self.equity_curve]
-        peak = equity_values[0]
-        max_dd = 0.0
+    def bootstrap(
+        self,
+        n_samples: int = 10_000,
+        method: str = "trades",
+        block_size: int = 1,
+        confidence: float = 0.95,
+        seed: int | None = None,
+    ) -> BootstrapResult:
+        """
+        Monte Carlo confidence intervals for the last run.
 
-        for value in equity_values:
-            if value > peak:
-                peak = value
-            dd = (peak - value) / peak
-            if dd > max_dd:
-                max_dd = dd
+        Args:
+            n_samples: Number of resampled paths
+            method: "trades" (resample round-trip P&Ls) or "returns"
+                (resample per-bar returns in blocks of ``block_size``)
+            block_size: Bars per block for the returns method
+            confidence: Interval coverage
+            seed: RNG seed
 
-        return max_dd
+        Returns:
+            BootstrapResult
+        """
+        if method == "trades":
+            return bootstrap_trades(
+                self.ledger.pnl,
+                self.initial_capital,
+                n_samples=n_samples,
+                confidence=confidence,
+                seed=seed,
+            )
+        if method == "returns":
+            return bootstrap_returns(
+                returns_from_equity(self.equity),
+                n_samples=n_samples,
+                block_size=block_size,
+                periods_per_year=self.periods_per_year,
+                confidence=confidence,
+                seed=seed,
+            )
+        raise ValueError(f"Unknown bootstrap method: {method}")
 
     def print_summary(self, metrics: BacktestMetrics):
         """Print backtest summary."""
@@ -374,7 +685,12 @@ class BacktestEngine:
         print(f"  Total Return: {metrics.total_return:.2%}")
         print(f"  Annualized Return: {metrics.annualized_return:.2%}")
         print(f"  Sharpe Ratio: {metrics.sharpe_ratio:.2f}")
-        print(f"  Max Drawdown: {metrics.max_drawdown:.2%}")
+        print(f"  Sortino Ratio: {metrics.sortino_ratio:.2f}")
+        print(f"  Calmar Ratio: {metrics.calmar_ratio:.2f}")
+        print(
+            f"  Max Drawdown: {metrics.max_drawdown:.2%}"
+            f" ({metrics.max_drawdown_duration} bars)"
+        )
         print(f"  95% VaR: {metrics.var_95:.2%}")
 
         print("\n📈 TRADE STATISTICS")
@@ -383,6 +699,7 @@ class BacktestEngine:
         print(f"  Avg Win: ${metrics.avg_win:.2f}")
         print(f"  Avg Loss: ${metrics.avg_loss:.2f}")
         print(f"  Profit Factor: {metrics.profit_factor:.2f}")
+        print(f"  Turnover: {metrics.turnover:.1f}x / year")
 
         print("\n💰 UNIT ECONOMICS")
         print(f"  Total P&L: ${metrics.total_pnl:.2f}")
@@ -0,0 +1,296 @@
+"""
+Columnar trade ledger.
+
+From first principles: A backtest can produce millions of fills, and a
+Python object per trade costs microseconds to build and hundreds of bytes
+to hold. The ledger keeps round trips as one structured NumPy array (one
+column per field, ~90 bytes a row) and builds it from the fill columns
+with array operations:
+- per-symbol running position = grouped cumulative sum of fill quantities
+- a fill that crosses zero is split into a closing and an opening part
+- a trip starts wherever the position leaves zero; per-trip totals are
+  bincounts over the trip id
+
+Pydantic ``Trade`` objects are only built on request (API boundaries), and
+the columns go straight to polars / Parquet for storage.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from agent_kit.backtesting.backtest_engine import Trade
+    from agent_kit.backtesting.portfolio import PortfolioResult
+
+TRADE_DTYPE = np.dtype(
+    [
+        ("symbol", np.int32),  # index into TradeLedger.symbols
+        ("side", np.int8),  # 1 long, -1 short
+        ("entry_bar", np.int64),
+        ("exit_bar", np.int64),  # -1 while open
+        ("entry_time", "datetime64[ns]"),
+        ("exit_time", "datetime64[ns]"),  # NaT while open
+        ("quantity", np.float64),  # peak shares (sum of opening fills)
+        ("entry_price", np.float64),  # volume-weighted
+        ("exit_price", np.float64),  # volume-weighted, NaN while open
+        ("pnl", np.float64),  # net of commission; open trips marked to market
+        ("commission", np.float64),
+    ]
+)
+
+# Positions within this fraction of the previous position count as flat
+_FLAT_TOLERANCE = 1e-9
+
+
+class TradeLedger:
+    """
+    Round-trip trades as a structured NumPy array.
+
+    Columns are exposed as attributes (``ledger.pnl``, ``ledger.quantity``,
+    ...); ``to_trades()`` converts rows to Trade models on demand.
+    """
+
+    def __init__(
+        self,
+        records: np.ndarray | None = None,
+        symbols: Sequence[str] = (),
+    ):
+        self.records = np.zeros(0, dtype=TRADE_DTYPE) if records is None else records
+        self.symbols = tuple(symbols)
+
+    @classmethod
+    def from_fills(
+        cls,
+        timestamps: np.ndarray,
+        symbols: Sequence[str],
+        fill_index: np.ndarray,
+        fill_symbol: np.ndarray,
+        fill_quantity: np.ndarray,
+        fill_price: np.ndarray,
+        fill_commission: np.ndarray,
+        last_close: np.ndarray,
+    ) -> TradeLedger:
+        """
+        Group fills into round trips (flat -> position -> flat).
+
+        Args:
+            timestamps: Bar timestamps that ``fill_index`` points into
+            symbols: Symbol names that ``fill_symbol`` points into
+            fill_index: Bar of each fill
+            fill_symbol: Symbol column of each fill
+            fill_quantity: Signed shares
+            fill_price: Fill price after slippage
+            fill_commission: Commission of each fill
+            last_close: Per-symbol price to mark trips still open at the end
+
+        Returns:
+            TradeLedger ordered by symbol, then entry
+        """
+        if len(fill_index) == 0:
+            return cls(symbols=symbols)
+
+        # Fills grouped by symbol, in time order within each symbol
+        order = np.lexsort((fill_index, fill_symbol))
+        bar = fill_index[order]
+        symbol = fill_symbol[order]
+        quantity = fill_quantity[order].astype(np.float64)
+        price = fill_price[order].astype(np.float64)
+        commission = fill_commission[order].astype(np.float64)
+
+        # Running position per symbol, and whether each fill leaves it flat
+        first = np.r_[True, symbol[1:] != symbol[:-1]]
+        position = _grouped_cumsum(quantity, first)
+        before = position - quantity
+        flat_after = np.abs(position) <= _FLAT_TOLERANCE * np.maximum(
+            np.abs(before), np.abs(quantity)
+        )
+        flat_before = first | np.r_[False, flat_after[:-1]]
+        position[flat_after] = 0.0
+        before[flat_before] = 0.0
+
+        # Split fills that flip the position into a close and an open
+        flips = (before * position < 0) & ~flat_after
+        if flips.any():
+            repeat = np.where(flips, 2, 1)
+            head = np.cumsum(repeat) - repeat  # first expanded row per fill
+            tail = head[flips] + 1
+            closing_part = -before[flips]
+            share = closing_part / quantity[flips]
+
+            bar = np.repeat(bar, repeat)
+            symbol = np.repeat(symbol, repeat)
+            price = np.repeat(price, repeat)
+            quantity = np.repeat(quantity, repeat)
+            commission = np.repeat(commission, repeat)
+            before = np.repeat(before, repeat)
+            flat_before = np.repeat(flat_before, repeat)
+            flat_after = np.repeat(flat_after, repeat)
+
+            flip_head = head[flips]
+            quantity[tail] -= closing_part
+            quantity[flip_head] = closing_part
+            commission[tail] *= 1 - share
+            commission[flip_head] *= share
+            flat_after[flip_head] = True
+            before[tail] = 0.0
+            flat_before[tail] = True
+
+        # A trip starts wherever the position leaves flat
+        trip = np.cumsum(flat_before) - 1
+        n_trips = int(trip[-1]) + 1
+        opening = flat_before | (np.sign(quantity) == np.sign(before))
+        size = np.abs(quantity)
+
+        def total(weights: np.ndarray) -> np.ndarray:
+            return np.bincount(trip, weights=weights, minlength=n_trips)
+
+        entry_quantity = total(np.where(opening, size, 0.0))
+        entry_value = total(np.where(opening, size * price, 0.0))
+        exit_quantity = total(np.where(opening, 0.0, size))
+        exit_value = total(np.where(opening, 0.0, size * price))
+        cash = total(-quantity * price)
+        fees = total(commission)
+
+        starts = np.flatnonzero(flat_before)
+        ends = np.r_[starts[1:], len(trip)] - 1
+        closed = flat_after[ends]
+        trip_symbol = symbol[starts]
+        held = total(quantity)  # remaining shares of open trips
+        marks = np.asarray(last_close, dtype=np.float64)[trip_symbol]
+        cash = np.where(closed, cash, cash + held * np.nan_to_num(marks))
+
+        records = np.zeros(n_trips, dtype=TRADE_DTYPE)
+        records["symbol"] = trip_symbol
+        records["side"] = np.sign(quantity[starts])
+        records["entry_bar"] = bar[starts]
+        records["exit_bar"] = np.where(closed, bar[ends], -1)
+        records["entry_time"] = timestamps[bar[starts]]
+        records["exit_time"] = np.where(
+            closed, timestamps[bar[ends]], np.datetime64("NaT", "ns")
+        )
+        records["quantity"] = entry_quantity
+        records["entry_price"] = entry_value / entry_quantity
+        with np.errstate(invalid="ignore", divide="ignore"):
+            records["exit_price"] = np.where(closed, exit_value / exit_quantity, np.nan)
+        records["pnl"] = cash - fees
+        records["commission"] = fees
+        return cls(records, symbols)
+
+    @classmethod
+    def from_result(cls, result: PortfolioResult) -> TradeLedger:
+        """Round trips of a portfolio simulation."""
+        last_close = (
+            result.marks[-1] if len(result.marks) else np.zeros(len(result.symbols))
+        )
+        return cls.from_fills(
+            result.timestamps,
+            result.symbols,
+            result.fill_index,
+            result.fill_symbol,
+            result.fill_quantity,
+            result.fill_price,
+            result.fill_commission,
+            last_close,
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        if name != "records" and name in TRADE_DTYPE.names:
+            return self.records[name]
+        raise AttributeError(name)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the records."""
+        return self.records.nbytes
+
+    def for_symbol(self, symbol: str) -> TradeLedger:
+        """Trades of one symbol."""
+        column = self.symbols.index(symbol)
+        return TradeLedger(self.records[self.records["symbol"] == column], self.symbols)
+
+    def iter_trades(self) -> Iterator[Trade]:
+        """Yield rows as Trade models (built one at a time)."""
+        from agent_kit.backtesting.backtest_engine import Trade
+
+        columns = {name: self.records[name].tolist() for name in TRADE_DTYPE.names}
+        entry_times = self.records["entry_time"].astype("datetime64[us]").tolist()
+        exit_times = self.records["exit_time"].astype("datetime64[us]").tolist()
+        for i in range(len(self.records)):
+            closed = columns["exit_bar"][i] >= 0
+            yield Trade(
+                timestamp=entry_times[i],
+                ticker=self.symbols[columns["symbol"][i]],
+                side="buy" if columns["side"][i] > 0 else "sell",
+                quantity=columns["quantity"][i],
+                entry_price=columns["entry_price"][i],
+                exit_price=columns["exit_price"][i] if closed else None,
+                exit_timestamp=exit_times[i] if closed else None,
+                pnl=columns["pnl"][i],
+                commission=columns["commission"][i],
+            )
+
+    def to_trades(self) -> list[Trade]:
+        """All rows as Trade models."""
+        return list(self.iter_trades())
+
+    def to_polars(self) -> Any:
+        """Columns as a polars DataFrame (symbol names and sides as strings)."""
+        import polars as pl
+
+        columns: dict[str, Any] = {
+            name: self.records[name] for name in TRADE_DTYPE.names
+        }
+        columns["symbol"] = np.asarray(self.symbols or [""], dtype=object)[
+            self.records["symbol"]
+        ]
+        columns["side"] = np.where(self.records["side"] > 0, "buy", "sell")
+        return pl.DataFrame(columns)
+
+    def write_parquet(self, path: str | Path, compression: str = "zstd") -> Path:
+        """Write the ledger to a Parquet file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.to_polars().write_parquet(path, compression=compression)
+        return path
+
+    @classmethod
+    def read_parquet(cls, path: str | Path) -> TradeLedger:
+        """Load a ledger written by write_parquet()."""
+        import polars as pl
+
+        frame = pl.read_parquet(path)
+        names = frame.get_column("symbol").to_numpy().astype(str)
+        symbols, column = np.unique(names, return_inverse=True)
+        records = np.zeros(frame.height, dtype=TRADE_DTYPE)
+        for name in TRADE_DTYPE.names:
+            if name == "symbol":
+                records[name] = column
+            elif name == "side":
+                records[name] = np.where(
+                    frame.get_column("side").to_numpy() == "buy", 1, -1
+                )
+            else:
+                records[name] = frame.get_column(name).to_numpy()
+        return cls(records, tuple(symbols.tolist()))
+
+
+def _grouped_cumsum(values: np.ndarray, group_start: np.ndarray) -> np.ndarray:
+    """
+    Cumulative sum restarting at every True in ``group_start``.
+
+    One cumsum per group rather than a global cumsum minus offsets, so
+    rounding from large earlier groups doesn't leak into small later ones.
+    """
+    out = np.empty_like(values)
+    bounds = np.r_[np.flatnonzero(group_start), len(values)]
+    for lo, hi in zip(bounds[:-1].tolist(), bounds[1:].tolist(), strict=True):
+        np.cumsum(values[lo:hi], out=out[lo:hi])
+    return out
@@ -0,0 +1,436 @@
+"""
+Local columnar OHLCV store.
+
+From first principles: Backtests and indicators read the same bars over and
+over, and regenerating or refetching them costs far more than reading
+them from disk. Bars are append-mostly time series, so the store lays them
+out the way they are queried:
+- one directory per interval and symbol, one Parquet file per calendar
+  partition (year for daily bars, month for intraday bars), columns
+  timestamp/open/high/low/close/volume sorted by timestamp
+- a range read opens only the partitions overlapping the range and slices
+  them with a binary search
+- an append rewrites only the partitions its bars fall in (merge, drop
+  duplicate timestamps keeping the new bar, atomic replace)
+- recently read ranges are kept in an in-process LRU as read-only arrays,
+  invalidated when their symbol is appended to
+
+Gap detection compares consecutive timestamps with the interval step
+(business days for daily bars), so callers fetch only what is missing.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from agent_kit.backtesting.portfolio import BarPanel
+from agent_kit.backtesting.simulation import BarSeries, to_datetime64
+
+# Bar spacing and partition unit per interval
+INTERVALS: dict[str, tuple[np.timedelta64, str]] = {
+    "1min": (np.timedelta64(1, "m"), "M"),
+    "5min": (np.timedelta64(5, "m"), "M"),
+    "15min": (np.timedelta64(15, "m"), "M"),
+    "1hour": (np.timedelta64(1, "h"), "M"),
+    "1day": (np.timedelta64(1, "D"), "Y"),
+}
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+
+# Symbols become directory names; anything else could escape the store root
+_SYMBOL = re.compile(r"[A-Za-z0-9._^=-]+")
+
+_NS = "datetime64[ns]"
+
+Bound = datetime | str | np.datetime64 | None
+
+
+def _to_ns(value: Bound) -> np.datetime64 | None:
+    """One timestamp as datetime64[ns] (None passes through)."""
+    return None if value is None else to_datetime64([value])[0]
+
+
+def _check_symbol(symbol: str) -> str:
+    if not _SYMBOL.fullmatch(symbol) or ".." in symbol or symbol == ".":
+        raise ValueError(f"Invalid symbol: {symbol!r}")
+    return symbol
+
+
+def _step(interval: str) -> tuple[np.timedelta64, str]:
+    if interval not in INTERVALS:
+        raise ValueError(f"interval must be one of {tuple(INTERVALS)}, got {interval}")
+    return INTERVALS[interval]
+
+
+class MarketDataStore:
+    """
+    Partitioned Parquet store of OHLCV bars with an LRU of hot ranges.
+
+    Thread-safe: reads and appends hold one lock, so tools running in
+    worker threads can share a store. Symbols name directories, so they
+    are limited to letters, digits and ``._^=-`` (no ``..``); anything
+    else raises ValueError.
+
+    Example:
+        >>> store = MarketDataStore("~/.agent_kit/market_data")
+        >>> store.append("AAPL", bars, interval="1day")
+        >>> series = store.read("AAPL", start="2024-01-01", end="2024-06-30")
+        >>> for first, last in store.gaps("AAPL", start="2024-01-01", end="2024-12-31"):
+        ...     store.append("AAPL", fetch_bars("AAPL", first, last))
+    """
+
+    def __init__(self, root: str | Path, cache_size: int = 128):
+        """
+        Initialize store.
+
+        Args:
+            root: Directory holding the partitions (created on first append)
+            cache_size: Max cached ranges (least recently used evicted)
+        """
+        if cache_size < 0:
+            raise ValueError("cache_size must be non-negative")
+        self.root = Path(root).expanduser()
+        self.cache_size = cache_size
+        self._cache: OrderedDict[tuple, BarSeries] = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+
+    def _directory(self, symbol: str, interval: str) -> Path:
+        return self.root / interval / _check_symbol(symbol)
+
+    def _partitions(
+        self, symbol: str, interval: str
+    ) -> list[tuple[np.datetime64, Path]]:
+        """(partition start, path) pairs in time order."""
+        directory = self._directory(symbol, interval)
+        if not directory.is_dir():
+            return []
+        partitions = [
+            (np.datetime64(path.stem), path) for path in directory.glob("*.parquet")
+        ]
+        return sorted(partitions, key=lambda item: item[0])
+
+    @staticmethod
+    def _read_file(path: Path) -> dict[str, np.ndarray]:
+        import polars as pl
+
+        frame = pl.read_parquet(path)
+        columns = {"timestamp": frame.get_column("timestamp").to_numpy().astype(_NS)}
+        for name in COLUMNS:
+            columns[name] = frame.get_column(name).to_numpy().astype(np.float64)
+        return columns
+
+    @staticmethod
+    def _write_file(path: Path, columns: Mapping[str, np.ndarray]) -> None:
+        import polars as pl
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(".parquet.tmp")
+        pl.DataFrame(dict(columns)).write_parquet(temporary, compression="zstd")
+        os.replace(temporary, path)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def symbols(self, interval: str = "1day") -> list[str]:
+        """Symbols with stored bars for an interval."""
+        _step(interval)
+        directory = self.root / interval
+        if not directory.is_dir():
+            return []
+        return sorted(p.name for p in directory.iterdir() if any(p.glob("*.parquet")))
+
+    def read(
+        self,
+        symbol: str,
+        start: Bound = None,
+        end: Bound = None,
+        interval: str = "1day",
+    ) -> BarSeries:
+        """
+        Bars with start <= timestamp <= end (either bound optional).
+
+        Args:
+            symbol: Ticker
+            start: First timestamp (inclusive)
+            end: Last timestamp (inclusive)
+            interval: Bar interval
+
+        Returns:
+            BarSeries with read-only arrays (empty if nothing is stored)
+        """
+        _, unit = _step(interval)
+        lo, hi = _to_ns(start), _to_ns(end)
+        key = (interval, symbol, lo, hi)
+        with self._lock:
+            cached = self._cached(key)
+            if cached is not None:
+                return cached
+
+            files = [
+                path
+                for begin, path in self._partitions(symbol, interval)
+                if (hi is None or begin.astype(_NS) <= hi)
+                and (lo is None or (begin + np.timedelta64(1, unit)).astype(_NS) > lo)
+            ]
+            return self._remember(key, self._load(files, lo, hi))
+
+    def tail(self, symbol: str, n: int, interval: str = "1day") -> BarSeries:
+        """The last ``n`` stored bars (fewer if the store holds fewer)."""
+        _step(interval)
+        key = (interval, symbol, "tail", n)
+        with self._lock:
+            cached = self._cached(key)
+            if cached is not None:
+                return cached
+
+            files: list[Path] = []
+            rows = 0
+            for _, path in reversed(self._partitions(symbol, interval)):
+                files.insert(0, path)
+                rows += self._row_count(path)
+                if rows >= n:
+                    break
+            series = self._load(files, None, None)
+            return self._remember(
+                key, series.take(slice(max(len(series) - n, 0), None))
+            )
+
+    def read_panel(
+        self,
+        symbols: Sequence[str],
+        start: Bound = None,
+        end: Bound = None,
+        interval: str = "1day",
+    ) -> BarPanel:
+        """Range read of several symbols aligned as a time x symbol BarPanel."""
+        return BarPanel.from_series(
+            {symbol: self.read(symbol, start, end, interval) for symbol in symbols}
+        )
+
+    @staticmethod
+    def _row_count(path: Path) -> int:
+        import polars as pl
+
+        return pl.scan_parquet(path).select(pl.len()).collect().item()
+
+    def _load(
+        self, files: Sequence[Path], lo: np.datetime64 | None, hi: np.datetime64 | None
+    ) -> BarSeries:
+        parts = [self._read_file(path) for path in files]
+        if parts:
+            columns = {
+                name: np.concatenate([part[name] for part in parts])
+                for name in ("timestamp", *COLUMNS)
+            }
+        else:
+            columns = {name: np.empty(0) for name in COLUMNS}
+            columns["timestamp"] = np.empty(0, _NS)
+        first = 0 if lo is None else np.searchsorted(columns["timestamp"], lo)
+        last = (
+            len(columns["timestamp"])
+            if hi is None
+            else np.searchsorted(columns["timestamp"], hi, side="right")
+        )
+        for values in columns.values():
+            values.setflags(write=False)
+        return BarSeries(
+            timestamps=columns["timestamp"],
+            close=columns["close"],
+            open=columns["open"],
+            high=columns["high"],
+            low=columns["low"],
+            volume=columns["volume"],
+        ).take(slice(int(first), int(last)))
+
+    # ------------------------------------------------------------------
+    # Gaps
+    # ------------------------------------------------------------------
+
+    def gaps(
+        self,
+        symbol: str,
+        start: Bound = None,
+        end: Bound = None,
+        interval: str = "1day",
+    ) -> list[tuple[np.datetime64, np.datetime64]]:
+        """
+        Missing stretches of bars, as (first missing, last missing) pairs.
+
+        Daily bars only count business days as missing (weekends are not
+        gaps); intraday bars count every step. With ``start``/``end``, the
+        stretches before the first and after the last stored bar are
+        included, so each pair can be passed straight to a fetch.
+        """
+        step, _ = _step(interval)
+        lo, hi = _to_ns(start), _to_ns(end)
+        timestamps = self.read(symbol, lo, hi, interval).timestamps
+        daily = interval == "1day"
+
+        # Stored bars bracketed by the requested bounds (one step outside)
+        points = timestamps
+        if lo is not None:
+            points = np.r_[np.array([lo - step], _NS), points]
+        if hi is not None:
+            points = np.r_[points, np.array([hi + step], _NS)]
+        if len(points) < 2:
+            return []
+        before, after = points[:-1], points[1:]
+
+        if daily:
+            first = np.busday_offset(
+                (before + step).astype("datetime64[D]"), 0, roll="forward"
+            )
+            last = np.busday_offset(
+                (after - step).astype("datetime64[D]"), 0, roll="backward"
+            )
+            missing = first <= last
+            first, last = first.astype(_NS), last.astype(_NS)
+        else:
+            first, last = before + step, after - step
+            missing = after - before > step
+        return list(zip(first[missing], last[missing], strict=True))
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(
+        self,
+        symbol: str,
+        bars: BarSeries | Iterable[Mapping[str, Any]],
+        interval: str = "1day",
+    ) -> int:
+        """
+        Merge bars into the store (a stored bar with the same timestamp is replaced).
+
+        Args:
+            symbol: Ticker
+            bars: BarSeries or bar dicts (``timestamp`` and ``close`` required)
+            interval: Bar interval
+
+        Returns:
+            Number of bars written
+        """
+        _, unit = _step(interval)
+        if not isinstance(bars, BarSeries):
+            bars = BarSeries.from_bars(list(bars))
+        if len(bars) == 0:
+            return 0
+        # Missing fields are stored as NaN columns
+        new = {"timestamp": bars.timestamps.astype(_NS)}
+        for name in COLUMNS:
+            values = getattr(bars, name)
+            new[name] = (
+                np.full(len(bars), np.nan)
+                if values is None
+                else np.asarray(values, dtype=np.float64)
+            )
+
+        partition = new["timestamp"].astype(f"datetime64[{unit}]")
+        order = np.argsort(partition, kind="stable")
+        keys, starts = np.unique(partition[order], return_index=True)
+        bounds = np.r_[starts, len(order)]
+        with self._lock:
+            directory = self._directory(symbol, interval)
+            for i, key in enumerate(keys):
+                path = directory / f"{key}.parquet"
+                rows = order[bounds[i] : bounds[i + 1]]
+                self._write_file(path, self._merge(path, new, rows))
+            self._invalidate(interval, symbol)
+        return len(bars)
+
+    def _merge(
+        self, path: Path, new: Mapping[str, np.ndarray], rows: np.ndarray
+    ) -> dict[str, np.ndarray]:
+        """Stored partition plus new rows, sorted, new bars winning ties."""
+        columns = {name: values[rows] for name, values in new.items()}
+        if path.exists():
+            stored = self._read_file(path)
+            columns = {
+                name: np.concatenate([stored[name], columns[name]]) for name in columns
+            }
+        # Last occurrence of each timestamp wins: unique over the reversed rows
+        reversed_ts = columns["timestamp"][::-1]
+        _, keep = np.unique(reversed_ts, return_index=True)
+        keep = len(reversed_ts) - 1 - keep
+        return {name: values[keep] for name, values in columns.items()}
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def _cached(self, key: tuple) -> BarSeries | None:
+        series = self._cache.get(key)
+        if series is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._cache.move_to_end(key)
+        return series
+
+    def _remember(self, key: tuple, series: BarSeries) -> BarSeries:
+        if self.cache_size:
+            self._cache[key] = series
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return series
+
+    def _invalidate(self, interval: str, symbol: str) -> None:
+        for key in [k for k in self._cache if k[:2] == (interval, symbol)]:
+            del self._cache[key]
+
+    def clear_cache(self) -> None:
+        """Drop all cached ranges."""
+        with self._lock:
+            self._cache.clear()
+
+    def get_cache_stats(self) -> dict[str, Any]:
+        """Cache hits, misses, hit rate and size."""
+        total = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / total if total else 0.0,
+            "cached_ranges": len(self._cache),
+        }
+
+
+_default_store: MarketDataStore | None = None
+_default_store_lock = threading.Lock()
+
+
+def get_market_store() -> MarketDataStore | None:
+    """
+    Process-wide store used by ``fetch_market_data``.
+
+    Created on first use from the ``MARKET_DATA_DIR`` environment variable;
+    None when neither that nor ``set_market_store`` configured one.
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None and os.getenv("MARKET_DATA_DIR"):
+            _default_store = MarketDataStore(os.environ["MARKET_DATA_DIR"])
+        return _default_store
+
+
+def set_market_store(store: MarketDataStore | None) -> None:
+    """Install (or with None, remove) the process-wide store."""
+    global _default_store
+    with _default_store_lock:
+        _default_store = store
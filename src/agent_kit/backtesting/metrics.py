@@ -0,0 +1,328 @@
+"""
+Vectorized performance metrics and Monte Carlo resampling for backtests.
+
+From first principles: Every headline number of a backtest is a reduction
+over its equity curve (or its list of trade P&Ls). Written as array
+expressions along the last axis, the same code scores one curve of shape
+(T,) or a batch of thousands of shape (B, T) in one pass, with no Python
+loop over bars or backtests.
+
+Monte Carlo answers "how much of this result is luck?": resample the
+trades (or blocks of bar returns) with replacement, rebuild the equity
+paths, and read confidence intervals off the distribution. Paths are
+generated in fixed-size batches so memory stays bounded however many
+samples are requested.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+
+def safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """numerator / denominator with 0 where the denominator is 0."""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    out = np.zeros(np.broadcast(numerator, denominator).shape)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out
+
+
+def _result(values: np.ndarray) -> float | np.ndarray:
+    """Plain float for a single series, array for a batch."""
+    return float(values) if np.ndim(values) == 0 else values
+
+
+def returns_from_equity(equity: np.ndarray) -> np.ndarray:
+    """Simple per-bar returns along the last axis (length T - 1)."""
+    equity = np.asarray(equity, dtype=np.float64)
+    return safe_divide(np.diff(equity, axis=-1), equity[..., :-1])
+
+
+def sharpe_ratio(
+    returns: np.ndarray,
+    periods_per_year: int = 252,
+    risk_free_rate: float = 0.0,
+) -> float | np.ndarray:
+    """Annualized Sharpe ratio of per-bar returns (risk-free rate is annual)."""
+    excess = np.asarray(returns, dtype=np.float64) - risk_free_rate / periods_per_year
+    if excess.shape[-1] < 2:
+        return _result(np.zeros(excess.shape[:-1]))
+    ratio = safe_divide(excess.mean(axis=-1), excess.std(axis=-1))
+    return _result(ratio * np.sqrt(periods_per_year))
+
+
+def sortino_ratio(
+    returns: np.ndarray,
+    periods_per_year: int = 252,
+    risk_free_rate: float = 0.0,
+) -> float | np.ndarray:
+    """Annualized Sortino ratio: mean excess return over downside deviation."""
+    excess = np.asarray(returns, dtype=np.float64) - risk_free_rate / periods_per_year
+    if excess.shape[-1] < 2:
+        return _result(np.zeros(excess.shape[:-1]))
+    downside = np.sqrt(np.mean(np.minimum(excess, 0.0) ** 2, axis=-1))
+    ratio = safe_divide(excess.mean(axis=-1), downside)
+    return _result(ratio * np.sqrt(periods_per_year))
+
+
+def drawdowns(equity: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Per-bar drawdown depth (fraction below the running peak) and duration
+    (bars since that peak) along the last axis.
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    peak = np.maximum.accumulate(equity, axis=-1)
+    depth = safe_divide(peak - equity, peak)
+    bars = np.broadcast_to(np.arange(equity.shape[-1]), equity.shape)
+    last_peak = np.maximum.accumulate(np.where(equity >= peak, bars, 0), axis=-1)
+    return depth, bars - last_peak
+
+
+def max_drawdown(equity: np.ndarray) -> tuple[float | np.ndarray, int | np.ndarray]:
+    """Deepest drawdown and longest drawdown duration (in bars)."""
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.shape[-1] == 0:
+        zeros = np.zeros(equity.shape[:-1])
+        return _result(zeros), _result(zeros.astype(np.int64))
+    depth, duration = drawdowns(equity)
+    longest = duration.max(axis=-1)
+    return _result(depth.max(axis=-1)), (
+        int(longest) if np.ndim(longest) == 0 else longest
+    )
+
+
+def annualized_return(
+    equity: np.ndarray, periods_per_year: int = 252
+) -> float | np.ndarray:
+    """Compound annual growth rate of an equity curve."""
+    equity = np.asarray(equity, dtype=np.float64)
+    periods = equity.shape[-1] - 1
+    if periods < 1:
+        return _result(np.zeros(equity.shape[:-1]))
+    growth = safe_divide(equity[..., -1], equity[..., 0])
+    return _result(np.maximum(growth, 0.0) ** (periods_per_year / periods) - 1)
+
+
+def calmar_ratio(equity: np.ndarray, periods_per_year: int = 252) -> float | np.ndarray:
+    """Annualized return over maximum drawdown."""
+    depth, _ = max_drawdown(equity)
+    return _result(safe_divide(annualized_return(equity, periods_per_year), depth))
+
+
+def turnover(
+    traded_value: np.ndarray | float,
+    equity: np.ndarray,
+    periods_per_year: int = 252,
+) -> float | np.ndarray:
+    """
+    Annualized turnover: total traded notional per year over average equity
+    (1.0 = the whole book traded once a year).
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    periods = max(equity.shape[-1], 1)
+    per_year = np.asarray(traded_value, dtype=np.float64) * periods_per_year / periods
+    return _result(safe_divide(per_year, equity.mean(axis=-1)))
+
+
+def hit_rate(pnl: np.ndarray) -> float | np.ndarray:
+    """Fraction of trades (or bars) with positive P&L."""
+    pnl = np.asarray(pnl, dtype=np.float64)
+    if pnl.shape[-1] == 0:
+        return _result(np.zeros(pnl.shape[:-1]))
+    return _result(np.mean(pnl > 0, axis=-1))
+
+
+def value_at_risk(returns: np.ndarray, confidence: float = 0.95) -> float | np.ndarray:
+    """Historical VaR: the loss (positive number) not exceeded with ``confidence``."""
+    returns = np.asarray(returns, dtype=np.float64)
+    if returns.shape[-1] == 0:
+        return _result(np.zeros(returns.shape[:-1]))
+    return _result(-np.quantile(returns, 1 - confidence, axis=-1))
+
+
+def performance_summary(
+    equity: np.ndarray,
+    periods_per_year: int = 252,
+    risk_free_rate: float = 0.0,
+    traded_value: np.ndarray | float | None = None,
+    trade_pnl: np.ndarray | None = None,
+) -> dict[str, Any]:
+    """
+    All metrics of one equity curve (T,) or a batch (B, T) in one call.
+
+    Args:
+        equity: Equity per bar
+        periods_per_year: Bars per year (252 daily, 98_280 minute, ...)
+        risk_free_rate: Annual risk-free rate for Sharpe/Sortino
+        traded_value: Total traded notional (per curve) for turnover
+        trade_pnl: Round-trip P&Ls (per curve) for hit rate
+
+    Returns:
+        Dict of metric name -> float (or array for a batch)
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    returns = returns_from_equity(equity)
+    depth, duration = max_drawdown(equity)
+    summary = {
+        "total_return": _result(
+            safe_divide(equity[..., -1], equity[..., 0]) - 1
+            if equity.shape[-1]
+            else np.zeros(equity.shape[:-1])
+        ),
+        "annualized_return": annualized_return(equity, periods_per_year),
+        "volatility": _result(
+            returns.std(axis=-1) * np.sqrt(periods_per_year)
+            if returns.shape[-1]
+            else np.zeros(returns.shape[:-1])
+        ),
+        "sharpe_ratio": sharpe_ratio(returns, periods_per_year, risk_free_rate),
+        "sortino_ratio": sortino_ratio(returns, periods_per_year, risk_free_rate),
+        "calmar_ratio": calmar_ratio(equity, periods_per_year),
+        "max_drawdown": depth,
+        "max_drawdown_duration": duration,
+        "var_95": value_at_risk(returns, 0.95),
+    }
+    if traded_value is not None:
+        summary["turnover"] = turnover(traded_value, equity, periods_per_year)
+    if trade_pnl is not None:
+        summary["hit_rate"] = hit_rate(trade_pnl)
+    return summary
+
+
+def _resample_indices(
+    rng: np.random.Generator, n: int, batch: int, block_size: int
+) -> np.ndarray:
+    """(batch, n) indices: iid draws, or circular blocks of ``block_size``."""
+    if block_size <= 1:
+        return rng.integers(0, n, size=(batch, n))
+    blocks = -(-n // block_size)
+    starts = rng.integers(0, n, size=(batch, blocks, 1))
+    indices = (starts + np.arange(block_size)) % n
+    return indices.reshape(batch, blocks * block_size)[:, :n]
+
+
+@dataclass
+class BootstrapResult:
+    """Distributions of resampled metrics."""
+
+    samples: dict[str, np.ndarray]
+    confidence: float = 0.95
+
+    @property
+    def num_samples(self) -> int:
+        """Number of resampled paths."""
+        return len(next(iter(self.samples.values()))) if self.samples else 0
+
+    def interval(self, metric: str) -> tuple[float, float]:
+        """Two-sided confidence interval of one metric."""
+        tail = (1 - self.confidence) / 2
+        low, high = np.quantile(self.samples[metric], [tail, 1 - tail])
+        return float(low), float(high)
+
+    def probability_below(self, metric: str, threshold: float = 0.0) -> float:
+        """Share of paths where ``metric`` ended below ``threshold``."""
+        return float(np.mean(self.samples[metric] < threshold))
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Median and confidence interval of every metric."""
+        return {
+            metric: {
+                "median": float(np.median(values)),
+                "low": self.interval(metric)[0],
+                "high": self.interval(metric)[1],
+            }
+            for metric, values in self.samples.items()
+        }
+
+
+def bootstrap_trades(
+    pnl: np.ndarray,
+    initial_capital: float,
+    n_samples: int = 10_000,
+    batch_size: int = 1_000,
+    confidence: float = 0.95,
+    seed: int | None = None,
+) -> BootstrapResult:
+    """
+    Resample round-trip P&Ls with replacement to get confidence intervals
+    for total return, max drawdown and hit rate.
+
+    Args:
+        pnl: P&L of each trade, in order
+        initial_capital: Capital the P&Ls accrue to
+        n_samples: Number of resampled trade sequences
+        batch_size: Sequences generated per vectorized batch
+        confidence: Interval coverage
+        seed: RNG seed
+
+    Returns:
+        BootstrapResult with total_return, max_drawdown and hit_rate samples
+    """
+    pnl = np.asarray(pnl, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    total_return = np.zeros(n_samples)
+    drawdown = np.zeros(n_samples)
+    hits = np.zeros(n_samples)
+    for lo in range(0, n_samples if len(pnl) else 0, batch_size):
+        hi = min(lo + batch_size, n_samples)
+        sample = pnl[_resample_indices(rng, len(pnl), hi - lo, 1)]
+        equity = initial_capital + np.cumsum(sample, axis=1)
+        equity = np.hstack([np.full((hi - lo, 1), float(initial_capital)), equity])
+        total_return[lo:hi] = equity[:, -1] / initial_capital - 1
+        drawdown[lo:hi] = max_drawdown(equity)[0]
+        hits[lo:hi] = hit_rate(sample)
+    return BootstrapResult(
+        samples={
+            "total_return": total_return,
+            "max_drawdown": drawdown,
+            "hit_rate": hits,
+        },
+        confidence=confidence,
+    )
+
+
+def bootstrap_returns(
+    returns: np.ndarray,
+    n_samples: int = 10_000,
+    block_size: int = 1,
+    periods_per_year: int = 252,
+    batch_size: int = 1_000,
+    confidence: float = 0.95,
+    seed: int | None = None,
+) -> BootstrapResult:
+    """
+    Resample per-bar returns (in blocks, to keep autocorrelation) to get
+    confidence intervals for total return, Sharpe and max drawdown.
+
+    Args:
+        returns: Per-bar returns
+        n_samples: Number of resampled paths
+        block_size: Consecutive bars drawn together (1 = iid bootstrap)
+        periods_per_year: Bars per year for annualizing Sharpe
+        batch_size: Paths generated per vectorized batch
+        confidence: Interval coverage
+        seed: RNG seed
+
+    Returns:
+        BootstrapResult with total_return, sharpe_ratio and max_drawdown samples
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    samples = {
+        name: np.zeros(n_samples)
+        for name in ("total_return", "sharpe_ratio", "max_drawdown")
+    }
+    for lo in range(0, n_samples if len(returns) else 0, batch_size):
+        hi = min(lo + batch_size, n_samples)
+        sample = returns[_resample_indices(rng, len(returns), hi - lo, block_size)]
+        equity = np.cumprod(1 + sample, axis=1)
+        samples["total_return"][lo:hi] = equity[:, -1] - 1
+        samples["sharpe_ratio"][lo:hi] = sharpe_ratio(sample, periods_per_year)
+        samples["max_drawdown"][lo:hi] = max_drawdown(
+            np.hstack([np.ones((hi - lo, 1)), equity])
+        )[0]
+    return BootstrapResult(samples=samples, confidence=confidence)
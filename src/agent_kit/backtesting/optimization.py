@@ -0,0 +1,480 @@
+"""
+Parallel parameter sweeps and walk-forward optimization.
+
+From first principles: Tuning a strategy is running the same backtest many
+times with different parameters. Each run only needs the prices (large,
+identical for every run) and its parameters (tiny), and returns a handful
+of scores. So:
+- Prices go into shared memory once; every worker process maps the same
+  pages instead of receiving a pickled copy per task.
+- Tasks are (parameters, row range) and results are small score dicts, so
+  inter-process traffic stays negligible and all cores stay busy.
+- Walk-forward repeats the search on rolling in-sample windows and scores
+  each window's winner on the following out-of-sample window, which is the
+  honest estimate of how the tuned strategy would have done.
+
+Strategies are functions ``strategy(panel, **params) -> (T, N) targets``
+defined at module level, so worker processes can import them.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import math
+import multiprocessing
+import os
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+import numpy as np
+
+from agent_kit.backtesting.metrics import performance_summary
+from agent_kit.backtesting.portfolio import (
+    BarPanel,
+    PortfolioResult,
+    forward_fill,
+    simulate_portfolio,
+)
+
+logger = logging.getLogger(__name__)
+
+Strategy = Callable[..., np.ndarray]
+
+SCORES = frozenset(
+    {
+        "total_return",
+        "sharpe_ratio",
+        "sortino_ratio",
+        "calmar_ratio",
+        "max_drawdown",
+        "num_fills",
+    }
+)
+# Scores where lower is better; everything else ranks descending
+LOWER_IS_BETTER = frozenset({"max_drawdown"})
+
+_PANEL_ARRAYS = ("timestamps", "close", "open", "high", "low", "volume")
+
+
+def parameter_grid(space: Mapping[str, Sequence[Any]]) -> list[dict[str, Any]]:
+    """Every combination of the given parameter values."""
+    names = list(space)
+    return [
+        dict(zip(names, values, strict=True))
+        for values in itertools.product(*(space[name] for name in names))
+    ]
+
+
+def random_parameters(
+    space: Mapping[str, Sequence[Any] | Callable[[np.random.Generator], Any]],
+    n_samples: int,
+    seed: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Random search: sample each parameter independently.
+
+    Values are either a sequence to choose from or a callable taking a
+    numpy Generator (e.g. ``lambda rng: rng.uniform(0.5, 2.0)``).
+    """
+    rng = np.random.default_rng(seed)
+    samples = []
+    for _ in range(n_samples):
+        params = {}
+        for name, values in space.items():
+            if callable(values):
+                params[name] = values(rng)
+            else:
+                params[name] = values[int(rng.integers(len(values)))]
+        samples.append(params)
+    return samples
+
+
+def score_result(
+    result: PortfolioResult,
+    periods_per_year: int = 252,
+    risk_free_rate: float = 0.0,
+) -> dict[str, float]:
+    """Summary scores of one simulation (Sharpe/Sortino net of risk_free_rate)."""
+    summary = performance_summary(result.equity, periods_per_year, risk_free_rate)
+    return {
+        "total_return": summary["total_return"],
+        "sharpe_ratio": summary["sharpe_ratio"],
+        "sortino_ratio": summary["sortino_ratio"],
+        "calmar_ratio": summary["calmar_ratio"],
+        "max_drawdown": summary["max_drawdown"],
+        "num_fills": float(result.num_fills),
+    }
+
+
+class SharedPanel:
+    """
+    A BarPanel's arrays copied into shared memory blocks.
+
+    Use as a context manager in the parent; ``spec`` is the small picklable
+    description workers pass to attach() to get a zero-copy BarPanel.
+    """
+
+    def __init__(self, panel: BarPanel):
+        self.blocks: list[SharedMemory] = []
+        self.spec: dict[str, Any] = {"symbols": panel.symbols, "arrays": {}}
+        for name in _PANEL_ARRAYS:
+            values = getattr(panel, name)
+            if values is None:
+                continue
+            if name == "timestamps":
+                values = values.astype("datetime64[ns]")
+            values = np.ascontiguousarray(values)
+            block = SharedMemory(create=True, size=max(values.nbytes, 1))
+            np.ndarray(values.shape, values.dtype, buffer=block.buf)[...] = values
+            self.blocks.append(block)
+            self.spec["arrays"][name] = (block.name, values.shape, values.dtype.str)
+
+    @staticmethod
+    def attach(spec: Mapping[str, Any]) -> tuple[BarPanel, list[SharedMemory]]:
+        """Map the blocks described by ``spec``; keep the blocks alive while in use."""
+        blocks = []
+        arrays = {}
+        for name, (block_name, shape, dtype) in spec["arrays"].items():
+            # Pool workers share the creator's resource tracker, so attaching
+            # here doesn't take over cleanup: the creator's close() unlinks
+            block = SharedMemory(name=block_name)
+            blocks.append(block)
+            arrays[name] = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+        return BarPanel(symbols=tuple(spec["symbols"]), **arrays), blocks
+
+    def close(self) -> None:
+        """Release and unlink the blocks."""
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self) -> SharedPanel:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class _Evaluator:
+    """Runs one (parameters, rows) task against a panel."""
+
+    def __init__(
+        self,
+        panel: BarPanel,
+        strategy: Strategy,
+        simulation: Mapping[str, Any],
+        periods_per_year: int,
+        risk_free_rate: float,
+    ):
+        self.panel = panel
+        self.strategy = strategy
+        self.simulation = dict(simulation)
+        self.periods_per_year = periods_per_year
+        self.risk_free_rate = risk_free_rate
+
+    def __call__(self, task: tuple[dict[str, Any], int, int, int]) -> dict[str, Any]:
+        """
+        Evaluate ``params`` trading rows [start, stop); rows from ``lookback``
+        feed the strategy's indicators but aren't traded.
+        """
+        params, lookback, start, stop = task
+        try:
+            targets = np.asarray(
+                self.strategy(self.panel.take(slice(lookback, stop)), **params),
+                dtype=np.float64,
+            )
+            if start > lookback:
+                # Carry targets set during the lookback into the traded window
+                targets = forward_fill(targets)[start - lookback :]
+            result = simulate_portfolio(
+                self.panel.take(slice(start, stop)), targets, **self.simulation
+            )
+            scores = score_result(result, self.periods_per_year, self.risk_free_rate)
+            return {"params": params, **scores}
+        except Exception as e:  # one bad config shouldn't sink the sweep
+            return {"params": params, "error": f"{type(e).__name__}: {e}"}
+
+
+_worker_state: dict[str, Any] = {}
+
+
+def _init_worker(
+    spec: Mapping[str, Any],
+    strategy: Strategy,
+    simulation: Mapping[str, Any],
+    periods_per_year: int,
+    risk_free_rate: float,
+) -> None:
+    panel, blocks = SharedPanel.attach(spec)
+    _worker_state["blocks"] = blocks
+    _worker_state["evaluate"] = _Evaluator(
+        panel, strategy, simulation, periods_per_year, risk_free_rate
+    )
+
+
+def _run_task(task: tuple[dict[str, Any], int, int, int]) -> dict[str, Any]:
+    return _worker_state["evaluate"](task)
+
+
+@dataclass
+class SweepResult:
+    """Scored configurations, best first."""
+
+    records: list[dict[str, Any]]
+    metric: str
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return iter(self.records)
+
+    @property
+    def best(self) -> dict[str, Any] | None:
+        """Highest-ranked successful record."""
+        return (
+            self.records[0] if self.records and "error" not in self.records[0] else None
+        )
+
+    @property
+    def errors(self) -> list[dict[str, Any]]:
+        """Records whose configuration raised."""
+        return [r for r in self.records if "error" in r]
+
+    def top(self, n: int = 10) -> list[dict[str, Any]]:
+        """The n best records."""
+        return self.records[:n]
+
+
+@dataclass
+class WalkForwardResult:
+    """Per-fold winners and their out-of-sample scores."""
+
+    folds: list[dict[str, Any]] = field(default_factory=list)
+    metric: str = "sharpe_ratio"
+
+    @property
+    def out_of_sample_return(self) -> float:
+        """Compounded out-of-sample return across folds."""
+        growth = 1.0
+        for fold in self.folds:
+            growth *= 1 + fold["test"].get("total_return", 0.0)
+        return growth - 1
+
+    def mean_score(self, key: str = "in_sample") -> float:
+        """Mean of the ranking metric, in-sample or out-of-sample ("test")."""
+        values = [
+            fold[key][self.metric] for fold in self.folds if self.metric in fold[key]
+        ]
+        return float(np.mean(values)) if values else float("nan")
+
+
+def _check_metric(metric: str) -> None:
+    if metric not in SCORES:
+        raise ValueError(f"Unknown metric: {metric} (expected one of {sorted(SCORES)})")
+
+
+def rank(records: list[dict[str, Any]], metric: str) -> list[dict[str, Any]]:
+    """Sort records best first by ``metric``; failed records go last."""
+    _check_metric(metric)
+    sign = 1.0 if metric in LOWER_IS_BETTER else -1.0
+
+    def key(record: dict[str, Any]) -> tuple[int, float]:
+        value = record.get(metric)
+        if value is None or math.isnan(value):
+            return (1, 0.0)
+        return (0, sign * value)
+
+    return sorted(records, key=key)
+
+
+class ParameterSweep:
+    """
+    Evaluate many parameter sets of one strategy over a process pool.
+
+    Example:
+        >>> def crossover(panel, fast, slow): ...
+        >>> sweep = ParameterSweep(crossover, panel, commission_rate=0.001)
+        >>> result = sweep.run(parameter_grid({"fast": [5, 10], "slow": [50, 100]}))
+        >>> result.best["params"]
+    """
+
+    def __init__(
+        self,
+        strategy: Strategy,
+        panel: BarPanel,
+        initial_capital: float = 100000.0,
+        commission_rate: float | Sequence[float] | Mapping[str, float] = 0.001,
+        slippage: float | Sequence[float] | Mapping[str, float] = 0.0005,
+        signal_delay: int = 1,
+        fill_price: str = "open",
+        periods_per_year: int = 252,
+        risk_free_rate: float = 0.0,
+        workers: int | None = None,
+        mp_context: Any = None,
+    ):
+        """
+        Args:
+            strategy: Module-level function ``(panel, **params) -> (T, N) targets``
+            panel: Prices shared by every run
+            initial_capital: Starting cash per run
+            commission_rate: Scalar or per-symbol commission
+            slippage: Scalar or per-symbol slippage
+            signal_delay: Bars between a signal and its execution
+            fill_price: "open" or "close" of the execution bar
+            periods_per_year: Bars per year for annualizing Sharpe
+            risk_free_rate: Annual risk-free rate for Sharpe/Sortino
+            workers: Processes (None = CPU count, 0 or 1 = run in-process)
+            mp_context: Optional multiprocessing context (e.g. "spawn")
+        """
+        self.strategy = strategy
+        self.panel = panel
+        self.simulation = {
+            "initial_capital": initial_capital,
+            "commission_rate": commission_rate,
+            "slippage": slippage,
+            "signal_delay": signal_delay,
+            "fill_price": fill_price,
+        }
+        self.periods_per_year = periods_per_year
+        self.risk_free_rate = risk_free_rate
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        if isinstance(mp_context, str):
+            mp_context = multiprocessing.get_context(mp_context)
+        self.mp_context = mp_context
+
+    def run(
+        self,
+        configs: Sequence[dict[str, Any]],
+        metric: str = "sharpe_ratio",
+        rows: tuple[int, int] | None = None,
+    ) -> SweepResult:
+        """
+        Score every configuration on the panel (or on ``rows`` [start, stop)).
+
+        Returns:
+            SweepResult ranked by ``metric``
+        """
+        _check_metric(metric)
+        start, stop = rows or (0, len(self.panel))
+        tasks = [(dict(params), start, start, stop) for params in configs]
+        return SweepResult(rank(self._evaluate(tasks), metric), metric)
+
+    def walk_forward(
+        self,
+        configs: Sequence[dict[str, Any]],
+        train_size: int,
+        test_size: int,
+        step: int | None = None,
+        metric: str = "sharpe_ratio",
+        anchored: bool = False,
+    ) -> WalkForwardResult:
+        """
+        Rolling in-sample search with out-of-sample scoring.
+
+        Each fold searches ``configs`` on ``train_size`` bars, then trades the
+        winner on the next ``test_size`` bars (the strategy still sees the
+        training bars as history). Folds advance by ``step`` (default
+        ``test_size``); ``anchored`` keeps every training window starting at 0.
+
+        Returns:
+            WalkForwardResult with one entry per fold
+        """
+        _check_metric(metric)
+        step = step or test_size
+        n = len(self.panel)
+        folds = []
+        train_start = 0
+        while train_start + train_size + test_size <= n:
+            train_stop = train_start + train_size
+            folds.append(
+                (0 if anchored else train_start, train_stop, train_stop + test_size)
+            )
+            train_start += step
+
+        # One batch for every fold's in-sample search keeps the pool saturated
+        tasks = [
+            (dict(params), lo, lo, train_stop)
+            for lo, train_stop, _ in folds
+            for params in configs
+        ]
+        in_sample = self._evaluate(tasks)
+        winners = []
+        for k, _fold in enumerate(folds):
+            ranked = rank(in_sample[k * len(configs) : (k + 1) * len(configs)], metric)
+            winners.append(ranked[0] if ranked and "error" not in ranked[0] else None)
+
+        test_tasks = [
+            (winner["params"], lo, train_stop, test_stop)
+            for (lo, train_stop, test_stop), winner in zip(folds, winners, strict=True)
+            if winner is not None
+        ]
+        tested = iter(self._evaluate(test_tasks))
+        result = WalkForwardResult(metric=metric)
+        for (lo, train_stop, test_stop), winner in zip(folds, winners, strict=True):
+            if winner is None:
+                continue
+            result.folds.append(
+                {
+                    "train": (
+                        self.panel.timestamps[lo],
+                        self.panel.timestamps[train_stop - 1],
+                    ),
+                    "test": next(tested),
+                    "test_range": (
+                        self.panel.timestamps[train_stop],
+                        self.panel.timestamps[test_stop - 1],
+                    ),
+                    "params": winner["params"],
+                    "in_sample": winner,
+                }
+            )
+        return result
+
+    def _evaluate(
+        self, tasks: list[tuple[dict[str, Any], int, int, int]]
+    ) -> list[dict]:
+        """Run tasks in-process or over the pool, preserving order."""
+        if not tasks:
+            return []
+        if self.workers <= 1 or len(tasks) == 1:
+            evaluate = _Evaluator(
+                self.panel,
+                self.strategy,
+                self.simulation,
+                self.periods_per_year,
+                self.risk_free_rate,
+            )
+            records = [evaluate(task) for task in tasks]
+        else:
+            workers = min(self.workers, len(tasks))
+            chunksize = max(1, len(tasks) // (workers * 4))
+            with (
+                SharedPanel(self.panel) as shared,
+                ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=self.mp_context,
+                    initializer=_init_worker,
+                    initargs=(
+                        shared.spec,
+                        self.strategy,
+                        self.simulation,
+                        self.periods_per_year,
+                        self.risk_free_rate,
+                    ),
+                ) as pool,
+            ):
+                records = list(pool.map(_run_task, tasks, chunksize=chunksize))
+
+        for record in records:
+            if "error" in record:
+                logger.warning(
+                    f"Backtest failed for {record['params']}: {record['error']}",
+                    extra={"params": record["params"]},
+                )
+        return records
@@ -0,0 +1,451 @@
+"""
+Multi-asset portfolio simulation over time x symbol arrays.
+
+From first principles: A portfolio backtest is the single-asset replay with
+one more axis. Prices, volumes, target weights and positions are (T, N)
+matrices on a shared timeline; a symbol without a bar at some timestamp is
+NaN there. Capital is shared: every rebalance sizes all changed symbols
+against the same portfolio equity, and the cost of trading them comes out
+of one cash balance.
+
+The work per rebalance is a handful of length-N vector operations, and only
+rows where some target changes are visited, so a universe of hundreds of
+tickers costs O(T x N) NumPy work plus O(rebalance rows) Python, never a
+Python loop over symbols. A single fully priced symbol goes to the scalar
+single-asset kernel instead, since for high-turnover intraday series the
+per-row array overhead would dominate.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+
+from agent_kit.backtesting.simulation import (
+    BarSeries,
+    SimulationResult,
+    simulate_targets,
+    to_datetime64,
+)
+
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def forward_fill(values: np.ndarray) -> np.ndarray:
+    """Replace NaNs with the last non-NaN value above them (per column)."""
+    valid = ~np.isnan(values)
+    rows = np.where(valid, np.arange(len(values))[:, None], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return np.take_along_axis(values, rows, axis=0)
+
+
+def _next_valid_row(valid: np.ndarray) -> np.ndarray:
+    """Per cell, the first row at or below it that is valid (len(valid) if none)."""
+    n = len(valid)
+    rows = np.where(valid, np.arange(n)[:, None], n)
+    return np.minimum.accumulate(rows[::-1], axis=0)[::-1]
+
+
+def per_symbol(
+    value: float | Sequence[float] | Mapping[str, float] | np.ndarray,
+    symbols: Sequence[str],
+    default: float,
+) -> np.ndarray:
+    """
+    Broadcast a cost parameter to one value per symbol.
+
+    Accepts a scalar, a sequence aligned with ``symbols``, or a mapping of
+    symbol -> value (symbols not in it get ``default``).
+    """
+    if isinstance(value, Mapping):
+        return np.array([value.get(s, default) for s in symbols], dtype=np.float64)
+    values = np.broadcast_to(np.asarray(value, dtype=np.float64), (len(symbols),))
+    return values.copy()
+
+
+@dataclass(frozen=True)
+class BarPanel:
+    """OHLCV bars for many symbols on one timeline as (T, N) arrays (NaN = no bar)."""
+
+    timestamps: np.ndarray  # datetime64[ns], ascending, unique
+    symbols: tuple[str, ...]
+    close: np.ndarray
+    open: np.ndarray | None = None
+    high: np.ndarray | None = None
+    low: np.ndarray | None = None
+    volume: np.ndarray | None = None
+
+    @classmethod
+    def from_series(cls, series: Mapping[str, BarSeries]) -> BarPanel:
+        """Align per-symbol series on the union of their timestamps."""
+        symbols = tuple(series)
+        parts = [s.timestamps for s in series.values()]
+        timeline = (
+            np.unique(np.concatenate(parts)) if parts else np.empty(0, "datetime64[ns]")
+        )
+        shape = (len(timeline), len(symbols))
+        fields: dict[str, np.ndarray | None] = {}
+        for name in OHLCV_FIELDS:
+            if name != "close" and all(
+                getattr(s, name) is None for s in series.values()
+            ):
+                fields[name] = None
+                continue
+            matrix = np.full(shape, np.nan)
+            for column, bars in enumerate(series.values()):
+                values = getattr(bars, name)
+                if values is not None:
+                    rows = np.searchsorted(timeline, bars.timestamps)
+                    matrix[rows, column] = values
+            fields[name] = matrix
+        return cls(timestamps=timeline, symbols=symbols, **fields)
+
+    @classmethod
+    def from_bars(cls, bars: Mapping[str, Sequence[Mapping[str, Any]]]) -> BarPanel:
+        """Align ticker -> list of bar dicts."""
+        return cls.from_series(
+            {symbol: BarSeries.from_bars(rows) for symbol, rows in bars.items()}
+        )
+
+    @classmethod
+    def from_long(
+        cls,
+        frame: Any,
+        timestamp: str = "timestamp",
+        symbol: str = "symbol",
+    ) -> BarPanel:
+        """
+        Pivot a long-format polars DataFrame (one row per timestamp and symbol).
+
+        Columns ``open``/``high``/``low``/``volume`` are optional; ``close`` is
+        required. Duplicate (timestamp, symbol) rows keep the last one.
+        """
+        timestamps = frame.get_column(timestamp).to_numpy()
+        if not np.issubdtype(timestamps.dtype, np.datetime64):
+            timestamps = to_datetime64(timestamps.tolist())
+        timestamps = timestamps.astype("datetime64[ns]")
+        symbols, column = np.unique(
+            frame.get_column(symbol).cast(str).to_numpy(), return_inverse=True
+        )
+        timeline, row = np.unique(timestamps, return_inverse=True)
+
+        fields: dict[str, np.ndarray | None] = {}
+        for name in OHLCV_FIELDS:
+            if name not in frame.columns:
+                fields[name] = None
+                continue
+            matrix = np.full((len(timeline), len(symbols)), np.nan)
+            matrix[row, column] = frame.get_column(name).cast(float).to_numpy()
+            fields[name] = matrix
+        if fields["close"] is None:
+            raise ValueError("long frame needs a 'close' column")
+        return cls(
+            timestamps=timeline,
+            symbols=tuple(symbols.tolist()),
+            **fields,
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def num_symbols(self) -> int:
+        """Number of symbols (columns)."""
+        return len(self.symbols)
+
+    def between(self, start: datetime | None, end: datetime | None) -> BarPanel:
+        """Rows with start <= timestamp <= end (either bound optional)."""
+        lo = 0
+        hi = len(self)
+        if start is not None:
+            lo = int(np.searchsorted(self.timestamps, to_datetime64([start])[0]))
+        if end is not None:
+            hi = int(
+                np.searchsorted(self.timestamps, to_datetime64([end])[0], side="right")
+            )
+        return self.take(slice(lo, hi))
+
+    def take(self, rows: slice) -> BarPanel:
+        """A range of rows (views, no copies)."""
+
+        def pick(values: np.ndarray | None) -> np.ndarray | None:
+            return None if values is None else values[rows]
+
+        return BarPanel(
+            timestamps=self.timestamps[rows],
+            symbols=self.symbols,
+            close=self.close[rows],
+            open=pick(self.open),
+            high=pick(self.high),
+            low=pick(self.low),
+            volume=pick(self.volume),
+        )
+
+    def series(self, symbol: str) -> BarSeries:
+        """One symbol's bars (rows where it has a close)."""
+        column = self.symbols.index(symbol)
+        rows = ~np.isnan(self.close[:, column])
+
+        def pick(values: np.ndarray | None) -> np.ndarray | None:
+            return None if values is None else values[rows, column]
+
+        return BarSeries(
+            timestamps=self.timestamps[rows],
+            close=self.close[rows, column],
+            open=pick(self.open),
+            high=pick(self.high),
+            low=pick(self.low),
+            volume=pick(self.volume),
+        )
+
+    def execution_prices(self, fill_price: str) -> np.ndarray:
+        """(T, N) fill prices: opens (falling back to close) or closes."""
+        if fill_price == "close" or self.open is None:
+            return self.close
+        if fill_price != "open":
+            raise ValueError("fill_price must be 'open' or 'close'")
+        return np.where(np.isnan(self.open), self.close, self.open)
+
+
+@dataclass
+class PortfolioResult:
+    """Per-bar portfolio state and columnar fills of one simulation."""
+
+    timestamps: np.ndarray  # (T,)
+    symbols: tuple[str, ...]
+    marks: np.ndarray  # (T, N) last known close, NaN before a symbol's first bar
+    positions: np.ndarray  # (T, N) shares after each bar
+    cash: np.ndarray  # (T,)
+    equity: np.ndarray  # (T,) cash + positions . marks
+    fill_index: np.ndarray  # bar of each fill
+    fill_symbol: np.ndarray  # column of each fill
+    fill_quantity: np.ndarray  # signed shares
+    fill_price: np.ndarray  # after slippage
+    fill_commission: np.ndarray
+    initial_capital: float = 0.0
+
+    @property
+    def final_equity(self) -> float:
+        """Equity after the last bar."""
+        return float(self.equity[-1]) if len(self.equity) else self.initial_capital
+
+    @property
+    def num_fills(self) -> int:
+        """Number of fills."""
+        return len(self.fill_index)
+
+    def weights(self) -> np.ndarray:
+        """(T, N) position value as a fraction of equity."""
+        values = self.positions * np.nan_to_num(self.marks)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.nan_to_num(values / self.equity[:, None])
+
+    def fills_for(self, symbol: str) -> tuple[np.ndarray, ...]:
+        """(bar, quantity, price, commission) arrays of one symbol's fills."""
+        mask = self.fill_symbol == self.symbols.index(symbol)
+        return (
+            self.fill_index[mask],
+            self.fill_quantity[mask],
+            self.fill_price[mask],
+            self.fill_commission[mask],
+        )
+
+    @classmethod
+    def from_results(
+        cls, results: Mapping[str, SimulationResult], cash: float = 0.0
+    ) -> PortfolioResult:
+        """
+        Combine independent single-asset results (each with its own capital)
+        into one portfolio on the union timeline. ``cash`` is extra capital
+        that none of them traded.
+        """
+        symbols = tuple(results)
+        parts = [r.timestamps for r in results.values()]
+        timeline = (
+            np.unique(np.concatenate(parts)) if parts else np.empty(0, "datetime64[ns]")
+        )
+        shape = (len(timeline), len(symbols))
+        marks = np.full(shape, np.nan)
+        positions = np.zeros(shape)
+        total_cash = np.full(len(timeline), float(cash))
+        fills: list[tuple[np.ndarray, ...]] = []
+        for column, result in enumerate(results.values()):
+            bar = np.searchsorted(result.timestamps, timeline, side="right") - 1
+            seen = bar >= 0
+            marks[seen, column] = result.close[bar[seen]]
+            positions[seen, column] = result.positions[bar[seen]]
+            total_cash += np.where(seen, result.cash[bar], result.initial_capital)
+            rows = np.searchsorted(timeline, result.timestamps[result.fill_index])
+            fills.append(
+                (
+                    rows,
+                    np.full(len(rows), column),
+                    result.fill_quantity,
+                    result.fill_price,
+                    result.fill_commission,
+                )
+            )
+
+        columns = [np.concatenate(c) for c in zip(*fills, strict=True)] or [
+            np.zeros(0)
+        ] * 5
+        order = np.argsort(columns[0], kind="stable")
+        return cls(
+            timestamps=timeline,
+            symbols=symbols,
+            marks=marks,
+            positions=positions,
+            cash=total_cash,
+            equity=total_cash + np.sum(positions * np.nan_to_num(marks), axis=1),
+            fill_index=columns[0][order].astype(np.int64),
+            fill_symbol=columns[1][order].astype(np.int64),
+            fill_quantity=columns[2][order].astype(np.float64),
+            fill_price=columns[3][order].astype(np.float64),
+            fill_commission=columns[4][order].astype(np.float64),
+            initial_capital=float(cash)
+            + sum(r.initial_capital for r in results.values()),
+        )
+
+
+def simulate_portfolio(
+    panel: BarPanel,
+    targets: np.ndarray,
+    initial_capital: float = 100000.0,
+    commission_rate: float | Sequence[float] | Mapping[str, float] = 0.001,
+    slippage: float | Sequence[float] | Mapping[str, float] = 0.0005,
+    signal_delay: int = 1,
+    fill_price: str = "open",
+    close_at_end: bool = True,
+) -> PortfolioResult:
+    """
+    Vectorized simulation of a (T, N) target-weight matrix with shared capital.
+
+    Targets are fractions of portfolio equity; NaN keeps a symbol's current
+    target. Execution follows simulate_targets(); a symbol whose execution
+    bar has no price trades at its next priced bar instead.
+
+    Args:
+        panel: Aligned prices
+        targets: (T, N) target weights
+        initial_capital: Starting cash
+        commission_rate: Fraction of traded value, scalar or per symbol
+        slippage: Fraction of the fill price, scalar or per symbol
+        signal_delay: Bars between a signal and its execution
+        fill_price: "open" or "close" of the execution bar (delay >= 1)
+        close_at_end: Liquidate everything at the last known closes
+
+    Returns:
+        PortfolioResult
+    """
+    n, m = len(panel), panel.num_symbols
+    targets = np.asarray(targets, dtype=np.float64)
+    if targets.shape != (n, m):
+        raise ValueError(f"targets must have shape ({n}, {m}), got {targets.shape}")
+    if signal_delay < 0:
+        raise ValueError("signal_delay must be >= 0")
+    rates = per_symbol(commission_rate, panel.symbols, 0.001)
+    slips = per_symbol(slippage, panel.symbols, 0.0005)
+    prices = panel.execution_prices("close" if signal_delay == 0 else fill_price)
+    if m == 1 and np.all(prices > 0) and not np.isnan(panel.close).any():
+        # Same fills as the loop below: no missing bars to defer trades over
+        result = simulate_targets(
+            panel.series(panel.symbols[0]),
+            targets[:, 0],
+            initial_capital=initial_capital,
+            commission_rate=float(rates[0]),
+            slippage=float(slips[0]),
+            signal_delay=signal_delay,
+            fill_price=fill_price,
+            close_at_end=close_at_end,
+        )
+        return PortfolioResult.from_results({panel.symbols[0]: result})
+
+    # Shift signals to execution bars and hold each target until the next one
+    executed = np.full((n, m), np.nan)
+    if signal_delay < n:
+        executed[signal_delay:] = targets[: n - signal_delay]
+    effective = np.nan_to_num(forward_fill(executed), nan=0.0)
+    changed = np.diff(effective, axis=0, prepend=np.zeros((1, m))) != 0
+
+    # Symbols can't trade on bars where they have no price: defer to the next priced bar
+    priced = ~np.isnan(prices)
+    blocked_rows, blocked_cols = np.nonzero(changed & ~priced)
+    if len(blocked_rows):
+        moved = _next_valid_row(priced)[blocked_rows, blocked_cols]
+        changed[blocked_rows, blocked_cols] = False
+        keep = moved < n
+        changed[moved[keep], blocked_cols[keep]] = True
+
+    marks = forward_fill(panel.close)
+    valuation = np.nan_to_num(marks)
+    # Value the book at each bar's fill prices where known, else the last marks
+    sizing = np.vstack([np.zeros((1, m)), valuation[:-1]])
+    np.copyto(sizing, prices, where=priced)
+    rows = np.flatnonzero(changed.any(axis=1))
+
+    # Book after each rebalance row; the extra last slot is the starting book
+    shares = np.zeros(m)
+    cash = float(initial_capital)
+    shares_after = np.zeros((len(rows) + 1, m))
+    cash_after = np.full(len(rows) + 1, cash)
+    fills: list[tuple[np.ndarray, ...]] = []
+
+    for k, row in enumerate(rows.tolist()):
+        columns = np.flatnonzero(changed[row])
+        price = prices[row, columns]
+        equity = cash + shares @ sizing[row]
+        quantity = effective[row, columns] * equity / price - shares[columns]
+        trading = quantity != 0
+        if trading.any():
+            columns, price, quantity = (
+                columns[trading],
+                price[trading],
+                quantity[trading],
+            )
+            fill = price * (1 + np.sign(quantity) * slips[columns])
+            commission = np.abs(quantity) * fill * rates[columns]
+            cash -= float(quantity @ fill + commission.sum())
+            shares[columns] += quantity
+            fills.append(
+                (np.full(len(columns), row), columns, quantity, fill, commission)
+            )
+        shares_after[k] = shares
+        cash_after[k] = cash
+
+    segment = np.searchsorted(rows, np.arange(n), side="right") - 1
+    positions = shares_after[segment]
+    cash_per_bar = cash_after[segment]
+
+    if close_at_end and n and shares.any():
+        columns = np.flatnonzero(shares)
+        quantity = -shares[columns]
+        fill = valuation[-1, columns] * (1 + np.sign(quantity) * slips[columns])
+        commission = np.abs(quantity) * fill * rates[columns]
+        cash -= float(quantity @ fill + commission.sum())
+        fills.append(
+            (np.full(len(columns), n - 1), columns, quantity, fill, commission)
+        )
+        positions[-1] = 0.0
+        cash_per_bar[-1] = cash
+
+    columns_out = [np.concatenate(c) for c in zip(*fills, strict=True)] or [
+        np.zeros(0)
+    ] * 5
+    return PortfolioResult(
+        timestamps=panel.timestamps,
+        symbols=panel.symbols,
+        marks=marks,
+        positions=positions,
+        cash=cash_per_bar,
+        equity=cash_per_bar + np.sum(positions * valuation, axis=1),
+        fill_index=columns_out[0].astype(np.int64),
+        fill_symbol=columns_out[1].astype(np.int64),
+        fill_quantity=columns_out[2].astype(np.float64),
+        fill_price=columns_out[3].astype(np.float64),
+        fill_commission=columns_out[4].astype(np.float64),
+        initial_capital=float(initial_capital),
+    )
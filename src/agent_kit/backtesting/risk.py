@@ -0,0 +1,273 @@
+"""
+Vectorized portfolio risk analytics.
+
+From first principles: Portfolio risk is linear algebra on a time x asset
+return matrix R (T, N) and a weight vector w (N,):
+- covariance S = centered R^T R / (T - 1); correlation rescales S by the
+  asset volatilities. Assets with shorter histories are NaN-padded and
+  every pair uses the periods both assets have (pairwise-complete), done
+  with masked matrix products instead of a loop over pairs
+- portfolio variance w^T S w; the marginal risk of asset i is (S w)_i / sigma
+  and w_i times that is its contribution, which sums to sigma
+- historical VaR/CVaR are a quantile and a tail mean of R w; parametric
+  VaR/CVaR use the normal distribution with the same mean and sigma
+- beta of each asset against a benchmark is cov(r_i, m) / var(m)
+
+Everything is O(T N^2) BLAS work, so hundreds of assets take milliseconds.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Any
+
+import numpy as np
+
+from agent_kit.backtesting.metrics import safe_divide, sharpe_ratio, value_at_risk
+
+
+def align_returns(
+    returns: Mapping[str, Sequence[float]],
+) -> tuple[list[str], np.ndarray]:
+    """
+    Stack per-asset return series into a (T, N) matrix.
+
+    Series are aligned on their latest period; shorter ones are NaN-padded
+    at the start.
+    """
+    symbols = list(returns)
+    length = max((len(values) for values in returns.values()), default=0)
+    matrix = np.full((length, len(symbols)), np.nan)
+    for column, values in enumerate(returns.values()):
+        if len(values):
+            matrix[length - len(values) :, column] = values
+    return symbols, matrix
+
+
+def _pairwise_moments(
+    returns: np.ndarray, ddof: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pairwise-complete covariance and the matching variances.
+
+    Returns:
+        (cov, var_row, var_col): cov[i, j] over periods where both i and j
+        are observed; var_row[i, j] / var_col[i, j] are the variances of i
+        and j over those same periods
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    mask = (~np.isnan(returns)).astype(np.float64)
+    values = np.where(mask > 0, returns, 0.0)
+
+    count = mask.T @ mask
+    sum_row = values.T @ mask  # sum of x_i over periods where j is observed
+    sum_col = sum_row.T
+    products = values.T @ values
+    squares_row = (values**2).T @ mask
+    squares_col = squares_row.T
+
+    denominator = count - ddof
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = (products - sum_row * sum_col / count) / denominator
+        var_row = (squares_row - sum_row**2 / count) / denominator
+        var_col = (squares_col - sum_col**2 / count) / denominator
+    invalid = denominator <= 0
+    for matrix in (cov, var_row, var_col):
+        matrix[invalid] = np.nan
+    return cov, np.maximum(var_row, 0.0), np.maximum(var_col, 0.0)
+
+
+def covariance(returns: np.ndarray, ddof: int = 1) -> np.ndarray:
+    """
+    Pairwise-complete covariance matrix of a (T, N) return matrix.
+
+    Args:
+        returns: Returns per period and asset (NaN = not observed)
+        ddof: Delta degrees of freedom
+
+    Returns:
+        (N, N) covariance (NaN for pairs with fewer than ddof + 1 periods)
+    """
+    return _pairwise_moments(returns, ddof)[0]
+
+
+def correlation(returns: np.ndarray) -> np.ndarray:
+    """
+    Pairwise-complete correlation matrix of a (T, N) return matrix.
+
+    Matches ``np.corrcoef`` on each pair's common periods; NaN where a
+    series is constant over them.
+    """
+    return _correlation(*_pairwise_moments(returns, 1))
+
+
+def _correlation(
+    cov: np.ndarray, var_row: np.ndarray, var_col: np.ndarray
+) -> np.ndarray:
+    """Scale pairwise covariances by the matching pairwise volatilities."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = cov / np.sqrt(var_row * var_col)
+    corr = np.clip(corr, -1.0, 1.0)
+    observed = np.diag(var_row) > 0
+    corr[np.diag_indices_from(corr)] = np.where(observed, 1.0, np.nan)
+    return corr
+
+
+def conditional_value_at_risk(
+    returns: np.ndarray, confidence: float = 0.95
+) -> float | np.ndarray:
+    """Historical CVaR (expected shortfall): mean loss beyond the VaR quantile."""
+    returns = np.asarray(returns, dtype=np.float64)
+    if returns.shape[-1] == 0:
+        result = np.zeros(returns.shape[:-1])
+        return float(result) if result.ndim == 0 else result
+    cutoff = np.quantile(returns, 1 - confidence, axis=-1, keepdims=True)
+    tail = returns <= cutoff
+    shortfall = -safe_divide(
+        np.sum(np.where(tail, returns, 0.0), axis=-1), np.sum(tail, axis=-1)
+    )
+    return float(shortfall) if shortfall.ndim == 0 else shortfall
+
+
+def parametric_var(
+    mean: float, volatility: float, confidence: float = 0.95
+) -> tuple[float, float]:
+    """
+    Gaussian VaR and CVaR of one period as positive losses.
+
+    Args:
+        mean: Expected period return
+        volatility: Period standard deviation
+        confidence: Confidence level
+
+    Returns:
+        (var, cvar)
+    """
+    normal = NormalDist()
+    z = normal.inv_cdf(1 - confidence)
+    var = -(mean + z * volatility)
+    cvar = -mean + volatility * normal.pdf(z) / (1 - confidence)
+    return var, cvar
+
+
+def betas(returns: np.ndarray, benchmark: np.ndarray) -> np.ndarray:
+    """
+    Beta of each asset column against a benchmark return series.
+
+    Args:
+        returns: (T, N) asset returns (NaN = not observed)
+        benchmark: (T,) benchmark returns over the same periods
+
+    Returns:
+        (N,) betas over each asset's observed periods
+    """
+    stacked = np.column_stack([np.asarray(returns, dtype=np.float64), benchmark])
+    cov, _, var_benchmark = _pairwise_moments(stacked, 1)
+    return safe_divide(cov[:-1, -1], var_benchmark[:-1, -1])
+
+
+@dataclass
+class PortfolioRisk:
+    """
+    Risk of one weighted portfolio.
+
+    Period quantities (VaR, CVaR) are fractions of portfolio value lost in
+    one period; volatility is annualized. Contributions are aligned with the
+    asset columns.
+    """
+
+    covariance: np.ndarray
+    correlation: np.ndarray
+    volatility: float
+    sharpe_ratio: float
+    var: float
+    cvar: float
+    parametric_var: float
+    parametric_cvar: float
+    marginal_risk: np.ndarray
+    risk_contributions: np.ndarray
+    beta: float | None = None
+    asset_betas: np.ndarray | None = None
+
+    @property
+    def contribution_share(self) -> np.ndarray:
+        """Fraction of portfolio volatility from each asset (sums to 1)."""
+        return safe_divide(self.risk_contributions, self.risk_contributions.sum())
+
+    def summary(self) -> dict[str, Any]:
+        """Scalar metrics as a dict."""
+        return {
+            "volatility": self.volatility,
+            "sharpe_ratio": self.sharpe_ratio,
+            "var": self.var,
+            "cvar": self.cvar,
+            "parametric_var": self.parametric_var,
+            "parametric_cvar": self.parametric_cvar,
+            "beta": self.beta,
+        }
+
+
+def portfolio_risk(
+    returns: np.ndarray,
+    weights: np.ndarray,
+    confidence: float = 0.95,
+    periods_per_year: int = 252,
+    risk_free_rate: float = 0.0,
+    benchmark: np.ndarray | None = None,
+) -> PortfolioRisk:
+    """
+    Full risk report of a weighted portfolio.
+
+    The covariance and correlation use every asset's history. Portfolio
+    return series (for Sharpe and historical VaR/CVaR) use the periods
+    where every asset with a non-zero weight is observed.
+
+    Args:
+        returns: (T, N) period returns (NaN = not observed)
+        weights: (N,) signed portfolio weights (fractions of equity)
+        confidence: VaR/CVaR confidence level
+        periods_per_year: Periods per year for annualization
+        risk_free_rate: Annual risk-free rate for the Sharpe ratio
+        benchmark: Optional (T,) benchmark returns for beta
+
+    Returns:
+        PortfolioRisk
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    cov_matrix, var_row, var_col = _pairwise_moments(returns, 1)
+    corr_matrix = _correlation(cov_matrix, var_row, var_col)
+
+    held = weights != 0
+    clean_cov = np.nan_to_num(cov_matrix)
+    exposure = clean_cov @ weights
+    sigma = float(np.sqrt(max(weights @ exposure, 0.0)))
+    marginal = safe_divide(exposure, sigma)
+    contributions = weights * marginal
+
+    complete = ~np.isnan(returns[:, held]).any(axis=1)
+    path = returns[complete][:, held] @ weights[held]
+    mean = float(path.mean()) if len(path) else 0.0
+    var_p, cvar_p = parametric_var(mean, sigma, confidence)
+
+    beta = asset_betas = None
+    if benchmark is not None:
+        asset_betas = betas(returns, np.asarray(benchmark, dtype=np.float64))
+        beta = float(weights @ asset_betas)
+
+    return PortfolioRisk(
+        covariance=cov_matrix,
+        correlation=corr_matrix,
+        volatility=sigma * float(np.sqrt(periods_per_year)),
+        sharpe_ratio=float(sharpe_ratio(path, periods_per_year, risk_free_rate)),
+        var=float(value_at_risk(path, confidence)),
+        cvar=float(conditional_value_at_risk(path, confidence)),
+        parametric_var=var_p,
+        parametric_cvar=cvar_p,
+        marginal_risk=marginal,
+        risk_contributions=contributions,
+        beta=beta,
+        asset_betas=asset_betas,
+    )
@@ -0,0 +1,390 @@
+"""
+Bar-by-bar trading simulation over NumPy arrays.
+
+From first principles: A backtest is a replay. At every bar the strategy
+states the position it wants, the simulator trades towards it at a
+realistic price (after the signal, with slippage and commission), and the
+book (shares, cash, equity) is marked to the close. Two ways in:
+- Vectorized: the strategy returns a target-weight array for the whole
+  history at once (NaN = keep the current target). Positions only change
+  where the target changes, so the simulator visits just those bars and
+  forward-fills shares and cash between them; equity is one array
+  expression. Cost is O(bars) NumPy work plus O(rebalances) Python.
+- Event-driven: the strategy is called once per bar with a BarContext
+  (history up to that bar, current position, cash, equity) and may return
+  a new target weight. Slower, but strategies can react to fills and state.
+
+Targets are fractions of current equity (1.0 = fully long, -0.5 = half
+short). A signal from bar t executes on bar t + signal_delay: at that bar's
+open by default, or at the signal bar's close when signal_delay is 0.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+import numpy as np
+
+FILL_PRICES = ("open", "close")
+
+
+def to_datetime64(values: Sequence[Any]) -> np.ndarray:
+    """Convert datetimes or ISO strings to a datetime64[ns] array (UTC, naive)."""
+    try:
+        return np.array(values, dtype="datetime64[ns]")
+    except (ValueError, TypeError):
+        converted = []
+        for value in values:
+            if isinstance(value, str):
+                value = datetime.fromisoformat(value)
+            if value.tzinfo is not None:
+                value = value.astimezone(UTC).replace(tzinfo=None)
+            converted.append(value)
+        return np.array(converted, dtype="datetime64[ns]")
+
+
+def _field(bars: Sequence[Mapping[str, Any]], name: str) -> np.ndarray | None:
+    """One OHLCV field as a float array (None if no bar has it)."""
+    if not any(name in bar for bar in bars):
+        return None
+    return np.array([bar.get(name, np.nan) for bar in bars], dtype=np.float64)
+
+
+@dataclass(frozen=True)
+class BarSeries:
+    """OHLCV bars for one symbol as aligned arrays (open/high/low/volume optional)."""
+
+    timestamps: np.ndarray  # datetime64[ns], ascending
+    close: np.ndarray
+    open: np.ndarray | None = None
+    high: np.ndarray | None = None
+    low: np.ndarray | None = None
+    volume: np.ndarray | None = None
+
+    @classmethod
+    def from_bars(cls, bars: Sequence[Mapping[str, Any]]) -> BarSeries:
+        """
+        Build from a list of bar dicts (``timestamp``, ``close`` and optional
+        ``open``/``high``/``low``/``volume``), sorting by timestamp.
+
+        Bars without timestamps get consecutive daily timestamps from the epoch.
+        """
+        if any("timestamp" in bar for bar in bars):
+            timestamps = to_datetime64([bar["timestamp"] for bar in bars])
+        else:
+            timestamps = np.arange(len(bars)).astype("datetime64[D]")
+            timestamps = timestamps.astype("datetime64[ns]")
+        series = cls(
+            timestamps=timestamps,
+            close=np.array([bar["close"] for bar in bars], dtype=np.float64),
+            open=_field(bars, "open"),
+            high=_field(bars, "high"),
+            low=_field(bars, "low"),
+            volume=_field(bars, "volume"),
+        )
+        if len(timestamps) > 1 and np.any(timestamps[1:] < timestamps[:-1]):
+            series = series.take(np.argsort(timestamps, kind="stable"))
+        return series
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def take(self, index: np.ndarray | slice) -> BarSeries:
+        """Subset of bars (a slice returns views)."""
+
+        def pick(values: np.ndarray | None) -> np.ndarray | None:
+            return None if values is None else values[index]
+
+        return BarSeries(
+            timestamps=self.timestamps[index],
+            close=self.close[index],
+            open=pick(self.open),
+            high=pick(self.high),
+            low=pick(self.low),
+            volume=pick(self.volume),
+        )
+
+    def between(self, start: datetime | None, end: datetime | None) -> BarSeries:
+        """Bars with start <= timestamp <= end (either bound optional)."""
+        lo = 0
+        hi = len(self)
+        if start is not None:
+            lo = int(np.searchsorted(self.timestamps, to_datetime64([start])[0]))
+        if end is not None:
+            hi = int(
+                np.searchsorted(self.timestamps, to_datetime64([end])[0], side="right")
+            )
+        return self.take(slice(lo, hi))
+
+    def execution_prices(self, fill_price: str) -> np.ndarray:
+        """Per-bar fill prices: opens (falling back to close where missing) or closes."""
+        if fill_price not in FILL_PRICES:
+            raise ValueError(f"fill_price must be one of {FILL_PRICES}")
+        if fill_price == "close" or self.open is None:
+            return self.close
+        return np.where(np.isnan(self.open), self.close, self.open)
+
+
+@dataclass
+class SimulationResult:
+    """Per-bar book state and fills of one simulation."""
+
+    timestamps: np.ndarray
+    close: np.ndarray
+    positions: np.ndarray  # shares held after each bar
+    cash: np.ndarray
+    equity: np.ndarray  # cash + positions * close
+    fill_index: np.ndarray  # bar of each fill
+    fill_quantity: np.ndarray  # signed shares
+    fill_price: np.ndarray  # after slippage
+    fill_commission: np.ndarray
+    initial_capital: float = 0.0
+
+    @property
+    def final_equity(self) -> float:
+        """Equity after the last bar."""
+        return float(self.equity[-1]) if len(self.equity) else 0.0
+
+    @property
+    def num_fills(self) -> int:
+        """Number of fills."""
+        return len(self.fill_index)
+
+
+class _Book:
+    """Shares, cash and the fill log while a simulation runs."""
+
+    __slots__ = (
+        "initial_capital",
+        "shares",
+        "cash",
+        "commission_rate",
+        "slippage",
+        "fill_index",
+        "fill_quantity",
+        "fill_price",
+        "fill_commission",
+    )
+
+    def __init__(self, initial_capital: float, commission_rate: float, slippage: float):
+        self.initial_capital = float(initial_capital)
+        self.shares = 0.0
+        self.cash = float(initial_capital)
+        self.commission_rate = commission_rate
+        self.slippage = slippage
+        self.fill_index: list[int] = []
+        self.fill_quantity: list[float] = []
+        self.fill_price: list[float] = []
+        self.fill_commission: list[float] = []
+
+    def rebalance(self, bar: int, target: float, price: float) -> None:
+        """Trade to hold ``target`` x equity worth of shares at ``price``."""
+        if not price > 0:  # also rejects NaN
+            return
+        equity = self.cash + self.shares * price
+        quantity = target * equity / price - self.shares
+        if quantity == 0:
+            return
+        fill = price * (1 + self.slippage if quantity > 0 else 1 - self.slippage)
+        commission = abs(quantity) * fill * self.commission_rate
+        self.cash -= quantity * fill + commission
+        self.shares += quantity
+        self.fill_index.append(bar)
+        self.fill_quantity.append(quantity)
+        self.fill_price.append(fill)
+        self.fill_commission.append(commission)
+
+    def result(
+        self,
+        bars: BarSeries,
+        positions: np.ndarray,
+        cash: np.ndarray,
+    ) -> SimulationResult:
+        """Package per-bar state and fills."""
+        return SimulationResult(
+            timestamps=bars.timestamps,
+            close=bars.close,
+            positions=positions,
+            cash=cash,
+            equity=cash + positions * bars.close,
+            fill_index=np.array(self.fill_index, dtype=np.int64),
+            fill_quantity=np.array(self.fill_quantity, dtype=np.float64),
+            fill_price=np.array(self.fill_price, dtype=np.float64),
+            fill_commission=np.array(self.fill_commission, dtype=np.float64),
+            initial_capital=self.initial_capital,
+        )
+
+
+def simulate_targets(
+    bars: BarSeries,
+    targets: np.ndarray,
+    initial_capital: float = 100000.0,
+    commission_rate: float = 0.001,
+    slippage: float = 0.0005,
+    signal_delay: int = 1,
+    fill_price: str = "open",
+    close_at_end: bool = True,
+) -> SimulationResult:
+    """
+    Vectorized simulation of a target-weight array.
+
+    Args:
+        bars: Price history
+        targets: Target weight per bar (NaN keeps the current target)
+        initial_capital: Starting cash
+        commission_rate: Commission as a fraction of traded value
+        slippage: Price impact as a fraction of the fill price
+        signal_delay: Bars between a signal and its execution
+        fill_price: "open" or "close" of the execution bar (delay >= 1)
+        close_at_end: Liquidate at the last bar's close
+
+    Returns:
+        SimulationResult
+    """
+    n = len(bars)
+    targets = np.asarray(targets, dtype=np.float64)
+    if targets.shape != (n,):
+        raise ValueError(f"targets must have shape ({n},), got {targets.shape}")
+    if signal_delay < 0:
+        raise ValueError("signal_delay must be >= 0")
+    if n == 0:
+        return _Book(initial_capital, commission_rate, slippage).result(
+            bars, np.zeros(0), np.zeros(0)
+        )
+
+    # Shift signals to the bars where they execute
+    executed = np.full(n, np.nan)
+    if signal_delay < n:
+        executed[signal_delay:] = targets[: n - signal_delay]
+    prices = bars.execution_prices("close" if signal_delay == 0 else fill_price)
+
+    # Effective target per bar: last non-NaN target so far (0 before any)
+    valid = ~np.isnan(executed)
+    last_valid = np.where(valid, np.arange(n), 0)
+    np.maximum.accumulate(last_valid, out=last_valid)
+    effective = np.where(valid[last_valid], executed[last_valid], 0.0)
+    changes = np.flatnonzero(np.diff(effective, prepend=0.0))
+
+    # Book after each rebalance; the extra last slot is the starting book,
+    # so bars before the first rebalance (segment -1) read it
+    book = _Book(initial_capital, commission_rate, slippage)
+    shares_after = np.zeros(len(changes) + 1)
+    cash_after = np.full(len(changes) + 1, float(initial_capital))
+    for k, bar in enumerate(changes.tolist()):
+        book.rebalance(bar, effective[bar], float(prices[bar]))
+        shares_after[k] = book.shares
+        cash_after[k] = book.cash
+
+    # Forward-fill the book between rebalances
+    segment = np.searchsorted(changes, np.arange(n), side="right") - 1
+    positions = shares_after[segment]
+    cash = cash_after[segment]
+    if close_at_end and book.shares:
+        book.rebalance(n - 1, 0.0, float(bars.close[-1]))
+        positions[-1] = book.shares
+        cash[-1] = book.cash
+    return book.result(bars, positions, cash)
+
+
+class BarContext:
+    """
+    What an event-driven strategy sees at one bar.
+
+    History properties are views up to and including the current bar.
+    """
+
+    __slots__ = ("bars", "ticker", "index", "position", "cash", "equity")
+
+    def __init__(self, bars: BarSeries, ticker: str = ""):
+        self.bars = bars
+        self.ticker = ticker
+        self.index = -1
+        self.position = 0.0
+        self.cash = 0.0
+        self.equity = 0.0
+
+    @property
+    def timestamp(self) -> np.datetime64:
+        """Current bar timestamp."""
+        return self.bars.timestamps[self.index]
+
+    @property
+    def price(self) -> float:
+        """Current close."""
+        return float(self.bars.close[self.index])
+
+    @property
+    def close(self) -> np.ndarray:
+        """Closes so far."""
+        return self.bars.close[: self.index + 1]
+
+    def history(self, field: str) -> np.ndarray | None:
+        """Any OHLCV field so far (None if the series doesn't have it)."""
+        values = getattr(self.bars, field)
+        return None if values is None else values[: self.index + 1]
+
+    @property
+    def weight(self) -> float:
+        """Current position value as a fraction of equity."""
+        return self.position * self.price / self.equity if self.equity else 0.0
+
+
+def simulate_events(
+    bars: BarSeries,
+    on_bar: Callable[[BarContext], float | None],
+    initial_capital: float = 100000.0,
+    commission_rate: float = 0.001,
+    slippage: float = 0.0005,
+    signal_delay: int = 1,
+    fill_price: str = "open",
+    close_at_end: bool = True,
+    ticker: str = "",
+) -> SimulationResult:
+    """
+    Event-driven simulation: call ``on_bar`` once per bar.
+
+    ``on_bar`` returns a target weight or None to keep the current one.
+    Execution rules match simulate_targets(): the book only trades when the
+    target changes, so repeating a target doesn't rebalance price drift.
+
+    Returns:
+        SimulationResult
+    """
+    if signal_delay < 0:
+        raise ValueError("signal_delay must be >= 0")
+    n = len(bars)
+    prices = bars.execution_prices(fill_price)
+    close = bars.close
+    book = _Book(initial_capital, commission_rate, slippage)
+    positions = np.zeros(n)
+    cash = np.zeros(n)
+    context = BarContext(bars, ticker)
+    pending: deque[tuple[int, float]] = deque()
+    last_target = 0.0
+
+    for bar in range(n):
+        while pending and pending[0][0] == bar:
+            book.rebalance(bar, pending.popleft()[1], float(prices[bar]))
+
+        context.index = bar
+        context.position = book.shares
+        context.cash = book.cash
+        context.equity = book.cash + book.shares * close[bar]
+        target = on_bar(context)
+        if target is not None and not np.isnan(target) and target != last_target:
+            last_target = target
+            if signal_delay == 0:
+                book.rebalance(bar, float(target), float(close[bar]))
+            else:
+                pending.append((bar + signal_delay, float(target)))
+
+        if close_at_end and bar == n - 1:
+            book.rebalance(bar, 0.0, float(close[bar]))
+        positions[bar] = book.shares
+        cash[bar] = book.cash
+
+    return book.result(bars, positions, cash)
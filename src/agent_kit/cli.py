@@ -40,7 +40,10 @@ from agent_kit.data_collection import (
 from agent_kit.domains.registry import get_global_registry
 from agent_kit.factories.agent_factory import AgentFactory
 from agent_kit.interactive_dashboard import InteractiveDashboard
-from agent_kit.monitoring.circuit_breaker import _circuit_breakers
+from agent_kit.monitoring.circuit_breaker import (
+    _circuit_breakers,
+    circuit_breaker_registry,
+)
 from agent_kit.ontology.loader import OntologyLoader
 from agent_kit.ontology_ml_workflow import OntologyMLWorkflowAnalyzer
 from agent_kit.orchestrator.ontology_orchestrator import OntologyOrchestrator
@@ -1129,7 +1132,8 @@ def status():
     """
     console.print("\n[bold cyan]Circuit Breaker Status[/bold cyan]\n")
 
-    if not _circuit_breakers:
+    breakers = list(_circuit_breakers.items()) + circuit_breaker_registry.items()
+    if not breakers:
         console.print("[yellow]No circuit breakers active.[/yellow]\n")
         return
 
@@ -1139,7 +1143,7 @@ def status():
     table.add_column("Recent Errors", style="red")
     table.add_column("Last Event")
 
-    for name, breaker in _circuit_breakers.items():
+    for name, breaker in breakers:
         status_data = breaker.get_status()
 
         state = status_data["state"]
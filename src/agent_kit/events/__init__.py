@@ -9,13 +9,27 @@ This module provides:
 - OntologyEvent: Enriched event with SPARQL queries, entities, leverage scores
 - OntologyEventLogger: Automatic event capture during agent execution
 - OntologyEventContent: Content wrapper for events
+- EventRingBuffer: Bounded per-session event storage with disk spill
+- EventDispatcher: Background batching to pluggable sinks (file, SQLite, socket)
+- EventPage: Paginated result of OntologyEventLogger.query_events
 """
 
+from .event_buffer import EventRingBuffer
+from .event_index import EventPage
 from .ontology_event import OntologyEvent, OntologyEventContent
 from .ontology_event_logger import OntologyEventLogger
+from .sinks import EventDispatcher, EventSink, FileSink, SocketSink, SqliteSink
 
 __all__ = [
     "OntologyEvent",
     "OntologyEventContent",
     "OntologyEventLogger",
+    "EventRingBuffer",
+    "EventPage",
+    # Sinks
+    "EventDispatcher",
+    "EventSink",
+    "FileSink",
+    "SqliteSink",
+    "SocketSink",
 ]
@@ -0,0 +1,149 @@
+"""
+Bounded per-session event storage.
+
+From first principles: A session's event history is read rarely (exports,
+summaries) but written constantly, so it doesn't need to live in memory.
+Each session keeps only its newest events in a fixed-size buffer; older
+events spill in batches to an append-only NDJSON segment file and are
+streamed back from disk when the full history is read.
+"""
+
+from __future__ import annotations
+
+import logging
+from array import array
+from collections import deque
+from collections.abc import Iterator
+from itertools import islice
+from pathlib import Path
+
+from .ontology_event import OntologyEvent
+
+logger = logging.getLogger(__name__)
+
+
+class EventRingBuffer:
+    """
+    Newest events of one session in memory, older events in a segment file.
+
+    When the buffer is full, its oldest ``spill_batch`` events are appended
+    to the segment in one write, so memory stays bounded by ``capacity`` and
+    disk writes are amortized. Iteration yields every event in order.
+
+    Example:
+        >>> buffer = EventRingBuffer(capacity=1000, segment_path=Path("s1.ndjson"))
+        >>> buffer.append(event)
+        >>> recent = buffer.tail(10)  # served from memory
+        >>> for event in buffer:  # streams spilled events from disk first
+        ...     ...
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        segment_path: Path,
+        spill_batch: int | None = None,
+    ):
+        """
+        Initialize buffer.
+
+        Args:
+            capacity: Max events held in memory
+            segment_path: Append-only file for spilled events (created lazily)
+            spill_batch: Events spilled per write (default: half the capacity)
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.segment_path = Path(segment_path)
+        self.spill_batch = min(spill_batch or max(capacity // 2, 1), capacity)
+        self._events: deque[OntologyEvent] = deque()
+        self.spilled = 0
+        # Byte offset of each spilled event's line, for random access
+        self._offsets = array("q")
+
+    def append(self, event: OntologyEvent) -> None:
+        """Add an event, spilling the oldest batch if the buffer is full."""
+        if len(self._events) >= self.capacity:
+            self._spill()
+        self._events.append(event)
+
+    def _spill(self) -> None:
+        """Append the oldest buffered events to the segment file."""
+        batch = [self._events.popleft() for _ in range(self.spill_batch)]
+        self.segment_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.segment_path.open("ab") as f:
+            position = f.tell()
+            lines = [event.model_dump_json().encode() + b"\n" for event in batch]
+            for line in lines:
+                self._offsets.append(position)
+                position += len(line)
+            f.writelines(lines)
+        self.spilled += len(batch)
+        logger.debug(f"Spilled {len(batch)} events to {self.segment_path}")
+
+    @property
+    def buffered(self) -> int:
+        """Number of events held in memory."""
+        return len(self._events)
+
+    def __len__(self) -> int:
+        """Total events (spilled and buffered)."""
+        return self.spilled + len(self._events)
+
+    def iter_spilled(self, limit: int | None = None) -> Iterator[OntologyEvent]:
+        """Stream spilled events from the segment file, oldest first."""
+        count = self.spilled if limit is None else min(limit, self.spilled)
+        if not count:
+            return
+        with self.segment_path.open(encoding="utf-8") as f:
+            for line in islice(f, count):
+                yield OntologyEvent.model_validate_json(line)
+
+    def __iter__(self) -> Iterator[OntologyEvent]:
+        """Stream all events, oldest first (as of the start of iteration)."""
+        spilled, buffered = self.spilled, list(self._events)
+        yield from self.iter_spilled(spilled)
+        yield from buffered
+
+    def get_many(self, seqs: list[int]) -> list[OntologyEvent]:
+        """
+        Fetch events by sequence number (position in the session's history).
+
+        Spilled events are read with one seek per event.
+        """
+        spilled, buffered = self.spilled, list(self._events)
+        events: list[OntologyEvent] = []
+        handle = None
+        try:
+            for seq in seqs:
+                if not 0 <= seq < spilled + len(buffered):
+                    raise IndexError(f"Event {seq} out of range")
+                if seq >= spilled:
+                    events.append(buffered[seq - spilled])
+                    continue
+                if handle is None:
+                    handle = self.segment_path.open("rb")
+                handle.seek(self._offsets[seq])
+                events.append(OntologyEvent.model_validate_json(handle.readline()))
+        finally:
+            if handle is not None:
+                handle.close()
+        return events
+
+    def tail(self, n: int) -> list[OntologyEvent]:
+        """The newest n events (reads the segment only if n exceeds the buffer)."""
+        if n <= 0:
+            return []
+        if n <= len(self._events):
+            return list(self._events)[-n:]
+        skip = max(len(self) - n, 0)
+        return [event for i, event in enumerate(self) if i >= skip]
+
+    def close(self, delete: bool = True) -> None:
+        """Drop buffered events and (by default) the segment file."""
+        self._events.clear()
+        if delete:
+            self.segment_path.unlink(missing_ok=True)
+            self.spilled = 0
+            self._offsets = array("q")
@@ -0,0 +1,178 @@
+"""
+Secondary indexes over logged events.
+
+From first principles: Debugging and analytics ask "which events touched
+entity X / came from agent Y / happened between T1 and T2", and scanning
+every session's history for each question is O(all events). Instead each
+session keeps posting lists, maintained on append, from index keys to the
+positions of matching events:
+- entity IRI, event type and agent (exact match)
+- time bucket (events grouped into fixed windows; edge buckets are
+  filtered exactly)
+
+Queries intersect the posting lists of each filter per session and merge
+sessions by global append order, then fetch only the requested page of
+events from the session buffers.
+"""
+
+from __future__ import annotations
+
+import bisect
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .ontology_event import OntologyEvent
+
+
+@dataclass
+class EventPage:
+    """One page of query results."""
+
+    events: list[OntologyEvent]
+    total: int
+    offset: int
+    limit: int
+    session_ids: list[str] = field(default_factory=list)
+
+    @property
+    def next_offset(self) -> int | None:
+        """Offset of the next page, or None if this is the last one."""
+        end = self.offset + len(self.events)
+        return end if end < self.total else None
+
+
+class SessionEventIndex:
+    """
+    Posting lists for one session's events.
+
+    Positions are local sequence numbers (the event's index in the session's
+    history); ``global_seqs`` maps them to logger-wide append order.
+    """
+
+    # Candidate sets up to this size are time-filtered directly instead of
+    # through the buckets
+    DIRECT_TIME_CHECK = 4096
+
+    def __init__(self, bucket_seconds: float):
+        """
+        Initialize index.
+
+        Args:
+            bucket_seconds: Width of time buckets
+        """
+        self.bucket_seconds = bucket_seconds
+        self.global_seqs = array("q")
+        self.timestamps = array("d")
+        self.postings: dict[tuple[str, str], array] = {}
+        self.buckets: dict[int, array] = {}
+        self._bucket_ids: list[int] = []
+
+    def __len__(self) -> int:
+        """Number of indexed events."""
+        return len(self.global_seqs)
+
+    def add(self, event: OntologyEvent, global_seq: int) -> None:
+        """Index the session's next event."""
+        local_seq = len(self.global_seqs)
+        self.global_seqs.append(global_seq)
+        self.timestamps.append(event.timestamp)
+
+        keys = {("agent", event.author), ("type", event.event_type)}
+        keys.update(("entity", entity) for entity in event.extracted_entities)
+        for key in keys:
+            posting = self.postings.get(key)
+            if posting is None:
+                posting = self.postings[key] = array("q")
+            posting.append(local_seq)
+
+        bucket_id = int(event.timestamp // self.bucket_seconds)
+        bucket = self.buckets.get(bucket_id)
+        if bucket is None:
+            bucket = self.buckets[bucket_id] = array("q")
+            bisect.insort(self._bucket_ids, bucket_id)
+        bucket.append(local_seq)
+
+    def match(
+        self,
+        keys: Iterable[tuple[str, str]],
+        start_time: float | None = None,
+        end_time: float | None = None,
+    ) -> np.ndarray:
+        """
+        Local sequence numbers of events matching every key and the time range.
+
+        Args:
+            keys: (field, value) pairs that must all match
+            start_time: Inclusive lower bound on timestamp
+            end_time: Exclusive upper bound on timestamp
+
+        Returns:
+            Sorted array of local sequence numbers
+        """
+        candidates: np.ndarray | None = None
+        for key in sorted(keys, key=lambda k: len(self.postings.get(k, ()))):
+            posting = self.postings.get(key)
+            if not posting:
+                return np.empty(0, dtype=np.int64)
+            values = np.array(posting, dtype=np.int64)
+            candidates = (
+                values
+                if candidates is None
+                else np.intersect1d(candidates, values, assume_unique=True)
+            )
+            if not len(candidates):
+                return candidates
+
+        if start_time is not None or end_time is not None:
+            if candidates is not None and len(candidates) <= self.DIRECT_TIME_CHECK:
+                return self._filter_time(candidates, start_time, end_time)
+            in_range = self._time_range(start_time, end_time)
+            candidates = (
+                in_range
+                if candidates is None
+                else np.intersect1d(candidates, in_range, assume_unique=True)
+            )
+
+        if candidates is None:
+            return np.arange(len(self.global_seqs), dtype=np.int64)
+        return candidates
+
+    def _filter_time(
+        self, seqs: np.ndarray, start_time: float | None, end_time: float | None
+    ) -> np.ndarray:
+        """Keep sequence numbers whose exact timestamp is in range."""
+        timestamps = np.frombuffer(self.timestamps, dtype=np.float64)[seqs]
+        mask = np.ones(len(seqs), dtype=bool)
+        if start_time is not None:
+            mask &= timestamps >= start_time
+        if end_time is not None:
+            mask &= timestamps < end_time
+        return seqs[mask]
+
+    def _time_range(
+        self, start_time: float | None, end_time: float | None
+    ) -> np.ndarray:
+        """Local sequence numbers with start_time <= timestamp < end_time."""
+        first = None if start_time is None else int(start_time // self.bucket_seconds)
+        last = None if end_time is None else int(end_time // self.bucket_seconds)
+        lo = 0 if first is None else bisect.bisect_left(self._bucket_ids, first)
+        hi = (
+            len(self._bucket_ids)
+            if last is None
+            else bisect.bisect_right(self._bucket_ids, last)
+        )
+
+        # Interior buckets match entirely; only the edge buckets need an
+        # exact timestamp check
+        parts = []
+        for bucket_id in self._bucket_ids[lo:hi]:
+            seqs = np.array(self.buckets[bucket_id], dtype=np.int64)
+            if bucket_id == first or bucket_id == last:
+                seqs = self._filter_time(seqs, start_time, end_time)
+            parts.append(seqs)
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(parts))
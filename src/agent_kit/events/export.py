@@ -0,0 +1,143 @@
+"""
+Streaming export of ontology events.
+
+From first principles: Exporting a long session shouldn't need the whole
+history in memory. Events are consumed from an iterator and written as they
+arrive: one NDJSON line at a time, or in fixed-size polars DataFrames
+(Arrow columns; one Parquet row group per batch, written by a polars
+streaming sink).
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any
+
+from .ontology_event import OntologyEvent
+
+
+def write_ndjson(
+    events: Iterable[OntologyEvent], destination: str | Path | IO[str]
+) -> int:
+    """
+    Write events as newline-delimited JSON (one ``to_dict()`` per line).
+
+    Args:
+        events: Events to write (consumed lazily)
+        destination: File path or open text stream
+
+    Returns:
+        Number of events written
+    """
+    if isinstance(destination, (str, Path)):
+        with open(destination, "w", encoding="utf-8") as f:
+            return write_ndjson(events, f)
+
+    count = 0
+    for event in events:
+        destination.write(json.dumps(event.to_dict()) + "\n")
+        count += 1
+    return count
+
+
+def event_schema() -> dict[str, Any]:
+    """Polars schema of exported events (nested dicts stored as JSON text)."""
+    import polars as pl
+
+    return {
+        "id": pl.String,
+        "author": pl.String,
+        "timestamp": pl.Float64,
+        "invocation_id": pl.String,
+        "branch": pl.String,
+        "event_type": pl.String,
+        "domain": pl.String,
+        "content_text": pl.String,
+        "content_parts": pl.String,
+        "ontology_triples": pl.String,
+        "sparql_queries": pl.List(pl.String),
+        "extracted_entities": pl.List(pl.String),
+        "leverage_scores": pl.List(pl.Struct({"key": pl.String, "value": pl.Float64})),
+    }
+
+
+def iter_event_frames(
+    events: Iterable[OntologyEvent], batch_size: int = 1000
+) -> Iterator[Any]:
+    """
+    Convert events to polars DataFrames of at most ``batch_size`` rows.
+
+    Args:
+        events: Events to convert (consumed lazily)
+        batch_size: Rows per frame
+
+    Yields:
+        polars.DataFrame instances (Arrow-backed; ``to_arrow()`` with pyarrow)
+    """
+    import polars as pl
+
+    schema = event_schema()
+    iterator = iter(events)
+    while batch := list(islice(iterator, batch_size)):
+        columns = {
+            "id": [e.id for e in batch],
+            "author": [e.author for e in batch],
+            "timestamp": [e.timestamp for e in batch],
+            "invocation_id": [e.invocation_id for e in batch],
+            "branch": [e.branch for e in batch],
+            "event_type": [e.event_type for e in batch],
+            "domain": [e.domain for e in batch],
+            "content_text": [e.content.text for e in batch],
+            "content_parts": [json.dumps(e.content.parts) for e in batch],
+            "ontology_triples": [json.dumps(e.ontology_triples) for e in batch],
+            "sparql_queries": [e.sparql_queries for e in batch],
+            "extracted_entities": [e.extracted_entities for e in batch],
+            "leverage_scores": [
+                [{"key": k, "value": v} for k, v in e.leverage_scores.items()]
+                for e in batch
+            ],
+        }
+        yield pl.DataFrame(columns, schema=schema)
+
+
+def write_parquet(
+    events: Iterable[OntologyEvent], path: str | Path, batch_size: int = 1000
+) -> int:
+    """
+    Write events to a Parquet file, one row group per batch.
+
+    The frames feed a polars streaming sink, so only the batches in flight
+    are in memory.
+
+    Args:
+        events: Events to write (consumed lazily)
+        path: Output file path
+        batch_size: Rows per row group
+
+    Returns:
+        Number of events written
+    """
+    from polars.io.plugins import register_io_source
+
+    count = 0
+
+    def source(
+        with_columns: list[str] | None,
+        predicate: Any,
+        n_rows: int | None,
+        _batch_size: int | None,
+    ) -> Iterator[Any]:
+        nonlocal count
+        for frame in iter_event_frames(events, batch_size):
+            count += len(frame)
+            if predicate is not None:
+                frame = frame.filter(predicate)
+            yield frame if with_columns is None else frame.select(with_columns)
+
+    register_io_source(source, schema=event_schema()).sink_parquet(
+        path, row_group_size=batch_size
+    )
+    return count
@@ -80,6 +80,10 @@ class OntologyEvent(BaseModel):
     branch: str | None = Field(
         default=None, description="Branch identifier for multi-agent isolation"
     )
+    event_type: str = Field(
+        default="agent_action",
+        description="Kind of event (agent_result, adk_event, agent_action, ...)",
+    )
 
     # Ontology-specific fields
     ontology_triples: list[dict[str, str]] = Field(
@@ -130,6 +134,7 @@ class OntologyEvent(BaseModel):
             author=agent_name,
             content=content,
             invocation_id=invocation_id,
+            event_type="agent_result",
             ontology_triples=ontology_context.get("triples", []),
             sparql_queries=ontology_context.get("queries", []),
             leverage_scores=ontology_context.get("leverage_scores", {}),
@@ -201,6 +206,7 @@ class OntologyEvent(BaseModel):
             timestamp=getattr(adk_event, "timestamp", time.time()),
             invocation_id=getattr(adk_event, "invocation_id", ""),
             branch=getattr(adk_event, "branch", None),
+            event_type="adk_event",
             ontology_triples=ontology_context.get("triples", []),
             sparql_queries=ontology_context.get("queries", []),
             leverage_scores=ontology_context.get("leverage_scores", {}),
@@ -218,6 +224,7 @@ class OntologyEvent(BaseModel):
             "timestamp_iso": datetime.fromtimestamp(self.timestamp).isoformat(),
             "invocation_id": self.invocation_id,
             "branch": self.branch,
+            "event_type": self.event_type,
             "ontology_triples": self.ontology_triples,
             "sparql_queries": self.sparql_queries,
             "leverage_scores": self.leverage_scores,
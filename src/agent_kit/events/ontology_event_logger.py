@@ -8,17 +8,34 @@ context from agent actions and ontology interactions.
 Integrates with:
 - OpenAI Agents SDK tracing
 - ADK Event system (when available)
+
+Memory per session is bounded: each session keeps its newest events in an
+EventRingBuffer and spills older ones to an on-disk segment file. Events can
+also be forwarded to external sinks through an EventDispatcher, which costs
+the call path a queue put. Events are indexed on append (entity, event type,
+agent, time bucket) so query_events() avoids scanning histories.
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
-from typing import Any
+import os
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Any
+
+import numpy as np
 
 from agent_kit.agents.base import AgentResult, AgentTask
 from agent_kit.ontology.loader import OntologyLoader
 
+from .event_buffer import EventRingBuffer
+from .event_index import EventPage, SessionEventIndex
+from .export import iter_event_frames, write_ndjson, write_parquet
 from .ontology_event import OntologyEvent
+from .sinks import EventDispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +65,11 @@ class OntologyEventLogger:
         self,
         ontology: OntologyLoader,
         domain: str = "business",
+        buffer_size: int = 1000,
+        spill_dir: str | Path | None = None,
+        dispatcher: EventDispatcher | None = None,
+        index_events: bool = True,
+        time_bucket_seconds: float = 3600.0,
     ):
         """
         Initialize logger with ontology loader.
@@ -55,13 +77,39 @@ class OntologyEventLogger:
         Args:
             ontology: OntologyLoader instance for tracking queries
             domain: Domain identifier for events (business, betting, trading)
+            buffer_size: Events kept in memory per session; older events
+                spill to disk
+            spill_dir: Directory for spilled event segments (default: a
+                per-logger directory under the system temp dir, created on
+                first spill)
+            dispatcher: Optional dispatcher forwarding events to sinks in
+                the background
+            index_events: Maintain secondary indexes for query_events()
+            time_bucket_seconds: Width of the time buckets in the index
         """
         self.ontology = ontology
         self.domain = domain
+        self.buffer_size = buffer_size
+        self.dispatcher = dispatcher
+        self.spill_dir = Path(
+            spill_dir
+            or Path(tempfile.gettempdir())
+            / "agent_kit_events"
+            / f"{os.getpid()}-{id(self):x}"
+        )
         self._session_queries: dict[str, list[str]] = {}
         self._session_triples: dict[str, list[dict[str, str]]] = {}
         self._session_entities: dict[str, list[str]] = {}
-        self._session_events: dict[str, list[OntologyEvent]] = {}
+        self._session_events: dict[str, EventRingBuffer] = {}
+        self.index_events = index_events
+        self.time_bucket_seconds = time_bucket_seconds
+        self._session_indexes: dict[str, SessionEventIndex] = {}
+        self._global_seq = 0
+
+    def _segment_path(self, session_id: str) -> Path:
+        """Spill file for a session (hashed so any session ID is a safe name)."""
+        digest = hashlib.sha1(session_id.encode()).hexdigest()[:16]
+        return self.spill_dir / f"{digest}.ndjson"
 
     def start_tracking(self, session_id: str) -> None:
         """
@@ -73,26 +121,41 @@ class OntologyEventLogger:
         self._session_queries[session_id] = []
         self._session_triples[session_id] = []
         self._session_entities[session_id] = []
-        self._session_events[session_id] = []
+        previous = self._session_events.get(session_id)
+        if previous is not None:
+            previous.close()
+        self._session_events[session_id] = EventRingBuffer(
+            self.buffer_size, self._segment_path(session_id)
+        )
+        if self.index_events:
+            self._session_indexes[session_id] = SessionEventIndex(
+                self.time_bucket_seconds
+            )
         logger.debug(f"Started tracking for session: {session_id}")
 
     def stop_tracking(self, session_id: str) -> list[OntologyEvent]:
         """
         Stop tracking and return all events for session.
 
+        Export the session first if it may have spilled a large history;
+        the spill file is deleted here.
+
         Args:
             session_id: Session identifier
 
         Returns:
             List of events captured during session
         """
-        events = self._session_events.get(session_id, [])
+        events = self.get_events(session_id)
 
         # Clean up
         self._session_queries.pop(session_id, None)
         self._session_triples.pop(session_id, None)
         self._session_entities.pop(session_id, None)
-        self._session_events.pop(session_id, None)
+        self._session_indexes.pop(session_id, None)
+        buffer = self._session_events.pop(session_id, None)
+        if buffer is not None:
+            buffer.close()
 
         logger.debug(
             f"Stopped tracking for session: {session_id}, {len(events)} events"
@@ -182,9 +245,7 @@ class OntologyEventLogger:
             invocation_id=invocation_id,
         )
 
-        # Store event
-        if session_id in self._session_events:
-            self._session_events[session_id].append(event)
+        self.log_event(session_id, event)
 
         # Clear session data for next event (queries are per-event)
         self._session_queries[session_id] = []
@@ -194,6 +255,28 @@ class OntologyEventLogger:
         logger.info(f"Created event for {agent_name} in session {session_id}")
         return event
 
+    def log_event(self, session_id: str, event: OntologyEvent) -> None:
+        """
+        Record an already-built event (e.g. converted from an ADK event).
+
+        Args:
+            session_id: Session identifier
+            event: Event to store, index and forward to sinks
+        """
+        if session_id in self._session_events:
+            self._session_events[session_id].append(event)
+            index = self._session_indexes.get(session_id)
+            if index is not None:
+                index.add(event, self._global_seq)
+                self._global_seq += 1
+        if self.dispatcher is not None:
+            self.dispatcher.submit(session_id, event)
+
+    def close(self) -> None:
+        """Flush pending events to sinks and stop the dispatcher."""
+        if self.dispatcher is not None:
+            self.dispatcher.close()
+
     def _extract_leverage_scores(
         self, result: AgentResult | dict[str, Any]
     ) -> dict[str, float]:
@@ -206,6 +289,22 @@ class OntologyEventLogger:
 
         return {}
 
+    def iter_events(self, session_id: str) -> Iterator[OntologyEvent]:
+        """
+        Stream all events for a session, oldest first.
+
+        Spilled events are read back from disk one at a time.
+
+        Args:
+            session_id: Session identifier
+
+        Yields:
+            Events for session
+        """
+        buffer = self._session_events.get(session_id)
+        if buffer is not None:
+            yield from buffer
+
     def get_events(self, session_id: str) -> list[OntologyEvent]:
         """
         Get all events for a session.
@@ -216,11 +315,16 @@ class OntologyEventLogger:
         Returns:
             List of events for session
         """
-        return self._session_events.get(session_id, []).copy()
+        return list(self.iter_events(session_id))
+
+    def get_recent_events(self, session_id: str, n: int) -> list[OntologyEvent]:
+        """Get the newest n events for a session (from memory when possible)."""
+        buffer = self._session_events.get(session_id)
+        return buffer.tail(n) if buffer is not None else []
 
     def get_event_count(self, session_id: str) -> int:
         """Get count of events in session."""
-        return len(self._session_events.get(session_id, []))
+        return len(self._session_events.get(session_id, ()))
 
     def export_events(self, session_id: str) -> list[dict[str, Any]]:
         """
@@ -232,14 +336,141 @@ class OntologyEventLogger:
         Returns:
             List of event dictionaries
         """
-        events = self._session_events.get(session_id, [])
-        return [event.to_dict() for event in events]
+        return [event.to_dict() for event in self.iter_events(session_id)]
+
+    def export_ndjson(self, session_id: str, destination: str | Path | IO[str]) -> int:
+        """
+        Stream a session's events to newline-delimited JSON.
+
+        Args:
+            session_id: Session identifier
+            destination: File path or open text stream
+
+        Returns:
+            Number of events written
+        """
+        return write_ndjson(self.iter_events(session_id), destination)
+
+    def export_frames(self, session_id: str, batch_size: int = 1000) -> Iterator[Any]:
+        """
+        Stream a session's events as polars DataFrames of ``batch_size`` rows.
+
+        Args:
+            session_id: Session identifier
+            batch_size: Rows per frame
+
+        Yields:
+            polars.DataFrame instances
+        """
+        return iter_event_frames(self.iter_events(session_id), batch_size)
+
+    def export_parquet(
+        self, session_id: str, path: str | Path, batch_size: int = 1000
+    ) -> int:
+        """
+        Stream a session's events to a Parquet file.
+
+        Args:
+            session_id: Session identifier
+            path: Output file path
+            batch_size: Rows per row group
+
+        Returns:
+            Number of events written
+        """
+        return write_parquet(self.iter_events(session_id), path, batch_size)
+
+    def query_events(
+        self,
+        entity: str | None = None,
+        event_type: str | None = None,
+        agent: str | None = None,
+        session_id: str | None = None,
+        start_time: float | None = None,
+        end_time: float | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        newest_first: bool = False,
+    ) -> EventPage:
+        """
+        Find events across tracked sessions using the secondary indexes.
+
+        Filters combine with AND; only the requested page is loaded.
+
+        Args:
+            entity: Entity IRI in the event's extracted entities
+            event_type: Event type (e.g. "agent_result")
+            agent: Authoring agent name
+            session_id: Restrict to one session
+            start_time: Inclusive lower bound on timestamp
+            end_time: Exclusive upper bound on timestamp
+            limit: Max events in the page
+            offset: Matches to skip
+            newest_first: Order by most recently logged first
+
+        Returns:
+            EventPage with the matching events and total match count
+        """
+        if not self.index_events:
+            raise RuntimeError("Event indexing is disabled for this logger")
+
+        keys = [
+            (name, value)
+            for name, value in (
+                ("entity", entity),
+                ("type", event_type),
+                ("agent", agent),
+            )
+            if value is not None
+        ]
+        sessions = (
+            [session_id] if session_id is not None else list(self._session_indexes)
+        )
+
+        global_parts, owner_parts, local_parts = [], [], []
+        for owner, sid in enumerate(sessions):
+            index = self._session_indexes.get(sid)
+            if index is None:
+                continue
+            local = index.match(keys, start_time, end_time)
+            if len(local):
+                global_parts.append(
+                    np.frombuffer(index.global_seqs, dtype=np.int64)[local]
+                )
+                owner_parts.append(np.full(len(local), owner))
+                local_parts.append(local)
+
+        if not global_parts:
+            return EventPage(events=[], total=0, offset=offset, limit=limit)
+
+        order = np.argsort(np.concatenate(global_parts), kind="stable")
+        if newest_first:
+            order = order[::-1]
+        page = order[offset : offset + limit]
+        owners = np.concatenate(owner_parts)[page]
+        locals_ = np.concatenate(local_parts)[page]
+
+        # Fetch per session, then restore result order
+        events: list[OntologyEvent | None] = [None] * len(page)
+        for owner in np.unique(owners):
+            positions = np.flatnonzero(owners == owner)
+            buffer = self._session_events[sessions[owner]]
+            fetched = buffer.get_many(locals_[positions].tolist())
+            for position, event in zip(positions.tolist(), fetched, strict=True):
+                events[position] = event
+
+        return EventPage(
+            events=[event for event in events if event is not None],
+            total=len(order),
+            offset=offset,
+            limit=limit,
+            session_ids=[sessions[owner] for owner in owners.tolist()],
+        )
 
     def get_query_history(self, session_id: str) -> list[str]:
         """Get all SPARQL queries executed in session."""
-        events = self._session_events.get(session_id, [])
         queries = []
-        for event in events:
+        for event in self.iter_events(session_id):
             queries.extend(event.sparql_queries)
         return queries
 
@@ -250,10 +481,9 @@ class OntologyEventLogger:
         Returns:
             Dict mapping entity to mention count
         """
-        events = self._session_events.get(session_id, [])
         entity_counts: dict[str, int] = {}
 
-        for event in events:
+        for event in self.iter_events(session_id):
             for entity in event.extracted_entities:
                 entity_counts[entity] = entity_counts.get(entity, 0) + 1
 
@@ -0,0 +1,442 @@
+"""
+Asynchronous event sinks.
+
+From first principles: Instrumentation must not slow down the agent it
+observes. Logging an event on the call path is a bounded queue put; a
+background flusher thread drains the queue in batches and hands each batch
+to pluggable sinks (file, SQLite, socket). When sinks fall behind, the
+backpressure policy decides what the call path pays:
+- block: wait for queue space (no loss, bounded latency via block_timeout)
+- drop: discard new events while the queue is full
+- sample: past a high-water mark keep only a fraction of events, drop when full
+
+Pending events are flushed on close() and at interpreter exit.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Protocol, runtime_checkable
+
+from .ontology_event import OntologyEvent
+
+logger = logging.getLogger(__name__)
+
+EventRecord = tuple[str, OntologyEvent]
+
+BACKPRESSURE_POLICIES = ("block", "drop", "sample")
+
+_STOP = object()
+
+
+@runtime_checkable
+class EventSink(Protocol):
+    """Destination for batches of (session_id, event) records."""
+
+    def write_batch(self, records: list[EventRecord]) -> None:
+        """Write a batch of records (called from the flusher thread)."""
+        ...
+
+    def close(self) -> None:
+        """Release resources."""
+        ...
+
+
+def _record_dict(session_id: str, event: OntologyEvent) -> dict[str, Any]:
+    """Serializable form of a record."""
+    return {"session_id": session_id, **event.to_dict()}
+
+
+class FileSink:
+    """Appends records to a newline-delimited JSON file."""
+
+    def __init__(self, path: str | Path, fsync: bool = False):
+        """
+        Initialize sink.
+
+        Args:
+            path: NDJSON file to append to
+            fsync: Sync to disk after every batch
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync
+        self._file = self.path.open("a", encoding="utf-8")
+
+    def write_batch(self, records: list[EventRecord]) -> None:
+        """Append one line per record."""
+        self._file.writelines(
+            json.dumps(_record_dict(session_id, event)) + "\n"
+            for session_id, event in records
+        )
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+
+class SqliteSink:
+    """Stores records in an SQLite table, one transaction per batch."""
+
+    def __init__(self, db_path: str | Path, table: str = "ontology_events"):
+        """
+        Initialize sink.
+
+        Args:
+            db_path: SQLite database file
+            table: Table name (created if missing)
+        """
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        self.db_path = Path(db_path)
+        self.table = table
+        # Used only by the flusher thread after construction
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        with self._conn:
+            self._conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id TEXT PRIMARY KEY,
+                    session_id TEXT NOT NULL,
+                    author TEXT NOT NULL,
+                    timestamp REAL NOT NULL,
+                    domain TEXT,
+                    data TEXT NOT NULL
+                )
+            """
+            )
+            self._conn.execute(
+                f"""
+                CREATE INDEX IF NOT EXISTS idx_{table}_session
+                ON {table}(session_id, timestamp)
+            """
+            )
+
+    def write_batch(self, records: list[EventRecord]) -> None:
+        """Insert records (replacing duplicates by event id)."""
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        event.id,
+                        session_id,
+                        event.author,
+                        event.timestamp,
+                        event.domain,
+                        json.dumps(_record_dict(session_id, event)),
+                    )
+                    for session_id, event in records
+                ],
+            )
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._conn.close()
+
+
+class SocketSink:
+    """
+    Sends batches over a stream socket as OTLP/JSON-shaped log payloads.
+
+    A local stand-in for an OpenTelemetry collector: each batch is one line
+    holding ``{"resourceLogs": [...]}`` with a log record per event. Accepts
+    a (host, port) TCP address or a Unix socket path; reconnects once per
+    batch on failure.
+    """
+
+    def __init__(
+        self,
+        address: tuple[str, int] | str,
+        service_name: str = "agent_kit",
+        timeout: float = 5.0,
+    ):
+        """
+        Initialize sink.
+
+        Args:
+            address: (host, port) for TCP or a filesystem path for a Unix socket
+            service_name: service.name resource attribute
+            timeout: Socket timeout in seconds
+        """
+        self.address = address
+        self.service_name = service_name
+        self.timeout = timeout
+        self._sock: socket.socket | None = None
+
+    def _connect(self) -> socket.socket:
+        """Open the socket."""
+        if isinstance(self.address, str):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.address)
+        return sock
+
+    def _payload(self, records: list[EventRecord]) -> bytes:
+        """Encode a batch as one OTLP/JSON logs line."""
+        log_records = [
+            {
+                "timeUnixNano": str(int(event.timestamp * 1e9)),
+                "severityText": "INFO",
+                "body": {"stringValue": event.content.text},
+                "attributes": [
+                    {"key": "session.id", "value": {"stringValue": session_id}},
+                    {"key": "event.id", "value": {"stringValue": event.id}},
+                    {"key": "agent.name", "value": {"stringValue": event.author}},
+                    {"key": "ontology.domain", "value": {"stringValue": event.domain}},
+                    {
+                        "key": "ontology.event",
+                        "value": {"stringValue": event.model_dump_json()},
+                    },
+                ],
+            }
+            for session_id, event in records
+        ]
+        payload = {
+            "resourceLogs": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": {"stringValue": self.service_name},
+                            }
+                        ]
+                    },
+                    "scopeLogs": [
+                        {
+                            "scope": {"name": "agent_kit.events"},
+                            "logRecords": log_records,
+                        }
+                    ],
+                }
+            ]
+        }
+        return (json.dumps(payload) + "\n").encode()
+
+    def write_batch(self, records: list[EventRecord]) -> None:
+        """Send one payload for the batch."""
+        payload = self._payload(records)
+        for attempt in range(2):
+            try:
+                if self._sock is None:
+                    self._sock = self._connect()
+                self._sock.sendall(payload)
+                return
+            except OSError:
+                self.close()
+                if attempt:
+                    raise
+
+    def close(self) -> None:
+        """Close the socket."""
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
+
+
+class EventDispatcher:
+    """
+    Bounded queue plus background flusher feeding one or more sinks.
+
+    Example:
+        >>> dispatcher = EventDispatcher([FileSink("events.ndjson")], policy="drop")
+        >>> logger = OntologyEventLogger(ontology, dispatcher=dispatcher)
+        >>> ...
+        >>> dispatcher.close()  # flushes pending events
+    """
+
+    def __init__(
+        self,
+        sinks: list[EventSink],
+        max_queue: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        policy: str = "block",
+        block_timeout: float | None = None,
+        sample_rate: float = 0.1,
+        sample_high_water: float = 0.75,
+    ):
+        """
+        Initialize dispatcher and start the flusher thread.
+
+        Args:
+            sinks: Sinks receiving every batch
+            max_queue: Max queued records
+            batch_size: Max records per sink write
+            flush_interval: Max seconds a record waits before its batch is written
+            policy: Backpressure policy ("block", "drop", "sample")
+            block_timeout: With "block", give up (drop) after this many seconds
+            sample_rate: With "sample", fraction kept above the high-water mark
+            sample_high_water: With "sample", queue fill ratio where sampling starts
+        """
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(
+                f"policy must be one of {BACKPRESSURE_POLICIES}, got {policy}"
+            )
+        if max_queue < 1 or batch_size < 1:
+            raise ValueError("max_queue and batch_size must be at least 1")
+
+        self.sinks = list(sinks)
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.sample_rate = sample_rate
+        self._high_water = int(max_queue * sample_high_water)
+
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "enqueued": 0,
+            "dropped": 0,
+            "sampled_out": 0,
+            "written": 0,
+            "failed_batches": 0,
+        }
+
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="event-dispatcher", daemon=True
+        )
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def submit(self, session_id: str, event: OntologyEvent) -> bool:
+        """
+        Queue an event for the sinks.
+
+        Returns:
+            Whether the event was queued (False if dropped by backpressure)
+        """
+        if self._closed:
+            raise RuntimeError("Event dispatcher is closed")
+
+        record = (session_id, event)
+        if self.policy == "sample" and self._queue.qsize() >= self._high_water:
+            if random.random() >= self.sample_rate:
+                self._count("sampled_out")
+                return False
+
+        try:
+            if self.policy == "block":
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            self._count("dropped")
+            return False
+
+        self._count("enqueued")
+        return True
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        """Add to a stats counter (submitters and the flusher share them)."""
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    @property
+    def pending(self) -> int:
+        """Records queued but not yet written."""
+        return self._queue.unfinished_tasks
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Wait until every queued record has been handed to the sinks.
+
+        Returns:
+            Whether the queue drained within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """Flush pending records, stop the flusher and close sinks."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(_STOP)
+        self._flusher.join(timeout)
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                logger.warning(f"Closing event sink {type(sink).__name__} failed: {e}")
+
+    def _flush_loop(self) -> None:
+        """Drain the queue in batches until stopped."""
+        stopping = False
+        while not stopping:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            if first is _STOP:
+                self._queue.task_done()
+                break
+
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    record = (
+                        self._queue.get(timeout=remaining)
+                        if remaining > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(record)
+
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write(self, batch: list[EventRecord]) -> None:
+        """
+        Hand a batch to every sink; failures are logged, not raised.
+
+        ``written`` counts records every sink accepted; each sink that
+        raises adds one to ``failed_batches``.
+        """
+        failed = 0
+        for sink in self.sinks:
+            try:
+                sink.write_batch(batch)
+            except Exception as e:
+                failed += 1
+                logger.warning(f"Event sink {type(sink).__name__} failed: {e}")
+        if failed:
+            self._count("failed_batches", failed)
+        else:
+            self._count("written", len(batch))
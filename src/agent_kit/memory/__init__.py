@@ -8,11 +8,17 @@ and Memory Bank services; we enhance with ontology-aware query expansion.
 This module provides:
 - OntologyMemoryService: Cross-session recall with entity linking
 - InMemoryBackend: Simple memory backend for testing
+- RetentionPolicy / MemorySweeper: TTL, quotas, dedup and compaction
 """
 
 from .ontology_memory_service import InMemoryBackend, OntologyMemoryService
+from .retention import MemorySweeper, RetentionPolicy, SweepStats
 
 __all__ = [
     "OntologyMemoryService",
     "InMemoryBackend",
+    # Retention
+    "RetentionPolicy",
+    "MemorySweeper",
+    "SweepStats",
 ]
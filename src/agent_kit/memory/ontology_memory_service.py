@@ -20,6 +20,8 @@ from typing import Any, Protocol, runtime_checkable
 
 from agent_kit.ontology.loader import OntologyLoader
 
+from .retention import MemorySweeper, RetentionPolicy, Summarizer, SweepStats
+
 logger = logging.getLogger(__name__)
 
 # Try to import ADK memory services
@@ -193,6 +195,27 @@ class InMemoryBackend:
             return True
         return False
 
+    async def list_entries(
+        self,
+        user_id: str | None = None,
+        domain: str | None = None,
+    ) -> list[MemoryEntry]:
+        """
+        List stored memories, optionally scoped to a user and/or domain.
+
+        Used by MemorySweeper to enforce retention policies.
+        """
+        return [
+            entry
+            for entry in self._memories.values()
+            if (user_id is None or entry.user_id == user_id)
+            and (domain is None or entry.domain == domain)
+        ]
+
+    def __len__(self) -> int:
+        """Number of stored memories."""
+        return len(self._memories)
+
     def clear(self) -> None:
         """Clear all memories."""
         self._memories.clear()
@@ -207,6 +230,7 @@ class OntologyMemoryService:
     - Entity extraction from conversations
     - Domain-scoped memory (business, betting, trading)
     - Session-to-memory ingestion
+    - Retention (TTL, quotas, content-hash dedup, compaction into digests)
 
     Works with ADK memory backends when available, fallback to InMemoryBackend.
 
@@ -219,6 +243,12 @@ class OntologyMemoryService:
         >>>
         >>> # Search with entity expansion
         >>> results = await memory.search("What was the revenue forecast?", "user_123")
+        >>>
+        >>> # Bound long-running tenants
+        >>> memory = OntologyMemoryService(
+        ...     ontology, retention=RetentionPolicy(ttl_seconds=7 * 86400, max_entries=5000)
+        ... )
+        >>> memory.start_retention()
     """
 
     def __init__(
@@ -226,6 +256,8 @@ class OntologyMemoryService:
         ontology: OntologyLoader,
         domain: str = "business",
         backend: MemoryBackend | Any | None = None,
+        retention: RetentionPolicy | None = None,
+        summarizer: Summarizer | None = None,
     ):
         """
         Initialize memory service.
@@ -234,9 +266,12 @@ class OntologyMemoryService:
             ontology: OntologyLoader for entity expansion
             domain: Domain scope (business, betting, trading)
             backend: Memory backend (ADK or InMemoryBackend)
+            retention: Retention policy (default: content-hash dedup only)
+            summarizer: Digest builder used when compaction is enabled
         """
         self.ontology = ontology
         self.domain = domain
+        self.retention = retention or RetentionPolicy()
 
         # Use provided backend or fallback
         if backend is not None:
@@ -244,6 +279,17 @@ class OntologyMemoryService:
         else:
             self.backend = InMemoryBackend()
 
+        # Retention is only enforceable on backends that can enumerate entries
+        self.sweeper: MemorySweeper | None = None
+        if retention is not None:
+            if hasattr(self.backend, "list_entries"):
+                self.sweeper = MemorySweeper(self.backend, retention, summarizer)
+            else:
+                logger.warning(
+                    f"{type(self.backend).__name__} cannot enumerate entries; "
+                    "retention limits will not be enforced"
+                )
+
         logger.info(f"Initialized OntologyMemoryService for domain: {domain}")
 
     async def store(
@@ -416,9 +462,43 @@ class OntologyMemoryService:
         logger.info(f"Ingested {count} memories from session {session_id}")
         return count
 
+    def start_retention(self) -> None:
+        """Start the background retention sweeper (requires a running loop)."""
+        if self.sweeper is None:
+            raise RuntimeError("No retention policy configured for this service")
+        self.sweeper.start()
+
+    async def stop_retention(self) -> None:
+        """Stop the background retention sweeper."""
+        if self.sweeper is not None:
+            await self.sweeper.stop()
+
+    async def enforce_retention(self, now: float | None = None) -> SweepStats:
+        """
+        Run a retention sweep immediately.
+
+        Args:
+            now: Reference time (defaults to time.time())
+
+        Returns:
+            Sweep statistics
+        """
+        if self.sweeper is None:
+            raise RuntimeError("No retention policy configured for this service")
+        return await self.sweeper.sweep(now)
+
     def _generate_id(self, content: str, user_id: str, session_id: str) -> str:
-        """Generate unique ID for memory entry."""
-        data = f"{content}:{user_id}:{session_id}:{time.time()}"
+        """
+        Generate ID for memory entry.
+
+        With dedup enabled the ID is a hash of (domain, user, content), so
+        re-storing the same content overwrites (and refreshes) one entry
+        instead of accumulating copies.
+        """
+        if self.retention.dedupe:
+            data = f"{self.domain}:{user_id}:{content}"
+        else:
+            data = f"{content}:{user_id}:{session_id}:{time.time()}"
         return hashlib.sha256(data.encode()).hexdigest()[:16]
 
     def _extract_entities(self, text: str) -> list[str]:
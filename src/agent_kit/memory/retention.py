@@ -0,0 +1,263 @@
+"""
+Retention policies for long-term memory.
+
+From first principles: Memory that only grows eventually hurts recall. Every
+search scans more stale entries, and a long-running tenant's footprint never
+shrinks. Retention keeps each (user, domain) scope bounded by:
+- TTL expiry (forget entries nobody has re-observed for a while)
+- Per-scope quotas on entry count and content bytes (oldest evicted first)
+- Compaction (merge old entries into digest entries instead of dropping them)
+
+Policies are enforced by MemorySweeper, either on demand via sweep() or
+periodically from a background asyncio task.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import logging
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from agent_kit.retention import PeriodicSweeper
+
+if TYPE_CHECKING:
+    from .ontology_memory_service import MemoryEntry
+
+logger = logging.getLogger(__name__)
+
+Summarizer = Callable[[list["MemoryEntry"]], "str | Awaitable[str]"]
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    Retention configuration for a memory store.
+
+    All limits are per (user_id, domain) scope. A limit of None disables it.
+    """
+
+    ttl_seconds: float | None = None
+    max_entries: int | None = None
+    max_bytes: int | None = None
+    dedupe: bool = True
+    compact_after_seconds: float | None = None
+    compaction_batch_size: int = 20
+    sweep_interval_seconds: float = 60.0
+
+    def __post_init__(self) -> None:
+        """Validate limits."""
+        if self.compaction_batch_size < 2:
+            raise ValueError("compaction_batch_size must be at least 2")
+        if self.sweep_interval_seconds <= 0:
+            raise ValueError("sweep_interval_seconds must be positive")
+
+
+@dataclass
+class SweepStats:
+    """Outcome of a single retention sweep."""
+
+    expired: int = 0
+    evicted: int = 0
+    compacted: int = 0
+    digests_created: int = 0
+    duration_seconds: float = 0.0
+
+    @property
+    def removed(self) -> int:
+        """Total entries removed from the store."""
+        return self.expired + self.evicted + self.compacted
+
+
+def content_hash(content: str) -> str:
+    """Stable hash of memory content used for deduplication."""
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def is_digest(entry: MemoryEntry) -> bool:
+    """Whether an entry was produced by compaction."""
+    return bool(entry.metadata.get("digest"))
+
+
+def default_summarizer(entries: list[MemoryEntry]) -> str:
+    """
+    Extractive digest: first sentence of each entry, oldest first.
+
+    Swap in an LLM-backed summarizer for abstractive digests.
+    """
+    lines = []
+    for entry in sorted(entries, key=lambda e: e.timestamp):
+        first_sentence = entry.content.strip().split(". ")[0]
+        if len(first_sentence) > 200:
+            first_sentence = first_sentence[:197] + "..."
+        lines.append(f"- {first_sentence}")
+    return "\n".join(lines)
+
+
+class MemorySweeper(PeriodicSweeper):
+    """
+    Enforces a RetentionPolicy against a memory backend.
+
+    The backend must support enumeration (``list_entries``) in addition to the
+    MemoryBackend protocol; InMemoryBackend does.
+
+    Example:
+        >>> sweeper = MemorySweeper(backend, RetentionPolicy(ttl_seconds=86400))
+        >>> stats = await sweeper.sweep()
+        >>> sweeper.start()  # periodic sweeps in the background
+    """
+
+    label = "Memory"
+
+    def __init__(
+        self,
+        backend: Any,
+        policy: RetentionPolicy,
+        summarizer: Summarizer | None = None,
+    ):
+        """
+        Initialize sweeper.
+
+        Args:
+            backend: Memory backend exposing list_entries/store/delete
+            policy: Retention limits to enforce
+            summarizer: Builds digest content during compaction
+        """
+        if not hasattr(backend, "list_entries"):
+            raise TypeError(
+                f"{type(backend).__name__} does not support list_entries; "
+                "retention cannot be enforced"
+            )
+        super().__init__(backend, policy)
+        self.last_stats: SweepStats | None = None
+        self.summarizer = summarizer or default_summarizer
+
+    async def _sweep(self, now: float) -> SweepStats:
+        """Expire, compact, then enforce quotas in every (user, domain) scope."""
+        stats = SweepStats()
+        scopes: dict[tuple[str, str], list[MemoryEntry]] = defaultdict(list)
+        for entry in await self.backend.list_entries():
+            scopes[(entry.user_id, entry.domain)].append(entry)
+
+        for scope_entries in scopes.values():
+            live = await self._expire(scope_entries, now, stats)
+            live = await self._compact(live, now, stats)
+            await self._enforce_quotas(live, stats)
+
+        if stats.removed or stats.digests_created:
+            logger.info(
+                f"Memory sweep: expired={stats.expired} evicted={stats.evicted} "
+                f"compacted={stats.compacted} digests={stats.digests_created}"
+            )
+        return stats
+
+    async def _expire(
+        self, entries: list[MemoryEntry], now: float, stats: SweepStats
+    ) -> list[MemoryEntry]:
+        """Delete entries older than the TTL."""
+        ttl = self.policy.ttl_seconds
+        if ttl is None:
+            return entries
+
+        live = []
+        for entry in entries:
+            if now - entry.timestamp > ttl:
+                if await self.backend.delete(entry.id):
+                    stats.expired += 1
+            else:
+                live.append(entry)
+        return live
+
+    async def _compact(
+        self, entries: list[MemoryEntry], now: float, stats: SweepStats
+    ) -> list[MemoryEntry]:
+        """Merge old non-digest entries into digest entries."""
+        threshold = self.policy.compact_after_seconds
+        if threshold is None:
+            return entries
+
+        old = sorted(
+            (e for e in entries if not is_digest(e) and now - e.timestamp > threshold),
+            key=lambda e: e.timestamp,
+        )
+        if len(old) < 2:
+            return entries
+
+        old_ids = {e.id for e in old}
+        live = [e for e in entries if e.id not in old_ids]
+        batch_size = self.policy.compaction_batch_size
+
+        for start in range(0, len(old), batch_size):
+            batch = old[start : start + batch_size]
+            if len(batch) < 2:
+                live.extend(batch)
+                continue
+
+            digest = await self._build_digest(batch)
+            await self.backend.store(digest)
+            for entry in batch:
+                await self.backend.delete(entry.id)
+            live.append(digest)
+            stats.compacted += len(batch)
+            stats.digests_created += 1
+
+        return live
+
+    async def _build_digest(self, batch: list[MemoryEntry]) -> MemoryEntry:
+        """Create a digest entry summarizing a batch of memories."""
+        from .ontology_memory_service import MemoryEntry
+
+        summary = self.summarizer(batch)
+        if inspect.isawaitable(summary):
+            summary = await summary
+
+        entities: list[str] = []
+        for entry in batch:
+            for entity in entry.entities:
+                if entity not in entities:
+                    entities.append(entity)
+
+        first = batch[0]
+        source_ids = [e.id for e in batch]
+        digest_id = "digest-" + content_hash(":".join(source_ids))
+        return MemoryEntry(
+            id=digest_id,
+            content=str(summary),
+            user_id=first.user_id,
+            session_id=first.session_id,
+            timestamp=max(e.timestamp for e in batch),
+            entities=entities,
+            domain=first.domain,
+            metadata={
+                "digest": True,
+                "source_ids": source_ids,
+                "source_count": len(batch),
+                "period_start": min(e.timestamp for e in batch),
+                "period_end": max(e.timestamp for e in batch),
+            },
+        )
+
+    async def _enforce_quotas(
+        self, entries: list[MemoryEntry], stats: SweepStats
+    ) -> None:
+        """Evict oldest entries until entry and byte quotas hold."""
+        max_entries = self.policy.max_entries
+        max_bytes = self.policy.max_bytes
+        if max_entries is None and max_bytes is None:
+            return
+
+        kept = 0
+        kept_bytes = 0
+        for entry in sorted(entries, key=lambda e: e.timestamp, reverse=True):
+            size = len(entry.content.encode())
+            over_count = max_entries is not None and kept + 1 > max_entries
+            over_bytes = max_bytes is not None and kept_bytes + size > max_bytes
+            if over_count or over_bytes:
+                if await self.backend.delete(entry.id):
+                    stats.evicted += 1
+                continue
+            kept += 1
+            kept_bytes += size
@@ -9,14 +9,24 @@ Automatically halts trading when:
 
 from __future__ import annotations
 
-from collections.abc import Callable
-from datetime import datetime, timedelta
+import inspect
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from datetime import datetime
 from enum import Enum
 from functools import wraps
 from typing import Any
 
 from pydantic import BaseModel  # pyright: ignore[reportMissingImports]
 
+from .metrics import metrics_registry
+from .sliding_window import SlidingWindowCounter
+
+logger = logging.getLogger(__name__)
+
 
 class CircuitState(str, Enum):
     """Circuit breaker states."""
@@ -33,9 +43,74 @@ class CircuitBreakerConfig(BaseModel):
     min_sharpe_ratio: float = 0.5  # Minimum Sharpe
     error_rate_threshold: float = 0.05  # 5% error rate
     check_window_minutes: int = 5  # Error rate window
+    window_buckets: int = 60  # Time slices in the error rate window
     recovery_timeout_minutes: int = 30  # Time before trying HALF_OPEN
 
 
+class _BreakerMetrics:
+    """A breaker's children of the shared circuit breaker metric families."""
+
+    calls = metrics_registry.counter(
+        "agent_kit_circuit_breaker_calls_total",
+        "Calls completed through the circuit breaker",
+        ["breaker"],
+    )
+    failures = metrics_registry.counter(
+        "agent_kit_circuit_breaker_failures_total",
+        "Calls through the circuit breaker that raised",
+        ["breaker"],
+    )
+    rejections = metrics_registry.counter(
+        "agent_kit_circuit_breaker_rejections_total",
+        "Calls rejected without running because the circuit was open",
+        ["breaker"],
+    )
+    transitions = metrics_registry.counter(
+        "agent_kit_circuit_breaker_transitions_total",
+        "Circuit breaker state transitions",
+        ["breaker", "from_state", "to_state"],
+    )
+    state = metrics_registry.gauge(
+        "agent_kit_circuit_breaker_state",
+        "Circuit breaker state (0=closed, 1=half-open, 2=open)",
+        ["breaker"],
+    )
+    latency = metrics_registry.histogram(
+        "agent_kit_circuit_breaker_call_latency_seconds",
+        "Latency of calls through the circuit breaker",
+        ["breaker"],
+    )
+
+    STATE_VALUES = {"CLOSED": 0, "HALF_OPEN": 1, "OPEN": 2}
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls = self.calls.labels(breaker=name)
+        self._failures = self.failures.labels(breaker=name)
+        self._rejections = self.rejections.labels(breaker=name)
+        self._state = self.state.labels(breaker=name)
+        self._latency = self.latency.labels(breaker=name)
+        self._state.set(0)
+
+    def record_call(self, started: float, failed: bool) -> None:
+        """Count a finished call and its latency (started from perf_counter)."""
+        self._latency.observe(time.perf_counter() - started)
+        self._calls.inc()
+        if failed:
+            self._failures.inc()
+
+    def record_rejection(self) -> None:
+        """Count a call rejected by an open circuit."""
+        self._rejections.inc()
+
+    def record_transition(self, previous: CircuitState, state: CircuitState) -> None:
+        """Count a state transition and publish the new state."""
+        self.transitions.labels(
+            breaker=self.name, from_state=previous.value, to_state=state.value
+        ).inc()
+        self._state.set(self.STATE_VALUES[state.value])
+
+
 class CircuitBreakerEvent(BaseModel):
     """Event logged when circuit breaker triggers."""
 
@@ -62,21 +137,32 @@ class CircuitBreaker:
         ...     print(f"Circuit breaker prevented trade: {e}")
     """
 
-    def __init__(self, config: CircuitBreakerConfig | None = None):
+    def __init__(
+        self,
+        config: CircuitBreakerConfig | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        name: str = "default",
+    ):
         """
         Initialize circuit breaker.
 
         Args:
             config: Circuit breaker configuration
+            clock: Monotonic time source in seconds (recovery timing and window)
+            name: Breaker name (the ``breaker`` label of its metrics)
         """
         self.config = config or CircuitBreakerConfig()
         self.state = CircuitState.CLOSED
-
-        # State tracking
-        self.errors: list[datetime] = []
-        self.successes: list[datetime] = (
-            []
-        )  # Track successes for error rate calculation
+        self.clock = clock
+        self.name = name
+        self.metrics = _BreakerMetrics(name)
+
+        # Calls and errors in the check window (O(1) per call)
+        self.window = SlidingWindowCounter(
+            window_seconds=self.config.check_window_minutes * 60,
+            num_buckets=self.config.window_buckets,
+            clock=clock,
+        )
         self.peak_portfolio_value = 0.0
         self.current_portfolio_value = 0.0
         self.current_sharpe_ratio = 0.0
@@ -84,6 +170,7 @@ class CircuitBreaker:
         # Events log
         self.events: list[CircuitBreakerEvent] = []
         self.last_state_change: datetime | None = None
+        self._state_changed_at: float | None = None  # clock() of last change
 
     def call(self, func: Callable, *args, **kwargs) -> Any:
         """
@@ -102,15 +189,19 @@ class CircuitBreaker:
         if self.state == CircuitState.OPEN:
             self._check_recovery()
             if self.state == CircuitState.OPEN:
+                self.metrics.record_rejection()
                 raise Exception(
                     f"Circuit breaker OPEN - trading halted. Last event: {self.events[-1].reason}"
                 )
 
+        started = time.perf_counter()
         try:
             result = func(*args, **kwargs)
+            self.metrics.record_call(started, failed=False)
             self._record_success()
             return result
         except Exception as e:
+            self.metrics.record_call(started, failed=True)
             self._record_error()
             raise e
 
@@ -152,35 +243,22 @@ class CircuitBreaker:
 
     def _record_error(self):
         """Record error and check error rate threshold."""
-        self.errors.append(datetime.now())
-
-        # Remove old errors outside check window
-        cutoff = datetime.now() - timedelta(minutes=self.config.check_window_minutes)
-        self.errors = [e for e in self.errors if e > cutoff]
-        self.successes = [e for e in self.successes if e > cutoff]
+        self.window.record(success=False)
 
-        # Calculate error rate based on actual call count
-        total_calls = len(self.errors) + len(self.successes)
-        if total_calls > 0:
-            error_rate = len(self.errors) / total_calls
-
-            if error_rate >= self.config.error_rate_threshold:
-                self._open_circuit(
-                    reason=f"Error rate {error_rate:.2%} >= threshold {self.config.error_rate_threshold:.2%}",
-                    metrics={
-                        "error_count": len(self.errors),
-                        "total_calls": total_calls,
-                        "error_rate": error_rate,
-                    },
-                )
+        error_rate = self.window.failure_rate
+        if error_rate >= self.config.error_rate_threshold:
+            self._open_circuit(
+                reason=f"Error rate {error_rate:.2%} >= threshold {self.config.error_rate_threshold:.2%}",
+                metrics={
+                    "error_count": self.window.failures,
+                    "total_calls": self.window.calls,
+                    "error_rate": error_rate,
+                },
+            )
 
     def _record_success(self):
         """Record successful execution."""
-        self.successes.append(datetime.now())
-
-        # Remove old successes outside check window
-        cutoff = datetime.now() - timedelta(minutes=self.config.check_window_minutes)
-        self.successes = [e for e in self.successes if e > cutoff]
+        self.window.record(success=True)
 
         if self.state == CircuitState.HALF_OPEN:
             # Success in HALF_OPEN state -> close circuit
@@ -189,8 +267,7 @@ class CircuitBreaker:
     def _open_circuit(self, reason: str, metrics: dict[str, Any]):
         """Open circuit breaker."""
         if self.state != CircuitState.OPEN:
-            self.state = CircuitState.OPEN
-            self.last_state_change = datetime.now()
+            self._mark_state_change(CircuitState.OPEN)
 
             event = CircuitBreakerEvent(
                 timestamp=datetime.now(),
@@ -204,8 +281,7 @@ class CircuitBreaker:
 
     def _close_circuit(self):
         """Close circuit breaker."""
-        self.state = CircuitState.CLOSED
-        self.last_state_change = datetime.now()
+        self._mark_state_change(CircuitState.CLOSED)
 
         event = CircuitBreakerEvent(
             timestamp=datetime.now(),
@@ -219,13 +295,11 @@ class CircuitBreaker:
 
     def _check_recovery(self):
         """Check if circuit can transition to HALF_OPEN."""
-        if self.state == CircuitState.OPEN and self.last_state_change:
-            time_since_open = datetime.now() - self.last_state_change
-            recovery_timeout = timedelta(minutes=self.config.recovery_timeout_minutes)
+        if self.state == CircuitState.OPEN and self._state_changed_at is not None:
+            time_since_open = self.clock() - self._state_changed_at
 
-            if time_since_open >= recovery_timeout:
-                self.state = CircuitState.HALF_OPEN
-                self.last_state_change = datetime.now()
+            if time_since_open >= self.config.recovery_timeout_minutes * 60:
+                self._mark_state_change(CircuitState.HALF_OPEN)
 
                 event = CircuitBreakerEvent(
                     timestamp=datetime.now(),
@@ -235,6 +309,14 @@ class CircuitBreaker:
                 )
                 self.events.append(event)
 
+    def _mark_state_change(self, state: CircuitState):
+        """Enter a state, stamping the time (wall clock for display, monotonic for timing)."""
+        previous = self.state
+        self.state = state
+        self.last_state_change = datetime.now()
+        self._state_changed_at = self.clock()
+        self.metrics.record_transition(previous, state)
+
     def _send_alert(self, event: CircuitBreakerEvent):
         """
         Send alert to monitoring system.
@@ -245,10 +327,14 @@ class CircuitBreaker:
         - PagerDuty (API)
         - SMS (Twilio)
         """
-        print(f"🚨 CIRCUIT BREAKER ALERT: {event.event_type}")
-        print(f"   Time: {event.timestamp}")
-        print(f"   Reason: {event.reason}")
-        print(f"   Metrics: {event.metrics}")
+        logger.warning(
+            f"Circuit breaker alert {event.event_type}: {event.reason}",
+            extra={
+                "event_type": event.event_type,
+                "reason": event.reason,
+                "metrics": event.metrics,
+            },
+        )
 
         # TODO: Integrate with real alerting
         # import requests
@@ -267,8 +353,8 @@ class CircuitBreaker:
                 else 0.0
             ),
             "sharpe_ratio": self.current_sharpe_ratio,
-            "recent_errors": len(self.errors),
-            "recent_successes": len(self.successes),
+            "recent_errors": self.window.failures,
+            "recent_successes": self.window.successes,
             "last_state_change": (
                 self.last_state_change.isoformat() if self.last_state_change else None
             ),
@@ -284,9 +370,8 @@ class CircuitBreaker:
 
     def manual_reset(self):
         """Manually reset circuit breaker (use with caution)."""
-        self.state = CircuitState.CLOSED
-        self.errors = []
-        self.last_state_change = datetime.now()
+        self.window.reset()
+        self._mark_state_change(CircuitState.CLOSED)
 
         event = CircuitBreakerEvent(
             timestamp=datetime.now(),
@@ -295,19 +380,19 @@ class CircuitBreaker:
             metrics={},
         )
         self.events.append(event)
-        print("⚠️  Circuit breaker manually reset")
+        logger.warning("Circuit breaker manually reset")
 
 
 # Global circuit breaker instances (one per agent/tool)
-# Note: Not thread-safe. Wrap in lock if used in multi-threaded context.
 _circuit_breakers: dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
 
 
 def get_circuit_breaker(
     agent_name: str, config: CircuitBreakerConfig | None = None
 ) -> CircuitBreaker:
     """
-    Get or create circuit breaker for agent.
+    Get or create circuit breaker for agent (thread-safe).
 
     Args:
         agent_name: Unique agent identifier
@@ -316,9 +401,354 @@ def get_circuit_breaker(
     Returns:
         CircuitBreaker instance
     """
-    if agent_name not in _circuit_breakers:
-        _circuit_breakers[agent_name] = CircuitBreaker(config)
-    return _circuit_breakers[agent_name]
+    with _circuit_breakers_lock:
+        if agent_name not in _circuit_breakers:
+            _circuit_breakers[agent_name] = CircuitBreaker(config, name=agent_name)
+        return _circuit_breakers[agent_name]
+
+
+# ============================================================================
+# Call-level circuit breakers (shared by name across decorated functions)
+# ============================================================================
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its circuit breaker is open."""
+
+    def __init__(self, name: str, retry_after: float | None = None):
+        self.name = name
+        self.retry_after = retry_after
+        if retry_after is None:
+            message = f"Circuit breaker OPEN for {name} (half-open probe in progress)"
+        else:
+            message = (
+                f"Circuit breaker OPEN for {name}. "
+                f"Wait {retry_after:.0f}s before retry."
+            )
+        super().__init__(message)
+
+
+class FunctionCircuitBreaker:
+    """
+    Thread-safe circuit breaker guarding calls to a dependency.
+
+    From first principles: The breaker is a small state machine
+    (CLOSED -> OPEN -> HALF_OPEN -> CLOSED) updated before and after every
+    call. Transitions happen under a lock that is never held while the
+    protected call runs, so the same breaker can guard threads and asyncio
+    tasks without blocking the event loop.
+
+    - CLOSED: calls pass; the breaker opens after ``max_failures``
+      consecutive failures, or when the failure rate over the last
+      ``window_seconds`` reaches ``failure_threshold`` (once at least
+      ``min_calls`` calls were seen)
+    - OPEN: calls are rejected with CircuitOpenError until ``reset_timeout``
+      has passed
+    - HALF_OPEN: at most ``half_open_max_calls`` probe calls run at once;
+      that many successes close the circuit, any failure reopens it
+
+    Example:
+        >>> breaker = circuit_breaker_registry.get_or_create("market_data")
+        >>> data = breaker.call(fetch, "AAPL")
+        >>> data = await breaker.acall(afetch, "AAPL")
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_failures: int = 3,
+        reset_timeout: float = 60.0,
+        failure_threshold: float = 0.5,
+        window_seconds: float = 60.0,
+        min_calls: int | None = None,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize breaker.
+
+        Args:
+            name: Breaker name (used in errors, logs and the registry)
+            max_failures: Consecutive failures that open the circuit
+            reset_timeout: Seconds OPEN before probing recovery
+            failure_threshold: Failure rate (0.0 to 1.0) that opens the circuit
+            window_seconds: Window for the failure rate
+            min_calls: Calls in the window before the rate applies
+                (defaults to max_failures)
+            half_open_max_calls: Concurrent probes allowed while HALF_OPEN
+            clock: Monotonic time source in seconds
+        """
+        if half_open_max_calls < 1:
+            raise ValueError("half_open_max_calls must be at least 1")
+        self.name = name
+        self.max_failures = max_failures
+        self.reset_timeout = reset_timeout
+        self.failure_threshold = failure_threshold
+        self.min_calls = max_failures if min_calls is None else min_calls
+        self.half_open_max_calls = half_open_max_calls
+        self.clock = clock
+
+        self.state = CircuitState.CLOSED
+        self.window = SlidingWindowCounter(window_seconds, clock=clock)
+        self.consecutive_failures = 0
+        self.last_state_change: datetime | None = None
+        self.events: deque[CircuitBreakerEvent] = deque(maxlen=20)
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+        self.metrics = _BreakerMetrics(name)
+
+    # ------------------------------------------------------------------
+    # Call protection
+    # ------------------------------------------------------------------
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a sync function under the breaker."""
+        probe = self._before_call()
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.metrics.record_call(started, failed=True)
+            self._on_failure(probe)
+            raise
+        except BaseException:
+            self._on_abandoned(probe)
+            raise
+        self.metrics.record_call(started, failed=False)
+        self._on_success(probe)
+        return result
+
+    async def acall(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Await a coroutine function under the breaker."""
+        probe = self._before_call()
+        started = time.perf_counter()
+        try:
+            result = await func(*args, **kwargs)
+        except Exception:
+            self.metrics.record_call(started, failed=True)
+            self._on_failure(probe)
+            raise
+        except BaseException:
+            # Cancellation says nothing about the dependency's health
+            self._on_abandoned(probe)
+            raise
+        self.metrics.record_call(started, failed=False)
+        self._on_success(probe)
+        return result
+
+    def _before_call(self) -> bool:
+        """
+        Admit or reject a call.
+
+        Returns:
+            Whether the call is a half-open probe
+
+        Raises:
+            CircuitOpenError: If the circuit is open or probes are exhausted
+        """
+        with self._lock:
+            if self.state == CircuitState.OPEN:
+                remaining = self.reset_timeout - (self.clock() - self._opened_at)
+                if remaining > 0:
+                    self.metrics.record_rejection()
+                    raise CircuitOpenError(self.name, remaining)
+                self._transition(
+                    CircuitState.HALF_OPEN,
+                    "Recovery timeout reached - probing",
+                )
+            if self.state == CircuitState.HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_max_calls:
+                    self.metrics.record_rejection()
+                    raise CircuitOpenError(self.name)
+                self._probes_in_flight += 1
+                return True
+            return False
+
+    def _on_success(self, probe: bool) -> None:
+        """Record a successful call."""
+        with self._lock:
+            self.window.record(success=True)
+            self.consecutive_failures = 0
+            if probe and self.state == CircuitState.HALF_OPEN:
+                self._probes_in_flight -= 1
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_max_calls:
+                    self._transition(
+                        CircuitState.CLOSED, "Recovered - probe calls succeeded"
+                    )
+
+    def _on_failure(self, probe: bool) -> None:
+        """Record a failed call and open the circuit if needed."""
+        with self._lock:
+            self.window.record(success=False)
+            self.consecutive_failures += 1
+            if self.state == CircuitState.HALF_OPEN:
+                # Only probes decide recovery; late results of calls admitted
+                # before the circuit opened are just counted
+                if probe:
+                    self._open("Probe call failed")
+            elif self.state == CircuitState.CLOSED:
+                calls = self.window.calls
+                error_rate = self.window.failure_rate
+                if self.consecutive_failures >= self.max_failures:
+                    self._open(f"{self.consecutive_failures} consecutive failures")
+                elif calls >= self.min_calls and error_rate >= self.failure_threshold:
+                    self._open(
+                        f"Error rate {error_rate:.2%} >= "
+                        f"threshold {self.failure_threshold:.2%}"
+                    )
+
+    def _on_abandoned(self, probe: bool) -> None:
+        """Release a probe slot for a call that neither succeeded nor failed."""
+        if probe:
+            with self._lock:
+                if self.state == CircuitState.HALF_OPEN:
+                    self._probes_in_flight -= 1
+
+    # ------------------------------------------------------------------
+    # State transitions (called with the lock held)
+    # ------------------------------------------------------------------
+
+    def _open(self, reason: str) -> None:
+        """Open the circuit."""
+        self._opened_at = self.clock()
+        self._transition(CircuitState.OPEN, reason)
+
+    def _transition(self, state: CircuitState, reason: str) -> None:
+        """Move to a new state and log it."""
+        previous = self.state
+        self.state = state
+        self.metrics.record_transition(previous, state)
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        if state == CircuitState.CLOSED:
+            self.consecutive_failures = 0
+        self.last_state_change = datetime.now()
+
+        metrics = {
+            "consecutive_failures": self.consecutive_failures,
+            "window_calls": self.window.calls,
+            "window_failures": self.window.failures,
+        }
+        event_type = {
+            CircuitState.OPEN: "OPENED",
+            CircuitState.HALF_OPEN: "HALF_OPENED",
+            CircuitState.CLOSED: "CLOSED",
+        }[state]
+        self.events.append(
+            CircuitBreakerEvent(
+                timestamp=self.last_state_change,
+                event_type=event_type,
+                reason=reason,
+                metrics=metrics,
+            )
+        )
+        logger.log(
+            logging.WARNING if state == CircuitState.OPEN else logging.INFO,
+            f"Circuit breaker {self.name} {previous.value} -> {state.value}: {reason}",
+            extra={
+                "circuit_breaker": self.name,
+                "from_state": previous.value,
+                "to_state": state.value,
+                "reason": reason,
+                **metrics,
+            },
+        )
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def reset(self) -> None:
+        """Close the circuit and forget recorded calls."""
+        with self._lock:
+            self.window.reset()
+            self._transition(CircuitState.CLOSED, "Manual reset by operator")
+
+    def get_status(self) -> dict[str, Any]:
+        """Get current breaker status."""
+        with self._lock:
+            return {
+                "state": self.state.value,
+                "consecutive_failures": self.consecutive_failures,
+                "recent_errors": self.window.failures,
+                "recent_successes": self.window.successes,
+                "half_open_probes": self._probes_in_flight,
+                "last_state_change": (
+                    self.last_state_change.isoformat()
+                    if self.last_state_change
+                    else None
+                ),
+                "recent_events": [
+                    {
+                        "timestamp": e.timestamp.isoformat(),
+                        "type": e.event_type,
+                        "reason": e.reason,
+                    }
+                    for e in list(self.events)[-5:]
+                ],
+            }
+
+
+class CircuitBreakerRegistry:
+    """
+    Thread-safe registry of named call-level breakers.
+
+    Functions decorated with the same breaker name share one breaker, so all
+    callers of a dependency trip and recover together.
+    """
+
+    def __init__(self) -> None:
+        self._breakers: dict[str, FunctionCircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get_or_create(self, name: str, **settings: Any) -> FunctionCircuitBreaker:
+        """
+        Get a breaker by name, creating it on first use.
+
+        Args:
+            name: Breaker name
+            **settings: FunctionCircuitBreaker arguments (used on first creation)
+
+        Returns:
+            Shared FunctionCircuitBreaker instance
+        """
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = FunctionCircuitBreaker(
+                    name, **settings
+                )
+            return breaker
+
+    def get(self, name: str) -> FunctionCircuitBreaker | None:
+        """Get a breaker by name, if registered."""
+        with self._lock:
+            return self._breakers.get(name)
+
+    def items(self) -> list[tuple[str, FunctionCircuitBreaker]]:
+        """Snapshot of (name, breaker) pairs."""
+        with self._lock:
+            return list(self._breakers.items())
+
+    def remove(self, name: str) -> None:
+        """Forget a breaker (decorated functions keep their reference)."""
+        with self._lock:
+            self._breakers.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        with self._lock:
+            return name in self._breakers
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._breakers)
+
+
+# Default registry used by with_circuit_breaker
+circuit_breaker_registry = CircuitBreakerRegistry()
 
 
 # ============================================================================
@@ -327,92 +757,83 @@ def get_circuit_breaker(
 
 
 def with_circuit_breaker(
-    max_failures: int = 3, reset_timeout: int = 60, failure_threshold: float = 0.5
+    max_failures: int = 3,
+    reset_timeout: float = 60,
+    failure_threshold: float = 0.5,
+    name: str | None = None,
+    half_open_max_calls: int = 1,
+    window_seconds: float = 60.0,
+    min_calls: int | None = None,
+    registry: CircuitBreakerRegistry | None = None,
 ):
     """
     Decorator to apply circuit breaker pattern to any function.
 
     From first principles: Functional composition—wrap function with resilience logic.
-    Uses nonlocal state (failure count) to track errors across invocations.
+    State lives in a FunctionCircuitBreaker, so it is safe to call the function
+    from many threads or asyncio tasks, and functions that share a ``name``
+    share one breaker from the registry. ``async def`` functions are awaited
+    natively; the breaker never blocks the event loop.
 
     Args:
         max_failures: Max consecutive failures before opening circuit
         reset_timeout: Seconds before attempting recovery
         failure_threshold: Error rate threshold (0.0 to 1.0)
+        name: Registry name; functions with the same name share one breaker.
+            Without a name the breaker is private to the function and not
+            registered.
+        half_open_max_calls: Concurrent probe calls allowed while recovering
+        window_seconds: Window for the error rate
+        min_calls: Calls in the window before the error rate applies
+            (defaults to max_failures)
+        registry: Registry holding the breaker (defaults to the global one)
 
     Returns:
-        Decorated function with circuit breaker protection
+        Decorated function with circuit breaker protection; the breaker is
+        available as ``func.circuit_breaker``
 
     Example:
-        >>> @with_circuit_breaker(max_failures=3, reset_timeout=60)
-        ... def fetch_api_data(url: str) -> dict:
-        ...     response = requests.get(url)
-        ...     return response.json()
+        >>> @with_circuit_breaker(max_failures=3, reset_timeout=60, name="market_data")
+        ... async def fetch_api_data(url: str) -> dict:
+        ...     async with httpx.AsyncClient() as client:
+        ...         return (await client.get(url)).json()
 
     References:
         - Release It! by Michael Nygard (Circuit Breaker pattern)
         - Python decorators: PEP 318
     """
 
+    settings: dict[str, Any] = {
+        "max_failures": max_failures,
+        "reset_timeout": reset_timeout,
+        "failure_threshold": failure_threshold,
+        "half_open_max_calls": half_open_max_calls,
+        "window_seconds": window_seconds,
+        "min_calls": min_calls,
+    }
+
     def decorator(func: Callable) -> Callable:
-        # Nonlocal state for circuit breaker (closure pattern)
-        state: dict[str, Any] = {
-            "failures": 0,
-            "successes": 0,
-            "last_failure_time": None,
-            "is_open": False,
-        }
+        if name is None:
+            breaker = FunctionCircuitBreaker(func.__qualname__, **settings)
+        else:
+            target = circuit_breaker_registry if registry is None else registry
+            breaker = target.get_or_create(name, **settings)
 
-        @wraps(func)  # Preserve function metadata
-        def wrapper(*args, **kwargs):
-            # Check if circuit is open
-            if state["is_open"]:
-                # Check if timeout elapsed
-                if state["last_failure_time"]:
-                    elapsed = (
-                        datetime.now() - state["last_failure_time"]
-                    ).total_seconds()
-                    if elapsed >= reset_timeout:
-                        # Try half-open state
-                        state["is_open"] = False
-                        state["failures"] = 0  # Reset
-                        print(
-                            f"🔄 Circuit breaker HALF-OPEN for {func.__name__} - testing recovery"
-                        )
-                    else:
-                        raise Exception(
-                            f"Circuit breaker OPEN for {func.__name__}. "
-                            f"Wait {reset_timeout - elapsed:.0f}s before retry."
-                        )
-                else:
-                    raise Exception(f"Circuit breaker OPEN for {func.__name__}")
-
-            # Execute function
-            try:
-                result = func(*args, **kwargs)
-                state["successes"] += 1
-                state["failures"] = 0  # Reset on success
-                return result
-            except Exception as e:
-                state["failures"] += 1
-                state["last_failure_time"] = datetime.now()
-
-                # Check if should open circuit
-                total_calls = state["successes"] + state["failures"]
-                error_rate = state["failures"] / total_calls if total_calls > 0 else 0
-
-                if state["failures"] >= max_failures or error_rate >= failure_threshold:
-                    state["is_open"] = True
-                    print(
-                        f"🚨 Circuit breaker OPENED for {func.__name__} - "
-                        f"{state['failures']} failures, {error_rate:.2%} error rate"
-                    )
+        if inspect.iscoroutinefunction(func):
 
-                raise e
+            @wraps(func)  # Preserve function metadata
+            async def async_wrapper(*args, **kwargs):
+                return await breaker.acall(func, *args, **kwargs)
 
-        # Expose state for testing/monitoring
-        wrapper.circuit_state = state  # type: ignore
+            async_wrapper.circuit_breaker = breaker  # type: ignore[attr-defined]
+            return async_wrapper
+
+        @wraps(func)  # Preserve function metadata
+        def wrapper(*args, **kwargs):
+            return breaker.call(func, *args, **kwargs)
 
+        # Expose breaker for testing/monitoring
+        wrapper.circuit_breaker = breaker  # type: ignore[attr-defined]
         return wrapper
 
     return decorator
@@ -0,0 +1,561 @@
+"""
+Bulkheads and adaptive concurrency limits for calls to dependencies.
+
+From first principles: A circuit breaker reacts to failures, but a slow
+dependency fails by *not answering*: every caller parks a worker thread (or
+task) on it until nothing is left for anything else. Little's law says
+in-flight calls = arrival rate x latency, so when latency grows the only
+way to protect the caller is to cap how many calls are in flight and shed
+the excess quickly.
+
+- Bulkhead: a fixed number of concurrent calls per dependency; extra calls
+  wait in a bounded FIFO queue for at most ``queue_timeout`` seconds and
+  are then rejected (shed) instead of piling up
+- AdaptiveConcurrencyLimiter: a bulkhead whose limit follows observed
+  latency. AIMD grows the limit by one while calls are fast and cuts it
+  multiplicatively on timeouts or shedding; the gradient algorithm scales
+  the limit by (long-term latency / recent latency), so queueing in the
+  dependency shows up as a shrinking limit before anything times out
+
+Permits are shared between threads and asyncio tasks: waiting threads block
+on an Event, waiting tasks await a future, and neither holds the internal
+lock while waiting. Every limiter works as a decorator (sync or
+``async def``) and as a ``with`` / ``async with`` context manager.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT: Any = object()
+
+
+class ConcurrencyLimitExceeded(Exception):
+    """Raised when a call is shed by a bulkhead or concurrency limiter."""
+
+    def __init__(self, name: str, reason: str):
+        self.name = name
+        self.reason = reason
+        super().__init__(f"Concurrency limit reached for {name}: {reason}")
+
+
+class _Waiter:
+    """A queued acquirer: a blocked thread or an awaiting task."""
+
+    __slots__ = ("granted", "_event", "_future", "_loop")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop | None = None):
+        self.granted = False
+        self._loop = loop
+        self._event = threading.Event() if loop is None else None
+        self._future = loop.create_future() if loop is not None else None
+
+    def grant(self) -> None:
+        """Hand the waiter a permit (called with the limiter lock held)."""
+        self.granted = True
+        if self._event is not None:
+            self._event.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wake)  # type: ignore[union-attr]
+
+    def _wake(self) -> None:
+        if not self._future.done():  # type: ignore[union-attr]
+            self._future.set_result(None)  # type: ignore[union-attr]
+
+
+class Bulkhead:
+    """
+    Fixed cap on concurrent calls to one dependency.
+
+    Example:
+        >>> market_data = Bulkhead("market_data", max_concurrent=8, queue_timeout=0.5)
+        >>>
+        >>> @market_data
+        ... def fetch(ticker: str) -> dict: ...
+        >>>
+        >>> async with market_data:
+        ...     await afetch("AAPL")
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int = 10,
+        max_queue: int | None = 100,
+        queue_timeout: float | None = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize bulkhead.
+
+        Args:
+            name: Dependency name (used in errors, logs and the registry)
+            max_concurrent: Max calls in flight
+            max_queue: Max calls waiting for a permit (None for unbounded,
+                0 to reject immediately when full)
+            queue_timeout: Max seconds a call waits for a permit before it
+                is shed (None waits indefinitely)
+            clock: Monotonic time source in seconds
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.name = name
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.clock = clock
+
+        self._limit = max_concurrent
+        self._in_flight = 0
+        self._waiters: deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+        # Start times of the permits held by the current thread/task
+        self._starts: ContextVar[tuple[float, ...]] = ContextVar(
+            f"bulkhead_{name}_starts", default=()
+        )
+        self.stats = {
+            "accepted": 0,
+            "rejected": 0,  # queue full
+            "shed": 0,  # queue timeout
+            "completed": 0,
+        }
+
+    @property
+    def limit(self) -> int:
+        """Current max calls in flight."""
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        """Calls holding a permit."""
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """Calls waiting for a permit."""
+        return len(self._waiters)
+
+    # ------------------------------------------------------------------
+    # Permits
+    # ------------------------------------------------------------------
+
+    def acquire(self, timeout: float | None = _DEFAULT) -> float:
+        """
+        Take a permit, blocking the calling thread while queued.
+
+        Args:
+            timeout: Max seconds to wait (defaults to queue_timeout)
+
+        Returns:
+            Start time to pass to release()
+
+        Raises:
+            ConcurrencyLimitExceeded: If the queue is full or the wait timed out
+        """
+        waiter = self._admit(None)
+        if waiter is not None:
+            timeout = self.queue_timeout if timeout is _DEFAULT else timeout
+            waiter._event.wait(timeout)  # type: ignore[union-attr]
+            self._finish_wait(waiter, timeout)
+        return self.clock()
+
+    async def acquire_async(self, timeout: float | None = _DEFAULT) -> float:
+        """Take a permit without blocking the event loop (see acquire())."""
+        waiter = self._admit(asyncio.get_running_loop())
+        if waiter is not None:
+            timeout = self.queue_timeout if timeout is _DEFAULT else timeout
+            try:
+                granted = asyncio.shield(waiter._future)  # type: ignore[arg-type]
+                await asyncio.wait_for(granted, timeout)
+            except TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                with self._lock:
+                    if waiter.granted:
+                        self._in_flight -= 1
+                        self._grant_waiters()
+                    else:
+                        self._waiters.remove(waiter)
+                raise
+            self._finish_wait(waiter, timeout)
+        return self.clock()
+
+    def release(self, started: float, dropped: bool = False) -> None:
+        """
+        Return a permit.
+
+        Args:
+            started: Value returned by acquire()
+            dropped: The call timed out (an overload signal for adaptive limits)
+        """
+        latency = self.clock() - started
+        with self._lock:
+            in_flight = self._in_flight
+            self._in_flight -= 1
+            self.stats["completed"] += 1
+            self._on_sample(latency, in_flight, dropped)
+            self._grant_waiters()
+
+    def _admit(self, loop: asyncio.AbstractEventLoop | None) -> _Waiter | None:
+        """Take a free permit, or enqueue a waiter (None if admitted)."""
+        with self._lock:
+            if self._in_flight < self._limit and not self._waiters:
+                self._in_flight += 1
+                self.stats["accepted"] += 1
+                return None
+            if self.max_queue is not None and len(self._waiters) >= self.max_queue:
+                self.stats["rejected"] += 1
+                self._on_sample(None, self._in_flight, True)
+                raise ConcurrencyLimitExceeded(
+                    self.name, f"{self._in_flight} in flight and queue full"
+                )
+            waiter = _Waiter(loop)
+            self._waiters.append(waiter)
+            return waiter
+
+    def _finish_wait(self, waiter: _Waiter, timeout: float | None) -> None:
+        """Resolve a wait that ended: keep the permit or shed the call."""
+        with self._lock:
+            if waiter.granted:
+                self.stats["accepted"] += 1
+                return
+            self._waiters.remove(waiter)
+            self.stats["shed"] += 1
+            self._on_sample(None, self._in_flight, True)
+        logger.warning(
+            f"Shed call to {self.name} after waiting {timeout}s for a permit",
+            extra={"bulkhead": self.name, "limit": self._limit},
+        )
+        raise ConcurrencyLimitExceeded(self.name, f"queued longer than {timeout}s")
+
+    def _grant_waiters(self) -> None:
+        """Hand free permits to queued callers in FIFO order (lock held)."""
+        while self._waiters and self._in_flight < self._limit:
+            self._in_flight += 1
+            self._waiters.popleft().grant()
+
+    def _on_sample(self, latency: float | None, in_flight: int, dropped: bool) -> None:
+        """Observe a finished or shed call (lock held); fixed limits ignore it."""
+
+    # ------------------------------------------------------------------
+    # Decorator and context managers
+    # ------------------------------------------------------------------
+
+    def __call__(self, func: Callable) -> Callable:
+        """Limit every call of a sync or async function."""
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                async with self:
+                    return await func(*args, **kwargs)
+
+            async_wrapper.bulkhead = self  # type: ignore[attr-defined]
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self:
+                return func(*args, **kwargs)
+
+        wrapper.bulkhead = self  # type: ignore[attr-defined]
+        return wrapper
+
+    def __enter__(self) -> Bulkhead:
+        started = self.acquire()
+        self._starts.set((*self._starts.get(), started))
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._exit(exc_type)
+
+    async def __aenter__(self) -> Bulkhead:
+        started = await self.acquire_async()
+        self._starts.set((*self._starts.get(), started))
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._exit(exc_type)
+
+    def _exit(self, exc_type: type[BaseException] | None) -> None:
+        """Release the innermost permit held by this thread/task."""
+        *rest, started = self._starts.get()
+        self._starts.set(tuple(rest))
+        dropped = exc_type is not None and issubclass(exc_type, TimeoutError)
+        self.release(started, dropped=dropped)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get current limiter statistics."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "limit": self._limit,
+                "in_flight": self._in_flight,
+                "queued": len(self._waiters),
+                **self.stats,
+            }
+
+
+# ============================================================================
+# Limit algorithms
+# ============================================================================
+
+
+class LimitAlgorithm(Protocol):
+    """Computes the next concurrency limit from one observed call."""
+
+    def update(
+        self, limit: float, latency: float | None, in_flight: int, dropped: bool
+    ) -> float:
+        """
+        Args:
+            limit: Current (unclamped) limit
+            latency: Call latency in seconds (None for shed calls)
+            in_flight: Calls in flight when the sample was taken
+            dropped: The call timed out or was shed
+
+        Returns:
+            New limit (clamped by the limiter)
+        """
+        ...
+
+
+class AIMDLimit:
+    """
+    Additive increase, multiplicative decrease.
+
+    The limit grows by ``increase`` per call that finishes under
+    ``latency_threshold`` while the limiter is at least half utilized, and
+    is multiplied by ``backoff_ratio`` on every slow, timed-out or shed call.
+    """
+
+    def __init__(
+        self,
+        latency_threshold: float | None = None,
+        backoff_ratio: float = 0.9,
+        increase: float = 1.0,
+    ):
+        """
+        Initialize algorithm.
+
+        Args:
+            latency_threshold: Seconds above which a call counts as overload
+                (None to react to timeouts and shedding only)
+            backoff_ratio: Multiplier applied on overload (0 < ratio < 1)
+            increase: Amount added per fast call
+        """
+        if not 0 < backoff_ratio < 1:
+            raise ValueError("backoff_ratio must be between 0 and 1")
+        self.latency_threshold = latency_threshold
+        self.backoff_ratio = backoff_ratio
+        self.increase = increase
+
+    def update(
+        self, limit: float, latency: float | None, in_flight: int, dropped: bool
+    ) -> float:
+        """Next limit (see LimitAlgorithm)."""
+        slow = (
+            latency is not None
+            and self.latency_threshold is not None
+            and latency > self.latency_threshold
+        )
+        if dropped or slow:
+            return limit * self.backoff_ratio
+        # Don't grow a limit the caller isn't using
+        if in_flight * 2 >= limit:
+            return limit + self.increase
+        return limit
+
+
+class GradientLimit:
+    """
+    Latency-gradient limit (as in Netflix's concurrency-limits Gradient2).
+
+    Tracks a long-term latency baseline and a short-term average; their
+    ratio (capped at 1) shrinks the limit as the dependency starts queueing,
+    while a sqrt(limit) headroom term lets it probe upward when latency is
+    flat.
+    """
+
+    def __init__(
+        self,
+        smoothing: float = 0.2,
+        tolerance: float = 1.5,
+        short_window: int = 10,
+        long_window: int = 600,
+    ):
+        """
+        Initialize algorithm.
+
+        Args:
+            smoothing: Weight of each new limit estimate (0 < smoothing <= 1)
+            tolerance: Latency inflation tolerated before shrinking
+            short_window: Samples in the short-term latency average
+            long_window: Samples in the long-term latency baseline
+        """
+        self.smoothing = smoothing
+        self.tolerance = tolerance
+        self._short_alpha = 2 / (short_window + 1)
+        self._long_alpha = 2 / (long_window + 1)
+        self.short_latency: float | None = None
+        self.long_latency: float | None = None
+
+    def update(
+        self, limit: float, latency: float | None, in_flight: int, dropped: bool
+    ) -> float:
+        """Next limit (see LimitAlgorithm)."""
+        if latency is None:
+            # Shed calls carry no latency; treat them as a full overload signal
+            return limit * (1 - self.smoothing / 2) if dropped else limit
+
+        if self.short_latency is None or self.long_latency is None:
+            self.short_latency = self.long_latency = latency
+            return limit
+        self.short_latency += self._short_alpha * (latency - self.short_latency)
+        self.long_latency += self._long_alpha * (latency - self.long_latency)
+
+        # Recover quickly after a sustained latency drop
+        if self.long_latency > self.short_latency * 2:
+            self.long_latency = self.short_latency
+
+        gradient = max(
+            0.5,
+            min(1.0, self.tolerance * self.long_latency / self.short_latency),
+        )
+        if dropped:
+            gradient = 0.5
+        estimate = limit * gradient + math.sqrt(limit)
+        new_limit = limit * (1 - self.smoothing) + estimate * self.smoothing
+
+        # Don't grow a limit the caller isn't using
+        if new_limit > limit and in_flight * 2 < limit:
+            return limit
+        return new_limit
+
+
+class AdaptiveConcurrencyLimiter(Bulkhead):
+    """
+    Bulkhead whose limit adapts to observed latency.
+
+    Example:
+        >>> limiter = AdaptiveConcurrencyLimiter("market_data", algorithm="gradient")
+        >>> @limiter
+        ... async def fetch(ticker: str) -> dict: ...
+    """
+
+    def __init__(
+        self,
+        name: str,
+        algorithm: str | LimitAlgorithm = "aimd",
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        max_queue: int | None = 100,
+        queue_timeout: float | None = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize limiter.
+
+        Args:
+            name: Dependency name
+            algorithm: "aimd", "gradient" or a LimitAlgorithm instance
+            initial_limit: Starting max calls in flight
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit
+            max_queue: Max calls waiting for a permit
+            queue_timeout: Max seconds a call waits before it is shed
+            clock: Monotonic time source in seconds
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Require 1 <= min_limit <= initial_limit <= max_limit")
+        super().__init__(
+            name,
+            max_concurrent=initial_limit,
+            max_queue=max_queue,
+            queue_timeout=queue_timeout,
+            clock=clock,
+        )
+        if algorithm == "aimd":
+            self.algorithm: LimitAlgorithm = AIMDLimit()
+        elif algorithm == "gradient":
+            self.algorithm = GradientLimit()
+        elif isinstance(algorithm, str):
+            raise ValueError(f"Unknown limit algorithm: {algorithm}")
+        else:
+            self.algorithm = algorithm
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self._estimate = float(initial_limit)
+
+    def _on_sample(self, latency: float | None, in_flight: int, dropped: bool) -> None:
+        """Feed the algorithm and apply the clamped limit (lock held)."""
+        estimate = self.algorithm.update(self._estimate, latency, in_flight, dropped)
+        self._estimate = min(max(estimate, self.min_limit), self.max_limit)
+        limit = int(self._estimate)
+        if limit != self._limit:
+            logger.debug(
+                f"Concurrency limit for {self.name}: {self._limit} -> {limit}",
+                extra={"bulkhead": self.name, "limit": limit},
+            )
+            self._limit = limit
+
+
+# ============================================================================
+# Registry (one limiter per dependency)
+# ============================================================================
+
+_bulkheads: dict[str, Bulkhead] = {}
+_bulkheads_lock = threading.Lock()
+
+
+def get_bulkhead(name: str, **settings: Any) -> Bulkhead:
+    """
+    Get or create a fixed bulkhead for a dependency.
+
+    Args:
+        name: Dependency name
+        **settings: Bulkhead arguments (used on first creation)
+
+    Returns:
+        Shared Bulkhead instance
+    """
+    return _get_or_create(Bulkhead, name, settings)
+
+
+def get_concurrency_limiter(name: str, **settings: Any) -> AdaptiveConcurrencyLimiter:
+    """
+    Get or create an adaptive concurrency limiter for a dependency.
+
+    Args:
+        name: Dependency name
+        **settings: AdaptiveConcurrencyLimiter arguments (used on first creation)
+
+    Returns:
+        Shared AdaptiveConcurrencyLimiter instance
+    """
+    return _get_or_create(AdaptiveConcurrencyLimiter, name, settings)  # type: ignore[return-value]
+
+
+def _get_or_create(kind: type[Bulkhead], name: str, settings: dict) -> Bulkhead:
+    """Registry lookup shared by get_bulkhead and get_concurrency_limiter."""
+    with _bulkheads_lock:
+        limiter = _bulkheads.get(name)
+        if limiter is None:
+            limiter = _bulkheads[name] = kind(name, **settings)
+        elif type(limiter) is not kind:
+            raise TypeError(
+                f"{name} is already registered as a {type(limiter).__name__}"
+            )
+        return limiter
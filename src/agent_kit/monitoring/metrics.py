@@ -0,0 +1,364 @@
+"""
+In-process metrics registry exported through prometheus_client.
+
+From first principles: Operators need rates and tail latency, not log
+lines. Instrumented code updates cheap in-memory metrics on the hot path
+and a scrape renders them; prometheus_client already owns counters, gauges
+and the exposition format, so only the latency histogram is custom:
+- Histogram: HDR-style log-linear buckets. Each power of two is split into
+  ``2**sub_bucket_bits`` linear sub-buckets, so every recorded value keeps
+  a bounded relative error (< 1% by default) from microseconds to hours, and
+  recording is O(1) (a bit_length and a shift). A prometheus_client
+  collector exports cumulative counts at fixed ``le`` boundaries plus
+  exact-to-bucket quantiles.
+
+Metrics are label families: ``family.labels(breaker="market_data")``
+returns a child that call sites resolve once and then update directly.
+The registry is in-process; serve it from the process that records the
+metrics (e.g. ``prometheus_client.start_http_server(port,
+registry=metrics_registry.registry)``).
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, generate_latest
+from prometheus_client.core import GaugeMetricFamily, HistogramMetricFamily
+from prometheus_client.metrics_core import Metric
+from prometheus_client.utils import floatToGoString
+
+# Default `le` boundaries (seconds) for exported latency histograms
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+class HdrHistogram:
+    """
+    Log-linear histogram of non-negative values (HdrHistogram layout).
+
+    Values are stored as integer multiples of ``unit``. Values below
+    ``2**sub_bucket_bits`` units are exact; above that each power of two has
+    ``2**sub_bucket_bits`` equal-width buckets, bounding the relative error
+    by ``2**-sub_bucket_bits``.
+    """
+
+    def __init__(
+        self,
+        unit: float = 1e-6,
+        max_value: float = 3600.0,
+        sub_bucket_bits: int = 7,
+    ):
+        """
+        Initialize histogram.
+
+        Args:
+            unit: Resolution (smallest distinguishable value)
+            max_value: Largest trackable value (larger values are clamped)
+            sub_bucket_bits: log2 of linear sub-buckets per power of two
+        """
+        self.unit = unit
+        self._per_unit = 1 / unit
+        self.sub_bucket_bits = sub_bucket_bits
+        self._sub_count = 1 << sub_bucket_bits
+        self._max_units = max(int(max_value / unit), self._sub_count)
+        self.counts = [0] * (self._index(self._max_units) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def _index(self, units: int) -> int:
+        """Bucket index for a value in units."""
+        if units < self._sub_count:
+            return units
+        shift = units.bit_length() - self.sub_bucket_bits - 1
+        return (shift + 1) * self._sub_count + (units >> shift) - self._sub_count
+
+    def _bounds(self, index: int) -> tuple[float, float]:
+        """[lower, upper) bounds of a bucket, in value units."""
+        if index < self._sub_count:
+            return index * self.unit, (index + 1) * self.unit
+        shift = index // self._sub_count - 1
+        mantissa = index % self._sub_count + self._sub_count
+        return (mantissa << shift) * self.unit, ((mantissa + 1) << shift) * self.unit
+
+    def record(self, value: float) -> None:
+        """Add one observation."""
+        units = int(value * self._per_unit)
+        if units < self._sub_count:
+            index = units if units > 0 else 0
+        else:
+            if units > self._max_units:
+                units = self._max_units
+            # Inlined _index(): hot path
+            shift = units.bit_length() - self.sub_bucket_bits - 1
+            index = (shift << self.sub_bucket_bits) + (units >> shift)
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """
+        Value at quantile q (0.0 to 1.0), accurate to one bucket.
+
+        Returns the midpoint of the bucket holding the q-th observation
+        (0.0 when empty).
+        """
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(q * self.count), 1)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count:
+                seen += count
+                if seen >= rank:
+                    lower, upper = self._bounds(index)
+                    return min((lower + upper) / 2, self.max)
+        return self.max
+
+    def cumulative_counts(self, boundaries: Sequence[float]) -> list[int]:
+        """Observations with a bucket upper bound <= each boundary."""
+        totals = []
+        seen = 0
+        index = 0
+        for boundary in boundaries:
+            while index < len(self.counts) and self._bounds(index)[1] <= boundary:
+                seen += self.counts[index]
+                index += 1
+            totals.append(seen)
+        return totals
+
+    def reset(self) -> None:
+        """Forget every observation."""
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+
+# ============================================================================
+# HDR histogram family
+# ============================================================================
+
+
+class _HistogramChild:
+    __slots__ = ("histogram", "_lock")
+
+    def __init__(self, **settings: Any) -> None:
+        self.histogram = HdrHistogram(**settings)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        with self._lock:
+            self.histogram.record(value)
+
+
+class Histogram:
+    """
+    HDR-style histogram family, collected as a Prometheus histogram.
+
+    Quantiles are exported as a companion gauge family named
+    ``<name>_quantile`` with a ``quantile`` label.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+        **hdr_settings: Any,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.quantiles = tuple(quantiles)
+        self._hdr_settings = hdr_settings
+        self._children: dict[tuple[str, ...], _HistogramChild] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels: str) -> _HistogramChild:
+        """Child for one label combination (created on first use)."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = _HistogramChild(**self._hdr_settings)
+        return child
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record an observation for a label combination."""
+        self.labels(**labels).observe(value)
+
+    def describe(self) -> list[Metric]:
+        """Families this collector yields (lets the registry check names)."""
+        families: list[Metric] = [
+            HistogramMetricFamily(self.name, self.documentation, labels=self.labelnames)
+        ]
+        if self.quantiles:
+            families.append(self._quantile_family())
+        return families
+
+    def collect(self) -> Iterator[Metric]:
+        """Snapshot every child as Prometheus histogram and quantile samples."""
+        with self._lock:
+            children = list(self._children.items())
+        histograms = HistogramMetricFamily(
+            self.name, self.documentation, labels=self.labelnames
+        )
+        quantiles = self._quantile_family()
+        for key, child in children:
+            with child._lock:
+                histogram = child.histogram
+                cumulative = histogram.cumulative_counts(self.buckets)
+                count, total = histogram.count, histogram.sum
+                values = [histogram.quantile(q) for q in self.quantiles]
+            buckets = [
+                (floatToGoString(boundary), value)
+                for boundary, value in zip(self.buckets, cumulative, strict=True)
+            ]
+            histograms.add_metric(list(key), [*buckets, ("+Inf", count)], total)
+            for q, value in zip(self.quantiles, values, strict=True):
+                quantiles.add_metric([*key, floatToGoString(q)], value)
+        yield histograms
+        if self.quantiles:
+            yield quantiles
+
+    def _quantile_family(self) -> GaugeMetricFamily:
+        return GaugeMetricFamily(
+            f"{self.name}_quantile",
+            f"{self.documentation} (quantiles)",
+            labels=[*self.labelnames, "quantile"],
+        )
+
+
+# ============================================================================
+# Registry
+# ============================================================================
+
+
+class MetricsRegistry:
+    """
+    Get-or-create front end to a prometheus_client CollectorRegistry.
+
+    Counters and gauges are plain prometheus_client metrics; histograms are
+    HDR collectors. Asking for an existing name returns the same family.
+
+    Example:
+        >>> calls = metrics_registry.counter(
+        ...     "agent_kit_tool_calls_total", "Tool calls", ["tool"]
+        ... )
+        >>> calls.labels(tool="fetch_market_data").inc()
+        >>> print(metrics_registry.render_prometheus())
+    """
+
+    def __init__(self, registry: CollectorRegistry | None = None) -> None:
+        """
+        Initialize registry.
+
+        Args:
+            registry: prometheus_client registry to register into
+                (default: a new private one)
+        """
+        self.registry = registry if registry is not None else CollectorRegistry()
+        self._families: dict[str, tuple[type, tuple[str, ...], Any]] = {}
+        self._lock = threading.Lock()
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """Get or create a counter family."""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        """Get or create a gauge family."""
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        **settings: Any,
+    ) -> Histogram:
+        """Get or create an HDR histogram family (settings used on first creation)."""
+        return self._register(Histogram, name, documentation, labelnames, **settings)
+
+    def _register(
+        self,
+        kind: type,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        **settings: Any,
+    ) -> Any:
+        labelnames = tuple(labelnames)
+        with self._lock:
+            existing = self._families.get(name)
+            if existing is not None:
+                registered_kind, registered_labels, family = existing
+                if registered_kind is not kind or registered_labels != labelnames:
+                    raise ValueError(
+                        f"Metric {name} already registered as "
+                        f"{registered_kind.__name__} with labels {registered_labels}"
+                    )
+                return family
+
+            if kind is Histogram:
+                family = Histogram(name, documentation, labelnames, **settings)
+                self.registry.register(family)
+            else:
+                family = kind(name, documentation, labelnames, registry=self.registry)
+            self._families[name] = (kind, labelnames, family)
+            return family
+
+    def get(self, name: str) -> Any | None:
+        """Get a family by the name it was registered under."""
+        with self._lock:
+            existing = self._families.get(name)
+        return None if existing is None else existing[2]
+
+    def sample(self, name: str, **labels: str) -> float | None:
+        """Current value of one exported sample (None if absent)."""
+        return self.registry.get_sample_value(name, labels)
+
+    def render_prometheus(self) -> str:
+        """All families in the Prometheus text exposition format."""
+        return generate_latest(self.registry).decode()
+
+
+# Default process-wide registry
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,138 @@
+"""
+Time-sliced sliding-window counters.
+
+From first principles: A circuit breaker only needs "how many calls and how
+many failures in the last N seconds", not the timestamp of every call.
+Keeping a list of timestamps and trimming it on each call costs
+O(window size) time and allocates on every request. Instead the window is
+split into a fixed ring of buckets; each bucket counts the calls and
+failures that landed in its time slice, and running totals are kept beside
+the ring:
+- record: advance the ring to "now", bump the current bucket and the totals
+- read: return the totals
+
+Advancing clears only the buckets that expired since the last call (at most
+the ring size, usually zero or one), so record and read are O(1) amortized.
+Time comes from a monotonic clock so wall-clock jumps can't open or close
+the window.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+
+class SlidingWindowCounter:
+    """
+    Call and failure counts over the last ``window_seconds``.
+
+    Resolution is one bucket: a call expires between ``window_seconds -
+    bucket_width`` and ``window_seconds`` after it was recorded.
+
+    Example:
+        >>> window = SlidingWindowCounter(window_seconds=300)
+        >>> window.record(success=False)
+        >>> window.failure_rate
+        1.0
+    """
+
+    __slots__ = (
+        "window_seconds",
+        "num_buckets",
+        "bucket_width",
+        "clock",
+        "_calls",
+        "_failures",
+        "_total_calls",
+        "_total_failures",
+        "_current",
+    )
+
+    def __init__(
+        self,
+        window_seconds: float,
+        num_buckets: int = 60,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize counter.
+
+        Args:
+            window_seconds: Length of the window
+            num_buckets: Number of time slices in the ring
+            clock: Monotonic time source in seconds
+        """
+        if window_seconds <= 0:
+            raise ValueError("window_seconds must be positive")
+        if num_buckets < 1:
+            raise ValueError("num_buckets must be at least 1")
+        self.window_seconds = window_seconds
+        self.num_buckets = num_buckets
+        self.bucket_width = window_seconds / num_buckets
+        self.clock = clock
+        self._calls = [0] * num_buckets
+        self._failures = [0] * num_buckets
+        self._total_calls = 0
+        self._total_failures = 0
+        self._current = int(clock() // self.bucket_width)
+
+    def _advance(self) -> int:
+        """Expire buckets older than the window; return the current slot."""
+        tick = int(self.clock() // self.bucket_width)
+        elapsed = tick - self._current
+        if elapsed > 0:
+            if elapsed >= self.num_buckets:
+                self.reset()
+            else:
+                for t in range(self._current + 1, tick + 1):
+                    slot = t % self.num_buckets
+                    self._total_calls -= self._calls[slot]
+                    self._total_failures -= self._failures[slot]
+                    self._calls[slot] = 0
+                    self._failures[slot] = 0
+            self._current = tick
+        return self._current % self.num_buckets
+
+    def record(self, success: bool) -> None:
+        """Count one call."""
+        slot = self._advance()
+        self._calls[slot] += 1
+        self._total_calls += 1
+        if not success:
+            self._failures[slot] += 1
+            self._total_failures += 1
+
+    @property
+    def calls(self) -> int:
+        """Calls in the window."""
+        self._advance()
+        return self._total_calls
+
+    @property
+    def failures(self) -> int:
+        """Failures in the window."""
+        self._advance()
+        return self._total_failures
+
+    @property
+    def successes(self) -> int:
+        """Successful calls in the window."""
+        self._advance()
+        return self._total_calls - self._total_failures
+
+    @property
+    def failure_rate(self) -> float:
+        """Failures / calls in the window (0.0 with no calls)."""
+        self._advance()
+        if not self._total_calls:
+            return 0.0
+        return self._total_failures / self._total_calls
+
+    def reset(self) -> None:
+        """Forget every recorded call."""
+        for slot in range(self.num_buckets):
+            self._calls[slot] = 0
+            self._failures[slot] = 0
+        self._total_calls = 0
+        self._total_failures = 0
@@ -3,15 +3,24 @@ Ontology-enhanced memory session that extends the SDK memory system.
 
 This class adds semantic search, ontology-aware context preservation,
 and knowledge graph integration to the standard SDK memory capabilities.
+
+Per-item semantic features (embedding, ontology concepts, tags, relations)
+are persisted in a sidecar table in the session's SQLite database at write
+time, so searches read precomputed features instead of recomputing them.
 """
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 
 # Try to import from agents SDK, with fallbacks
 try:
@@ -30,6 +39,19 @@ if TYPE_CHECKING:
         TResponseInputItem = Any
 
 
+SEMANTIC_INDEX_TABLE = "ontology_semantic_index"
+
+
+@dataclass
+class SemanticFeatures:
+    """Precomputed semantic features for one conversation item."""
+
+    embedding: np.ndarray | None = None
+    concepts: list[str] = field(default_factory=list)
+    tags: list[str] = field(default_factory=list)
+    relations: dict[str, Any] = field(default_factory=dict)
+
+
 class OntologyMemorySession(SQLiteSession if AGENTS_AVAILABLE else object):
     """
     Ontology-enhanced memory session with semantic capabilities.
@@ -39,6 +61,7 @@ class OntologyMemorySession(SQLiteSession if AGENTS_AVAILABLE else object):
     - Semantic search across conversation history
     - Knowledge graph integration for memory enrichment
     - SPARQL-based memory queries
+    - Sidecar table of per-item embeddings, concepts, tags and relations
     """
 
     def __init__(
@@ -46,6 +69,8 @@ class OntologyMemorySession(SQLiteSession if AGENTS_AVAILABLE else object):
         session_id: str,
         ontology_path: str | None = None,
         db_path: str | None = ":memory:",
+        candidate_multiplier: int = 3,
+        embedding_cache_size: int = 10_000,
         **kwargs,
     ):
         """
@@ -55,10 +80,15 @@ class OntologyMemorySession(SQLiteSession if AGENTS_AVAILABLE else object):
             session_id: Unique session identifier
             ontology_path: Path to ontology file for semantic enhancement
             db_path: SQLite database path
+            candidate_multiplier: Default semantic search pool size as a
+                multiple of the requested limit
+            embedding_cache_size: Max cached text embeddings (LRU)
             **kwargs: Additional arguments for SQLiteSession
         """
         super().__init__(session_id, db_path, **kwargs)
         self.ontology_path = ontology_path
+        self.candidate_multiplier = candidate_multiplier
+        self.embedding_cache_size = embedding_cache_size
 
         # Load ontology if provided
         self.ontology = None
@@ -74,7 +104,164 @@ class OntologyMemorySession(SQLiteSession if AGENTS_AVAILABLE else object):
 
         # Initialize embedder for semantic search (lazy loading)
         self._embedder = None
-        self._embedding_cache: dict[str, np.ndarray] = {}
+        self._embedding_cache: OrderedDict[str, np.ndarray] = OrderedDict()
+
+        # Sidecar table shares the SDK session's database and write lock
+        self._sidecar_lock = getattr(self, "_lock", None) or threading.RLock()
+        self._init_semantic_index()
+
+    def _init_semantic_index(self) -> None:
+        """Create the semantic sidecar table if needed."""
+        conn = self._get_connection()
+        with self._sidecar_lock:
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {SEMANTIC_INDEX_TABLE} (
+                    session_id TEXT NOT NULL,
+                    item_key TEXT NOT NULL,
+                    embedding BLOB,
+                    dim INTEGER,
+                    concepts TEXT NOT NULL DEFAULT '[]',
+                    tags TEXT NOT NULL DEFAULT '[]',
+                    relations TEXT NOT NULL DEFAULT '{{}}',
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (session_id, item_key)
+                )
+            """
+            )
+            conn.commit()
+
+    @staticmethod
+    def _item_key(item: Any) -> str:
+        """Stable key for a conversation item (hash of its JSON form)."""
+        data = json.dumps(item, sort_keys=True, default=str)
+        return hashlib.md5(data.encode()).hexdigest()
+
+    def _load_semantic_features(self, keys: list[str]) -> dict[str, SemanticFeatures]:
+        """Read sidecar rows for the given item keys."""
+        conn = self._get_connection()
+        found: dict[str, SemanticFeatures] = {}
+        unique_keys = list(dict.fromkeys(keys))
+
+        # Chunk to stay under SQLite's host parameter limit
+        for start in range(0, len(unique_keys), 500):
+            chunk = unique_keys[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"""SELECT item_key, embedding, dim, concepts, tags, relations
+                    FROM {SEMANTIC_INDEX_TABLE}
+                    WHERE session_id = ? AND item_key IN ({placeholders})""",
+                (self.session_id, *chunk),
+            ).fetchall()
+            for key, blob, dim, concepts, tags, relations in rows:
+                embedding = None
+                if blob is not None:
+                    embedding = np.frombuffer(blob, dtype=np.float32, count=dim)
+                found[key] = SemanticFeatures(
+                    embedding=embedding,
+                    concepts=json.loads(concepts),
+                    tags=json.loads(tags),
+                    relations=json.loads(relations),
+                )
+        return found
+
+    def _save_semantic_features(self, rows: dict[str, SemanticFeatures]) -> None:
+        """Upsert sidecar rows."""
+        if not rows:
+            return
+
+        now = time.time()
+        params = []
+        for key, features in rows.items():
+            embedding = features.embedding
+            params.append(
+                (
+                    self.session_id,
+                    key,
+                    (
+                        None
+                        if embedding is None
+                        else embedding.astype(np.float32).tobytes()
+                    ),
+                    None if embedding is None else int(embedding.shape[0]),
+                    json.dumps(features.concepts),
+                    json.dumps(features.tags),
+                    json.dumps(features.relations, default=str),
+                    now,
+                )
+            )
+
+        conn = self._get_connection()
+        with self._sidecar_lock:
+            conn.executemany(
+                f"""INSERT OR REPLACE INTO {SEMANTIC_INDEX_TABLE}
+                    (session_id, item_key, embedding, dim, concepts, tags,
+                     relations, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                params,
+            )
+            conn.commit()
+
+    def _compute_semantic_features(
+        self,
+        texts: list[str],
+        embed: bool = True,
+        tags: list[str] | None = None,
+        relations: dict[str, Any] | None = None,
+    ) -> list[SemanticFeatures]:
+        """Compute features for texts (embeddings in one batch)."""
+        embeddings = self._get_embeddings(texts) if embed and texts else None
+        return [
+            SemanticFeatures(
+                embedding=None if embeddings is None else embeddings[i],
+                concepts=self._extract_ontology_concepts(text, max_concepts=None),
+                tags=list(tags or []),
+                relations=dict(relations or {}),
+            )
+            for i, text in enumerate(texts)
+        ]
+
+    async def _get_semantic_features(
+        self,
+        items: list[Any],
+        texts: list[str],
+        embed: bool = True,
+    ) -> list[SemanticFeatures]:
+        """
+        Read features for items from the sidecar, backfilling any misses.
+
+        Args:
+            items: Conversation items
+            texts: Searchable text for each item
+            embed: Whether missing embeddings should be computed
+
+        Returns:
+            Features aligned with items
+        """
+        keys = [self._item_key(item) for item in items]
+        stored = await asyncio.to_thread(self._load_semantic_features, keys)
+
+        # Items never indexed, or indexed before an embedder was available
+        pending: dict[str, str] = {}
+        for key, text in zip(keys, texts, strict=True):
+            features = stored.get(key)
+            if features is None or (embed and features.embedding is None):
+                pending[key] = text
+
+        if pending:
+            computed = self._compute_semantic_features(list(pending.values()), embed)
+            updates: dict[str, SemanticFeatures] = {}
+            for key, features in zip(pending, computed, strict=True):
+                existing = stored.get(key)
+                if existing is not None:
+                    existing.embedding = features.embedding
+                    features = existing
+                if features.embedding is not None or existing is None:
+                    updates[key] = features
+                stored[key] = features
+            await asyncio.to_thread(self._save_semantic_features, updates)
+
+        return [stored[key] for key in keys]
 
     def _get_embedder(self):
         """Lazy-load embedder for semantic search."""
@@ -105,24 +292,66 @@ class OntologyMemorySession(SQLiteSession if AGENTS_AVAILABLE else object):
 
     def _get_embedding(self, text: str) -> np.ndarray | None:
         """Get embedding for text with caching."""
-        # Create cache key
-        cache_key = hashlib.md5(text.encode()).hexdigest()
+        embeddings = self._get_embeddings([text])
+        return None if embeddings is None else embeddings[0]
 
-        if cache_key in self._embedding_cache:
-            return self._embedding_cache[cache_key]
+    def _get_embeddings(self, texts: list[str]) -> np.ndarray | None:
+        """
+        Get embeddings for many texts, embedding cache misses in one batch.
 
-        embedder = self._get_embedder()
-        if embedder is None:
-            return None
+        Returns:
+            Array of shape (len(texts), dim), or None if no embedder is available
+        """
+        keys = [hashlib.md5(text.encode()).hexdigest() for text in texts]
 
-        try:
-            embedding = embedder.embed(text)
-            self._embedding_cache[cache_key] = embedding
-            return embedding
-        except Exception:
-            return None
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, texts, strict=True):
+            if key in self._embedding_cache:
+                self._embedding_cache.move_to_end(key)
+            else:
+                missing[key] = text
 
-    def _extract_ontology_concepts(self, query: str) -> list[str]:
+        if missing:
+            embedder = self._get_embedder()
+            if embedder is None:
+                return None
+            try:
+                batch = embedder.embed_batch(
+                    list(missing.values()), show_progress=False
+                )
+            except Exception:
+                return None
+            for key, embedding in zip(missing, batch, strict=True):
+                self._embedding_cache[key] = np.asarray(embedding, dtype=np.float32)
+
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        matrix = np.vstack([self._embedding_cache[key] for key in keys])
+
+        # Evict least recently used entries beyond the cache bound
+        while len(self._embedding_cache) > self.embedding_cache_size:
+            self._embedding_cache.popitem(last=False)
+
+        return matrix
+
+    @staticmethod
+    def _cosine_scores(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        """Cosine similarity of each matrix row against the query vector."""
+        row_norms = np.linalg.norm(matrix, axis=1)
+        query_norm = np.linalg.norm(query)
+        denom = row_norms * query_norm
+        dots = matrix @ query
+        return np.divide(
+            dots,
+            denom,
+            out=np.zeros(len(matrix), dtype=np.float64),
+            where=denom > 0,
+        ).astype(np.float64)
+
+    def _extract_ontology_concepts(
+        self, query: str, max_concepts: int | None = 10
+    ) -> list[str]:
         """Extract relevant ontology concepts from query."""
         if not self.ontology_loader:
             return []
@@ -143,7 +372,7 @@ class OntologyMemorySession(SQLiteSession if AGENTS_AVAILABLE else object):
                 if local_name.lower() in query_lower:
                     concepts.append(local_name)
 
-            return concepts[:10]  # Limit to top 10
+            return concepts[:max_concepts]  # Limit to top 10 by default
         except Exception:
             return []
 
@@ -152,20 +381,28 @@ class OntologyMemorySession(SQLiteSession if AGENTS_AVAILABLE else object):
         query: str,
         limit: int = 10,
         ontology_context: dict[str, Any] | None = None,
+        candidate_limit: int | None = None,
     ) -> list[TResponseInputItem]:
         """
         Perform semantic search across conversation history with ontology enhancement.
 
+        Candidates are embedded in a single batch (through the embedding cache)
+        and scored with one matrix-vector product.
+
         Args:
             query: Semantic query to search for
             limit: Maximum number of results to return
             ontology_context: Additional ontology context for the search
+            candidate_limit: Number of recent items to score
+                (default: limit * candidate_multiplier)
 
         Returns:
             Semantically relevant conversation items
         """
         # Get more items than needed for better semantic filtering
-        candidate_items = await self.get_items(limit=limit * 3)
+        if candidate_limit is None:
+            candidate_limit = limit * self.candidate_multiplier
+        candidate_items = await self.get_items(limit=max(candidate_limit, limit))
 
         if not candidate_items:
             return []
@@ -178,35 +415,34 @@ class OntologyMemorySession(SQLiteSession if AGENTS_AVAILABLE else object):
         # Extract ontology concepts from query
         ontology_concepts = self._extract_ontology_concepts(query)
 
-        # Score items by semantic similarity
-        scored_items = []
-        for item in candidate_items:
-            item_text = self._get_text_from_item(item)
-            item_embedding = self._get_embedding(item_text)
-
-            if item_embedding is None:
-                scored_items.append((0.0, item))
-                continue
-
-            # Calculate cosine similarity
-            similarity = float(
-                cosine_similarity([query_embedding], [item_embedding])[0][0]
+        # Precomputed per-item features from the sidecar table
+        item_texts = [self._get_text_from_item(item) for item in candidate_items]
+        features = await self._get_semantic_features(candidate_items, item_texts)
+
+        dim = query_embedding.shape[0]
+        matrix = np.zeros((len(features), dim), dtype=np.float32)
+        for i, item_features in enumerate(features):
+            embedding = item_features.embedding
+            if embedding is not None and embedding.shape[0] == dim:
+                matrix[i] = embedding
+
+        scores = self._cosine_scores(query_embedding, matrix)
+
+        # Boost score by 0.1 per query concept the item mentions
+        if ontology_concepts and self.ontology:
+            query_concepts = {c.lower() for c in ontology_concepts}
+            scores += 0.1 * np.fromiter(
+                (
+                    len(query_concepts.intersection(c.lower() for c in f.concepts))
+                    for f in features
+                ),
+                dtype=np.float64,
+                count=len(features),
             )
 
-            # Boost score if ontology concepts match
-            ontology_boost = 0.0
-            if ontology_concepts and self.ontology:
-                item_text_lower = item_text.lower()
-                for concept in ontology_concepts:
-                    if concept.lower() in item_text_lower:
-                        ontology_boost += 0.1
-
-            final_score = similarity + ontology_boost
-            scored_items.append((final_score, item))
-
         # Sort by score (descending) and return top items
-        scored_items.sort(key=lambda x: x[0], reverse=True)
-        top_items = [item for _, item in scored_items[:limit]]
+        order = np.argsort(-scores, kind="stable")[:limit]
+        top_items = [candidate_items[i] for i in order]
 
         # Add ontology metadata to results
         enhanced_items = []
@@ -234,6 +470,9 @@ class OntologyMemorySession(SQLiteSession if AGENTS_AVAILABLE else object):
         """
         Store conversation items with semantic context and ontology relationships.
 
+        Embeddings and ontology concepts are computed once here and written
+        to the sidecar table alongside the tags and relations.
+
         Args:
             items: Conversation items to store
             semantic_tags: Semantic tags for categorization
@@ -242,8 +481,49 @@ class OntologyMemorySession(SQLiteSession if AGENTS_AVAILABLE else object):
         # Store the basic items
         await self.add_items(items)
 
-        # TODO: Extend storage to include semantic tags and ontology relations
-        # This could involve additional database tables or metadata storage
+        if not items:
+            return
+
+        texts = [self._get_text_from_item(item) for item in items]
+        computed = self._compute_semantic_features(
+            texts, tags=semantic_tags, relations=ontology_relations
+        )
+        rows = {
+            self._item_key(item): features
+            for item, features in zip(items, computed, strict=True)
+        }
+        await asyncio.to_thread(self._save_semantic_features, rows)
+
+    async def get_semantic_context(
+        self, item: TResponseInputItem
+    ) -> SemanticFeatures | None:
+        """
+        Get stored semantic features for a conversation item.
+
+        Args:
+            item: Conversation item previously stored in this session
+
+        Returns:
+            Stored features, or None if the item was never indexed
+        """
+        key = self._item_key(item)
+        stored = await asyncio.to_thread(self._load_semantic_features, [key])
+        return stored.get(key)
+
+    async def clear_session(self) -> None:
+        """Clear all items for this session, including sidecar features."""
+        await super().clear_session()
+
+        def _clear_sidecar() -> None:
+            conn = self._get_connection()
+            with self._sidecar_lock:
+                conn.execute(
+                    f"DELETE FROM {SEMANTIC_INDEX_TABLE} WHERE session_id = ?",
+                    (self.session_id,),
+                )
+                conn.commit()
+
+        await asyncio.to_thread(_clear_sidecar)
 
     async def get_ontology_relevant_history(
         self,
@@ -265,48 +545,37 @@ class OntologyMemorySession(SQLiteSession if AGENTS_AVAILABLE else object):
 
         # Get candidate items
         candidate_items = await self.get_items(limit=limit * 3)
+        if not candidate_items:
+            return []
 
-        # Filter items by ontology concept relevance
-        relevant_items = []
         concept_lower = [c.lower() for c in ontology_concepts]
+        related_terms = self._related_concept_terms(ontology_concepts)
 
-        for item in candidate_items:
-            item_text = self._get_text_from_item(item).lower()
+        # Concepts and tags come precomputed from the sidecar table
+        item_texts = [self._get_text_from_item(item) for item in candidate_items]
+        features = await self._get_semantic_features(
+            candidate_items, item_texts, embed=False
+        )
 
-            # Check if item text contains any ontology concept
-            relevance_score = 0
+        # Filter items by ontology concept relevance
+        relevant_items = []
+        for item, text, item_features in zip(
+            candidate_items, item_texts, features, strict=True
+        ):
+            item_text = text.lower()
+            labels = {c.lower() for c in item_features.concepts}
+            labels.update(t.lower() for t in item_features.tags)
+
+            # Check if item mentions or is tagged with any ontology concept
+            relevance_score = 0.0
             for concept in concept_lower:
-                if concept in item_text:
+                if concept in labels or concept in item_text:
                     relevance_score += 1
 
-            # Also check for related concepts via ontology queries
-            if self.ontology_loader:
-                try:
-                    # Query for related concepts
-                    for concept in ontology_concepts:
-                        sparql = f"""
-                        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-                        PREFIX owl: <http://www.w3.org/2002/07/owl#>
-                        SELECT ?related WHERE {{
-                            {{
-                                ?concept rdfs:label ?label .
-                                FILTER(REGEX(?label, "{concept}", "i"))
-                                ?concept (rdfs:subClassOf|owl:equivalentClass|^rdfs:subClassOf)* ?related .
-                                ?related rdfs:label ?relatedLabel .
-                            }}
-                        }}
-                        LIMIT 5
-                        """
-                        try:
-                            results = self.ontology_loader.query(sparql)
-                            for result in results:
-                                related = str(result.get("related", ""))
-                                if related and related.lower() in item_text:
-                                    relevance_score += 0.5
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
+            # Also check for related concepts from the ontology
+            for related in related_terms:
+                if related in labels or related in item_text:
+                    relevance_score += 0.5
 
             if relevance_score > 0:
                 relevant_items.append((relevance_score, item))
@@ -315,6 +584,42 @@ class OntologyMemorySession(SQLiteSession if AGENTS_AVAILABLE else object):
         relevant_items.sort(key=lambda x: x[0], reverse=True)
         return [item for _, item in relevant_items[:limit]]
 
+    def _related_concept_terms(self, ontology_concepts: list[str]) -> list[str]:
+        """
+        Look up related concept names once per query concept.
+
+        Returns lowercase local names; a name appears once per concept it is
+        related to, so items matching several concepts' relatives score higher.
+        """
+        if not self.ontology_loader:
+            return []
+
+        terms: list[str] = []
+        for concept in ontology_concepts:
+            sparql = f"""
+            PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+            PREFIX owl: <http://www.w3.org/2002/07/owl#>
+            SELECT ?related WHERE {{
+                {{
+                    ?concept rdfs:label ?label .
+                    FILTER(REGEX(?label, "{concept}", "i"))
+                    ?concept (rdfs:subClassOf|owl:equivalentClass|^rdfs:subClassOf)* ?related .
+                    ?related rdfs:label ?relatedLabel .
+                }}
+            }}
+            LIMIT 5
+            """
+            try:
+                results = self.ontology_loader.query(sparql)
+            except Exception:
+                continue
+            for result in results:
+                related = str(result.get("related", "") or "")
+                local_name = related.split("#")[-1].split("/")[-1].lower()
+                if local_name:
+                    terms.append(local_name)
+        return terms
+
     async def enrich_with_ontology_context(
         self,
         query: str,
@@ -0,0 +1,106 @@
+"""
+Shared machinery for retention sweepers.
+
+From first principles: Every store that enforces retention needs the same
+scaffolding around its actual clean-up pass:
+- sweep() on demand, serialized so two passes never overlap
+- an optional background asyncio task that sweeps every
+  ``policy.sweep_interval_seconds``, logging failures and retrying on the
+  next tick
+- timing and the stats of the last pass
+
+PeriodicSweeper provides that; memory.MemorySweeper and
+sessions.SessionSweeper only implement the pass itself (``_sweep``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Any, ClassVar
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicSweeper(ABC):
+    """
+    Base class: runs ``_sweep(now)`` on demand or periodically.
+
+    Subclasses set ``label`` (used in log messages) and implement ``_sweep``,
+    returning a stats object with a ``duration_seconds`` field.
+    """
+
+    label: ClassVar[str] = "Retention"
+
+    def __init__(self, backend: Any, policy: Any):
+        """
+        Initialize sweeper.
+
+        Args:
+            backend: Store the policy is enforced against
+            policy: Retention limits (must define sweep_interval_seconds)
+        """
+        self.backend = backend
+        self.policy = policy
+        self._task: asyncio.Task[None] | None = None
+        self._lock = asyncio.Lock()
+        self.last_stats: Any = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background sweep loop is active."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start periodic sweeping on the running event loop."""
+        if self.running:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(
+            f"{self.label} sweeper started "
+            f"(interval={self.policy.sweep_interval_seconds}s)"
+        )
+
+    async def stop(self) -> None:
+        """Stop the background sweep loop."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info(f"{self.label} sweeper stopped")
+
+    async def _run(self) -> None:
+        """Sweep loop; failures are logged and retried next interval."""
+        while True:
+            await asyncio.sleep(self.policy.sweep_interval_seconds)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.warning(f"{self.label} sweep failed: {e}")
+
+    async def sweep(self, now: float | None = None) -> Any:
+        """
+        Run one retention pass.
+
+        Args:
+            now: Reference time (defaults to time.time())
+
+        Returns:
+            Stats of the pass (also kept as ``last_stats``)
+        """
+        async with self._lock:
+            started = time.perf_counter()
+            stats = await self._sweep(time.time() if now is None else now)
+            stats.duration_seconds = time.perf_counter() - started
+            self.last_stats = stats
+            return stats
+
+    @abstractmethod
+    async def _sweep(self, now: float) -> Any:
+        """Enforce the policy once at reference time ``now``."""
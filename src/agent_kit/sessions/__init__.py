@@ -11,25 +11,42 @@ This module provides:
 - OntologySessionService: Session service with ontology awareness
 - SessionBackend protocol and implementations
 - Backend adapters for ADK integration
+- SqliteConnectionPool: WAL-mode single-writer/multi-reader connections
+- CachedSessionBackend: Read-through LRU cache in front of any backend
+- SessionRetentionPolicy/SessionSweeper: TTL expiry and event-log rollover
 """
 
 from .backends import (
     ADKSessionBackendAdapter,
+    EventLogBackend,
     InMemorySessionBackend,
     SessionBackend,
+    SessionConflictError,
     SqliteSessionBackend,
     create_session_backend,
 )
-from .ontology_session_service import OntologySessionService
+from .cache import CachedSessionBackend
+from .ontology_session_service import OntologySessionService, SessionMutation
+from .retention import SessionRetentionPolicy, SessionSweeper, SessionSweepStats
+from .sqlite_pool import SqliteConnectionPool
 
 __all__ = [
     # Main service
     "OntologySessionService",
+    "SessionMutation",
+    "SessionConflictError",
     # Backends
     "SessionBackend",
+    "EventLogBackend",
     "InMemorySessionBackend",
     "SqliteSessionBackend",
     "ADKSessionBackendAdapter",
+    "SqliteConnectionPool",
+    "CachedSessionBackend",
+    # Retention
+    "SessionRetentionPolicy",
+    "SessionSweeper",
+    "SessionSweepStats",
     # Factory
     "create_session_backend",
 ]
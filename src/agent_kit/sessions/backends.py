@@ -7,12 +7,17 @@ From first principles: Sessions need different backends for different use cases:
 - PostgreSQL/Spanner: Production scalability
 - VertexAI: Cloud-managed (if using GCP)
 
-Each backend implements the SessionBackend protocol.
+Each backend implements the SessionBackend protocol. Backends that store
+events as an append-only log (EventLogBackend) also support appending single
+events and loading only the most recent events of a session.
+
+The in-memory and SQLite backends accept a SessionRetentionPolicy: idle
+sessions expire after a TTL, and events beyond a per-session cap roll over
+into compressed archives (see SessionSweeper).
 """
 
 from __future__ import annotations
 
-import asyncio
 import json
 import logging
 import sqlite3
@@ -20,9 +25,29 @@ import time
 from pathlib import Path
 from typing import Any, Protocol, runtime_checkable
 
+from .retention import (
+    SessionRetentionPolicy,
+    SessionSweepStats,
+    compress_events,
+    decompress_events,
+)
+from .sqlite_pool import SqliteConnectionPool
+
 logger = logging.getLogger(__name__)
 
 
+class SessionConflictError(RuntimeError):
+    """A versioned save found the session changed since it was read."""
+
+    def __init__(self, session_id: str, expected: int, actual: int):
+        super().__init__(
+            f"Session {session_id} is at version {actual}, expected {expected}"
+        )
+        self.session_id = session_id
+        self.expected = expected
+        self.actual = actual
+
+
 @runtime_checkable
 class SessionBackend(Protocol):
     """Protocol for session storage backends."""
@@ -39,11 +64,74 @@ class SessionBackend(Protocol):
         """Delete session."""
         ...
 
-    async def list_sessions(self, user_id: str | None = None) -> list[str]:
-        """List session IDs, optionally filtered by user."""
+    async def list_sessions(
+        self,
+        user_id: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        updated_after: float | None = None,
+        updated_before: float | None = None,
+    ) -> list[str]:
+        """List session IDs (most recently updated first), optionally filtered."""
         ...
 
 
+@runtime_checkable
+class EventLogBackend(SessionBackend, Protocol):
+    """
+    Session backend that stores events as an append-only log.
+
+    Sessions loaded with ``last_n_events`` carry an ``events_offset`` key (the
+    number of older events omitted); saving such a session keeps the omitted
+    events and appends only new ones.
+
+    Sessions also carry a ``version`` that every write increments; passing
+    ``expected_version`` to save_session makes the save optimistic.
+    """
+
+    async def get_session(
+        self, session_id: str, last_n_events: int | None = None
+    ) -> dict[str, Any]:
+        """Retrieve session, optionally with only its last N events."""
+        ...
+
+    async def save_session(
+        self,
+        session_id: str,
+        session_data: dict[str, Any],
+        expected_version: int | None = None,
+    ) -> None:
+        """Save session; raises SessionConflictError on version mismatch."""
+        ...
+
+    async def append_event(self, session_id: str, event: dict[str, Any]) -> int:
+        """Append one event; returns the session's new event count."""
+        ...
+
+
+def _split_events(
+    session_data: dict[str, Any],
+) -> tuple[dict[str, Any], list[dict[str, Any]] | None, int]:
+    """Split a session dict into (header, events, events_offset)."""
+    header = {
+        k: v
+        for k, v in session_data.items()
+        if k not in ("events", "events_offset", "version")
+    }
+    return header, session_data.get("events"), session_data.get("events_offset", 0)
+
+
+def _with_events(
+    header: dict[str, Any], events: list[dict[str, Any]], total: int
+) -> dict[str, Any]:
+    """Assemble a session dict from its header and (possibly partial) events."""
+    session = dict(header)
+    session["events"] = events
+    if total > len(events):
+        session["events_offset"] = total - len(events)
+    return session
+
+
 class InMemorySessionBackend:
     """
     In-memory session backend for development and testing.
@@ -51,68 +139,245 @@ class InMemorySessionBackend:
     Sessions are lost when process exits.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, retention: SessionRetentionPolicy | None = None) -> None:
+        """
+        Initialize backend.
+
+        Args:
+            retention: Optional TTL and per-session event cap
+        """
+        self.retention = retention
         self._sessions: dict[str, dict[str, Any]] = {}
+        # session_id -> [(first_seq, end_seq, compressed events)]
+        self._archives: dict[str, list[tuple[int, int, bytes]]] = {}
 
-    async def get_session(self, session_id: str) -> dict[str, Any]:
-        """Get or create session."""
-        if session_id not in self._sessions:
-            self._sessions[session_id] = {
+    def _archived(self, session_id: str) -> int:
+        """Number of a session's events rolled over into archives."""
+        chunks = self._archives.get(session_id)
+        return chunks[-1][1] if chunks else 0
+
+    def _expired(self, session: dict[str, Any], now: float) -> bool:
+        """Whether a stored session is past the retention TTL."""
+        if self.retention is None:
+            return False
+        return self.retention.is_expired(session.get("updated_at", 0.0), now)
+
+    async def get_session(
+        self, session_id: str, last_n_events: int | None = None
+    ) -> dict[str, Any]:
+        """Get or create session, optionally with only its last N events."""
+        session = self._sessions.get(session_id)
+        if session is not None and self._expired(session, time.time()):
+            await self.delete_session(session_id)
+            session = None
+        if session is None:
+            session = self._sessions[session_id] = {
                 "id": session_id,
                 "created_at": time.time(),
                 "updated_at": time.time(),
                 "events": [],
                 "metadata": {},
+                "version": 0,
             }
-        return self._sessions[session_id].copy()
 
-    async def save_session(self, session_id: str, session_data: dict[str, Any]) -> None:
-        """Save session."""
+        archived = self._archived(session_id)
+        if last_n_events is None and not archived:
+            return session.copy()
+
+        header, events, _ = _split_events(session)
+        events = events or []
+        if last_n_events is not None:
+            events = events[max(len(events) - last_n_events, 0) :]
+        partial = _with_events(header, events, archived + len(session["events"]))
+        partial["version"] = session.get("version", 0)
+        return partial
+
+    async def save_session(
+        self,
+        session_id: str,
+        session_data: dict[str, Any],
+        expected_version: int | None = None,
+    ) -> None:
+        """Save session (keeping events omitted from a partial load)."""
+        stored = self._sessions.get(session_id, {})
+        current = stored.get("version", 0)
+        if expected_version is not None and expected_version != current:
+            raise SessionConflictError(session_id, expected_version, current)
+
         session_data["updated_at"] = time.time()
-        self._sessions[session_id] = session_data
+        session_data["version"] = current + 1
+        archived = self._archived(session_id)
+        if "events_offset" not in session_data and not archived:
+            self._sessions[session_id] = session_data
+            return
+
+        # Offsets count archived events; keep stored events before the offset
+        # and skip incoming events that were already archived
+        header, events, offset = _split_events(session_data)
+        header["events"] = (
+            stored.get("events", [])[: max(offset - archived, 0)]
+            + (events or [])[max(archived - offset, 0) :]
+        )
+        header["version"] = current + 1
+        self._sessions[session_id] = header
+
+    async def append_event(self, session_id: str, event: dict[str, Any]) -> int:
+        """Append one event to a session."""
+        session = self._sessions.get(session_id)
+        if session is None or self._expired(session, time.time()):
+            await self.get_session(session_id)
+            session = self._sessions[session_id]
+        session.setdefault("events", []).append(event)
+        session["updated_at"] = time.time()
+        session["version"] = session.get("version", 0) + 1
+        return self._archived(session_id) + len(session["events"])
+
+    async def get_archived_events(self, session_id: str) -> list[dict[str, Any]]:
+        """Events rolled over into archives, oldest first."""
+        events: list[dict[str, Any]] = []
+        for _, _, blob in self._archives.get(session_id, []):
+            events.extend(decompress_events(blob))
+        return events
 
     async def delete_session(self, session_id: str) -> bool:
         """Delete session."""
+        self._archives.pop(session_id, None)
         if session_id in self._sessions:
             del self._sessions[session_id]
             return True
         return False
 
-    async def list_sessions(self, user_id: str | None = None) -> list[str]:
-        """List session IDs."""
-        if user_id:
-            return [
-                sid
-                for sid, data in self._sessions.items()
-                if data.get("user_id") == user_id
-            ]
-        return list(self._sessions.keys())
+    async def list_sessions(
+        self,
+        user_id: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        updated_after: float | None = None,
+        updated_before: float | None = None,
+    ) -> list[str]:
+        """
+        List session IDs, most recently updated first.
+
+        Args:
+            user_id: Only sessions of this user
+            limit: Max IDs to return (None = all)
+            offset: IDs to skip (for pagination)
+            updated_after: Only sessions updated after this time
+            updated_before: Only sessions updated before this time
+
+        Returns:
+            Session IDs (expired sessions excluded)
+        """
+        now = time.time()
+        matches = [
+            (data.get("updated_at", 0.0), sid)
+            for sid, data in self._sessions.items()
+            if (not user_id or data.get("user_id") == user_id)
+            and (updated_after is None or data.get("updated_at", 0.0) > updated_after)
+            and (updated_before is None or data.get("updated_at", 0.0) < updated_before)
+            and not self._expired(data, now)
+        ]
+        matches.sort(reverse=True)
+        ids = [sid for _, sid in matches][offset:]
+        return ids if limit is None else ids[:limit]
+
+    async def apply_retention(
+        self,
+        policy: SessionRetentionPolicy | None = None,
+        now: float | None = None,
+    ) -> SessionSweepStats:
+        """
+        Expire idle sessions and roll events beyond the cap into archives.
+
+        Args:
+            policy: Limits to apply (default: the backend's policy)
+            now: Reference time (defaults to time.time())
+        """
+        policy = policy or self.retention
+        if policy is None:
+            raise ValueError("No retention policy configured for this backend")
+        now = time.time() if now is None else now
+        stats = SessionSweepStats()
+
+        for session_id, session in list(self._sessions.items()):
+            if policy.is_expired(session.get("updated_at", 0.0), now):
+                await self.delete_session(session_id)
+                stats.expired += 1
+                continue
+
+            events = session.get("events") or []
+            if policy.max_events is None or len(events) <= policy.max_events:
+                continue
+            cut = len(events) - policy.max_events
+            first = self._archived(session_id)
+            self._archives.setdefault(session_id, []).append(
+                (
+                    first,
+                    first + cut,
+                    compress_events(events[:cut], policy.compression_level),
+                )
+            )
+            self._sessions[session_id] = {**session, "events": events[cut:]}
+            stats.archived_events += cut
+            stats.archives_created += 1
+
+        return stats
 
     def clear(self) -> None:
         """Clear all sessions."""
         self._sessions.clear()
+        self._archives.clear()
 
 
 class SqliteSessionBackend:
     """
     SQLite-backed session storage for local persistence.
 
-    Compatible with ADK's SqliteSessionService pattern.
+    Compatible with ADK's SqliteSessionService pattern. Connections are
+    persistent and run in WAL mode: a dedicated writer thread commits writes
+    (batched under concurrency) while a pool of readers serves lookups.
+
+    Each session is a small header row plus an append-only event log, so
+    appending an event or saving a session with a few new events costs
+    O(new events) rather than rewriting the whole history. Events rolled over
+    by retention move to compressed chunks in ``session_archives``; sequence
+    numbers stay absolute, so loads return the live tail with events_offset.
     """
 
-    def __init__(self, db_path: str | Path = "sessions.db"):
+    def __init__(
+        self,
+        db_path: str | Path = "sessions.db",
+        pool_size: int = 4,
+        synchronous: str = "NORMAL",
+        group_commit_ms: float = 0.0,
+        retention: SessionRetentionPolicy | None = None,
+    ):
         """
         Initialize SQLite backend.
 
         Args:
             db_path: Path to SQLite database file
+            pool_size: Number of reader connections
+            synchronous: PRAGMA synchronous level ("NORMAL" cannot corrupt
+                under WAL but may lose the latest commits on power loss;
+                "FULL" syncs every commit)
+            group_commit_ms: Time the writer waits to batch more commits
+            retention: Optional TTL and per-session event cap
         """
         self.db_path = Path(db_path)
+        self.retention = retention
+        self._pool = SqliteConnectionPool(
+            self.db_path,
+            readers=pool_size,
+            synchronous=synchronous,
+            group_commit_ms=group_commit_ms,
+        )
         self._init_db()
 
     def _init_db(self) -> None:
-        """Initialize database schema."""
-        with sqlite3.connect(self.db_path) as conn:
+        """Initialize database schema, migrating inline event lists."""
+
+        def _create(conn: sqlite3.Connection) -> None:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS sessions (
@@ -120,105 +385,475 @@ class SqliteSessionBackend:
                     user_id TEXT,
                     data TEXT NOT NULL,
                     created_at REAL NOT NULL,
-                    updated_at REAL NOT NULL
+                    updated_at REAL NOT NULL,
+                    event_count INTEGER NOT NULL DEFAULT 0,
+                    version INTEGER NOT NULL DEFAULT 0,
+                    archived_count INTEGER NOT NULL DEFAULT 0
                 )
             """
             )
+            # Listing filters by user and pages by recency; expiry scans by age
+            conn.execute("DROP INDEX IF EXISTS idx_sessions_user")
             conn.execute(
                 """
-                CREATE INDEX IF NOT EXISTS idx_sessions_user
-                ON sessions(user_id)
+                CREATE INDEX IF NOT EXISTS idx_sessions_user_updated
+                ON sessions(user_id, updated_at, session_id)
+            """
+            )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_sessions_updated
+                ON sessions(updated_at, session_id)
+            """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS session_events (
+                    session_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    data TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (session_id, seq)
+                ) WITHOUT ROWID
+            """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS session_archives (
+                    session_id TEXT NOT NULL,
+                    first_seq INTEGER NOT NULL,
+                    end_seq INTEGER NOT NULL,
+                    data BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (session_id, first_seq)
+                ) WITHOUT ROWID
             """
             )
-            conn.commit()
-
-    async def get_session(self, session_id: str) -> dict[str, Any]:
-        """Get or create session."""
 
-        def _get() -> dict[str, Any]:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute(
-                    "SELECT data FROM sessions WHERE session_id = ?", (session_id,)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+            if "event_count" not in columns:
+                self._migrate_inline_events(conn)
+            if "version" not in columns:
+                conn.execute(
+                    "ALTER TABLE sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
                 )
-                row = cursor.fetchone()
-                if row:
-                    return json.loads(row[0])
-
-                # Create new session
-                now = time.time()
-                session = {
-                    "id": session_id,
-                    "created_at": now,
-                    "updated_at": now,
-                    "events": [],
-                    "metadata": {},
-                }
+            if "archived_count" not in columns:
                 conn.execute(
-                    """INSERT INTO sessions (session_id, user_id, data, created_at, updated_at)
-                       VALUES (?, ?, ?, ?, ?)""",
-                    (session_id, None, json.dumps(session), now, now),
+                    "ALTER TABLE sessions ADD COLUMN "
+                    "archived_count INTEGER NOT NULL DEFAULT 0"
                 )
-                conn.commit()
-                return session
 
-        return await asyncio.to_thread(_get)
+        self._pool.write_sync(_create)
+
+    @staticmethod
+    def _migrate_inline_events(conn: sqlite3.Connection) -> None:
+        """Move events stored inside session documents into the event log."""
+        conn.execute(
+            "ALTER TABLE sessions ADD COLUMN event_count INTEGER NOT NULL DEFAULT 0"
+        )
+        rows = conn.execute("SELECT session_id, data, updated_at FROM sessions")
+        for session_id, data, updated_at in rows.fetchall():
+            header, events, _ = _split_events(json.loads(data))
+            events = events or []
+            conn.executemany(
+                """INSERT INTO session_events (session_id, seq, data, created_at)
+                   VALUES (?, ?, ?, ?)""",
+                [
+                    (session_id, seq, json.dumps(event), updated_at)
+                    for seq, event in enumerate(events)
+                ],
+            )
+            conn.execute(
+                "UPDATE sessions SET data = ?, event_count = ? WHERE session_id = ?",
+                (json.dumps(header), len(events), session_id),
+            )
+        logger.info("Migrated session events to append-only event log")
+
+    @staticmethod
+    def _new_header(conn: sqlite3.Connection, session_id: str) -> dict[str, Any]:
+        """Insert a header row for a new session."""
+        now = time.time()
+        header = {
+            "id": session_id,
+            "created_at": now,
+            "updated_at": now,
+            "metadata": {},
+        }
+        conn.execute(
+            """INSERT INTO sessions
+               (session_id, user_id, data, created_at, updated_at, event_count,
+                version)
+               VALUES (?, ?, ?, ?, ?, 0, 0)""",
+            (session_id, None, json.dumps(header), now, now),
+        )
+        return {**header, "version": 0}
+
+    @staticmethod
+    def _read_session(
+        conn: sqlite3.Connection, session_id: str, last_n_events: int | None
+    ) -> dict[str, Any] | None:
+        """Read a session header and its (last N) live events."""
+        row = conn.execute(
+            """SELECT data, event_count, version, archived_count, updated_at
+               FROM sessions WHERE session_id = ?""",
+            (session_id,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        header, total, archived = json.loads(row[0]), row[1], row[3]
+        header["version"] = row[2]
+        header["updated_at"] = row[4]
+        first_seq = archived
+        if last_n_events is not None:
+            first_seq = max(total - last_n_events, archived)
+        events = []
+        if first_seq < total:
+            events = [
+                json.loads(data)
+                for (data,) in conn.execute(
+                    """SELECT data FROM session_events
+                       WHERE session_id = ? AND seq >= ?
+                       ORDER BY seq""",
+                    (session_id, first_seq),
+                )
+            ]
+        return _with_events(header, events, total)
+
+    @staticmethod
+    def _delete_sessions(conn: sqlite3.Connection, session_ids: list[str]) -> int:
+        """Delete sessions with their events and archives; returns rows deleted."""
+        if not session_ids:
+            return 0
+        params = [(session_id,) for session_id in session_ids]
+        conn.executemany("DELETE FROM session_events WHERE session_id = ?", params)
+        conn.executemany("DELETE FROM session_archives WHERE session_id = ?", params)
+        cursor = conn.executemany("DELETE FROM sessions WHERE session_id = ?", params)
+        return cursor.rowcount
+
+    def _expired(self, session: dict[str, Any] | None, now: float) -> bool:
+        """Whether a loaded session is past the retention TTL."""
+        if session is None or self.retention is None:
+            return False
+        return self.retention.is_expired(session["updated_at"], now)
+
+    def _snapshot(
+        self, conn: sqlite3.Connection, session_id: str, last_n_events: int | None
+    ) -> dict[str, Any] | None:
+        """Read a session so header and events come from the same snapshot."""
+        if conn.in_transaction:
+            return self._read_session(conn, session_id, last_n_events)
+        conn.execute("BEGIN")
+        try:
+            return self._read_session(conn, session_id, last_n_events)
+        finally:
+            conn.execute("COMMIT")
 
-    async def save_session(self, session_id: str, session_data: dict[str, Any]) -> None:
-        """Save session."""
+    async def get_session(
+        self, session_id: str, last_n_events: int | None = None
+    ) -> dict[str, Any]:
+        """
+        Get or create session.
 
-        def _save() -> None:
-            now = time.time()
-            session_data["updated_at"] = now
-            user_id = session_data.get("user_id")
+        Args:
+            session_id: Session identifier
+            last_n_events: Load only the most recent N events (None = all)
 
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
-                    """INSERT OR REPLACE INTO sessions
-                       (session_id, user_id, data, created_at, updated_at)
-                       VALUES (?, ?, ?, COALESCE(
-                           (SELECT created_at FROM sessions WHERE session_id = ?),
-                           ?
-                       ), ?)""",
-                    (
-                        session_id,
-                        user_id,
-                        json.dumps(session_data),
-                        session_id,
-                        now,
-                        now,
-                    ),
+        Returns:
+            Session dict; partial loads include ``events_offset``
+        """
+        session = await self._pool.read(
+            lambda conn: self._snapshot(conn, session_id, last_n_events)
+        )
+        if session is not None and not self._expired(session, time.time()):
+            return session
+
+        def _create(conn: sqlite3.Connection) -> dict[str, Any]:
+            # Another writer may have created (or refreshed) it since the read
+            existing = self._read_session(conn, session_id, last_n_events)
+            if existing is not None:
+                if not self._expired(existing, time.time()):
+                    return existing
+                self._delete_sessions(conn, [session_id])
+            return _with_events(self._new_header(conn, session_id), [], 0)
+
+        return await self._pool.write(_create)
+
+    async def save_session(
+        self,
+        session_id: str,
+        session_data: dict[str, Any],
+        expected_version: int | None = None,
+    ) -> None:
+        """
+        Save session.
+
+        Writes the header and appends only events beyond the stored count.
+        Stored events are immutable; a shorter event list truncates the live
+        log (archived events are kept).
+
+        Args:
+            session_id: Session identifier
+            session_data: Session dict (full or partially loaded)
+            expected_version: Fail with SessionConflictError unless the stored
+                version still matches (optimistic concurrency)
+        """
+        now = time.time()
+        session_data["updated_at"] = now
+        header, events, offset = _split_events(session_data)
+        user_id = header.get("user_id")
+        header_json = json.dumps(header)
+        encoded = None if events is None else [json.dumps(e) for e in events]
+
+        def _save(conn: sqlite3.Connection) -> int:
+            row = conn.execute(
+                """SELECT event_count, version, archived_count
+                   FROM sessions WHERE session_id = ?""",
+                (session_id,),
+            ).fetchone()
+            count, version, archived = row if row else (0, 0, 0)
+            if expected_version is not None and expected_version != version:
+                raise SessionConflictError(session_id, expected_version, version)
+
+            if encoded is not None:
+                # Archived events are never truncated
+                total = max(offset + len(encoded), archived)
+                if total < count:
+                    conn.execute(
+                        "DELETE FROM session_events WHERE session_id = ? AND seq >= ?",
+                        (session_id, total),
+                    )
+                    count = total
+                new_events = encoded[max(count - offset, 0) :]
+                conn.executemany(
+                    """INSERT INTO session_events (session_id, seq, data, created_at)
+                       VALUES (?, ?, ?, ?)""",
+                    [
+                        (session_id, count + i, data, now)
+                        for i, data in enumerate(new_events)
+                    ],
                 )
-                conn.commit()
+                count += len(new_events)
 
-        await asyncio.to_thread(_save)
+            conn.execute(
+                """INSERT INTO sessions
+                   (session_id, user_id, data, created_at, updated_at, event_count,
+                    version)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(session_id) DO UPDATE SET
+                       user_id = excluded.user_id,
+                       data = excluded.data,
+                       updated_at = excluded.updated_at,
+                       event_count = excluded.event_count,
+                       version = excluded.version""",
+                (session_id, user_id, header_json, now, now, count, version + 1),
+            )
+            return version + 1
+
+        session_data["version"] = await self._pool.write(_save)
+
+    async def append_event(self, session_id: str, event: dict[str, Any]) -> int:
+        """
+        Append one event to a session's log (creating the session if needed).
+
+        Returns:
+            The session's event count after the append
+        """
+        return await self.append_events(session_id, [event])
+
+    async def append_events(self, session_id: str, events: list[dict[str, Any]]) -> int:
+        """Append several events in one write; returns the new event count."""
+        now = time.time()
+        encoded = [json.dumps(e) for e in events]
+
+        def _append(conn: sqlite3.Connection) -> int:
+            row = conn.execute(
+                "SELECT event_count, updated_at FROM sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is not None and self._expired({"updated_at": row[1]}, now):
+                self._delete_sessions(conn, [session_id])
+                row = None
+            if row is None:
+                self._new_header(conn, session_id)
+                count = 0
+            else:
+                count = row[0]
+
+            conn.executemany(
+                """INSERT INTO session_events (session_id, seq, data, created_at)
+                   VALUES (?, ?, ?, ?)""",
+                [(session_id, count + i, data, now) for i, data in enumerate(encoded)],
+            )
+            conn.execute(
+                """UPDATE sessions
+                   SET event_count = ?, updated_at = ?, version = version + 1
+                   WHERE session_id = ?""",
+                (count + len(encoded), now, session_id),
+            )
+            return count + len(encoded)
+
+        return await self._pool.write(_append)
 
     async def delete_session(self, session_id: str) -> bool:
-        """Delete session."""
+        """Delete session with its events and archives."""
+        return (
+            await self._pool.write(
+                lambda conn: self._delete_sessions(conn, [session_id])
+            )
+            > 0
+        )
+
+    async def list_sessions(
+        self,
+        user_id: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        updated_after: float | None = None,
+        updated_before: float | None = None,
+    ) -> list[str]:
+        """
+        List session IDs, most recently updated first.
 
-        def _delete() -> bool:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute(
-                    "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+        Served from the (user_id, updated_at) index, so filtered pages don't
+        scan the table.
+
+        Args:
+            user_id: Only sessions of this user
+            limit: Max IDs to return (None = all)
+            offset: IDs to skip (for pagination)
+            updated_after: Only sessions updated after this time
+            updated_before: Only sessions updated before this time
+
+        Returns:
+            Session IDs (expired sessions excluded)
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        if user_id:
+            clauses.append("user_id = ?")
+            params.append(user_id)
+        if updated_after is not None:
+            clauses.append("updated_at > ?")
+            params.append(updated_after)
+        if updated_before is not None:
+            clauses.append("updated_at < ?")
+            params.append(updated_before)
+        if self.retention is not None and self.retention.ttl_seconds is not None:
+            clauses.append("updated_at >= ?")
+            params.append(time.time() - self.retention.ttl_seconds)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (
+            f"SELECT session_id FROM sessions{where} "
+            "ORDER BY updated_at DESC, session_id DESC LIMIT ? OFFSET ?"
+        )
+        params.extend([-1 if limit is None else limit, offset])
+
+        def _list(conn: sqlite3.Connection) -> list[str]:
+            return [row[0] for row in conn.execute(sql, params)]
+
+        return await self._pool.read(_list)
+
+    async def get_archived_events(self, session_id: str) -> list[dict[str, Any]]:
+        """Events rolled over into archives, oldest first."""
+
+        def _load(conn: sqlite3.Connection) -> list[bytes]:
+            return [
+                blob
+                for (blob,) in conn.execute(
+                    """SELECT data FROM session_archives
+                       WHERE session_id = ? ORDER BY first_seq""",
+                    (session_id,),
                 )
-                conn.commit()
-                return cursor.rowcount > 0
+            ]
 
-        return await asyncio.to_thread(_delete)
+        events: list[dict[str, Any]] = []
+        for blob in await self._pool.read(_load):
+            events.extend(decompress_events(blob))
+        return events
 
-    async def list_sessions(self, user_id: str | None = None) -> list[str]:
-        """List session IDs."""
+    async def apply_retention(
+        self,
+        policy: SessionRetentionPolicy | None = None,
+        now: float | None = None,
+    ) -> SessionSweepStats:
+        """
+        Expire idle sessions and roll events beyond the cap into archives.
+
+        Runs as one write on the writer thread.
 
-        def _list() -> list[str]:
-            with sqlite3.connect(self.db_path) as conn:
-                if user_id:
-                    cursor = conn.execute(
-                        "SELECT session_id FROM sessions WHERE user_id = ?", (user_id,)
+        Args:
+            policy: Limits to apply (default: the backend's policy)
+            now: Reference time (defaults to time.time())
+        """
+        policy = policy or self.retention
+        if policy is None:
+            raise ValueError("No retention policy configured for this backend")
+        now = time.time() if now is None else now
+
+        def _apply(conn: sqlite3.Connection) -> SessionSweepStats:
+            stats = SessionSweepStats()
+            if policy.ttl_seconds is not None:
+                expired = [
+                    session_id
+                    for (session_id,) in conn.execute(
+                        "SELECT session_id FROM sessions WHERE updated_at < ?",
+                        (now - policy.ttl_seconds,),
                     )
-                else:
-                    cursor = conn.execute("SELECT session_id FROM sessions")
-                return [row[0] for row in cursor.fetchall()]
+                ]
+                stats.expired = self._delete_sessions(conn, expired)
+
+            if policy.max_events is None:
+                return stats
+            oversized = conn.execute(
+                """SELECT session_id, event_count, archived_count FROM sessions
+                   WHERE event_count - archived_count > ?""",
+                (policy.max_events,),
+            ).fetchall()
+            for session_id, count, archived in oversized:
+                end_seq = count - policy.max_events
+                events = [
+                    data
+                    for (data,) in conn.execute(
+                        """SELECT data FROM session_events
+                           WHERE session_id = ? AND seq >= ? AND seq < ?
+                           ORDER BY seq""",
+                        (session_id, archived, end_seq),
+                    )
+                ]
+                conn.execute(
+                    "INSERT INTO session_archives VALUES (?, ?, ?, ?, ?)",
+                    (
+                        session_id,
+                        archived,
+                        end_seq,
+                        compress_events(events, policy.compression_level),
+                        now,
+                    ),
+                )
+                conn.execute(
+                    "DELETE FROM session_events WHERE session_id = ? AND seq < ?",
+                    (session_id, end_seq),
+                )
+                conn.execute(
+                    "UPDATE sessions SET archived_count = ? WHERE session_id = ?",
+                    (end_seq, session_id),
+                )
+                stats.archived_events += end_seq - archived
+                stats.archives_created += 1
+            return stats
+
+        return await self._pool.write(_apply)
 
-        return await asyncio.to_thread(_list)
+    @property
+    def stats(self) -> dict[str, int]:
+        """Writer statistics (writes, commits, failed_writes)."""
+        return dict(self._pool.stats)
+
+    def close(self) -> None:
+        """Flush pending writes and close connections."""
+        self._pool.close()
 
 
 class ADKSessionBackendAdapter:
@@ -274,11 +909,19 @@ class ADKSessionBackendAdapter:
             logger.error(f"ADK delete_session failed: {e}")
             return False
 
-    async def list_sessions(self, user_id: str | None = None) -> list[str]:
-        """List sessions from ADK backend."""
+    async def list_sessions(
+        self,
+        user_id: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        updated_after: float | None = None,
+        updated_before: float | None = None,
+    ) -> list[str]:
+        """List sessions from ADK backend (time filters are not supported)."""
         try:
             sessions = await self.adk_service.list_sessions(user_id=user_id)
-            return [s.id for s in sessions]
+            ids = [s.id for s in sessions][offset:]
+            return ids if limit is None else ids[:limit]
         except Exception as e:
             logger.error(f"ADK list_sessions failed: {e}")
             return []
@@ -302,23 +945,43 @@ def create_session_backend(
 
     Args:
         backend_type: Type of backend ("memory", "sqlite", "adk")
-        **kwargs: Backend-specific configuration
+        **kwargs: Backend-specific configuration (memory: retention;
+            sqlite: db_path, pool_size, synchronous, group_commit_ms,
+            retention; adk: adk_service). Passing
+            cache_size (and optionally cache_mode, cache_flush_interval)
+            wraps the backend in a CachedSessionBackend.
 
     Returns:
         SessionBackend instance
     """
+    backend: SessionBackend
     if backend_type == "memory":
-        return InMemorySessionBackend()
+        backend = InMemorySessionBackend(retention=kwargs.get("retention"))
 
     elif backend_type == "sqlite":
-        db_path = kwargs.get("db_path", "sessions.db")
-        return SqliteSessionBackend(db_path)
+        options = {
+            key: kwargs[key]
+            for key in ("pool_size", "synchronous", "group_commit_ms", "retention")
+            if key in kwargs
+        }
+        backend = SqliteSessionBackend(kwargs.get("db_path", "sessions.db"), **options)
 
     elif backend_type == "adk":
         adk_service = kwargs.get("adk_service")
         if not adk_service:
             raise ValueError("adk backend requires adk_service parameter")
-        return ADKSessionBackendAdapter(adk_service)
+        backend = ADKSessionBackendAdapter(adk_service)
 
     else:
         raise ValueError(f"Unknown backend type: {backend_type}")
+
+    if kwargs.get("cache_size"):
+        from .cache import CachedSessionBackend
+
+        return CachedSessionBackend(
+            backend,
+            max_sessions=kwargs["cache_size"],
+            mode=kwargs.get("cache_mode", "write-through"),
+            flush_interval=kwargs.get("cache_flush_interval", 1.0),
+        )
+    return backend
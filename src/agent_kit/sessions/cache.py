@@ -0,0 +1,458 @@
+"""
+Read-through LRU cache in front of session backends.
+
+From first principles: Within one agent turn the same session is read many
+times (context lookup, entity updates, event appends). Serving those reads
+from memory removes backend round trips, provided writes can't be lost:
+- Write-through: every write reaches the backend before the cache updates
+- Write-behind: writes land in the cache and are flushed in the background
+  (on an interval, on eviction, before listing, and on close). Only safe
+  when this process is the sole writer of its sessions. The backend stays
+  the only source of versions: deferred saves keep the last flushed
+  version, and versioned saves (expected_version) go straight through so
+  the backend's check decides conflicts. Dirty sessions pushed out of the
+  LRU wait in a pending map, still readable, until written back.
+- Per-session locks order reads and writes of the same session, and collapse
+  concurrent cache misses into one backend read.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from .backends import (
+    EventLogBackend,
+    SessionBackend,
+    SessionConflictError,
+    _split_events,
+    _with_events,
+)
+from .retention import SessionRetentionPolicy, SessionSweepStats
+
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = ("write-through", "write-behind")
+
+
+def _copy_session(session: dict[str, Any]) -> dict[str, Any]:
+    """Copy a session; events are treated as immutable and shared."""
+    return {
+        key: list(value) if key == "events" else copy.deepcopy(value)
+        for key, value in session.items()
+    }
+
+
+class CachedSessionBackend:
+    """
+    LRU session cache wrapping any SessionBackend.
+
+    Caches full sessions; partial loads (``last_n_events``) are sliced from a
+    cached session when present and passed through to the backend otherwise.
+
+    Example:
+        >>> backend = CachedSessionBackend(SqliteSessionBackend("sessions.db"))
+        >>> session = await backend.get_session("s1")  # miss: backend read
+        >>> session = await backend.get_session("s1")  # hit: served from memory
+        >>> backend.get_cache_stats()["hit_rate"]
+        0.5
+    """
+
+    def __init__(
+        self,
+        backend: SessionBackend,
+        max_sessions: int = 256,
+        mode: str = "write-through",
+        flush_interval: float = 1.0,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            backend: Backend to wrap
+            max_sessions: Max cached sessions (least recently used evicted)
+            mode: "write-through" or "write-behind"
+            flush_interval: Seconds between background flushes (write-behind)
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"mode must be one of {CACHE_MODES}, got {mode}")
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+
+        self.backend = backend
+        self.max_sessions = max_sessions
+        self.mode = mode
+        self.flush_interval = flush_interval
+
+        self._cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._dirty: set[str] = set()
+        self._pending: dict[str, dict[str, Any]] = {}  # Evicted, not yet flushed
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._lock_users: dict[str, int] = {}  # Holders plus waiters per lock
+        self._flush_task: asyncio.Task[None] | None = None
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._backend_writes = 0
+
+    @property
+    def write_behind(self) -> bool:
+        """Whether writes are deferred to background flushes."""
+        return self.mode == "write-behind"
+
+    @property
+    def _versioned(self) -> bool:
+        """Whether the wrapped backend supports optimistic versioning."""
+        return isinstance(self.backend, EventLogBackend)
+
+    @asynccontextmanager
+    async def lock(self, session_id: str) -> AsyncIterator[None]:
+        """
+        Hold the per-session lock.
+
+        The lock is shared while anyone holds or waits for it (a released
+        lock reads unlocked before the woken waiter takes it), and dropped
+        once the last user leaves an uncached session.
+        """
+        lock = self._locks.setdefault(session_id, asyncio.Lock())
+        self._lock_users[session_id] = self._lock_users.get(session_id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            users = self._lock_users[session_id] - 1
+            if users:
+                self._lock_users[session_id] = users
+            else:
+                del self._lock_users[session_id]
+                if session_id not in self._cache and session_id not in self._pending:
+                    self._locks.pop(session_id, None)
+
+    async def get_session(
+        self, session_id: str, last_n_events: int | None = None
+    ) -> dict[str, Any]:
+        """Get session from cache, reading through to the backend on a miss."""
+        async with self.lock(session_id):
+            cached, evicted = self._lookup(session_id)
+            if cached is not None and self._expired(cached):
+                self._drop(session_id)
+                cached = None
+            if cached is not None:
+                self._hits += 1
+                self._cache.move_to_end(session_id)
+                view = self._view(cached, last_n_events)
+            else:
+                self._misses += 1
+                if last_n_events is not None and self._versioned:
+                    # Partial loads stay cheap; only full sessions are cached
+                    view = await self.backend.get_session(
+                        session_id, last_n_events=last_n_events
+                    )
+                else:
+                    session = await self.backend.get_session(session_id)
+                    evicted += self._store(session_id, session)
+                    view = self._view(session, last_n_events)
+
+        await self._flush_evicted(evicted)
+        return view
+
+    async def save_session(
+        self,
+        session_id: str,
+        session_data: dict[str, Any],
+        expected_version: int | None = None,
+    ) -> None:
+        """
+        Save session through (or behind) the cache.
+
+        In write-behind mode only saves without ``expected_version`` are
+        deferred; versioned saves are written immediately so the backend
+        checks and assigns the version.
+        """
+        async with self.lock(session_id):
+            cached, evicted = self._lookup(session_id)
+            dirty = session_id in self._dirty
+            full = self._merge(cached, session_data)
+
+            if self.write_behind and expected_version is None and full is not None:
+                # The version stays the backend's until the flush bumps it
+                if cached is None:
+                    current = (await self.backend.get_session(session_id)).get(
+                        "version"
+                    )
+                else:
+                    current = cached.get("version")
+                if current is not None:
+                    full["version"] = current
+                self._dirty.add(session_id)
+                evicted += self._store(session_id, full)
+                self._ensure_flusher()
+            else:
+                # A dirty copy holds unflushed events a partial save omits,
+                # so write the merged session in full
+                data = full if dirty and full is not None else session_data
+                try:
+                    await self._write(session_id, data, expected_version)
+                except SessionConflictError:
+                    if not dirty:
+                        self._drop(session_id)
+                    raise
+                self._dirty.discard(session_id)
+                # Uncached sessions are left for the next read to load, since
+                # the backend may have archived events the caller still holds
+                full = None if cached is None else self._merge(cached, data)
+                if full is None:
+                    self._drop(session_id)
+                else:
+                    evicted += self._store(session_id, full)
+
+        await self._flush_evicted(evicted)
+
+    async def append_event(self, session_id: str, event: dict[str, Any]) -> int:
+        """Append an event, keeping any cached copy in sync."""
+        if not self.write_behind and hasattr(self.backend, "append_event"):
+            async with self.lock(session_id):
+                count = await self.backend.append_event(session_id, event)
+                self._backend_writes += 1
+                cached = self._cache.get(session_id)
+                if cached is not None:
+                    cached.setdefault("events", []).append(event)
+                    if "version" in cached:
+                        cached["version"] += 1
+                return count
+
+        session = await self.get_session(session_id)
+        session.setdefault("events", []).append(event)
+        await self.save_session(session_id, session)
+        return session.get("events_offset", 0) + len(session["events"])
+
+    async def delete_session(self, session_id: str) -> bool:
+        """Delete session from cache and backend."""
+        async with self.lock(session_id):
+            was_pending = session_id in self._dirty or session_id in self._pending
+            self._drop(session_id)
+            deleted = await self.backend.delete_session(session_id)
+            return deleted or was_pending
+
+    async def list_sessions(
+        self, user_id: str | None = None, **filters: Any
+    ) -> list[str]:
+        """List sessions (flushing pending writes first)."""
+        await self.flush()
+        return await self.backend.list_sessions(user_id=user_id, **filters)
+
+    async def apply_retention(
+        self,
+        policy: SessionRetentionPolicy | None = None,
+        now: float | None = None,
+    ) -> SessionSweepStats:
+        """Flush, apply the wrapped backend's retention, then drop stale copies."""
+        await self.flush()
+        stats = await self.backend.apply_retention(policy, now)
+        if stats.expired or stats.archived_events:
+            self.invalidate()
+        return stats
+
+    async def flush(self) -> int:
+        """
+        Write all pending write-behind sessions to the backend.
+
+        Returns:
+            Number of sessions flushed
+        """
+        flushed = await self._flush_evicted(list(self._pending))
+        for session_id in list(self._dirty):
+            async with self.lock(session_id):
+                if session_id not in self._dirty:
+                    continue
+                session = self._cache.get(session_id)
+                if session is not None:
+                    written = _copy_session(session)
+                    await self._write(session_id, written, None)
+                    if "version" in written:
+                        session["version"] = written["version"]
+                    flushed += 1
+                self._dirty.discard(session_id)
+        return flushed
+
+    async def close(self) -> None:
+        """Stop the background flusher and flush pending writes."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+
+    def invalidate(self, session_id: str | None = None) -> None:
+        """Drop one (or every) clean cached session."""
+        targets = [session_id] if session_id else list(self._cache)
+        for target in targets:
+            if target not in self._dirty:
+                self._cache.pop(target, None)
+
+    def get_cache_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        total = self._hits + self._misses
+        return {
+            "cache_size": len(self._cache),
+            "max_cache_size": self.max_sessions,
+            "cache_hits": self._hits,
+            "cache_misses": self._misses,
+            "hit_rate": self._hits / total if total > 0 else 0.0,
+            "evictions": self._evictions,
+            "dirty": len(self._dirty) + len(self._pending),
+            "backend_writes": self._backend_writes,
+            "mode": self.mode,
+        }
+
+    def __getattr__(self, name: str) -> Any:
+        """Expose wrapped backend extras (stats, ...)."""
+        if name == "backend":
+            raise AttributeError(name)
+        return getattr(self.backend, name)
+
+    def _expired(self, session: dict[str, Any]) -> bool:
+        """Whether a cached session is past the wrapped backend's TTL."""
+        retention = getattr(self.backend, "retention", None)
+        if retention is None or "updated_at" not in session:
+            return False
+        return retention.is_expired(session["updated_at"], time.time())
+
+    @staticmethod
+    def _view(session: dict[str, Any], last_n_events: int | None) -> dict[str, Any]:
+        """Copy of a cached session, optionally with only its last N events."""
+        if last_n_events is None:
+            return _copy_session(session)
+        # A cached session may itself omit archived events (events_offset)
+        header, events, base = _split_events(session)
+        events = events or []
+        recent = events[max(len(events) - last_n_events, 0) :]
+        view = _with_events(copy.deepcopy(header), recent, base + len(events))
+        if "version" in session:
+            view["version"] = session["version"]
+        return view
+
+    @staticmethod
+    def _merge(
+        cached: dict[str, Any] | None, session_data: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        """Full session after a save, or None if it can't be reconstructed."""
+        if "events_offset" not in session_data:
+            return session_data
+        base = (cached or {}).get("events_offset", 0)
+        header, events, offset = _split_events(session_data)
+        if cached is None or offset < base:
+            return None
+
+        full = dict(header)
+        full["events"] = (cached.get("events") or [])[: offset - base] + list(
+            events or []
+        )
+        if base:
+            full["events_offset"] = base
+        if "version" in session_data:
+            full["version"] = session_data["version"]
+        return full
+
+    async def _write(
+        self,
+        session_id: str,
+        session_data: dict[str, Any],
+        expected_version: int | None,
+    ) -> None:
+        """Save to the wrapped backend."""
+        if expected_version is not None and self._versioned:
+            await self.backend.save_session(
+                session_id, session_data, expected_version=expected_version
+            )
+        else:
+            await self.backend.save_session(session_id, session_data)
+        self._backend_writes += 1
+
+    def _lookup(self, session_id: str) -> tuple[dict[str, Any] | None, list[str]]:
+        """
+        Cached session, taking back one evicted but not yet written back.
+
+        Returns:
+            (cached session or None, IDs of dirty sessions evicted to make room)
+        """
+        cached = self._cache.get(session_id)
+        if cached is not None or session_id not in self._pending:
+            return cached, []
+        evicted = self._store(session_id, self._pending.pop(session_id))
+        self._dirty.add(session_id)
+        return self._cache[session_id], evicted
+
+    def _store(self, session_id: str, session: dict[str, Any]) -> list[str]:
+        """
+        Cache a copy of a session.
+
+        Dirty sessions pushed out move to the pending map, where reads and
+        saves still find them, until _flush_evicted writes them back.
+
+        Returns:
+            IDs of evicted dirty sessions
+        """
+        self._cache[session_id] = _copy_session(session)
+        self._cache.move_to_end(session_id)
+
+        evicted = []
+        while len(self._cache) > self.max_sessions:
+            old_id, old_session = self._cache.popitem(last=False)
+            self._evictions += 1
+            if old_id in self._dirty:
+                self._dirty.discard(old_id)
+                self._pending[old_id] = old_session
+                evicted.append(old_id)
+        return evicted
+
+    def _drop(self, session_id: str) -> None:
+        """Remove a session from the cache, discarding pending writes."""
+        self._cache.pop(session_id, None)
+        self._pending.pop(session_id, None)
+        self._dirty.discard(session_id)
+
+    async def _flush_evicted(self, evicted: list[str]) -> int:
+        """
+        Write back evicted dirty sessions still pending.
+
+        Returns:
+            Number of sessions written
+        """
+        flushed = 0
+        for session_id in evicted:
+            async with self.lock(session_id):
+                # Taken back into the cache or deleted in the meantime
+                session = self._pending.get(session_id)
+                if session is None:
+                    continue
+                await self._write(session_id, session, None)
+                self._pending.pop(session_id, None)
+                flushed += 1
+        return flushed
+
+    def _ensure_flusher(self) -> None:
+        """Start the background flusher if it isn't running."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(
+                self._flush_loop()
+            )
+
+    async def _flush_loop(self) -> None:
+        """Periodically flush pending writes."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Session cache flush failed: {e}")
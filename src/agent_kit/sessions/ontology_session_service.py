@@ -2,14 +2,33 @@
 Ontology-aware session service.
 
 Wraps a standard session backend (like ADK's) to add ontology context persistence.
+
+Per-turn updates can be buffered in a SessionMutation and flushed with a
+single backend write (see OntologySessionService.transaction).
 """
 
 from __future__ import annotations
 
+import asyncio
+import logging
+import random
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from typing import Any, Protocol, runtime_checkable
 
 from agent_kit.ontology.loader import OntologyLoader
 
+from .backends import EventLogBackend, SessionConflictError
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Full-jitter backoff between conflict replays (seconds)
+_RETRY_BASE_DELAY = 0.002
+_RETRY_MAX_DELAY = 0.1
+
 
 @runtime_checkable
 class SessionBackend(Protocol):
@@ -24,6 +43,82 @@ class SessionBackend(Protocol):
         ...
 
 
+@dataclass
+class SessionMutation:
+    """
+    Buffered changes to one session, applied in a single backend write.
+
+    Changes are recorded as operations rather than a session snapshot, so a
+    flush that loses a version race can replay them onto the fresh session.
+    """
+
+    session_id: str
+    entities: list[str] = field(default_factory=list)
+    queries: list[str] = field(default_factory=list)
+    events: list[dict[str, Any]] = field(default_factory=list)
+    state: dict[str, Any] = field(default_factory=dict)
+
+    def add_entity(self, entity_uri: str) -> None:
+        """Buffer an extracted entity (deduplicated on apply)."""
+        if entity_uri not in self.entities:
+            self.entities.append(entity_uri)
+
+    def add_query(self, query: str) -> None:
+        """Buffer a SPARQL query for the session history."""
+        self.queries.append(query)
+
+    def append_event(self, event: dict[str, Any]) -> None:
+        """Buffer an event for the session's event log."""
+        self.events.append(event)
+
+    def set_state(self, key: str, value: Any) -> None:
+        """Buffer a session state (metadata) update."""
+        self.state[key] = value
+
+    @property
+    def pending(self) -> bool:
+        """Whether any change is buffered."""
+        return bool(self.entities or self.queries or self.events or self.state)
+
+    def apply(self, session: dict[str, Any]) -> bool:
+        """
+        Apply buffered changes to a session dict in place.
+
+        Returns:
+            Whether the session changed
+        """
+        context = session["ontology_context"]
+        changed = False
+
+        for entity_uri in self.entities:
+            if entity_uri not in context["entities"]:
+                context["entities"].append(entity_uri)
+                changed = True
+
+        if self.queries:
+            context["queries"].extend(self.queries)
+            changed = True
+
+        if self.events:
+            session.setdefault("events", []).extend(self.events)
+            changed = True
+
+        metadata = session.setdefault("metadata", {})
+        for key, value in self.state.items():
+            if metadata.get(key, _MISSING) != value:
+                metadata[key] = value
+                changed = True
+
+        return changed
+
+    def clear(self) -> None:
+        """Drop buffered changes."""
+        self.entities.clear()
+        self.queries.clear()
+        self.events.clear()
+        self.state.clear()
+
+
 class OntologySessionService:
     """
     Wraps a session backend to manage ontology context within sessions.
@@ -32,6 +127,14 @@ class OntologySessionService:
     1. Ontology entities extracted in previous turns are persisted.
     2. SPARQL query history is maintained across turns.
     3. Session metadata is linked to ontology concepts.
+
+    Example:
+        >>> service = OntologySessionService(backend, ontology)
+        >>> async with service.transaction("session_001") as tx:
+        ...     tx.add_entity("http://example.org/business#Revenue")
+        ...     tx.add_query("SELECT ?s WHERE { ?s a :Revenue }")
+        ...     tx.append_event({"author": "agent", "content": "..."})
+        >>> # One backend write for the whole turn
     """
 
     def __init__(self, backend: SessionBackend, ontology: OntologyLoader):
@@ -56,19 +159,41 @@ class OntologySessionService:
             Session dictionary with 'ontology_context' key
         """
         session = await self.backend.get_session(session_id)
+        return self._ensure_context(session)
+
+    async def _get_header(self, session_id: str) -> dict[str, Any]:
+        """
+        Retrieve session without its events when the backend allows it.
+
+        Ontology context lives in the session header, so context updates on
+        event-log backends don't read or rewrite the event history.
+        """
+        if isinstance(self.backend, EventLogBackend):
+            session = await self.backend.get_session(session_id, last_n_events=0)
+        else:
+            session = await self.backend.get_session(session_id)
+        return self._ensure_context(session)
 
+    @staticmethod
+    def _ensure_context(session: dict[str, Any]) -> dict[str, Any]:
+        """Add an empty ontology context to sessions that lack one."""
         if "ontology_context" not in session:
             session["ontology_context"] = {"entities": [], "queries": [], "history": []}
-
         return session
 
-    async def save_session(self, session_id: str, session_data: dict[str, Any]) -> None:
+    async def save_session(
+        self,
+        session_id: str,
+        session_data: dict[str, Any],
+        expected_version: int | None = None,
+    ) -> None:
         """
         Save session data, ensuring ontology context is preserved.
 
         Args:
             session_id: Unique session identifier
             session_data: Session dictionary to save
+            expected_version: Optimistic version check (event-log backends)
         """
         # Validate entities before saving (optional)
         if "ontology_context" in session_data:
@@ -76,32 +201,130 @@ class OntologySessionService:
             if not isinstance(entities, list):
                 raise ValueError("ontology_context.entities must be a list")
 
-        await self.backend.save_session(session_id, session_data)
+        if expected_version is not None and isinstance(self.backend, EventLogBackend):
+            await self.backend.save_session(
+                session_id, session_data, expected_version=expected_version
+            )
+        else:
+            await self.backend.save_session(session_id, session_data)
+
+    @asynccontextmanager
+    async def transaction(
+        self, session_id: str, max_retries: int | None = 3
+    ) -> AsyncIterator[SessionMutation]:
+        """
+        Buffer session updates and flush them in one write on exit.
+
+        Nothing is written if the block raises.
+
+        Args:
+            session_id: Session ID
+            max_retries: Replays allowed after a concurrent-writer conflict
+                (None retries until the flush lands)
+
+        Yields:
+            SessionMutation to record entity, query, event and state updates
+        """
+        mutation = SessionMutation(session_id)
+        yield mutation
+        await self.commit(mutation, max_retries=max_retries)
+
+    async def commit(
+        self, mutation: SessionMutation, max_retries: int | None = 3
+    ) -> bool:
+        """
+        Apply a SessionMutation with a single backend write.
+
+        On event-log backends the write is optimistic: if another writer
+        changed the session since it was read, the buffered operations are
+        replayed onto the fresh session after a jittered exponential backoff,
+        up to max_retries times. Every conflict means another writer's flush
+        landed, so unbounded retries always make progress.
+
+        Args:
+            mutation: Buffered changes
+            max_retries: Replays allowed after a conflict (None = unbounded)
+
+        Returns:
+            Whether a write was needed
+
+        Raises:
+            SessionConflictError: If conflicts persist after all retries
+        """
+        if not mutation.pending:
+            return False
+
+        session_id = mutation.session_id
+        versioned = isinstance(self.backend, EventLogBackend)
+        attempt = 0
+        while True:
+            session = await self._get_header(session_id)
+            if not mutation.apply(session):
+                mutation.clear()
+                return False
+
+            try:
+                await self.save_session(
+                    session_id,
+                    session,
+                    expected_version=session.get("version") if versioned else None,
+                )
+            except SessionConflictError:
+                if max_retries is not None and attempt >= max_retries:
+                    raise
+                attempt += 1
+                logger.debug(
+                    f"Session {session_id} changed concurrently; "
+                    f"retrying flush ({attempt}/{max_retries or 'unbounded'})"
+                )
+                delay = min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2**attempt)
+                await asyncio.sleep(random.uniform(0, delay))
+                continue
+
+            mutation.clear()
+            return True
 
     async def add_entity_to_session(self, session_id: str, entity_uri: str) -> None:
         """
         Add an extracted entity to the session context.
 
+        Retries concurrent-writer conflicts until the entity is stored.
+
         Args:
             session_id: Session ID
             entity_uri: URI of the entity to add
         """
-        session = await self.get_session(session_id)
-        entities = session["ontology_context"]["entities"]
-
-        if entity_uri not in entities:
-            entities.append(entity_uri)
-            await self.save_session(session_id, session)
+        async with self.transaction(session_id, max_retries=None) as tx:
+            tx.add_entity(entity_uri)
 
     async def add_query_to_session(self, session_id: str, query: str) -> None:
         """
         Add a SPARQL query to the session history.
 
+        Retries concurrent-writer conflicts until the query is stored.
+
         Args:
             session_id: Session ID
             query: SPARQL query string
         """
+        async with self.transaction(session_id, max_retries=None) as tx:
+            tx.add_query(query)
+
+    async def append_event(self, session_id: str, event: dict[str, Any]) -> None:
+        """
+        Append an event to the session history.
+
+        Uses the backend's append-only log when available, otherwise falls
+        back to a read-modify-write of the whole session.
+
+        Args:
+            session_id: Session ID
+            event: Event dictionary (id, author, timestamp, content, ...)
+        """
+        if isinstance(self.backend, EventLogBackend):
+            await self.backend.append_event(session_id, event)
+            return
+
         session = await self.get_session(session_id)
-        queries = session["ontology_context"]["queries"]
-        queries.append(query)
+        session.setdefault("events", []).append(event)
         await self.save_session(session_id, session)
@@ -0,0 +1,123 @@
+"""
+Retention policies for session storage.
+
+From first principles: A long-lived deployment creates sessions forever, and
+each active session's event log only grows. Retention keeps storage bounded:
+- TTL expiry (sessions idle longer than the TTL are deleted; reads treat
+  them as gone even before a sweep removes them)
+- Per-session event caps (events beyond the most recent ``max_events`` roll
+  over into zlib-compressed archive chunks, still retrievable on demand)
+
+Policies are enforced by SessionSweeper, either on demand via sweep() or
+periodically from a background asyncio task.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import zlib
+from dataclasses import dataclass
+from typing import Any
+
+from agent_kit.retention import PeriodicSweeper
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SessionRetentionPolicy:
+    """
+    Retention configuration for a session backend.
+
+    A limit of None disables it.
+    """
+
+    ttl_seconds: float | None = None
+    max_events: int | None = None
+    compression_level: int = 6
+    sweep_interval_seconds: float = 60.0
+
+    def __post_init__(self) -> None:
+        """Validate limits."""
+        if self.max_events is not None and self.max_events < 0:
+            raise ValueError("max_events must be non-negative")
+        if not 0 <= self.compression_level <= 9:
+            raise ValueError("compression_level must be between 0 and 9")
+        if self.sweep_interval_seconds <= 0:
+            raise ValueError("sweep_interval_seconds must be positive")
+
+    def is_expired(self, updated_at: float, now: float) -> bool:
+        """Whether a session last updated at ``updated_at`` has expired."""
+        return self.ttl_seconds is not None and now - updated_at > self.ttl_seconds
+
+
+@dataclass
+class SessionSweepStats:
+    """Outcome of a single session retention sweep."""
+
+    expired: int = 0
+    archived_events: int = 0
+    archives_created: int = 0
+    duration_seconds: float = 0.0
+
+
+def compress_events(events: list[Any], level: int = 6) -> bytes:
+    """Compress events (dicts or pre-encoded JSON strings) into an archive chunk."""
+    encoded = [e if isinstance(e, str) else json.dumps(e) for e in events]
+    return zlib.compress(("[" + ",".join(encoded) + "]").encode(), level)
+
+
+def decompress_events(blob: bytes) -> list[dict[str, Any]]:
+    """Decode an archive chunk back into events."""
+    return json.loads(zlib.decompress(blob))
+
+
+class SessionSweeper(PeriodicSweeper):
+    """
+    Enforces a SessionRetentionPolicy against a session backend.
+
+    The backend must implement ``apply_retention``; InMemorySessionBackend
+    and SqliteSessionBackend do.
+
+    Example:
+        >>> backend = SqliteSessionBackend(
+        ...     "sessions.db", retention=SessionRetentionPolicy(ttl_seconds=86400)
+        ... )
+        >>> sweeper = SessionSweeper(backend)
+        >>> stats = await sweeper.sweep()
+        >>> sweeper.start()  # periodic sweeps in the background
+    """
+
+    label = "Session"
+
+    def __init__(self, backend: Any, policy: SessionRetentionPolicy | None = None):
+        """
+        Initialize sweeper.
+
+        Args:
+            backend: Session backend exposing apply_retention
+            policy: Retention limits (default: the backend's own policy)
+        """
+        if not hasattr(backend, "apply_retention"):
+            raise TypeError(
+                f"{type(backend).__name__} does not support apply_retention; "
+                "retention cannot be enforced"
+            )
+        policy = policy or getattr(backend, "retention", None)
+        if policy is None:
+            raise ValueError("No retention policy given or configured on backend")
+
+        super().__init__(backend, policy)
+        self.last_stats: SessionSweepStats | None = None
+
+    async def _sweep(self, now: float) -> SessionSweepStats:
+        """Expire idle sessions, then roll over events beyond the cap."""
+        stats = await self.backend.apply_retention(self.policy, now)
+        if stats.expired or stats.archived_events:
+            logger.info(
+                f"Session sweep: expired={stats.expired} "
+                f"archived_events={stats.archived_events} "
+                f"archives={stats.archives_created}"
+            )
+        return stats
@@ -0,0 +1,271 @@
+"""
+Connection management for SQLite-backed session storage.
+
+From first principles: Opening a connection per operation pays for the file
+open, schema load and statement compilation every time, and the default
+rollback journal makes readers wait behind writers. Instead:
+- One dedicated writer thread owns the only write connection (SQLite allows
+  one writer at a time anyway) and commits queued writes together
+- A bounded pool of reader connections serves concurrent reads under WAL
+- Connections are persistent, so sqlite3's per-connection statement cache
+  keeps hot statements prepared
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_STOP = object()
+
+SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
+class SqliteConnectionPool:
+    """
+    Single-writer, multi-reader SQLite connection manager.
+
+    Writes are callables run on the writer thread inside a transaction; each
+    runs in its own savepoint, so one failing write does not roll back the
+    others committed in the same batch. Writes already queued when the writer
+    wakes are committed together; ``group_commit_ms`` additionally waits that
+    long to gather more writes per commit (trading latency for throughput).
+
+    Example:
+        >>> pool = SqliteConnectionPool("sessions.db", readers=4)
+        >>> await pool.write(lambda conn: conn.execute("INSERT ..."))
+        >>> rows = await pool.read(lambda conn: conn.execute("SELECT ...").fetchall())
+        >>> pool.close()
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        readers: int = 4,
+        synchronous: str = "NORMAL",
+        busy_timeout_ms: int = 5000,
+        group_commit_ms: float = 0.0,
+        max_batch: int = 64,
+        cached_statements: int = 256,
+    ):
+        """
+        Initialize pool and start the writer thread.
+
+        Args:
+            db_path: Path to SQLite database file (":memory:" disables readers)
+            readers: Max concurrent reader connections
+            synchronous: PRAGMA synchronous level (OFF, NORMAL, FULL, EXTRA)
+            busy_timeout_ms: How long a connection waits on a locked database
+            group_commit_ms: Extra time the writer waits to batch commits
+            max_batch: Max writes per commit
+            cached_statements: Prepared statements cached per connection
+        """
+        synchronous = synchronous.upper()
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(
+                f"synchronous must be one of {SYNCHRONOUS_MODES}, got {synchronous}"
+            )
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+
+        self.db_path = str(db_path)
+        self.synchronous = synchronous
+        self.busy_timeout_ms = busy_timeout_ms
+        self.group_commit_ms = group_commit_ms
+        self.max_batch = max_batch
+        self.cached_statements = cached_statements
+
+        # An in-memory database is private to its connection, so reads must
+        # share the writer's connection
+        self._in_memory = self.db_path == ":memory:"
+        self.max_readers = 0 if self._in_memory else max(readers, 0)
+
+        self._readers: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._reader_lock = threading.Lock()
+        self._reader_slots = threading.BoundedSemaphore(max(self.max_readers, 1))
+        self._all_readers: list[sqlite3.Connection] = []
+
+        self._writes: queue.Queue[Any] = queue.Queue()
+        self._closed = False
+        self.stats = {"writes": 0, "commits": 0, "failed_writes": 0}
+
+        self._writer_conn = self._connect()
+        self._writer = threading.Thread(
+            target=self._writer_loop, name=f"sqlite-writer:{self.db_path}", daemon=True
+        )
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a tuned connection in autocommit mode."""
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=self.cached_statements,
+        )
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        if not self._in_memory:
+            conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        return conn
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a reader connection (blocks while all are in use)."""
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+
+        with self._reader_slots:
+            try:
+                conn = self._readers.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+                with self._reader_lock:
+                    self._all_readers.append(conn)
+            try:
+                yield conn
+            finally:
+                self._readers.put(conn)
+
+    def read_sync(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run a read on a pooled reader connection in the calling thread."""
+        if self._in_memory:
+            return self.write_sync(fn)
+        with self.reader() as conn:
+            return fn(conn)
+
+    async def read(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run a read without blocking the event loop."""
+        if self._in_memory:
+            return await self.write(fn)
+        return await asyncio.to_thread(self.read_sync, fn)
+
+    def submit_write(
+        self, fn: Callable[[sqlite3.Connection], T]
+    ) -> concurrent.futures.Future[T]:
+        """Queue a write for the writer thread; resolves after commit."""
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        future: concurrent.futures.Future[T] = concurrent.futures.Future()
+        self._writes.put((fn, future))
+        return future
+
+    def write_sync(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run a write and wait for its commit."""
+        return self.submit_write(fn).result()
+
+    async def write(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run a write and await its commit without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit_write(fn))
+
+    def _writer_loop(self) -> None:
+        """Drain the write queue, committing writes in batches."""
+        stopping = False
+        while not stopping:
+            job = self._writes.get()
+            if job is _STOP:
+                break
+
+            batch = [job]
+            deadline = time.monotonic() + self.group_commit_ms / 1000
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        job = self._writes.get(timeout=remaining)
+                    else:
+                        job = self._writes.get_nowait()
+                except queue.Empty:
+                    break
+                if job is _STOP:
+                    stopping = True
+                    break
+                batch.append(job)
+
+            self._commit_batch(batch)
+
+        self._writer_conn.close()
+
+    def _commit_batch(self, batch: list[tuple[Callable[..., Any], Any]]) -> None:
+        """
+        Run a batch of writes in one transaction.
+
+        Never raises: if the transaction itself fails (BEGIN, a savepoint,
+        COMMIT, or SQLite rolling back on its own after SQLITE_FULL/IOERR),
+        it is rolled back and every write in the batch that hasn't resolved
+        fails with the error, so the writer thread keeps serving the queue.
+        """
+        try:
+            self._run_batch(batch)
+        except Exception as e:
+            logger.error(f"SQLite write batch failed: {e}")
+            self._abort_transaction()
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    def _run_batch(self, batch: list[tuple[Callable[..., Any], Any]]) -> None:
+        """Run each write in its own savepoint, commit, then resolve futures."""
+        conn = self._writer_conn
+        outcomes: list[tuple[concurrent.futures.Future[Any], Any, Exception | None]]
+        outcomes = []
+
+        conn.execute("BEGIN IMMEDIATE")
+        for fn, future in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+            conn.execute("SAVEPOINT session_write")
+            try:
+                result = fn(conn)
+            except Exception as e:
+                conn.execute("ROLLBACK TO SAVEPOINT session_write")
+                conn.execute("RELEASE SAVEPOINT session_write")
+                outcomes.append((future, None, e))
+            else:
+                conn.execute("RELEASE SAVEPOINT session_write")
+                outcomes.append((future, result, None))
+        conn.execute("COMMIT")
+
+        self.stats["commits"] += 1
+        for future, result, error in outcomes:
+            if error is None:
+                self.stats["writes"] += 1
+                future.set_result(result)
+            else:
+                self.stats["failed_writes"] += 1
+                future.set_exception(error)
+
+    def _abort_transaction(self) -> None:
+        """Roll back whatever is left of a failed batch's transaction."""
+        conn = self._writer_conn
+        if not conn.in_transaction:
+            return
+        try:
+            conn.execute("ROLLBACK")
+        except sqlite3.Error as e:
+            logger.error(f"SQLite rollback after failed batch failed: {e}")
+
+    def close(self) -> None:
+        """Flush pending writes and close all connections."""
+        if self._closed:
+            return
+        self._closed = True
+        self._writes.put(_STOP)
+        self._writer.join()
+        with self._reader_lock:
+            for conn in self._all_readers:
+                conn.close()
+            self._all_readers.clear()
@@ -54,7 +54,7 @@ class ArbitrageOpportunity(BaseModel):
 
 
 @function_tool
-@with_circuit_breaker(max_failures=5, reset_timeout=180)
+@with_circuit_breaker(max_failures=5, reset_timeout=180, name="odds_api")
 def fetch_odds(
     sport: str = "basketball_nba",
     market: str = "h2h",
@@ -116,7 +116,7 @@ def fetch_odds(
 
 
 @function_tool
-@with_circuit_breaker(max_failures=5, reset_timeout=180)
+@with_circuit_breaker(max_failures=5, reset_timeout=180, name="odds_api")
 def fetch_player_props(
     sport: str = "basketball_nba", player_name: str | None = None
 ) -> list[dict]:
@@ -0,0 +1,448 @@
+"""
+Vectorized technical indicator kernels.
+
+From first principles: Every indicator here is either a recursive filter
+(EMA, Wilder smoothing) or a fixed-length window (SMA, rolling standard
+deviation), and both have array forms that avoid a Python loop per bar:
+- y[t] = a*x[t] + (1-a)*y[t-1] unrolls within a block to a scaled
+  cumulative sum, so only one Python step runs per block of bars
+- window sums are differences of one cumulative sum; window standard
+  deviations reduce a strided (copy-free) view of the series
+
+Kernels work along the last axis, so they take one series (T,) or a batch
+(N, T), and return arrays aligned with the input (NaN during warm-up).
+``latest_indicators`` screens a whole universe (time x symbol matrix or
+long polars frame) in one pass and returns one column per indicator.
+"""
+
+from __future__ import annotations
+
+import warnings
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+INDICATOR_NAMES = (
+    "rsi",
+    "macd",
+    "macd_signal",
+    "macd_histogram",
+    "ema_20",
+    "ema_50",
+    "bollinger_upper",
+    "bollinger_middle",
+    "bollinger_lower",
+    "volatility",
+    "sharpe_ratio",
+)
+
+# Largest power of ten the in-block scaling (1-a)^-k may reach
+_MAX_SCALE_EXPONENT = 100
+
+
+def _check_period(period: int) -> None:
+    if period < 1:
+        raise ValueError(f"period must be >= 1, got {period}")
+
+
+def _exponential_filter(
+    values: np.ndarray, alpha: float, initial: np.ndarray | float
+) -> np.ndarray:
+    """
+    y[0] = initial; y[t] = alpha * values[t] + (1 - alpha) * y[t-1].
+
+    Within a block of k bars starting from carry c:
+        y[k] = (1-a)^(k+1) * c + a * (1-a)^k * cumsum((1-a)^-j * x[j])[k]
+    The block length keeps (1-a)^-k below 1e100, so the scaled sum stays
+    finite and its rounding error stays relative to the largest term.
+    """
+    out = np.empty(values.shape, dtype=np.float64)
+    n = values.shape[-1]
+    if n == 0:
+        return out
+    out[..., 0] = initial
+    decay = 1.0 - alpha
+    if decay == 0.0:
+        out[..., 1:] = values[..., 1:]
+        return out
+
+    block = max(1, int(_MAX_SCALE_EXPONENT / -np.log10(decay)))
+    carry = out[..., 0]
+    for lo in range(1, n, block):
+        hi = min(lo + block, n)
+        steps = np.arange(hi - lo)
+        shrink = decay**steps
+        scaled = np.cumsum(values[..., lo:hi] / shrink, axis=-1)
+        out[..., lo:hi] = alpha * scaled * shrink + decay * shrink * carry[..., None]
+        carry = out[..., hi - 1]
+    return out
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Exponential moving average, alpha = 2 / (period + 1), seeded with the first value.
+
+    Args:
+        values: Series (T,) or batch (N, T)
+        period: EMA span
+
+    Returns:
+        EMA aligned with ``values``
+    """
+    _check_period(period)
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape[-1] == 0:
+        return values.copy()
+    return _exponential_filter(values, 2.0 / (period + 1), values[..., 0])
+
+
+def wilder_smooth(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder's smoothing (alpha = 1 / period) seeded with the first full SMA.
+
+    Args:
+        values: Series (T,) or batch (N, T)
+        period: Smoothing period
+
+    Returns:
+        Smoothed values; the first ``period - 1`` entries are NaN
+    """
+    _check_period(period)
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < period:
+        return out
+    seed = values[..., :period].mean(axis=-1)
+    out[..., period - 1 :] = _exponential_filter(
+        values[..., period - 1 :], 1.0 / period, seed
+    )
+    return out
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sum over a trailing window via differences of one cumulative sum.
+
+    Args:
+        values: Series (T,) or batch (N, T)
+        window: Window length
+
+    Returns:
+        Window sums; the first ``window - 1`` entries are NaN
+    """
+    _check_period(window)
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    n = values.shape[-1]
+    if n < window:
+        return out
+    # Offsetting by the first value keeps the running total small
+    offset = values[..., :1]
+    total = np.cumsum(values - offset, axis=-1)
+    sums = total[..., window - 1 :].copy()
+    sums[..., 1:] -= total[..., : n - window]
+    out[..., window - 1 :] = sums + window * offset
+    return out
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average over a trailing window (NaN during warm-up)."""
+    return rolling_sum(values, window) / window
+
+
+def rolling_std(values: np.ndarray, window: int, ddof: int = 0) -> np.ndarray:
+    """
+    Standard deviation over a trailing window.
+
+    Reduces a strided view (no copy of the series) with the two-pass
+    formula, so results match ``np.std`` of each window.
+
+    Args:
+        values: Series (T,) or batch (N, T)
+        window: Window length
+        ddof: Delta degrees of freedom
+
+    Returns:
+        Window standard deviations; the first ``window - 1`` entries are NaN
+    """
+    _check_period(window)
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < window:
+        return out
+    windows = sliding_window_view(values, window, axis=-1)
+    out[..., window - 1 :] = windows.std(axis=-1, ddof=ddof)
+    return out
+
+
+def _lag(values: np.ndarray, fill: float = np.nan) -> np.ndarray:
+    """Prepend one ``fill`` column so per-step series align with prices."""
+    pad = np.full(values.shape[:-1] + (1,), fill)
+    return np.concatenate([pad, values], axis=-1)
+
+
+def rsi(prices: np.ndarray, period: int = 14, smoothing: str = "simple") -> np.ndarray:
+    """
+    Relative Strength Index.
+
+    Args:
+        prices: Closing prices (T,) or (N, T)
+        period: Lookback in price changes
+        smoothing: "simple" (mean of the last ``period`` gains/losses, as
+            ``calculate_rsi``) or "wilder" (Wilder's smoothing)
+
+    Returns:
+        RSI in [0, 100] aligned with ``prices``; the first ``period``
+        entries are NaN. Windows without losses read 100.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    deltas = np.diff(prices, axis=-1)
+    gains = np.maximum(deltas, 0.0)
+    losses = np.maximum(-deltas, 0.0)
+    if smoothing == "simple":
+        avg_gain = rolling_mean(gains, period)
+        avg_loss = rolling_mean(losses, period)
+    elif smoothing == "wilder":
+        avg_gain = wilder_smooth(gains, period)
+        avg_loss = wilder_smooth(losses, period)
+    else:
+        raise ValueError(f"Unknown smoothing: {smoothing}")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    value = np.where(avg_loss == 0, 100.0, value)
+    return _lag(value)
+
+
+def macd(
+    prices: np.ndarray,
+    fast_period: int = 12,
+    slow_period: int = 26,
+    signal_period: int = 9,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD line, signal line and histogram.
+
+    Args:
+        prices: Closing prices (T,) or (N, T)
+        fast_period: Fast EMA period
+        slow_period: Slow EMA period
+        signal_period: Signal EMA period
+
+    Returns:
+        (macd, signal, histogram), each aligned with ``prices``
+    """
+    line = ema(prices, fast_period) - ema(prices, slow_period)
+    signal = ema(line, signal_period)
+    return line, signal, line - signal
+
+
+def bollinger_bands(
+    prices: np.ndarray, period: int = 20, std_dev: float = 2.0
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bollinger Bands (SMA +/- ``std_dev`` population standard deviations).
+
+    Returns:
+        (upper, middle, lower), NaN for the first ``period - 1`` entries
+    """
+    middle = rolling_mean(prices, period)
+    width = std_dev * rolling_std(prices, period)
+    return middle + width, middle, middle - width
+
+
+def volatility(
+    prices: np.ndarray,
+    period: int = 20,
+    annualize: bool = True,
+    periods_per_year: float = 252,
+) -> np.ndarray:
+    """
+    Rolling standard deviation of simple returns.
+
+    Args:
+        prices: Closing prices (T,) or (N, T)
+        period: Returns per window
+        annualize: Scale by sqrt(periods_per_year)
+        periods_per_year: Bars per year
+
+    Returns:
+        Volatility aligned with ``prices``; the first ``period`` entries are NaN
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    returns = np.diff(prices, axis=-1) / prices[..., :-1]
+    vol = rolling_std(returns, period)
+    if annualize:
+        vol = vol * np.sqrt(periods_per_year)
+    return _lag(vol)
+
+
+def sharpe_ratio(
+    returns: np.ndarray, risk_free_rate: float = 0.02, periods_per_year: float = 252
+) -> float | np.ndarray:
+    """
+    Annualized Sharpe ratio, (mean * ppy - rf) / (std * sqrt(ppy)).
+
+    NaN returns are skipped, so ragged batches can be NaN-padded. Fewer
+    than two returns or zero variance give 0.
+
+    Args:
+        returns: Period returns (T,) or (N, T)
+        risk_free_rate: Annual risk-free rate
+        periods_per_year: Periods per year
+
+    Returns:
+        Float for one series, (N,) array for a batch
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    count = np.sum(~np.isnan(returns), axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN rows
+        mean = np.nanmean(returns, axis=-1)
+        std = np.nanstd(returns, axis=-1)
+        ratio = (mean * periods_per_year - risk_free_rate) / (
+            std * np.sqrt(periods_per_year)
+        )
+    ratio = np.where((count < 2) | (std == 0), 0.0, ratio)
+    return float(ratio) if ratio.ndim == 0 else ratio
+
+
+def _pack_observed(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Move each row's observations (in order) to the end of the last axis and
+    fill the freed leading slots with the first observation.
+
+    Dropping the NaNs leaves exactly the bars the symbol has. A constant
+    prefix equal to the first price leaves an EMA seeded at that price
+    unchanged, and every window that reaches into the prefix falls under
+    the too-little-history fallbacks, so a packed row gives the same latest
+    values as its observed series on its own.
+
+    Returns:
+        (packed values, index of the first observation per row; T if none)
+    """
+    valid = ~np.isnan(values)
+    n = values.shape[-1]
+    first = n - valid.sum(axis=-1)
+    packed = np.take_along_axis(
+        values, np.argsort(valid, axis=-1, kind="stable"), axis=-1
+    )
+    source = np.maximum(np.arange(n), np.minimum(first, n - 1)[..., None])
+    return np.take_along_axis(packed, source, axis=-1), first
+
+
+def latest_indicators(
+    close: np.ndarray,
+    names: Sequence[str] | None = None,
+    risk_free_rate: float = 0.02,
+    periods_per_year: float = 252,
+) -> dict[str, np.ndarray]:
+    """
+    Latest indicator values for every symbol of a time x symbol close matrix.
+
+    Uses the defaults and fallbacks of ``calculate_indicators`` (RSI 50,
+    MACD 0, EMA-50 -> EMA-20, bands at the last price, volatility 0 when a
+    symbol has too little history). NaN marks a missing bar: each column is
+    computed on its own observed rows, so late listings and gaps give the
+    same values as the single series of that symbol's prices, as of its
+    last observation. Windowed indicators only touch the last few rows, so
+    cost is dominated by the EMAs.
+
+    Args:
+        close: Close prices (T, N), one column per symbol
+        names: Indicators to compute (default: INDICATOR_NAMES)
+        risk_free_rate: Annual risk-free rate for the Sharpe ratio
+        periods_per_year: Bars per year for volatility and Sharpe
+
+    Returns:
+        Dict of indicator name -> (N,) array (NaN for symbols with no prices)
+    """
+    names = INDICATOR_NAMES if names is None else tuple(names)
+    unknown = set(names) - set(INDICATOR_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown indicators: {sorted(unknown)}")
+
+    raw = np.ascontiguousarray(np.asarray(close, dtype=np.float64).T)
+    n = raw.shape[-1]
+    if n == 0:
+        return {name: np.full(len(raw), np.nan) for name in names}
+    prices, first = _pack_observed(raw)
+    history = n - first
+    last = prices[:, -1]
+    out: dict[str, np.ndarray] = {}
+
+    def tail(k: int) -> np.ndarray:
+        return prices[:, max(n - k, 0) :]
+
+    if "rsi" in names:
+        out["rsi"] = np.where(history >= 15, rsi(tail(15), 14)[:, -1], 50.0)
+    if {"macd", "macd_signal", "macd_histogram"} & set(names):
+        enough = history >= 26 + 9
+        for name, series in zip(
+            ("macd", "macd_signal", "macd_histogram"), macd(prices), strict=True
+        ):
+            if name in names:
+                out[name] = np.where(enough, series[:, -1], 0.0)
+    if "ema_20" in names or "ema_50" in names:
+        ema_20 = ema(prices, 20)[:, -1]
+        if "ema_20" in names:
+            out["ema_20"] = ema_20
+        if "ema_50" in names:
+            out["ema_50"] = np.where(history >= 50, ema(prices, 50)[:, -1], ema_20)
+    bands = ("bollinger_upper", "bollinger_middle", "bollinger_lower")
+    if set(bands) & set(names):
+        enough = history >= 20
+        for name, series in zip(bands, bollinger_bands(tail(20), 20), strict=True):
+            if name in names:
+                out[name] = np.where(enough, series[:, -1], last)
+    if "volatility" in names:
+        vol = volatility(tail(21), 20, periods_per_year=periods_per_year)[:, -1]
+        out["volatility"] = np.where(history >= 21, vol, 0.0)
+    if "sharpe_ratio" in names:
+        returns = np.diff(prices, axis=-1) / prices[:, :-1]
+        returns[np.arange(n - 1) < first[:, None]] = np.nan
+        out["sharpe_ratio"] = np.atleast_1d(
+            sharpe_ratio(returns, risk_free_rate, periods_per_year)
+        )
+
+    empty = history == 0
+    return {name: np.where(empty, np.nan, out[name]) for name in names}
+
+
+def latest_indicators_frame(
+    frame: Any,
+    names: Sequence[str] | None = None,
+    timestamp: str = "timestamp",
+    symbol: str = "ticker",
+    close: str = "close",
+    risk_free_rate: float = 0.02,
+    periods_per_year: float = 252,
+) -> Any:
+    """
+    ``latest_indicators`` for a long-format polars DataFrame.
+
+    Args:
+        frame: One row per (timestamp, symbol) with a close column
+        names: Indicators to compute (default: INDICATOR_NAMES)
+        timestamp: Timestamp column
+        symbol: Symbol column
+        close: Close price column
+        risk_free_rate: Annual risk-free rate for the Sharpe ratio
+        periods_per_year: Bars per year for volatility and Sharpe
+
+    Returns:
+        polars DataFrame with one row per symbol and one column per indicator
+    """
+    import polars as pl
+
+    symbols, column = np.unique(
+        frame.get_column(symbol).cast(pl.String).to_numpy(), return_inverse=True
+    )
+    _, row = np.unique(frame.get_column(timestamp).to_numpy(), return_inverse=True)
+    matrix = np.full((row.max(initial=-1) + 1, len(symbols)), np.nan)
+    matrix[row, column] = frame.get_column(close).cast(pl.Float64).to_numpy()
+
+    values = latest_indicators(matrix, names, risk_free_rate, periods_per_year)
+    return pl.DataFrame({symbol: symbols, **values})
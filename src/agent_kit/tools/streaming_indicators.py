@@ -0,0 +1,437 @@
+"""
+Incremental indicators for live market data.
+
+From first principles: A live feed adds one bar at a time, and every
+indicator in ``indicators`` can be carried forward from a few numbers
+instead of being recomputed over the whole history:
+- EMA / Wilder smoothing: the previous average
+- window mean and standard deviation: a ring of the last N values plus a
+  running mean and sum of squared deviations (Welford's update, with the
+  oldest value swapped out)
+- RSI, MACD, Bollinger Bands, volatility: combinations of the above
+
+So each update is O(1) regardless of history length. Running sums drift by
+a rounding error per update, so window totals are recomputed from the ring
+each time it wraps (O(1) amortized).
+
+State is plain data: ``snapshot()`` returns a JSON-serializable dict and
+``restore_indicator(state)`` rebuilds the object, so a feed handler can
+checkpoint and resume without replaying history. Values match the batch
+kernels bar for bar (NaN during warm-up).
+"""
+
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from typing import Any, ClassVar
+
+from agent_kit.tools.indicators import INDICATOR_NAMES
+
+_NAN = float("nan")
+
+
+class StreamingIndicator(ABC):
+    """
+    Base class: ``update(value)`` consumes one bar and returns the latest value.
+
+    Subclasses list their state in ``__slots__``; ``snapshot``/``restore``
+    copy exactly those attributes.
+    """
+
+    __slots__ = ()
+    kind: ClassVar[str] = ""
+    _kinds: ClassVar[dict[str, type[StreamingIndicator]]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        if cls.kind:
+            StreamingIndicator._kinds[cls.kind] = cls
+
+    @abstractmethod
+    def update(self, value: float) -> Any:
+        """Consume one bar and return the latest value."""
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current state as a JSON-serializable dict."""
+        state: dict[str, Any] = {"kind": self.kind}
+        for name in self._state_slots():
+            value = getattr(self, name)
+            if isinstance(value, StreamingIndicator):
+                value = value.snapshot()
+            elif isinstance(value, list):
+                value = list(value)
+            state[name] = value
+        return state
+
+    @classmethod
+    def restore(cls, state: dict[str, Any]) -> StreamingIndicator:
+        """Rebuild an indicator from ``snapshot()`` output."""
+        if state.get("kind") != cls.kind:
+            raise ValueError(
+                f"Snapshot of {state.get('kind')!r}, expected {cls.kind!r}"
+            )
+        indicator = cls.__new__(cls)
+        for name in cls._state_slots():
+            value = state[name]
+            if isinstance(value, dict) and "kind" in value:
+                value = restore_indicator(value)
+            elif isinstance(value, list):
+                value = list(value)
+            setattr(indicator, name, value)
+        return indicator
+
+    @classmethod
+    def _state_slots(cls) -> list[str]:
+        return [
+            name
+            for klass in reversed(cls.__mro__)
+            for name in getattr(klass, "__slots__", ())
+        ]
+
+
+def restore_indicator(state: dict[str, Any]) -> StreamingIndicator:
+    """Rebuild any streaming indicator from its ``snapshot()``."""
+    kind = state.get("kind")
+    if kind not in StreamingIndicator._kinds:
+        raise ValueError(f"Unknown indicator kind: {kind!r}")
+    return StreamingIndicator._kinds[kind].restore(state)
+
+
+def _check_period(period: int) -> None:
+    if period < 1:
+        raise ValueError(f"period must be >= 1, got {period}")
+
+
+class StreamingEMA(StreamingIndicator):
+    """
+    EMA with alpha = 2 / (period + 1), seeded with the first value.
+
+    Example:
+        >>> ema = StreamingEMA(20)
+        >>> for price in (100.0, 101.0, 102.0):
+        ...     latest = ema.update(price)
+    """
+
+    __slots__ = ("period", "alpha", "value", "count")
+    kind = "ema"
+
+    def __init__(self, period: int):
+        _check_period(period)
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.value = _NAN
+        self.count = 0
+
+    def update(self, value: float) -> float:
+        if self.count == 0:
+            self.value = float(value)
+        else:
+            self.value = self.alpha * value + (1.0 - self.alpha) * self.value
+        self.count += 1
+        return self.value
+
+
+class WilderAverage(StreamingIndicator):
+    """Wilder's smoothing: SMA of the first ``period`` values, then alpha = 1/period."""
+
+    __slots__ = ("period", "value", "count", "_seed_total")
+    kind = "wilder"
+
+    def __init__(self, period: int):
+        _check_period(period)
+        self.period = period
+        self.value = _NAN
+        self.count = 0
+        self._seed_total = 0.0
+
+    def update(self, value: float) -> float:
+        self.count += 1
+        if self.count < self.period:
+            self._seed_total += value
+        elif self.count == self.period:
+            self.value = (self._seed_total + value) / self.period
+        else:
+            self.value += (value - self.value) / self.period
+        return self.value
+
+
+class RollingStats(StreamingIndicator):
+    """
+    Mean and population standard deviation of the last ``window`` values.
+
+    Returns (mean, std), NaN until the window is full.
+    """
+
+    __slots__ = ("window", "_ring", "_index", "count", "_mean", "_m2")
+    kind = "rolling_stats"
+
+    def __init__(self, window: int):
+        _check_period(window)
+        self.window = window
+        self._ring: list[float] = []
+        self._index = 0
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, value: float) -> tuple[float, float]:
+        value = float(value)
+        self.count += 1
+        if len(self._ring) < self.window:
+            # Welford add while the ring fills
+            self._ring.append(value)
+            delta = value - self._mean
+            self._mean += delta / len(self._ring)
+            self._m2 += delta * (value - self._mean)
+        else:
+            # Swap the oldest value out of the running mean and M2
+            old = self._ring[self._index]
+            self._ring[self._index] = value
+            self._index = (self._index + 1) % self.window
+            if self._index == 0:
+                self._recompute()
+            else:
+                mean = self._mean + (value - old) / self.window
+                self._m2 += (value - old) * (value - mean + old - self._mean)
+                self._mean = mean
+        return self.value
+
+    def _recompute(self) -> None:
+        """Two-pass totals from the ring, dropping accumulated rounding."""
+        self._mean = math.fsum(self._ring) / self.window
+        self._m2 = math.fsum((v - self._mean) ** 2 for v in self._ring)
+
+    @property
+    def ready(self) -> bool:
+        return len(self._ring) == self.window
+
+    @property
+    def mean(self) -> float:
+        return self._mean if self.ready else _NAN
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(max(self._m2, 0.0) / self.window) if self.ready else _NAN
+
+    @property
+    def value(self) -> tuple[float, float]:
+        return self.mean, self.std
+
+
+class StreamingRSI(StreamingIndicator):
+    """
+    RSI over the last ``period`` price changes.
+
+    Args:
+        period: Lookback in price changes
+        smoothing: "simple" (window means, as ``calculate_rsi``) or "wilder"
+    """
+
+    __slots__ = ("period", "smoothing", "_previous", "_gains", "_losses", "value")
+    kind = "rsi"
+
+    def __init__(self, period: int = 14, smoothing: str = "simple"):
+        _check_period(period)
+        averages: type[StreamingIndicator]
+        if smoothing == "simple":
+            averages = RollingStats
+        elif smoothing == "wilder":
+            averages = WilderAverage
+        else:
+            raise ValueError(f"Unknown smoothing: {smoothing}")
+        self.period = period
+        self.smoothing = smoothing
+        self._previous = _NAN
+        self._gains = averages(period)
+        self._losses = averages(period)
+        self.value = _NAN
+
+    def update(self, value: float) -> float:
+        if not math.isnan(self._previous):
+            delta = value - self._previous
+            self._gains.update(max(delta, 0.0))
+            self._losses.update(max(-delta, 0.0))
+            self.value = self._rsi(
+                self._average(self._gains), self._average(self._losses)
+            )
+        self._previous = float(value)
+        return self.value
+
+    @staticmethod
+    def _average(average: StreamingIndicator) -> float:
+        return average.mean if isinstance(average, RollingStats) else average.value
+
+    @staticmethod
+    def _rsi(gain: float, loss: float) -> float:
+        if math.isnan(gain) or math.isnan(loss):
+            return _NAN
+        if loss == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + gain / loss)
+
+
+class StreamingMACD(StreamingIndicator):
+    """MACD line, signal and histogram; returns (macd, signal, histogram)."""
+
+    __slots__ = ("_fast", "_slow", "_signal")
+    kind = "macd"
+
+    def __init__(
+        self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9
+    ):
+        self._fast = StreamingEMA(fast_period)
+        self._slow = StreamingEMA(slow_period)
+        self._signal = StreamingEMA(signal_period)
+
+    def update(self, value: float) -> tuple[float, float, float]:
+        self._signal.update(self._fast.update(value) - self._slow.update(value))
+        return self.value
+
+    @property
+    def value(self) -> tuple[float, float, float]:
+        line = self._fast.value - self._slow.value
+        return line, self._signal.value, line - self._signal.value
+
+
+class StreamingBollinger(StreamingIndicator):
+    """Bollinger Bands of the last ``period`` prices; returns (upper, middle, lower)."""
+
+    __slots__ = ("std_dev", "_stats")
+    kind = "bollinger"
+
+    def __init__(self, period: int = 20, std_dev: float = 2.0):
+        self.std_dev = std_dev
+        self._stats = RollingStats(period)
+
+    def update(self, value: float) -> tuple[float, float, float]:
+        self._stats.update(value)
+        return self.value
+
+    @property
+    def value(self) -> tuple[float, float, float]:
+        middle, std = self._stats.value
+        return middle + self.std_dev * std, middle, middle - self.std_dev * std
+
+
+class StreamingVolatility(StreamingIndicator):
+    """Standard deviation of the last ``period`` simple returns (optionally annualized)."""
+
+    __slots__ = ("scale", "_previous", "_stats")
+    kind = "volatility"
+
+    def __init__(
+        self, period: int = 20, annualize: bool = True, periods_per_year: float = 252
+    ):
+        self.scale = math.sqrt(periods_per_year) if annualize else 1.0
+        self._previous = _NAN
+        self._stats = RollingStats(period)
+
+    def update(self, value: float) -> float:
+        if not math.isnan(self._previous):
+            self._stats.update(value / self._previous - 1.0)
+        self._previous = float(value)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self._stats.std * self.scale
+
+
+class IndicatorSet(StreamingIndicator):
+    """
+    Every indicator of ``latest_indicators`` for one live symbol.
+
+    ``update(close)`` returns the same dict (and fallbacks) that
+    ``latest_indicators`` gives for the history seen so far, in O(1).
+
+    Example:
+        >>> live = IndicatorSet()
+        >>> for bar in feed:
+        ...     snapshot = live.update(bar["close"])
+        >>> checkpoint = live.snapshot()
+    """
+
+    __slots__ = (
+        "risk_free_rate",
+        "periods_per_year",
+        "count",
+        "_last",
+        "_rsi",
+        "_macd",
+        "_ema_20",
+        "_ema_50",
+        "_bollinger",
+        "_volatility",
+        "_return_count",
+        "_return_mean",
+        "_return_m2",
+    )
+    kind = "indicator_set"
+
+    def __init__(self, risk_free_rate: float = 0.02, periods_per_year: float = 252):
+        self.risk_free_rate = risk_free_rate
+        self.periods_per_year = periods_per_year
+        self.count = 0
+        self._last = _NAN
+        self._rsi = StreamingRSI(14)
+        self._macd = StreamingMACD()
+        self._ema_20 = StreamingEMA(20)
+        self._ema_50 = StreamingEMA(50)
+        self._bollinger = StreamingBollinger(20)
+        self._volatility = StreamingVolatility(20, periods_per_year=periods_per_year)
+        # Welford totals of every return, for the Sharpe ratio
+        self._return_count = 0
+        self._return_mean = 0.0
+        self._return_m2 = 0.0
+
+    def update(self, value: float) -> dict[str, float]:
+        value = float(value)
+        self.count += 1
+        for indicator in (
+            self._rsi,
+            self._macd,
+            self._ema_20,
+            self._ema_50,
+            self._bollinger,
+            self._volatility,
+        ):
+            indicator.update(value)
+        if self.count > 1:
+            change = value / self._last - 1.0
+            self._return_count += 1
+            delta = change - self._return_mean
+            self._return_mean += delta / self._return_count
+            self._return_m2 += delta * (change - self._return_mean)
+        self._last = value
+        return self.value
+
+    @property
+    def value(self) -> dict[str, float]:
+        if self.count == 0:
+            return dict.fromkeys(INDICATOR_NAMES, _NAN)
+        macd = self._macd.value if self.count >= 26 + 9 else (0.0, 0.0, 0.0)
+        bands = self._bollinger.value if self.count >= 20 else (self._last,) * 3
+        ema_20 = self._ema_20.value
+        return {
+            "rsi": self._rsi.value if self.count >= 15 else 50.0,
+            "macd": macd[0],
+            "macd_signal": macd[1],
+            "macd_histogram": macd[2],
+            "ema_20": ema_20,
+            "ema_50": self._ema_50.value if self.count >= 50 else ema_20,
+            "bollinger_upper": bands[0],
+            "bollinger_middle": bands[1],
+            "bollinger_lower": bands[2],
+            "volatility": self._volatility.value if self.count >= 21 else 0.0,
+            "sharpe_ratio": self._sharpe(),
+        }
+
+    def _sharpe(self) -> float:
+        if self._return_count < 2:
+            return 0.0
+        std = math.sqrt(max(self._return_m2, 0.0) / self._return_count)
+        if std == 0:
+            return 0.0
+        ppy = self.periods_per_year
+        return (self._return_mean * ppy - self.risk_free_rate) / (std * math.sqrt(ppy))
@@ -5,7 +5,12 @@ Tools for fetching market data, calculating indicators, and executing trades.
 Integrates with financial data APIs (Alpha Vantage, Polygon, Binance, etc.)
 
 From first principles: External APIs are unreliable—circuit breakers prevent
-cascading failures by failing fast when error rates spike.
+cascading failures by failing fast when error rates spike, and concurrency
+limits keep a slow data source from tying up every worker thread.
+Indicator math lives in ``indicators`` as array kernels; the tools here
+only pick the latest value. When a local market data store is configured,
+``fetch_market_data`` serves bars from it and only generates (in production:
+fetches) what the store lacks.
 """
 
 from __future__ import annotations
@@ -16,7 +21,11 @@ import numpy as np
 from agents import function_tool
 from pydantic import BaseModel
 
+from agent_kit.backtesting.market_store import INTERVALS, get_market_store
+from agent_kit.backtesting.simulation import BarSeries
 from agent_kit.monitoring.circuit_breaker import with_circuit_breaker
+from agent_kit.monitoring.concurrency import get_concurrency_limiter
+from agent_kit.tools import indicators
 
 
 class MarketData(BaseModel):
@@ -33,6 +42,15 @@ class MarketData(BaseModel):
     volume: float
 
 
+class PriceSeries(BaseModel):
+    """One asset's closing prices (or returns), oldest first."""
+
+    model_config = {"extra": "forbid"}
+
+    ticker: str
+    values: list[float]
+
+
 class TechnicalIndicators(BaseModel):
     """Technical indicators for an asset."""
 
@@ -51,7 +69,8 @@ class TechnicalIndicators(BaseModel):
 
 
 @function_tool
-@with_circuit_breaker(max_failures=5, reset_timeout=120)
+@get_concurrency_limiter("market_data", algorithm="gradient", queue_timeout=2.0)
+@with_circuit_breaker(max_failures=5, reset_timeout=120, name="market_data")
 def fetch_market_data(
     ticker: str, interval: str = "1day", limit: int = 100
 ) -> list[dict]:
@@ -76,6 +95,60 @@ def fetch_market_data(
         - Crypto: Binance, Coinbase, Kraken APIs
         - Futures: Interactive Brokers, TD Ameritrade
     """
+    if limit <= 0:
+        return []
+    timestamps = _bar_timestamps(interval, limit)
+
+    store = get_market_store() if interval in INTERVALS else None
+    if store is None:
+        return _mock_bars(ticker, timestamps, base_price=150.0)
+
+    # Generate (in production: fetch) only the stretches the store lacks;
+    # stored bars are never regenerated
+    start, current = timestamps[0], timestamps[-1]
+    stored = store.read(ticker, start, current, interval)
+    for first, last in store.gaps(ticker, start, current, interval):
+        missing = timestamps[(timestamps >= first) & (timestamps <= last)]
+        if len(missing) == 0:
+            continue
+        before = np.searchsorted(stored.timestamps, first) - 1
+        base_price = float(stored.close[before]) if before >= 0 else 150.0
+        store.append(ticker, _mock_bars(ticker, missing, base_price), interval)
+
+    bars = store.read(ticker, start, current, interval)
+    return _bar_records(ticker, bars.take(slice(max(len(bars) - limit, 0), None)))
+
+
+def _bar_timestamps(interval: str, limit: int) -> np.ndarray:
+    """Timestamps of the latest ``limit`` bars (business days for daily bars)."""
+    now = np.datetime64(datetime.now(), "us")
+    if interval in INTERVALS and interval != "1day":
+        step = INTERVALS[interval][0]
+        current = now - (now - np.datetime64(0, "us")) % step
+        return (current - np.arange(limit)[::-1] * step).astype("datetime64[ns]")
+    today = np.busday_offset(now.astype("datetime64[D]"), 0, roll="backward")
+    return np.busday_offset(today, -np.arange(limit)[::-1]).astype("datetime64[ns]")
+
+
+def _bar_records(ticker: str, bars: BarSeries) -> list[dict]:
+    """Stored bars in the fetch_market_data dict format."""
+    timestamps = bars.timestamps.astype("datetime64[us]").tolist()
+    columns = {
+        name: getattr(bars, name).tolist()
+        for name in ("open", "high", "low", "close", "volume")
+    }
+    return [
+        {
+            "ticker": ticker,
+            "timestamp": timestamp.isoformat(),
+            **{name: values[i] for name, values in columns.items()},
+        }
+        for i, timestamp in enumerate(timestamps)
+    ]
+
+
+def _mock_bars(ticker: str, timestamps: np.ndarray, base_price: float) -> list[dict]:
+    """Random-walk bars at ``timestamps``, starting from ``base_price``."""
     # TODO: Integrate with real APIs
     # Example with yfinance:
     # import yfinance as yf
@@ -83,11 +156,9 @@ def fetch_market_data(
     # df = ticker_obj.history(period="3mo", interval=interval)
     # return df.to_dict('records')
 
-    # Mock data
     mock_data = []
-    base_price = 150.0
 
-    for _ in range(limit):
+    for timestamp in timestamps.astype("datetime64[us]").tolist():
         # Simulate price movement
         price_change = np.random.randn() * 2
         base_price = max(base_price + price_change, 1.0)
@@ -95,7 +166,7 @@ def fetch_market_data(
         mock_data.append(
             {
                 "ticker": ticker,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp.isoformat(),
                 "open": base_price - 1,
                 "high": base_price + 2,
                 "low": base_price - 2,
@@ -125,27 +196,14 @@ def calculate_rsi(prices: list[float], period: int = 14) -> float:
         >>> rsi = calculate_rsi(prices)
         >>> print(f"RSI: {rsi:.2f}")
     """
-    if len(prices) < period + 1:
-        return 50.0  # Neutral if not enough data
+    return _latest_rsi(np.asarray(prices, dtype=np.float64), period)
 
-    # Calculate price changes
-    deltas = np.diff(prices)
 
-    # Separate gains and losses
-    gains = np.where(deltas > 0, deltas, 0)
-    losses = np.where(deltas < 0, -deltas, 0)
-
-    # Calculate average gain and loss
-    avg_gain = np.mean(gains[-period:])
-    avg_loss = np.mean(losses[-period:])
-
-    if avg_loss == 0:
-        return 100.0
-
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-
-    return float(rsi)
+def _latest_rsi(prices: np.ndarray, period: int = 14) -> float:
+    """RSI of the last ``period`` price changes (50 if too few prices)."""
+    if len(prices) < period + 1:
+        return 50.0  # Neutral if not enough data
+    return float(indicators.rsi(prices[-period - 1 :], period)[-1])
 
 
 @function_tool
@@ -173,24 +231,24 @@ def calculate_macd(
         >>> macd_data = calculate_macd(prices)
         >>> print(f"MACD: {macd_data['macd']:.2f}")
     """
-    if len(prices) < slow_period + signal_period:
-        return {"macd": 0.0, "signal": 0.0, "histogram": 0.0}
-
-    prices_array = np.array(prices)
-
-    # Calculate EMAs
-    ema_fast = _calculate_ema(prices_array, fast_period)
-    ema_slow = _calculate_ema(prices_array, slow_period)
-
-    # MACD line
-    macd_line = ema_fast - ema_slow
+    return _latest_macd(
+        np.asarray(prices, dtype=np.float64), fast_period, slow_period, signal_period
+    )
 
-    # Signal line (EMA of MACD)
-    signal_line = _calculate_ema(macd_line, signal_period)
 
-    # Histogram
-    histogram = macd_line - signal_line
+def _latest_macd(
+    prices: np.ndarray,
+    fast_period: int = 12,
+    slow_period: int = 26,
+    signal_period: int = 9,
+) -> dict[str, float]:
+    """Last MACD, signal and histogram values (zeros if too few prices)."""
+    if len(prices) < slow_period + signal_period:
+        return {"macd": 0.0, "signal": 0.0, "histogram": 0.0}
 
+    macd_line, signal_line, histogram = indicators.macd(
+        prices, fast_period, slow_period, signal_period
+    )
     return {
         "macd": float(macd_line[-1]),
         "signal": float(signal_line[-1]),
@@ -198,18 +256,6 @@ def calculate_macd(
     }
 
 
-def _calculate_ema(data: np.ndarray, period: int) -> np.ndarray:
-    """Calculate Exponential Moving Average."""
-    alpha = 2 / (period + 1)
-    ema = np.zeros_like(data)
-    ema[0] = data[0]
-
-    for i in range(1, len(data)):
-        ema[i] = alpha * data[i] + (1 - alpha) * ema[i - 1]
-
-    return ema
-
-
 @function_tool
 def calculate_bollinger_bands(
     prices: list[float], period: int = 20, std_dev: float = 2.0
@@ -231,23 +277,23 @@ def calculate_bollinger_bands(
         >>> bands = calculate_bollinger_bands(prices)
         >>> print(f"Upper: ${bands['upper']:.2f}, Lower: ${bands['lower']:.2f}")
     """
-    if len(prices) < period:
-        current_price = prices[-1] if prices else 100.0
-        return {"upper": current_price, "middle": current_price, "lower": current_price}
-
-    prices_array = np.array(prices[-period:])
-
-    # Middle band (SMA)
-    middle = np.mean(prices_array)
+    return _latest_bollinger(np.asarray(prices, dtype=np.float64), period, std_dev)
 
-    # Standard deviation
-    std = np.std(prices_array)
 
-    # Upper and lower bands
-    upper = middle + (std_dev * std)
-    lower = middle - (std_dev * std)
+def _latest_bollinger(
+    prices: np.ndarray, period: int = 20, std_dev: float = 2.0
+) -> dict[str, float]:
+    """Bands of the last ``period`` prices (flat at the last price if too few)."""
+    if len(prices) < period:
+        current_price = float(prices[-1]) if len(prices) else 100.0
+        return {"upper": current_price, "middle": current_price, "lower": current_price}
 
-    return {"upper": float(upper), "middle": float(middle), "lower": float(lower)}
+    upper, middle, lower = indicators.bollinger_bands(prices[-period:], period, std_dev)
+    return {
+        "upper": float(upper[-1]),
+        "middle": float(middle[-1]),
+        "lower": float(lower[-1]),
+    }
 
 
 @function_tool
@@ -267,21 +313,19 @@ def calculate_indicators(ticker: str, market_data: list[MarketData]) -> dict:
         >>> indicators = calculate_indicators("AAPL", data)
         >>> print(f"RSI: {indicators['RSI']:.2f}")
     """
-    prices = [bar.close for bar in market_data]
+    prices = np.fromiter((bar.close for bar in market_data), np.float64)
 
-    rsi = calculate_rsi(prices)
-    macd_data = calculate_macd(prices)
-    bollinger = calculate_bollinger_bands(prices)
+    rsi = _latest_rsi(prices)
+    macd_data = _latest_macd(prices)
+    bollinger = _latest_bollinger(prices)
 
     # EMAs
-    ema_20 = float(_calculate_ema(np.array(prices), 20)[-1])
-    ema_50 = (
-        float(_calculate_ema(np.array(prices), 50)[-1]) if len(prices) >= 50 else ema_20
-    )
+    ema_20 = float(indicators.ema(prices, 20)[-1])
+    ema_50 = float(indicators.ema(prices, 50)[-1]) if len(prices) >= 50 else ema_20
 
     return {
         "ticker": ticker,
-        "timestamp": market_data[-1]["timestamp"],
+        "timestamp": market_data[-1].timestamp,
         "RSI": rsi,
         "MACD": macd_data["macd"],
         "MACD_Signal": macd_data["signal"],
@@ -294,6 +338,51 @@ def calculate_indicators(ticker: str, market_data: list[MarketData]) -> dict:
     }
 
 
+def _align_right(series: list[PriceSeries]) -> tuple[list[str], np.ndarray]:
+    """Stack ragged series into a time x symbol matrix, NaN-padded at the start."""
+    length = max((len(s.values) for s in series), default=0)
+    matrix = np.full((length, len(series)), np.nan)
+    for j, s in enumerate(series):
+        if s.values:
+            matrix[length - len(s.values) :, j] = s.values
+    return [s.ticker for s in series], matrix
+
+
+def _json_column(values: np.ndarray) -> list[float | None]:
+    """Floats with NaN as None, so results stay valid JSON."""
+    return [None if np.isnan(v) else v for v in values.tolist()]
+
+
+@function_tool
+def calculate_indicators_batch(
+    prices: list[PriceSeries], names: list[str] | None = None
+) -> dict[str, list]:
+    """
+    Calculate technical indicators for many assets in one call.
+
+    Args:
+        prices: Closing prices per ticker; series may have different
+            lengths and are aligned on their latest bar
+        names: Indicators to compute (default: all of rsi, macd,
+            macd_signal, macd_histogram, ema_20, ema_50, bollinger_upper,
+            bollinger_middle, bollinger_lower, volatility, sharpe_ratio)
+
+    Returns:
+        Columnar dict: "ticker" plus one list per indicator, in ticker order
+
+    Example:
+        >>> closes = [
+        ...     PriceSeries(ticker=t, values=[bar["close"] for bar in fetch_market_data(t)])
+        ...     for t in universe
+        ... ]
+        >>> screen = calculate_indicators_batch(closes, ["rsi", "volatility"])
+        >>> oversold = [t for t, r in zip(screen["ticker"], screen["rsi"]) if r < 30]
+    """
+    symbols, matrix = _align_right(prices)
+    values = indicators.latest_indicators(matrix, names)
+    return {"ticker": symbols, **{k: _json_column(v) for k, v in values.items()}}
+
+
 @function_tool
 def calculate_volatility(
     prices: list[float], period: int = 20, annualize: bool = True
@@ -318,19 +407,15 @@ def calculate_volatility(
     if len(prices) < period + 1:
         return 0.0
 
-    prices_array = np.array(prices[-period - 1 :])
-    returns = np.diff(prices_array) / prices_array[:-1]
-
-    volatility = np.std(returns)
-
-    if annualize:
-        volatility *= np.sqrt(252)  # 252 trading days per year
-
-    return float(volatility)
+    prices_array = np.asarray(prices[-period - 1 :], dtype=np.float64)
+    # 252 trading days per year when annualized
+    return float(indicators.volatility(prices_array, period, annualize)[-1])
 
 
 @function_tool
-@with_circuit_breaker(max_failures=3, reset_timeout=300)  # Stricter for trades
+@with_circuit_breaker(
+    max_failures=3, reset_timeout=300, name="trade_execution"
+)  # Stricter for trades
 def execute_trade(
     ticker: str,
     side: str,
@@ -404,24 +489,35 @@ def calculate_sharpe_ratio(returns: list[float], risk_free_rate: float = 0.02) -
         >>> sharpe = calculate_sharpe_ratio(returns)
         >>> print(f"Sharpe ratio: {sharpe:.2f}")
     """
-    if len(returns) < 2:
-        return 0.0
-
-    returns_array = np.array(returns)
+    # Annualized with 252 trading days
+    return indicators.sharpe_ratio(
+        np.asarray(returns, dtype=np.float64), risk_free_rate
+    )
 
-    mean_return = np.mean(returns_array)
-    std_return = np.std(returns_array)
 
-    if std_return == 0:
-        return 0.0
+@function_tool
+def calculate_sharpe_ratio_batch(
+    returns: list[PriceSeries], risk_free_rate: float = 0.02
+) -> dict[str, float]:
+    """
+    Calculate Sharpe ratios for many return series in one call.
 
-    # Annualize
-    annual_return = mean_return * 252  # 252 trading days
-    annual_std = std_return * np.sqrt(252)
+    Args:
+        returns: Period returns per ticker (lengths may differ)
+        risk_free_rate: Annual risk-free rate (default 2%)
 
-    sharpe = (annual_return - risk_free_rate) / annual_std
+    Returns:
+        Dict of ticker -> Sharpe ratio (0 for fewer than two returns)
 
-    return float(sharpe)
+    Example:
+        >>> ratios = calculate_sharpe_ratio_batch(
+        ...     [PriceSeries(ticker="AAPL", values=[0.01, -0.02, 0.03])]
+        ... )
+        >>> print(f"AAPL Sharpe: {ratios['AAPL']:.2f}")
+    """
+    symbols, matrix = _align_right(returns)
+    ratios = indicators.sharpe_ratio(matrix.T, risk_free_rate)
+    return dict(zip(symbols, np.atleast_1d(ratios).tolist(), strict=True))
 
 
 # Export all tools
@@ -431,7 +527,9 @@ __all__ = [
     "calculate_macd",
     "calculate_bollinger_bands",
     "calculate_indicators",
+    "calculate_indicators_batch",
     "calculate_volatility",
     "execute_trade",
     "calculate_sharpe_ratio",
+    "calculate_sharpe_ratio_batch",
 ]
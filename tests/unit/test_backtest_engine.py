@@ -0,0 +1,152 @@
+"""Unit tests for the bar-by-bar backtest simulation."""
+
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from agent_kit.backtesting import (
+    BacktestEngine,
+    BarSeries,
+    simulate_events,
+    simulate_targets,
+)
+
+
+def make_bars(n: int = 300, seed: int = 0) -> BarSeries:
+    """Random-walk daily bars whose open is the previous close plus noise."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = np.r_[close[0], close[:-1]] * (1 + rng.normal(0, 0.002, n))
+    timestamps = np.datetime64("2024-01-01") + np.arange(n).astype("timedelta64[D]")
+    return BarSeries(
+        timestamps=timestamps.astype("datetime64[ns]"), close=close, open=open_
+    )
+
+
+def crossover_targets(close: np.ndarray) -> np.ndarray:
+    """Long when the 5-bar mean is above the 20-bar mean, else flat."""
+    targets = np.full(len(close), np.nan)
+    csum = np.cumsum(np.r_[0.0, close])
+    fast = (csum[20:] - csum[15:-5]) / 5
+    slow = (csum[20:] - csum[:-20]) / 20
+    targets[19:] = (fast > slow).astype(float)
+    return targets
+
+
+def test_buy_and_hold_fills_next_open_with_costs() -> None:
+    """Test a signal fills at the next open with slippage and commission."""
+    bars = make_bars(10)
+    targets = np.full(10, np.nan)
+    targets[0] = 1.0
+
+    result = simulate_targets(bars, targets, 1000.0, 0.001, 0.01)
+
+    fill = bars.open[1] * 1.01
+    shares = 1000.0 / bars.open[1]
+    assert result.fill_index.tolist() == [1, 9]
+    assert result.fill_price[0] == pytest.approx(fill)
+    assert result.fill_quantity[0] == pytest.approx(shares)
+    assert result.fill_commission[0] == pytest.approx(shares * fill * 0.001)
+    assert result.positions[0] == 0 and result.positions[1:9] == pytest.approx(shares)
+    np.testing.assert_allclose(
+        result.equity, result.cash + result.positions * bars.close
+    )
+    exit_fill = bars.close[-1] * 0.99
+    expected = 1000.0 - shares * fill * 1.001 + shares * exit_fill * (1 - 0.001)
+    assert result.final_equity == pytest.approx(expected)
+    assert result.positions[-1] == 0
+
+
+def test_zero_delay_fills_at_signal_close() -> None:
+    """Test signal_delay=0 trades at the signal bar's close."""
+    bars = make_bars(5)
+    targets = np.array([np.nan, 0.5, np.nan, np.nan, np.nan])
+
+    result = simulate_targets(bars, targets, slippage=0.0, signal_delay=0)
+
+    assert result.fill_index[0] == 1
+    assert result.fill_price[0] == bars.close[1]
+
+
+def test_vectorized_and_event_paths_agree() -> None:
+    """Test both paths produce identical books for the same decisions."""
+    bars = make_bars()
+    targets = crossover_targets(bars.close)
+
+    def on_bar(context) -> float | None:
+        return None if np.isnan(targets[context.index]) else targets[context.index]
+
+    vectorized = simulate_targets(bars, targets)
+    event = simulate_events(bars, on_bar)
+
+    assert vectorized.num_fills > 4
+    np.testing.assert_array_equal(vectorized.fill_index, event.fill_index)
+    np.testing.assert_allclose(vectorized.fill_quantity, event.fill_quantity)
+    np.testing.assert_allclose(vectorized.equity, event.equity)
+
+
+def test_engine_round_trips_reconcile_with_equity() -> None:
+    """Test trades from fills (including a long->short flip) sum to the equity change."""
+    bars = make_bars(50)
+    targets = np.full(50, np.nan)
+    targets[[5, 20, 35]] = [1.0, -0.5, 0.0]
+    engine = BacktestEngine(initial_capital=10_000)
+
+    metrics = engine.run_vectorized(lambda data: {"X": targets}, {"X": bars})
+
+    assert [t.side for t in engine.trades] == ["buy", "sell"]
+    assert engine.trades[0].exit_timestamp == engine.trades[1].timestamp
+    assert metrics.total_pnl == pytest.approx(engine.capital - 10_000)
+    assert len(engine.equity_curve) == 50
+    assert engine.equity_curve[-1][1] == pytest.approx(engine.capital)
+
+
+def test_run_backtest_calls_strategy_per_bar() -> None:
+    """Test legacy signal strategies are replayed bar by bar."""
+    bars = make_bars(30)
+    records = [
+        {"timestamp": str(ts), "open": o, "close": c}
+        for ts, o, c in zip(bars.timestamps, bars.open, bars.close, strict=True)
+    ]
+    seen: list[int] = []
+
+    def strategy(data: dict) -> list[dict]:
+        n = len(data["AAPL"])
+        seen.append(n)
+        if n == 5:
+            return [{"ticker": "AAPL", "signal_type": "BUY", "position_size": 0.5}]
+        if n == 15:
+            return [{"ticker": "AAPL", "signal_type": "SELL"}]
+        return []
+
+    engine = BacktestEngine(initial_capital=10_000)
+    metrics = engine.run_backtest(
+        strategy, {"AAPL": records}, datetime(2024, 1, 3), datetime(2024, 1, 28)
+    )
+
+    assert seen == list(range(1, 27))
+    assert metrics.num_trades == 1
+    trade = engine.trades[0]
+    assert trade.entry_price == pytest.approx(bars.open[7] * 1.0005)
+    assert trade.exit_price == pytest.approx(bars.open[17] * 0.9995)
+    assert trade.quantity * bars.open[7] == pytest.approx(5_000)
+    assert engine.capital == pytest.approx(10_000 + trade.pnl)
+
+
+def test_minute_year_runs_quickly() -> None:
+    """Test a year of high-turnover minute bars backtests in well under a second."""
+    bars = make_bars(98_280)
+    # Long after up bars, flat after down bars: a fill on most bars
+    targets = (np.diff(bars.close, prepend=bars.close[0]) > 0).astype(float)
+    engine = BacktestEngine()
+
+    start = time.perf_counter()
+    metrics = engine.run_vectorized(lambda data: {"X": targets}, {"X": bars})
+    elapsed = time.perf_counter() - start
+
+    assert metrics.num_trades > 1000
+    assert engine.result.num_fills > 30_000
+    assert elapsed < 0.5
+    assert len(engine.equity) == 98_280
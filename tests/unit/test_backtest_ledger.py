@@ -0,0 +1,179 @@
+"""Unit tests for the columnar trade ledger."""
+
+import math
+
+import numpy as np
+import pytest
+
+from agent_kit.backtesting import BacktestEngine, BarSeries, TradeLedger
+
+
+def reference_round_trips(quantity, price, commission, last_close):
+    """Loop-based round trips of one symbol: (side, quantity, pnl, closed)."""
+    trips, position, trip = [], 0.0, None
+    for q, p, c in zip(quantity, price, commission, strict=True):
+        remaining = q
+        while abs(remaining) > 1e-9 * abs(q):
+            opening = position == 0 or (remaining > 0) == (position > 0)
+            part = (
+                remaining
+                if opening
+                else math.copysign(min(abs(position), abs(remaining)), remaining)
+            )
+            if trip is None:
+                trip = {"side": 1 if part > 0 else -1, "qty": 0.0, "cash": 0.0}
+            if opening:
+                trip["qty"] += abs(part)
+            trip["cash"] -= part * p + c * abs(part) / abs(q)
+            position += part
+            remaining -= part
+            if not opening and abs(position) <= 1e-9 * trip["qty"]:
+                position = 0.0
+                trips.append((trip["side"], trip["qty"], trip["cash"], True))
+                trip = None
+    if trip is not None:
+        trips.append(
+            (trip["side"], trip["qty"], trip["cash"] + position * last_close, False)
+        )
+    return trips
+
+
+def random_fills(n: int, symbols: int, seed: int = 0):
+    """Fills that open, add, reduce, flip and close positions."""
+    rng = np.random.default_rng(seed)
+    quantity = rng.choice([-3.0, -1.0, -0.5, 0.5, 1.0, 2.0], n)
+    return (
+        np.sort(rng.integers(0, n, n)),
+        rng.integers(0, symbols, n),
+        quantity,
+        rng.uniform(90, 110, n),
+        rng.uniform(0, 0.1, n),
+    )
+
+
+def test_matches_loop_reference_with_flips_and_open_trips() -> None:
+    """Test vectorized grouping equals a per-fill loop, symbol by symbol."""
+    index, symbol, quantity, price, commission = random_fills(2_000, 3)
+    timestamps = np.datetime64("2024-01-01", "ns") + np.arange(2_000) * np.timedelta64(
+        1, "m"
+    )
+    last_close = np.array([100.0, 101.0, 99.0])
+
+    ledger = TradeLedger.from_fills(
+        timestamps,
+        ("A", "B", "C"),
+        index,
+        symbol,
+        quantity,
+        price,
+        commission,
+        last_close,
+    )
+
+    for j, name in enumerate(("A", "B", "C")):
+        mask = symbol == j
+        expected = reference_round_trips(
+            quantity[mask], price[mask], commission[mask], last_close[j]
+        )
+        trades = ledger.for_symbol(name)
+        assert len(trades) == len(expected)
+        np.testing.assert_array_equal(trades.side, [e[0] for e in expected])
+        np.testing.assert_allclose(trades.quantity, [e[1] for e in expected])
+        np.testing.assert_allclose(trades.pnl, [e[2] for e in expected])
+        np.testing.assert_array_equal(trades.exit_bar >= 0, [e[3] for e in expected])
+    assert ledger.pnl.sum() == pytest.approx(
+        -(quantity * price).sum()
+        - commission.sum()
+        + sum(quantity[symbol == j].sum() * last_close[j] for j in range(3))
+    )
+
+
+def test_flip_splits_commission_and_prices() -> None:
+    """Test a long -> short fill closes one trip and opens the next."""
+    timestamps = np.datetime64("2024-01-01", "ns") + np.arange(3) * np.timedelta64(
+        1, "D"
+    )
+    ledger = TradeLedger.from_fills(
+        timestamps,
+        ("X",),
+        np.array([0, 1, 2]),
+        np.zeros(3, dtype=int),
+        np.array([10.0, -30.0, 20.0]),
+        np.array([100.0, 110.0, 105.0]),
+        np.array([1.0, 3.0, 2.0]),
+        np.array([105.0]),
+    )
+
+    long, short = ledger.to_trades()
+    assert (long.side, short.side) == ("buy", "sell")
+    assert long.pnl == pytest.approx(100 - 1 - 1)
+    assert short.quantity == 20 and short.entry_price == 110
+    assert short.pnl == pytest.approx(20 * 5 - 2 - 2)
+    assert long.exit_timestamp == short.timestamp
+
+
+def test_parquet_round_trip(tmp_path) -> None:
+    """Test the ledger survives Parquet export and reload."""
+    index, symbol, quantity, price, commission = random_fills(500, 2, seed=3)
+    timestamps = np.datetime64("2024-01-01", "ns") + np.arange(500) * np.timedelta64(
+        1, "h"
+    )
+    ledger = TradeLedger.from_fills(
+        timestamps, ("AAPL", "MSFT"), index, symbol, quantity, price, commission, [1, 2]
+    )
+
+    path = ledger.write_parquet(tmp_path / "trades" / "ledger.parquet")
+    loaded = TradeLedger.read_parquet(path)
+
+    assert loaded.symbols == ("AAPL", "MSFT")
+    for name in ledger.records.dtype.names:
+        np.testing.assert_array_equal(loaded.records[name], ledger.records[name])
+    frame = ledger.to_polars()
+    assert set(frame.get_column("symbol").unique()) == {"AAPL", "MSFT"}
+
+
+def test_engine_uses_ledger_and_converts_on_demand() -> None:
+    """Test the engine keeps trades columnar and builds Trade models lazily."""
+    rng = np.random.default_rng(2)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 300)))
+    timestamps = np.datetime64("2024-01-01", "ns") + np.arange(300) * np.timedelta64(
+        1, "D"
+    )
+    targets = np.where(
+        np.arange(300) % 30 == 0, rng.choice([-1.0, 0.0, 1.0], 300), np.nan
+    )
+    engine = BacktestEngine()
+
+    metrics = engine.run_vectorized(
+        lambda data: {"X": targets},
+        {"X": BarSeries(timestamps=timestamps, close=close)},
+    )
+
+    assert metrics.num_trades == len(engine.ledger) == len(engine.trades)
+    assert metrics.total_pnl == pytest.approx(engine.ledger.pnl.sum())
+    assert engine.trades[0].ticker == "X"
+
+
+def test_million_fills_build_compact_ledger() -> None:
+    """Test a million open/close fills become half a million ledger rows."""
+    rng = np.random.default_rng(9)
+    pairs = 500_000
+    size = np.repeat(rng.uniform(1, 10, pairs), 2) * np.tile([1.0, -1.0], pairs)
+    timestamps = np.datetime64("2024-01-01", "ns") + np.arange(
+        2 * pairs
+    ) * np.timedelta64(1, "s")
+
+    ledger = TradeLedger.from_fills(
+        timestamps,
+        tuple("ABCDEFGHIJ"),
+        np.arange(2 * pairs),
+        np.repeat(rng.integers(0, 10, pairs), 2),
+        size,
+        rng.uniform(90, 110, 2 * pairs),
+        np.zeros(2 * pairs),
+        np.full(10, 100.0),
+    )
+
+    assert len(ledger) == pairs
+    assert (ledger.exit_bar - ledger.entry_bar == 1).all()
+    assert ledger.nbytes == pairs * ledger.records.dtype.itemsize
@@ -0,0 +1,134 @@
+"""Unit tests for vectorized backtest metrics and Monte Carlo resampling."""
+
+import math
+
+import numpy as np
+import pytest
+
+from agent_kit.backtesting import BacktestEngine, BarSeries
+from agent_kit.backtesting.metrics import (
+    _resample_indices,
+    bootstrap_returns,
+    bootstrap_trades,
+    calmar_ratio,
+    hit_rate,
+    max_drawdown,
+    performance_summary,
+    returns_from_equity,
+    sharpe_ratio,
+    sortino_ratio,
+    turnover,
+)
+
+
+def reference_sharpe(returns: list[float], periods: int) -> float:
+    mean = sum(returns) / len(returns)
+    std = math.sqrt(sum((r - mean) ** 2 for r in returns) / len(returns))
+    return mean / std * math.sqrt(periods)
+
+
+def test_ratios_match_loop_reference_and_batch() -> None:
+    """Test Sharpe/Sortino match a plain loop and batches match single curves."""
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.0005, 0.01, (5, 500))
+
+    assert sharpe_ratio(returns[0]) == pytest.approx(
+        reference_sharpe(returns[0].tolist(), 252)
+    )
+    downside = math.sqrt(np.mean(np.minimum(returns[0], 0) ** 2))
+    assert sortino_ratio(returns[0]) == pytest.approx(
+        returns[0].mean() / downside * math.sqrt(252)
+    )
+    batch = sharpe_ratio(returns)
+    assert batch.shape == (5,)
+    assert batch[3] == pytest.approx(sharpe_ratio(returns[3]))
+
+
+def test_max_drawdown_depth_and_duration() -> None:
+    """Test the deepest drawdown and the longest time below a peak."""
+    equity = np.array([100, 120, 90, 100, 130, 125, 126, 127, 131.0])
+
+    depth, duration = max_drawdown(equity)
+
+    assert depth == pytest.approx(0.25)
+    assert duration == 3  # 130 -> 125, 126, 127 -> 131
+    batch_depth, batch_duration = max_drawdown(np.vstack([equity, equity[::-1]]))
+    assert batch_depth[0] == pytest.approx(0.25)
+    assert batch_duration.tolist() == [3, 8]
+
+
+def test_calmar_turnover_and_hit_rate() -> None:
+    """Test the remaining ratios on small hand-checked inputs."""
+    equity = np.array([100.0, 110.0, 99.0, 121.0])
+
+    assert calmar_ratio(equity, periods_per_year=3) == pytest.approx(0.21 / 0.1)
+    assert turnover(200.0, np.full(252, 100.0)) == pytest.approx(2.0)
+    assert hit_rate(np.array([5.0, -1.0, 0.0, 2.0])) == 0.5
+    summary = performance_summary(np.tile(equity, (3, 1)), periods_per_year=3)
+    np.testing.assert_allclose(summary["total_return"], 0.21)
+
+
+def test_bootstrap_trades_is_seeded_and_batched() -> None:
+    """Test resampling is reproducible, batch-size independent and sensible."""
+    pnl = np.random.default_rng(1).normal(50, 200, 300)
+
+    result = bootstrap_trades(pnl, 100_000, n_samples=2_500, batch_size=700, seed=7)
+    again = bootstrap_trades(pnl, 100_000, n_samples=2_500, batch_size=700, seed=7)
+
+    assert result.num_samples == 2_500
+    np.testing.assert_array_equal(
+        result.samples["total_return"], again.samples["total_return"]
+    )
+    low, high = result.interval("total_return")
+    assert low < pnl.sum() / 100_000 < high
+    assert 0 <= result.probability_below("total_return") < 0.05
+    assert set(result.summary()) == {"total_return", "max_drawdown", "hit_rate"}
+
+
+def test_block_bootstrap_keeps_runs_together() -> None:
+    """Test block resampling draws consecutive (circular) bars."""
+    indices = _resample_indices(np.random.default_rng(0), 10, 4, block_size=5)
+
+    assert indices.shape == (4, 10)
+    steps = np.diff(indices[:, :5], axis=1) % 10
+    assert (steps == 1).all()
+    result = bootstrap_returns(
+        np.random.default_rng(2).normal(0, 0.01, 250), 500, block_size=20, seed=0
+    )
+    assert result.samples["sharpe_ratio"].shape == (500,)
+
+
+def test_engine_reports_risk_metrics_and_bootstrap() -> None:
+    """Test engine metrics come from the equity curve and bootstrap works."""
+    rng = np.random.default_rng(4)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 400)))
+    timestamps = np.datetime64("2024-01-01", "ns") + np.arange(400) * np.timedelta64(
+        1, "D"
+    )
+    bars = BarSeries(timestamps=timestamps, close=close)
+    targets = np.where(np.arange(400) % 40 == 0, (np.arange(400) // 40) % 2, np.nan)
+    engine = BacktestEngine(risk_free_rate=0.0)
+
+    metrics = engine.run_vectorized(lambda data: {"X": targets}, {"X": bars})
+
+    returns = returns_from_equity(engine.equity)
+    assert metrics.sharpe_ratio == pytest.approx(sharpe_ratio(returns))
+    assert metrics.max_drawdown == pytest.approx(max_drawdown(engine.equity)[0])
+    assert metrics.max_drawdown_duration > 0
+    assert metrics.turnover > 0
+    assert metrics.win_rate == pytest.approx(
+        np.mean([t.pnl > 0 for t in engine.trades])
+    )
+    assert engine.bootstrap(200, seed=0).num_samples == 200
+    assert engine.bootstrap(200, method="returns", block_size=10).num_samples == 200
+
+
+def test_batch_summary_of_many_backtests_is_fast() -> None:
+    """Test thousands of equity curves are summarized in one vectorized call."""
+    rng = np.random.default_rng(5)
+    equity = 100 * np.cumprod(1 + rng.normal(0.0003, 0.01, (2_000, 2_520)), axis=1)
+
+    summary = performance_summary(equity)
+
+    assert summary["sharpe_ratio"].shape == (2_000,)
+    assert summary["max_drawdown_duration"].dtype.kind == "i"
@@ -0,0 +1,151 @@
+"""Unit tests for parameter sweeps and walk-forward optimization."""
+
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pytest
+
+from agent_kit.backtesting import (
+    BacktestEngine,
+    BarPanel,
+    ParameterSweep,
+    parameter_grid,
+    random_parameters,
+)
+from agent_kit.backtesting.optimization import SharedPanel
+
+
+def make_panel(n: int = 600, m: int = 4, seed: int = 0) -> BarPanel:
+    """Trending random walks so some crossovers beat others."""
+    rng = np.random.default_rng(seed)
+    drift = np.sin(np.arange(n) / 40)[:, None] * 0.004
+    close = 100 * np.exp(np.cumsum(drift + rng.normal(0, 0.01, (n, m)), axis=0))
+    timestamps = np.datetime64("2020-01-01") + np.arange(n).astype("timedelta64[D]")
+    return BarPanel(
+        timestamps=timestamps.astype("datetime64[ns]"),
+        symbols=tuple(f"S{j}" for j in range(m)),
+        close=close,
+    )
+
+
+def crossover(panel: BarPanel, fast: int, slow: int) -> np.ndarray:
+    """Equal-weight long in symbols whose fast mean is above the slow mean."""
+    if fast >= slow:
+        raise ValueError("fast must be shorter than slow")
+    csum = np.vstack([np.zeros((1, panel.num_symbols)), np.cumsum(panel.close, 0)])
+    targets = np.full(panel.close.shape, np.nan)
+    fast_mean = (csum[slow:] - csum[slow - fast : -fast]) / fast
+    slow_mean = (csum[slow:] - csum[:-slow]) / slow
+    targets[slow - 1 :] = (fast_mean > slow_mean) / panel.num_symbols
+    return targets
+
+
+def test_parameter_grid_and_random_search() -> None:
+    """Test grids enumerate every combination and random search is seeded."""
+    grid = parameter_grid({"fast": [5, 10], "slow": [20, 50, 100]})
+    space = {"fast": [5, 10], "scale": lambda rng: rng.uniform(0.5, 2.0)}
+
+    assert len(grid) == 6 and {"fast": 10, "slow": 50} in grid
+    assert random_parameters(space, 5, seed=1) == random_parameters(space, 5, seed=1)
+    assert all(0.5 <= p["scale"] <= 2.0 for p in random_parameters(space, 20))
+
+
+def test_pool_matches_in_process_and_ranks() -> None:
+    """Test the process pool returns the same ranked scores as a serial run."""
+    panel = make_panel()
+    configs = parameter_grid({"fast": [3, 5, 10], "slow": [20, 40, 80]})
+
+    serial = ParameterSweep(crossover, panel, workers=1).run(configs)
+    parallel = ParameterSweep(crossover, panel, workers=2).run(configs)
+
+    assert [r["params"] for r in serial] == [r["params"] for r in parallel]
+    np.testing.assert_allclose(
+        [r["sharpe_ratio"] for r in serial], [r["sharpe_ratio"] for r in parallel]
+    )
+    sharpes = [r["sharpe_ratio"] for r in serial]
+    assert sharpes == sorted(sharpes, reverse=True)
+    assert serial.best is serial.records[0]
+
+
+def test_failing_configs_rank_last() -> None:
+    """Test a config that raises is recorded with its error instead of aborting."""
+    panel = make_panel(200)
+    result = ParameterSweep(crossover, panel, workers=1).run(
+        [{"fast": 50, "slow": 10}, {"fast": 5, "slow": 20}], metric="max_drawdown"
+    )
+
+    assert result.best["params"] == {"fast": 5, "slow": 20}
+    assert result.errors[0]["error"].startswith("ValueError")
+    assert result.records[-1] is result.errors[0]
+
+
+def test_unknown_metric_fails_before_simulating() -> None:
+    """Test a bad metric is rejected before any config is evaluated."""
+    calls = []
+
+    def strategy(panel: BarPanel, fast: int, slow: int) -> np.ndarray:
+        calls.append((fast, slow))
+        return crossover(panel, fast, slow)
+
+    sweep = ParameterSweep(strategy, make_panel(200), workers=1)
+    configs = [{"fast": 5, "slow": 20}]
+
+    with pytest.raises(ValueError, match="Unknown metric"):
+        sweep.run(configs, metric="sharpe")
+    with pytest.raises(ValueError, match="Unknown metric"):
+        sweep.walk_forward(configs, train_size=100, test_size=50, metric="sharpe")
+    assert calls == []
+
+
+def test_sweep_scores_match_engine_metrics() -> None:
+    """Test sweep Sharpe uses the engine's risk-free rate and annualization."""
+    panel = make_panel(300)
+    engine = BacktestEngine(risk_free_rate=0.02)
+    params = {"fast": 5, "slow": 20}
+
+    record = engine.sweep(crossover, panel, [params], workers=1).best
+    metrics = engine.run_portfolio(lambda p: crossover(p, **params), panel)
+
+    assert record["sharpe_ratio"] == pytest.approx(metrics.sharpe_ratio)
+    assert record["max_drawdown"] == pytest.approx(metrics.max_drawdown)
+
+
+def test_shared_panel_is_zero_copy_and_unlinked() -> None:
+    """Test workers see the parent's shared pages and blocks are freed after."""
+    panel = make_panel(50, 2)
+    with SharedPanel(panel) as shared:
+        attached, blocks = SharedPanel.attach(shared.spec)
+        np.testing.assert_array_equal(attached.close, panel.close)
+        np.testing.assert_array_equal(attached.timestamps, panel.timestamps)
+        original = np.ndarray(
+            panel.close.shape, panel.close.dtype, buffer=shared.blocks[1].buf
+        )
+        original[0, 0] = -1.0
+        assert attached.close[0, 0] == -1.0
+        del attached, original
+        for block in blocks:
+            block.close()
+        name = shared.blocks[0].name
+
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
+
+
+def test_walk_forward_tests_each_winner_out_of_sample() -> None:
+    """Test folds roll forward and score the in-sample winner on unseen bars."""
+    panel = make_panel(600)
+    engine = BacktestEngine()
+    configs = parameter_grid({"fast": [3, 10], "slow": [20, 60]})
+
+    result = engine.walk_forward(
+        crossover, panel, configs, train_size=200, test_size=100, workers=2
+    )
+
+    assert len(result.folds) == 4
+    for fold in result.folds:
+        assert fold["train"][1] < fold["test_range"][0]
+        assert fold["params"] == fold["in_sample"]["params"]
+        assert fold["test"]["params"] == fold["params"]
+    starts = [fold["test_range"][0] for fold in result.folds]
+    assert starts == [panel.timestamps[i] for i in (200, 300, 400, 500)]
+    assert np.isfinite(result.out_of_sample_return)
@@ -0,0 +1,161 @@
+"""Unit tests for multi-asset portfolio backtesting."""
+
+import numpy as np
+import polars as pl
+import pytest
+
+from agent_kit.backtesting import (
+    BacktestEngine,
+    BarPanel,
+    BarSeries,
+    simulate_portfolio,
+    simulate_targets,
+)
+
+
+def make_panel(n: int = 100, m: int = 3, seed: int = 0) -> BarPanel:
+    """Random-walk closes with opens near the previous close."""
+    rng = np.random.default_rng(seed)
+    close = 50 * np.exp(np.cumsum(rng.normal(0, 0.01, (n, m)), axis=0))
+    open_ = np.vstack([close[:1], close[:-1]]) * (1 + rng.normal(0, 0.002, (n, m)))
+    timestamps = np.datetime64("2024-01-01") + np.arange(n).astype("timedelta64[D]")
+    return BarPanel(
+        timestamps=timestamps.astype("datetime64[ns]"),
+        symbols=tuple(f"S{j}" for j in range(m)),
+        close=close,
+        open=open_,
+    )
+
+
+def test_from_series_aligns_on_union_timeline() -> None:
+    """Test symbols missing a timestamp are NaN there."""
+    days = np.datetime64("2024-01-01", "ns") + np.arange(4) * np.timedelta64(1, "D")
+    panel = BarPanel.from_series(
+        {
+            "A": BarSeries(timestamps=days, close=np.array([1.0, 2.0, 3.0, 4.0])),
+            "B": BarSeries(timestamps=days[[1, 3]], close=np.array([20.0, 40.0])),
+        }
+    )
+
+    assert panel.symbols == ("A", "B")
+    np.testing.assert_array_equal(panel.close[:, 0], [1, 2, 3, 4])
+    np.testing.assert_array_equal(panel.close[:, 1], [np.nan, 20, np.nan, 40])
+    np.testing.assert_array_equal(panel.series("B").close, [20, 40])
+
+
+def test_from_long_polars_frame_matches_wide_arrays() -> None:
+    """Test a long-format frame pivots to the same panel."""
+    panel = make_panel(10, 2)
+    rows, cols = np.indices(panel.close.shape)
+    frame = pl.DataFrame(
+        {
+            "timestamp": panel.timestamps[rows.ravel()],
+            "symbol": np.array(panel.symbols)[cols.ravel()],
+            "open": panel.open.ravel(),
+            "close": panel.close.ravel(),
+        }
+    ).sample(fraction=1.0, shuffle=True, seed=1)
+
+    pivoted = BarPanel.from_long(frame)
+
+    assert pivoted.symbols == panel.symbols
+    np.testing.assert_array_equal(pivoted.timestamps, panel.timestamps)
+    np.testing.assert_array_equal(pivoted.close, panel.close)
+    assert pivoted.volume is None
+
+
+def test_rebalance_shares_capital_across_symbols() -> None:
+    """Test one cash balance funds all symbols at their target weights."""
+    panel = make_panel(20, 2)
+    targets = np.full((20, 2), np.nan)
+    targets[0] = [0.5, 0.5]
+
+    result = simulate_portfolio(panel, targets, 10_000, 0.0, 0.0, close_at_end=False)
+
+    np.testing.assert_allclose(result.fill_quantity, 5_000 / panel.open[1])
+    assert result.cash[1] == pytest.approx(0.0, abs=1e-9)
+    np.testing.assert_allclose(result.weights()[1].sum(), 1.0)
+    np.testing.assert_allclose(
+        result.equity, result.cash + (result.positions * result.marks).sum(axis=1)
+    )
+
+
+def test_per_symbol_costs() -> None:
+    """Test commissions and slippage can differ by symbol."""
+    panel = make_panel(5, 2)
+    targets = np.full((5, 2), np.nan)
+    targets[0] = [0.4, 0.4]
+
+    result = simulate_portfolio(
+        panel,
+        targets,
+        commission_rate={"S0": 0.0, "S1": 0.01},
+        slippage=[0.0, 0.02],
+    )
+
+    first = result.fill_index == 1
+    np.testing.assert_allclose(
+        result.fill_price[first], panel.open[1] * np.array([1.0, 1.02])
+    )
+    assert result.fill_commission[first][0] == 0
+    assert result.fill_commission[first][1] > 0
+
+
+def test_trades_defer_to_next_priced_bar() -> None:
+    """Test a symbol without a bar at the execution time trades at its next bar."""
+    panel = make_panel(6, 1)
+    close = panel.close.copy()
+    close[1:3] = np.nan
+    gappy = BarPanel(timestamps=panel.timestamps, symbols=panel.symbols, close=close)
+    targets = np.full((6, 1), np.nan)
+    targets[0] = 1.0
+
+    result = simulate_portfolio(gappy, targets, close_at_end=False)
+
+    assert result.fill_index.tolist() == [3]
+    assert result.equity[2] == pytest.approx(100_000)
+
+
+def test_single_symbol_matches_single_asset_simulation() -> None:
+    """Test a one-column panel reproduces simulate_targets and the panel loop."""
+    panel = make_panel(200, 2)
+    rng = np.random.default_rng(3)
+    targets = np.where(rng.random(200) < 0.1, rng.choice([-1.0, 0.0, 1.0], 200), np.nan)
+    one = BarPanel(
+        timestamps=panel.timestamps,
+        symbols=("S0",),
+        close=panel.close[:, :1],
+        open=panel.open[:, :1],
+    )
+
+    single = simulate_targets(panel.series("S0"), targets)
+    portfolio = simulate_portfolio(one, targets[:, None])
+    # An idle second symbol sends the same trades through the (T, N) loop
+    looped = simulate_portfolio(panel, np.column_stack([targets, np.zeros(200)]))
+
+    for result in (portfolio, looped):
+        np.testing.assert_array_equal(single.fill_index, result.fill_index)
+        np.testing.assert_allclose(single.fill_quantity, result.fill_quantity)
+        np.testing.assert_allclose(single.fill_price, result.fill_price)
+        np.testing.assert_allclose(single.equity, result.equity)
+    assert set(looped.fill_symbol.tolist()) == {0}
+
+
+def test_engine_runs_large_universe() -> None:
+    """Test hundreds of tickers with monthly rebalancing through the engine."""
+    panel = make_panel(2520, 300)
+    engine = BacktestEngine(initial_capital=1_000_000)
+
+    def momentum(data: BarPanel) -> np.ndarray:
+        targets = np.full(data.close.shape, np.nan)
+        month_ends = np.arange(252, len(data), 21)
+        past = data.close[month_ends] / data.close[month_ends - 252]
+        top = past >= np.quantile(past, 0.9, axis=1, keepdims=True)
+        targets[month_ends] = top / top.sum(axis=1, keepdims=True)
+        return targets
+
+    metrics = engine.run_portfolio(momentum, panel, commission_rate={"S0": 0.0})
+
+    assert metrics.num_trades > 100
+    assert engine.result.positions.shape == (2520, 300)
+    assert metrics.total_pnl == pytest.approx(engine.capital - 1_000_000)
@@ -0,0 +1,168 @@
+"""Unit tests for the vectorized portfolio risk analytics."""
+
+import time
+
+import numpy as np
+import pytest
+
+from agent_kit.agents.algo_trading_agent import AlgoTradingAgent, Asset, TradingSignal
+from agent_kit.backtesting.metrics import sharpe_ratio, value_at_risk
+from agent_kit.backtesting.risk import (
+    align_returns,
+    conditional_value_at_risk,
+    correlation,
+    covariance,
+    parametric_var,
+    portfolio_risk,
+)
+
+
+def factor_returns(periods: int, assets: int, seed: int = 0) -> np.ndarray:
+    """Correlated daily returns driven by one market factor."""
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0004, 0.01, (periods, 1))
+    loadings = rng.uniform(0.5, 1.5, assets)
+    return market * loadings + rng.normal(0, 0.01, (periods, assets))
+
+
+def test_covariance_and_correlation_match_numpy() -> None:
+    """Test full-history matrices equal np.cov / np.corrcoef."""
+    returns = factor_returns(250, 40)
+
+    np.testing.assert_allclose(covariance(returns), np.cov(returns.T), rtol=1e-10)
+    np.testing.assert_allclose(
+        correlation(returns), np.corrcoef(returns.T), rtol=1e-10, atol=1e-12
+    )
+
+
+def test_correlation_uses_each_pairs_common_history() -> None:
+    """Test ragged histories match a per-pair corrcoef on the overlap."""
+    returns = factor_returns(120, 3, seed=1)
+    tickers, matrix = align_returns(
+        {"AAPL": returns[:, 0], "MSFT": returns[40:, 1], "NVDA": returns[90:, 2]}
+    )
+    corr = correlation(matrix)
+
+    assert tickers == ["AAPL", "MSFT", "NVDA"]
+    assert np.isnan(matrix[:40, 1]).all()
+    assert corr[0, 1] == pytest.approx(
+        np.corrcoef(returns[40:, 0], returns[40:, 1])[0, 1]
+    )
+    assert corr[1, 2] == pytest.approx(
+        np.corrcoef(returns[90:, 1], returns[90:, 2])[0, 1]
+    )
+    np.testing.assert_allclose(corr, corr.T)
+
+
+def test_var_and_cvar() -> None:
+    """Test historical and Gaussian tail measures."""
+    returns = np.linspace(-0.10, 0.09, 20)
+
+    assert conditional_value_at_risk(returns, 0.90) == pytest.approx(0.095)
+    assert conditional_value_at_risk(returns, 0.90) >= value_at_risk(returns, 0.90)
+
+    var, cvar = parametric_var(0.0, 0.01, 0.95)
+    assert var == pytest.approx(0.0164485, rel=1e-5)
+    assert cvar == pytest.approx(0.0206271, rel=1e-5)
+
+
+def test_portfolio_risk_decomposition_and_beta() -> None:
+    """Test contributions sum to volatility and beta matches a regression."""
+    returns = factor_returns(500, 6, seed=2)
+    benchmark = returns.mean(axis=1)
+    weights = np.array([0.1, -0.05, 0.2, 0.0, 0.1, 0.05])
+
+    risk = portfolio_risk(returns, weights, benchmark=benchmark)
+    path = returns @ weights
+    sigma = np.sqrt(weights @ np.cov(returns.T) @ weights)
+
+    assert risk.volatility == pytest.approx(sigma * np.sqrt(252))
+    assert risk.risk_contributions.sum() == pytest.approx(sigma)
+    assert risk.contribution_share.sum() == pytest.approx(1.0)
+    assert risk.risk_contributions[3] == 0.0
+    assert risk.sharpe_ratio == pytest.approx(sharpe_ratio(path))
+    assert risk.var == pytest.approx(value_at_risk(path))
+    assert risk.beta == pytest.approx(np.polyfit(benchmark, path, 1)[0])
+
+
+def test_portfolio_risk_scales_to_hundreds_of_assets() -> None:
+    """Test a 500-asset, 3-year report runs in well under a second."""
+    returns = factor_returns(756, 500, seed=3)
+    weights = np.full(500, 1 / 500)
+
+    start = time.perf_counter()
+    risk = portfolio_risk(returns, weights, benchmark=returns.mean(axis=1))
+    elapsed = time.perf_counter() - start
+
+    assert risk.correlation.shape == (500, 500)
+    assert risk.beta == pytest.approx(1.0)
+    assert elapsed < 1.0
+
+
+def make_agent() -> AlgoTradingAgent:
+    """Agent with default risk rules, skipping the LLM client setup."""
+    agent = AlgoTradingAgent.__new__(AlgoTradingAgent)
+    agent.portfolio_value = agent.peak_portfolio_value = 100_000.0
+    agent.risk_rules = {
+        "max_position_size": 0.10,
+        "max_drawdown": 0.15,
+        "min_sharpe_ratio": 1.0,
+        "stop_loss_percent": 0.03,
+        "correlation_limit": 0.5,
+    }
+    return agent
+
+
+def make_signal(ticker: str, signal_type: str, size: float) -> TradingSignal:
+    """Trading signal with only the fields risk metrics use."""
+    return TradingSignal(
+        asset=Asset(ticker=ticker, current_price=100.0, volatility=0.2),
+        signal_type=signal_type,
+        signal_strength=1.0,
+        expected_return=0.05,
+        stop_loss=97.0,
+        take_profit=105.0,
+        position_size=size,
+        strategy="MeanReversion",
+    )
+
+
+def test_agent_portfolio_metrics_and_correlation_checks() -> None:
+    """Test the agent reports real risk metrics and flags correlated pairs."""
+    agent = make_agent()
+    returns = factor_returns(250, 3, seed=4)
+    historical = {
+        "AAPL": returns[:, 0].tolist(),
+        "MSFT": (returns[:, 0] * 0.9 + returns[:, 1] * 0.1).tolist(),
+        "NVDA": returns[:, 2].tolist(),
+    }
+    signals = [make_signal("AAPL", "BUY", 0.08), make_signal("MSFT", "SELL", 0.05)]
+
+    metrics = agent.calculate_portfolio_metrics(
+        signals, historical, benchmark_returns=returns.mean(axis=1).tolist()
+    )
+    path = 0.08 * returns[:, 0] - 0.05 * np.array(historical["MSFT"])
+
+    assert metrics.var_95 == pytest.approx(value_at_risk(path))
+    assert metrics.sharpe_ratio == pytest.approx(
+        sharpe_ratio(path, risk_free_rate=0.02)
+    )
+    assert metrics.cvar_95 >= metrics.var_95 > 0
+    assert metrics.beta is not None
+    assert set(metrics.risk_contributions) == {"AAPL", "MSFT"}
+    assert metrics.correlation_matrix["AAPL"]["MSFT"] == pytest.approx(
+        np.corrcoef(historical["AAPL"], historical["MSFT"])[0, 1]
+    )
+
+    passed, violations = agent.validate_risk_constraints(signals, metrics)
+    assert not passed
+    assert violations == [
+        f"Correlation AAPL-MSFT: {metrics.correlation_matrix['AAPL']['MSFT']:.2f} "
+        "> limit 0.50",
+        f"Correlation MSFT-AAPL: {metrics.correlation_matrix['MSFT']['AAPL']:.2f} "
+        "> limit 0.50",
+    ]
+
+    empty = agent.calculate_portfolio_metrics(signals)
+    assert empty.var_95 == empty.sharpe_ratio == 0.0
+    assert empty.total_exposure == pytest.approx(0.13)
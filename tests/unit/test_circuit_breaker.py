@@ -0,0 +1,272 @@
+"""Unit tests for CircuitBreaker and its sliding-window counters."""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from agent_kit.monitoring.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    CircuitState,
+    FunctionCircuitBreaker,
+    with_circuit_breaker,
+)
+from agent_kit.monitoring.sliding_window import SlidingWindowCounter
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_window_counts_and_expires_buckets() -> None:
+    """Test calls leave the window once their bucket ages out."""
+    clock = FakeClock()
+    window = SlidingWindowCounter(window_seconds=10, num_buckets=10, clock=clock)
+
+    window.record(success=True)
+    window.record(success=False)
+    clock.now += 5
+    window.record(success=False)
+
+    assert (window.calls, window.failures, window.successes) == (3, 2, 1)
+    assert window.failure_rate == pytest.approx(2 / 3)
+
+    clock.now += 5  # first bucket expires
+    assert (window.calls, window.failures) == (1, 1)
+
+    clock.now += 100  # jump past the whole ring
+    assert window.calls == 0
+    assert window.failure_rate == 0.0
+
+
+def test_window_matches_exact_count_at_bucket_resolution() -> None:
+    """Test totals equal a brute-force count over recorded timestamps."""
+    clock = FakeClock(0.0)
+    window = SlidingWindowCounter(window_seconds=60, num_buckets=60, clock=clock)
+    recorded = []
+    for i in range(500):
+        clock.now = i * 0.7
+        window.record(success=i % 3 != 0)
+        recorded.append((clock.now, i % 3 != 0))
+
+        # Buckets are whole seconds, so the window starts at a bucket edge
+        start = (int(clock.now) - 59) * 1.0
+        in_window = [ok for t, ok in recorded if t >= start]
+        assert window.calls == len(in_window)
+        assert window.failures == in_window.count(False)
+
+
+def test_breaker_opens_on_error_rate() -> None:
+    """Test the error rate over the window trips the breaker."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        CircuitBreakerConfig(error_rate_threshold=0.5, check_window_minutes=1),
+        clock=clock,
+    )
+
+    for _ in range(3):
+        breaker.call(lambda: "ok")
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            breaker.call(_fail)
+    assert breaker.state == CircuitState.CLOSED
+
+    with pytest.raises(ValueError):
+        breaker.call(_fail)
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.get_status()["recent_errors"] == 3
+
+
+def test_old_successes_do_not_dilute_error_rate() -> None:
+    """Test successes outside the window no longer count."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        CircuitBreakerConfig(error_rate_threshold=0.5, check_window_minutes=1),
+        clock=clock,
+    )
+    for _ in range(10):
+        breaker.call(lambda: "ok")
+
+    clock.now += 120
+    with pytest.raises(ValueError):
+        breaker.call(_fail)
+
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_breaker_recovers_after_timeout() -> None:
+    """Test OPEN -> HALF_OPEN after the monotonic timeout, then CLOSED."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        CircuitBreakerConfig(recovery_timeout_minutes=1), clock=clock
+    )
+    breaker.update_sharpe_ratio(-1.0)
+    assert breaker.state == CircuitState.OPEN
+
+    with pytest.raises(Exception, match="Circuit breaker OPEN"):
+        breaker.call(lambda: "ok")
+
+    clock.now += 60
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CircuitState.CLOSED
+    assert [e.event_type for e in breaker.events] == [
+        "OPENED",
+        "HALF_OPENED",
+        "CLOSED",
+    ]
+
+
+def _fail() -> None:
+    raise ValueError("boom")
+
+
+def test_decorated_functions_share_named_breaker() -> None:
+    """Test functions decorated with one name trip together."""
+    registry = CircuitBreakerRegistry()
+
+    @with_circuit_breaker(max_failures=2, name="quotes", registry=registry)
+    def fetch_quote() -> None:
+        raise ValueError("down")
+
+    @with_circuit_breaker(max_failures=2, name="quotes", registry=registry)
+    def fetch_depth() -> str:
+        return "depth"
+
+    assert fetch_quote.circuit_breaker is fetch_depth.circuit_breaker
+    assert registry.get("quotes") is fetch_quote.circuit_breaker
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            fetch_quote()
+
+    with pytest.raises(CircuitOpenError, match="Circuit breaker OPEN for quotes"):
+        fetch_depth()
+
+
+def test_concurrent_threads_keep_consistent_counts() -> None:
+    """Test breaker bookkeeping is not corrupted by concurrent threads."""
+    breaker = FunctionCircuitBreaker("threads", max_failures=10**9)
+    barrier = threading.Barrier(8)
+
+    def worker(i: int) -> None:
+        barrier.wait()
+        for j in range(500):
+            try:
+                breaker.call(_fail if (i + j) % 10 == 0 else int)
+            except ValueError:
+                pass
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(worker, range(8)))
+
+    assert breaker.window.calls == 4000
+    assert breaker.window.failures == 400
+
+
+def test_async_functions_are_awaited_natively() -> None:
+    """Test async def functions stay coroutines and run under the breaker."""
+
+    @with_circuit_breaker(max_failures=1)
+    async def fetch(value: int) -> int:
+        await asyncio.sleep(0)
+        if value < 0:
+            raise ValueError("negative")
+        return value
+
+    async def scenario() -> None:
+        assert await asyncio.gather(*(fetch(i) for i in range(5))) == list(range(5))
+        with pytest.raises(ValueError):
+            await fetch(-1)
+        with pytest.raises(CircuitOpenError):
+            await fetch(1)
+
+    assert asyncio.iscoroutinefunction(fetch)
+    asyncio.run(scenario())
+    assert fetch.circuit_breaker.state == CircuitState.OPEN
+
+
+def test_half_open_limits_concurrent_probes() -> None:
+    """Test only half_open_max_calls probes run while recovering."""
+    clock = FakeClock()
+    breaker = FunctionCircuitBreaker(
+        "probes", max_failures=1, reset_timeout=10, half_open_max_calls=2, clock=clock
+    )
+    with pytest.raises(ValueError):
+        breaker.call(_fail)
+    clock.now += 10
+
+    async def scenario() -> list:
+        release = asyncio.Event()
+
+        async def slow() -> str:
+            await release.wait()
+            return "ok"
+
+        probes = [asyncio.create_task(breaker.acall(slow)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpenError, match="probe"):
+            await breaker.acall(slow)
+        release.set()
+        return await asyncio.gather(*probes)
+
+    assert asyncio.run(scenario()) == ["ok", "ok"]
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_cancelled_probe_releases_slot() -> None:
+    """Test a cancelled probe neither counts as failure nor holds its slot."""
+    clock = FakeClock()
+    breaker = FunctionCircuitBreaker(
+        "cancel", max_failures=1, reset_timeout=10, clock=clock
+    )
+    with pytest.raises(ValueError):
+        breaker.call(_fail)
+    clock.now += 10
+
+    async def scenario() -> None:
+        task = asyncio.create_task(breaker.acall(asyncio.sleep, 10))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert await breaker.acall(asyncio.sleep, 0, "ok") == "ok"
+
+    asyncio.run(scenario())
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_failed_probe_reopens_and_transitions_are_logged(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test a failing probe reopens the circuit; transitions log structured fields."""
+    clock = FakeClock()
+    breaker = FunctionCircuitBreaker(
+        "logged", max_failures=1, reset_timeout=5, clock=clock
+    )
+
+    with caplog.at_level(logging.INFO, logger="agent_kit.monitoring.circuit_breaker"):
+        with pytest.raises(ValueError):
+            breaker.call(_fail)
+        clock.now += 5
+        with pytest.raises(ValueError):
+            breaker.call(_fail)
+
+    assert breaker.state == CircuitState.OPEN
+    transitions = [(r.from_state, r.to_state) for r in caplog.records]
+    assert transitions == [
+        ("CLOSED", "OPEN"),
+        ("OPEN", "HALF_OPEN"),
+        ("HALF_OPEN", "OPEN"),
+    ]
+    assert caplog.records[0].circuit_breaker == "logged"
@@ -0,0 +1,209 @@
+"""Unit tests for bulkheads and adaptive concurrency limits."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from agent_kit.monitoring.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    AIMDLimit,
+    Bulkhead,
+    ConcurrencyLimitExceeded,
+    GradientLimit,
+    get_bulkhead,
+    get_concurrency_limiter,
+)
+
+
+def test_bulkhead_caps_threads_and_sheds_after_queue_timeout() -> None:
+    """Test at most max_concurrent threads run and late callers are shed."""
+    bulkhead = Bulkhead("slow", max_concurrent=2, queue_timeout=0.05)
+    release = threading.Event()
+    peak = 0
+    lock = threading.Lock()
+
+    @bulkhead
+    def slow_call() -> str:
+        nonlocal peak
+        with lock:
+            peak = max(peak, bulkhead.in_flight)
+        release.wait(5)
+        return "ok"
+
+    with ThreadPoolExecutor(6) as pool:
+        futures = [pool.submit(slow_call) for _ in range(6)]
+        time.sleep(0.2)  # queued callers time out meanwhile
+        release.set()
+        outcomes = []
+        for future in futures:
+            try:
+                outcomes.append(future.result())
+            except ConcurrencyLimitExceeded:
+                outcomes.append("shed")
+
+    assert peak == 2
+    assert outcomes.count("ok") == 2
+    assert outcomes.count("shed") == 4 == bulkhead.stats["shed"]
+    assert bulkhead.in_flight == 0 and bulkhead.queued == 0
+
+
+def test_bulkhead_rejects_when_queue_full() -> None:
+    """Test callers beyond max_queue are rejected without waiting."""
+    bulkhead = Bulkhead("tiny", max_concurrent=1, max_queue=0)
+
+    with bulkhead:
+        with pytest.raises(ConcurrencyLimitExceeded, match="queue full"):
+            bulkhead.acquire()
+    assert bulkhead.stats["rejected"] == 1
+
+    with bulkhead:  # permit was returned
+        pass
+
+
+def test_queued_waiters_are_granted_in_order() -> None:
+    """Test released permits go to queued callers instead of being lost."""
+    bulkhead = Bulkhead("fifo", max_concurrent=1, queue_timeout=5)
+    order: list[int] = []
+
+    def worker(i: int) -> None:
+        with bulkhead:
+            order.append(i)
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(5)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.005)
+    for thread in threads:
+        thread.join()
+
+    assert sorted(order) == list(range(5))
+    assert bulkhead.stats["completed"] == 5
+
+
+def test_async_limiter_does_not_block_event_loop() -> None:
+    """Test async callers wait on the loop and permits flow between tasks."""
+    bulkhead = Bulkhead("async", max_concurrent=2, queue_timeout=5)
+    running = 0
+    peak = 0
+
+    @bulkhead
+    async def call(i: int) -> int:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return i
+
+    async def scenario() -> list[int]:
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        tick_task = asyncio.create_task(ticker())
+        results = await asyncio.gather(*(call(i) for i in range(10)))
+        tick_task.cancel()
+        assert ticks > 10  # loop kept running while tasks were queued
+        return results
+
+    assert asyncio.run(scenario()) == list(range(10))
+    assert peak == 2
+
+
+def test_async_queue_timeout_and_cancellation() -> None:
+    """Test queued tasks are shed on timeout and cancelled waiters leave the queue."""
+    bulkhead = Bulkhead("async-shed", max_concurrent=1, queue_timeout=0.02)
+
+    async def scenario() -> None:
+        async with bulkhead:
+            with pytest.raises(ConcurrencyLimitExceeded):
+                await bulkhead.acquire_async()
+
+            waiter = asyncio.create_task(bulkhead.acquire_async(timeout=5))
+            await asyncio.sleep(0)
+            assert bulkhead.queued == 1
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            assert bulkhead.queued == 0
+        assert bulkhead.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_aimd_limit_grows_when_fast_and_backs_off_on_overload() -> None:
+    """Test additive increase under load and multiplicative decrease on drops."""
+    aimd = AIMDLimit(latency_threshold=0.1, backoff_ratio=0.5)
+
+    assert aimd.update(10, 0.01, in_flight=8, dropped=False) == 11
+    assert aimd.update(10, 0.01, in_flight=1, dropped=False) == 10
+    assert aimd.update(10, 0.5, in_flight=8, dropped=False) == 5
+    assert aimd.update(10, None, in_flight=8, dropped=True) == 5
+
+
+def test_gradient_limit_shrinks_as_latency_rises() -> None:
+    """Test the gradient algorithm reduces the limit when latency inflates."""
+    gradient = GradientLimit(smoothing=0.5)
+    limit = 20.0
+    for _ in range(50):
+        limit = gradient.update(limit, 0.01, in_flight=20, dropped=False)
+    steady = limit
+
+    for _ in range(20):
+        limit = gradient.update(limit, 0.2, in_flight=20, dropped=False)
+
+    assert limit < steady / 2
+
+
+def test_adaptive_limiter_backs_off_under_shedding() -> None:
+    """Test shedding lowers the limit, clamped at min_limit."""
+    limiter = AdaptiveConcurrencyLimiter(
+        "adaptive",
+        algorithm=AIMDLimit(backoff_ratio=0.5),
+        initial_limit=8,
+        min_limit=2,
+        max_queue=0,
+    )
+    permits = [limiter.acquire() for _ in range(8)]
+    for _ in range(5):
+        with pytest.raises(ConcurrencyLimitExceeded):
+            limiter.acquire()
+
+    assert limiter.limit == 2
+    for started in permits:
+        limiter.release(started)
+    assert limiter.in_flight == 0
+
+
+def test_adaptive_limiter_grows_with_fast_saturated_calls() -> None:
+    """Test fast calls at full utilization raise the limit up to max_limit."""
+    limiter = AdaptiveConcurrencyLimiter(
+        "grow", initial_limit=2, max_limit=5, queue_timeout=5
+    )
+
+    @limiter
+    def fast() -> None:
+        time.sleep(0.001)
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: fast(), range(200)))
+
+    assert limiter.limit == 5
+
+
+def test_registry_returns_shared_limiters() -> None:
+    """Test named limiters are shared and kinds can't be mixed."""
+    assert get_bulkhead("registry-test", max_concurrent=3) is get_bulkhead(
+        "registry-test"
+    )
+    assert get_bulkhead("registry-test").limit == 3
+    with pytest.raises(TypeError):
+        get_concurrency_limiter("registry-test")
@@ -0,0 +1,169 @@
+"""Unit tests for OntologyEventLogger storage and export."""
+
+import io
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import polars as pl
+import pytest
+
+from agent_kit.events import (
+    EventRingBuffer,
+    OntologyEvent,
+    OntologyEventContent,
+    OntologyEventLogger,
+)
+
+
+@pytest.fixture
+def event_logger(tmp_path: Path) -> OntologyEventLogger:
+    """Logger with a small buffer spilling into a temp directory."""
+    event_logger = OntologyEventLogger(MagicMock(), buffer_size=4, spill_dir=tmp_path)
+    event_logger.start_tracking("s1")
+    return event_logger
+
+
+def log_events(event_logger: OntologyEventLogger, count: int) -> None:
+    """Create numbered events, each with one query and entity."""
+    for i in range(count):
+        event_logger.log_query("s1", f"SELECT ?x{i} WHERE {{}}")
+        event_logger.log_entity("s1", f"Entity{i % 3}")
+        event_logger.create_event(
+            "Agent", "task", {"summary": f"event {i}"}, session_id="s1"
+        )
+
+
+def test_buffer_spills_oldest_events(tmp_path: Path) -> None:
+    """Test memory holds at most capacity events and order is preserved."""
+    buffer = EventRingBuffer(capacity=4, segment_path=tmp_path / "s.ndjson")
+    for i in range(10):
+        buffer.append(OntologyEvent(author=f"a{i}"))
+
+    assert len(buffer) == 10
+    assert buffer.buffered <= 4
+    assert [e.author for e in buffer] == [f"a{i}" for i in range(10)]
+    assert [e.author for e in buffer.tail(6)] == [f"a{i}" for i in range(4, 10)]
+
+
+def test_logger_keeps_full_history_with_bounded_memory(
+    event_logger: OntologyEventLogger,
+) -> None:
+    """Test spilled events still count toward history and summaries."""
+    log_events(event_logger, 25)
+
+    assert event_logger.get_event_count("s1") == 25
+    assert event_logger._session_events["s1"].buffered <= 4
+    events = event_logger.get_events("s1")
+    assert [e.content.text for e in events] == [f"event {i}" for i in range(25)]
+    assert len(event_logger.get_query_history("s1")) == 25
+    assert event_logger.get_entity_summary("s1")["Entity0"] == 25
+    assert event_logger.get_recent_events("s1", 2)[-1].content.text == "event 24"
+
+
+def test_stop_tracking_removes_spill_file(
+    event_logger: OntologyEventLogger, tmp_path: Path
+) -> None:
+    """Test stopping a session deletes its segment file."""
+    log_events(event_logger, 10)
+    assert list(tmp_path.glob("*.ndjson"))
+
+    events = event_logger.stop_tracking("s1")
+
+    assert len(events) == 10
+    assert not list(tmp_path.glob("*.ndjson"))
+
+
+def test_export_ndjson_streams_events(event_logger: OntologyEventLogger) -> None:
+    """Test NDJSON export writes one to_dict() line per event."""
+    log_events(event_logger, 9)
+    out = io.StringIO()
+
+    written = event_logger.export_ndjson("s1", out)
+
+    lines = out.getvalue().splitlines()
+    assert written == len(lines) == 9
+    assert json.loads(lines[0]) == event_logger.export_events("s1")[0]
+
+
+def test_export_parquet_writes_row_groups(
+    event_logger: OntologyEventLogger, tmp_path: Path
+) -> None:
+    """Test Parquet export writes every event through polars."""
+    log_events(event_logger, 10)
+    path = tmp_path / "events.parquet"
+
+    written = event_logger.export_parquet("s1", path, batch_size=4)
+
+    table = pl.read_parquet(path)
+    assert written == table.height == 10
+    assert table.get_column("content_text").to_list()[-1] == "event 9"
+    assert table.get_column("sparql_queries").to_list()[0] == ["SELECT ?x0 WHERE {}"]
+    frames = list(event_logger.export_frames("s1", batch_size=4))
+    assert [frame.height for frame in frames] == [4, 4, 2]
+    assert pl.concat(frames).equals(table)
+
+
+def log_mixed_events(event_logger: OntologyEventLogger) -> None:
+    """Log events across two sessions with varied agents, entities and times."""
+    event_logger.start_tracking("s2")
+    for i in range(30):
+        event = OntologyEvent(
+            author=f"Agent{i % 3}",
+            content=OntologyEventContent(text=f"event {i}"),
+            timestamp=1000.0 + i * 100,  # spread over several buckets
+            extracted_entities=["ex:Revenue"] if i % 5 == 0 else ["ex:Cost"],
+            event_type="agent_result",
+        )
+        event_logger.log_event("s1" if i % 2 == 0 else "s2", event)
+
+
+def test_query_events_matches_scan(tmp_path: Path) -> None:
+    """Test indexed queries return the same events as a full scan."""
+    event_logger = OntologyEventLogger(
+        MagicMock(), buffer_size=4, spill_dir=tmp_path, time_bucket_seconds=500
+    )
+    event_logger.start_tracking("s1")
+    log_mixed_events(event_logger)
+    everything = event_logger.get_events("s1") + event_logger.get_events("s2")
+
+    def scan(predicate) -> list[str]:
+        matches = sorted(
+            (e for e in everything if predicate(e)),
+            key=lambda e: int(e.content.text.split()[1]),
+        )
+        return [e.content.text for e in matches]
+
+    page = event_logger.query_events(entity="ex:Revenue", limit=100)
+    assert [e.content.text for e in page.events] == scan(
+        lambda e: "ex:Revenue" in e.extracted_entities
+    )
+
+    page = event_logger.query_events(
+        agent="Agent1", start_time=1550.0, end_time=2850.0, limit=100
+    )
+    assert [e.content.text for e in page.events] == scan(
+        lambda e: e.author == "Agent1" and 1550.0 <= e.timestamp < 2850.0
+    )
+
+    page = event_logger.query_events(event_type="agent_result", session_id="s2")
+    assert page.total == 15
+    assert set(page.session_ids) == {"s2"}
+
+
+def test_query_events_paginates(tmp_path: Path) -> None:
+    """Test offset pagination walks every match once."""
+    event_logger = OntologyEventLogger(MagicMock(), buffer_size=4, spill_dir=tmp_path)
+    event_logger.start_tracking("s1")
+    log_events(event_logger, 23)
+
+    seen = []
+    offset: int | None = 0
+    while offset is not None:
+        page = event_logger.query_events(agent="Agent", limit=10, offset=offset)
+        seen.extend(e.content.text for e in page.events)
+        offset = page.next_offset
+
+    assert seen == [f"event {i}" for i in range(23)]
+    newest = event_logger.query_events(limit=1, newest_first=True)
+    assert newest.events[0].content.text == "event 22"
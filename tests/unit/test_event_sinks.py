@@ -0,0 +1,205 @@
+"""Unit tests for asynchronous event sinks."""
+
+import json
+import socket
+import sqlite3
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from agent_kit.events import (
+    EventDispatcher,
+    FileSink,
+    OntologyEvent,
+    OntologyEventLogger,
+    SocketSink,
+    SqliteSink,
+)
+
+
+class BlockingSink:
+    """Sink that holds the flusher until released."""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.records: list = []
+
+    def write_batch(self, records: list) -> None:
+        self.release.wait(5)
+        self.records.extend(records)
+
+    def close(self) -> None:
+        pass
+
+
+def make_events(count: int) -> list[OntologyEvent]:
+    """Numbered events."""
+    return [OntologyEvent(author=f"agent{i}") for i in range(count)]
+
+
+def test_file_sink_receives_batches_and_flushes_on_close(tmp_path: Path) -> None:
+    """Test all queued events reach the file once the dispatcher closes."""
+    path = tmp_path / "events.ndjson"
+    dispatcher = EventDispatcher([FileSink(path)], batch_size=8, flush_interval=0.01)
+
+    for event in make_events(20):
+        assert dispatcher.submit("s1", event)
+    dispatcher.close()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["author"] for line in lines] == [f"agent{i}" for i in range(20)]
+    assert lines[0]["session_id"] == "s1"
+    assert dispatcher.stats["written"] == 20
+
+
+def test_failed_batches_are_not_counted_as_written(tmp_path: Path) -> None:
+    """Test a batch only counts as written when no sink raised."""
+    broken = MagicMock()
+    broken.write_batch.side_effect = OSError("disk full")
+    path = tmp_path / "events.ndjson"
+    dispatcher = EventDispatcher(
+        [FileSink(path), broken], batch_size=5, flush_interval=0.01
+    )
+
+    for event in make_events(10):
+        dispatcher.submit("s1", event)
+    dispatcher.close()
+
+    assert len(path.read_text().splitlines()) == 10
+    assert dispatcher.stats["written"] == 0
+    assert dispatcher.stats["failed_batches"] == broken.write_batch.call_count >= 2
+
+
+def test_stats_count_every_concurrent_submit() -> None:
+    """Test counters stay exact with many submitting threads."""
+    sink = MagicMock()
+    dispatcher = EventDispatcher([sink], max_queue=100_000, flush_interval=0.01)
+    events = make_events(500)
+
+    threads = [
+        threading.Thread(
+            target=lambda: [dispatcher.submit("s1", event) for event in events]
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    dispatcher.close()
+
+    assert dispatcher.stats["enqueued"] == dispatcher.stats["written"] == 4000
+
+
+def test_sqlite_sink_stores_events(tmp_path: Path) -> None:
+    """Test SQLite sink inserts one row per event."""
+    db_path = tmp_path / "events.db"
+    dispatcher = EventDispatcher([SqliteSink(db_path)], flush_interval=0.01)
+
+    for event in make_events(5):
+        dispatcher.submit("s1", event)
+    assert dispatcher.flush(timeout=5)
+    dispatcher.close()
+
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT session_id, author FROM ontology_events").fetchall()
+    assert sorted(rows) == [("s1", f"agent{i}") for i in range(5)]
+
+
+def test_socket_sink_sends_otlp_shaped_payload() -> None:
+    """Test socket sink sends one resourceLogs line per batch."""
+    server = socket.create_server(("127.0.0.1", 0))
+    received: list[bytes] = []
+
+    def serve() -> None:
+        conn, _ = server.accept()
+        with conn:
+            while chunk := conn.recv(65536):
+                received.append(chunk)
+
+    thread = threading.Thread(target=serve)
+    thread.start()
+
+    dispatcher = EventDispatcher(
+        [SocketSink(server.getsockname())], batch_size=10, flush_interval=0.01
+    )
+    for event in make_events(3):
+        dispatcher.submit("s1", event)
+    dispatcher.close()
+    thread.join(5)
+    server.close()
+
+    payload = json.loads(b"".join(received).splitlines()[0])
+    records = payload["resourceLogs"][0]["scopeLogs"][0]["logRecords"]
+    assert len(records) == 3
+    assert records[0]["attributes"][0]["value"]["stringValue"] == "s1"
+
+
+def test_drop_policy_never_blocks() -> None:
+    """Test a full queue drops new events instead of blocking."""
+    sink = BlockingSink()
+    dispatcher = EventDispatcher([sink], max_queue=4, batch_size=1, policy="drop")
+
+    accepted = [dispatcher.submit("s1", event) for event in make_events(20)]
+
+    assert not all(accepted)
+    assert dispatcher.stats["dropped"] == accepted.count(False)
+    sink.release.set()
+    dispatcher.close()
+    assert len(sink.records) == accepted.count(True)
+
+
+def test_sample_policy_thins_events_under_pressure() -> None:
+    """Test sampling keeps only a fraction past the high-water mark."""
+    sink = BlockingSink()
+    dispatcher = EventDispatcher(
+        [sink], max_queue=100, batch_size=1, policy="sample", sample_rate=0.0
+    )
+
+    for event in make_events(200):
+        dispatcher.submit("s1", event)
+
+    # Everything past 75 queued records is sampled out at rate 0
+    assert dispatcher.stats["enqueued"] <= 76
+    assert dispatcher.stats["sampled_out"] >= 124
+    sink.release.set()
+    dispatcher.close()
+
+
+def test_block_policy_times_out() -> None:
+    """Test block policy drops after block_timeout when sinks stall."""
+    sink = BlockingSink()
+    dispatcher = EventDispatcher(
+        [sink], max_queue=1, batch_size=1, policy="block", block_timeout=0.01
+    )
+
+    results = [dispatcher.submit("s1", event) for event in make_events(5)]
+
+    assert results.count(False) == dispatcher.stats["dropped"] > 0
+    sink.release.set()
+    dispatcher.close()
+
+
+def test_logger_forwards_events_to_dispatcher(tmp_path: Path) -> None:
+    """Test logger events reach sinks via the dispatcher."""
+    path = tmp_path / "events.ndjson"
+    dispatcher = EventDispatcher([FileSink(path)], flush_interval=0.01)
+    event_logger = OntologyEventLogger(MagicMock(), dispatcher=dispatcher)
+    event_logger.start_tracking("s1")
+
+    event_logger.create_event("Agent", "task", {"summary": "done"}, "s1")
+    event_logger.close()
+
+    line = json.loads(path.read_text())
+    assert line["content"]["text"] == "done"
+
+
+def test_submit_after_close_raises() -> None:
+    """Test a closed dispatcher rejects events."""
+    dispatcher = EventDispatcher([BlockingSink()])
+    dispatcher.close(timeout=0)
+
+    with pytest.raises(RuntimeError):
+        dispatcher.submit("s1", OntologyEvent(author="a"))
@@ -0,0 +1,295 @@
+"""Unit tests for the vectorized indicator kernels."""
+
+import asyncio
+import json
+import time
+
+import numpy as np
+import polars as pl
+import pytest
+from agents.tool_context import ToolContext
+
+from agent_kit.tools import indicators
+from agent_kit.tools.trading_tools import (
+    _latest_bollinger,
+    _latest_macd,
+    _latest_rsi,
+    calculate_indicators_batch,
+    calculate_sharpe_ratio_batch,
+)
+
+
+def loop_ema(data: np.ndarray, period: int) -> np.ndarray:
+    """Per-bar EMA recursion (the original trading_tools implementation)."""
+    alpha = 2 / (period + 1)
+    ema = np.zeros_like(data)
+    ema[0] = data[0]
+    for i in range(1, len(data)):
+        ema[i] = alpha * data[i] + (1 - alpha) * ema[i - 1]
+    return ema
+
+
+def loop_rsi(prices: np.ndarray, period: int = 14) -> float:
+    """RSI from the mean of the last ``period`` gains and losses."""
+    deltas = np.diff(prices)
+    avg_gain = np.mean(np.where(deltas > 0, deltas, 0)[-period:])
+    avg_loss = np.mean(np.where(deltas < 0, -deltas, 0)[-period:])
+    if avg_loss == 0:
+        return 100.0
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def random_walk(n: int, seed: int = 0) -> np.ndarray:
+    """Positive price path with a drift, so windows sit far from zero."""
+    rng = np.random.default_rng(seed)
+    return 150 * np.exp(np.cumsum(rng.normal(0.0002, 0.01, n)))
+
+
+@pytest.mark.parametrize("period", [1, 2, 9, 20, 50, 500])
+def test_ema_matches_recursion(period: int) -> None:
+    """Test the blocked filter equals the per-bar recursion over long series."""
+    prices = random_walk(20_000)
+
+    np.testing.assert_allclose(
+        indicators.ema(prices, period), loop_ema(prices, period), rtol=1e-11
+    )
+
+
+def test_wilder_smooth_matches_recursion() -> None:
+    """Test Wilder smoothing is seeded with the first SMA then recursive."""
+    values = np.abs(np.diff(random_walk(1_000, seed=1)))
+    period = 14
+
+    expected = np.full(len(values), np.nan)
+    expected[period - 1] = values[:period].mean()
+    for i in range(period, len(values)):
+        expected[i] = (expected[i - 1] * (period - 1) + values[i]) / period
+
+    np.testing.assert_allclose(
+        indicators.wilder_smooth(values, period), expected, rtol=1e-11
+    )
+
+
+def test_rolling_windows_match_per_window_reductions() -> None:
+    """Test cumsum and strided windows against np.mean / np.std per window."""
+    prices = random_walk(3_000, seed=2)
+    window = 20
+    views = [prices[i - window + 1 : i + 1] for i in range(window - 1, len(prices))]
+
+    mean = indicators.rolling_mean(prices, window)
+    std = indicators.rolling_std(prices, window)
+
+    assert np.isnan(mean[: window - 1]).all() and np.isnan(std[: window - 1]).all()
+    np.testing.assert_allclose(
+        mean[window - 1 :], [v.mean() for v in views], rtol=1e-12
+    )
+    np.testing.assert_allclose(std[window - 1 :], [v.std() for v in views], rtol=1e-9)
+
+
+def test_series_kernels_match_latest_value_tools() -> None:
+    """Test every bar of each series equals the old latest-value result."""
+    prices = random_walk(400, seed=3)
+
+    rsi = indicators.rsi(prices)
+    line, signal, histogram = indicators.macd(prices)
+    upper, middle, lower = indicators.bollinger_bands(prices)
+    vol = indicators.volatility(prices)
+
+    for t in range(40, len(prices)):
+        head = prices[: t + 1]
+        assert rsi[t] == pytest.approx(loop_rsi(head), rel=1e-9)
+        macd_line = loop_ema(head, 12) - loop_ema(head, 26)
+        assert line[t] == pytest.approx(macd_line[-1], rel=1e-9, abs=1e-12)
+        assert signal[t] == pytest.approx(loop_ema(macd_line, 9)[-1], abs=1e-10)
+        window = head[-20:]
+        assert middle[t] == pytest.approx(window.mean(), rel=1e-12)
+        assert upper[t] - lower[t] == pytest.approx(4 * window.std(), rel=1e-9)
+        returns = np.diff(head[-21:]) / head[-21:-1]
+        assert vol[t] == pytest.approx(returns.std() * np.sqrt(252), rel=1e-9)
+    np.testing.assert_allclose(histogram, line - signal)
+
+
+def test_latest_value_helpers_keep_edge_cases() -> None:
+    """Test short inputs and loss-free windows return the old fallbacks."""
+    rising = np.arange(1.0, 40.0)
+
+    assert _latest_rsi(rising[:5]) == 50.0
+    assert _latest_rsi(rising) == 100.0
+    assert _latest_macd(rising[:30]) == {"macd": 0.0, "signal": 0.0, "histogram": 0.0}
+    assert _latest_bollinger(rising[:3]) == {"upper": 3.0, "middle": 3.0, "lower": 3.0}
+    assert _latest_bollinger(np.array([])) == {
+        "upper": 100.0,
+        "middle": 100.0,
+        "lower": 100.0,
+    }
+
+
+def test_kernels_accept_batches_along_last_axis() -> None:
+    """Test (N, T) inputs give the same rows as one series at a time."""
+    batch = np.stack([random_walk(500, seed=s) for s in range(4)])
+
+    for kernel in (
+        lambda x: indicators.ema(x, 20),
+        lambda x: indicators.rsi(x, 14, smoothing="wilder"),
+        lambda x: indicators.bollinger_bands(x)[0],
+    ):
+        rows = np.stack([kernel(row) for row in batch])
+        np.testing.assert_allclose(kernel(batch), rows, rtol=1e-12)
+
+
+def test_hundred_thousand_bars_take_milliseconds() -> None:
+    """Test all series indicators on 100k bars finish well under a second."""
+    prices = random_walk(100_000, seed=4)
+
+    start = time.perf_counter()
+    indicators.rsi(prices)
+    indicators.macd(prices)
+    indicators.bollinger_bands(prices)
+    indicators.volatility(prices)
+    indicators.ema(prices, 20)
+    indicators.ema(prices, 50)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5
+
+
+def invoke(tool, **arguments):
+    """Run a function tool the way the agent runtime does."""
+    payload = json.dumps(arguments)
+    context = ToolContext(
+        context=None, tool_name=tool.name, tool_call_id="test", tool_arguments=payload
+    )
+    return asyncio.run(tool.on_invoke_tool(context, payload))
+
+
+def single_series_indicators(prices: np.ndarray) -> dict[str, float]:
+    """Latest values the way calculate_indicators computes one series."""
+    macd = _latest_macd(prices)
+    bands = _latest_bollinger(prices)
+    ema_20 = loop_ema(prices, 20)[-1]
+    returns = np.diff(prices) / prices[:-1]
+    vol = returns[-20:].std() * np.sqrt(252) if len(prices) >= 21 else 0.0
+    sharpe = (
+        (returns.mean() * 252 - 0.02) / (returns.std() * np.sqrt(252))
+        if len(returns) >= 2
+        else 0.0
+    )
+    return {
+        "rsi": _latest_rsi(prices),
+        "macd": macd["macd"],
+        "macd_signal": macd["signal"],
+        "macd_histogram": macd["histogram"],
+        "ema_20": ema_20,
+        "ema_50": loop_ema(prices, 50)[-1] if len(prices) >= 50 else ema_20,
+        "bollinger_upper": bands["upper"],
+        "bollinger_middle": bands["middle"],
+        "bollinger_lower": bands["lower"],
+        "volatility": vol,
+        "sharpe_ratio": sharpe,
+    }
+
+
+def test_latest_indicators_match_single_series_with_ragged_history() -> None:
+    """Test late listings (leading NaN) match their unpadded single-series values."""
+    lengths = [300, 120, 49, 34, 20, 14, 2, 1]
+    close = np.full((300, len(lengths)), np.nan)
+    series = []
+    for j, length in enumerate(lengths):
+        series.append(random_walk(length, seed=10 + j))
+        close[300 - length :, j] = series[-1]
+
+    batch = indicators.latest_indicators(close)
+
+    assert tuple(batch) == indicators.INDICATOR_NAMES
+    for j, prices in enumerate(series):
+        for name, expected in single_series_indicators(prices).items():
+            assert batch[name][j] == pytest.approx(expected, rel=1e-9, abs=1e-12), (
+                name,
+                lengths[j],
+            )
+
+
+def test_latest_indicators_skip_gaps_and_empty_symbols() -> None:
+    """Test gapped columns match their observed series and empty ones read NaN."""
+    gappy = random_walk(100, seed=5)
+    gappy[[0, 40, 41, 60, 99]] = np.nan
+    sparse = np.full(100, np.nan)
+    sparse[::5] = random_walk(20, seed=6)
+    close = np.column_stack([gappy, sparse, np.full(100, np.nan)])
+
+    batch = indicators.latest_indicators(close)
+
+    for j, column in enumerate((gappy, sparse)):
+        observed = column[~np.isnan(column)]
+        for name, expected in single_series_indicators(observed).items():
+            assert batch[name][j] == pytest.approx(expected, rel=1e-9, abs=1e-12), (
+                name,
+                j,
+            )
+    assert all(np.isnan(values[2]) for values in batch.values())
+    with pytest.raises(ValueError, match="Unknown indicators"):
+        indicators.latest_indicators(close, ["stochastic"])
+
+
+def test_latest_indicators_frame_from_long_polars() -> None:
+    """Test a long-format frame pivots to the same screen as the matrix."""
+    close = np.column_stack([random_walk(80, seed=s) for s in range(3)])
+    timestamps = np.datetime64("2024-01-01") + np.arange(80)
+    frame = pl.DataFrame(
+        {
+            "timestamp": np.repeat(timestamps, 3),
+            "ticker": np.tile(["MSFT", "AAPL", "NVDA"], 80),
+            "close": close.ravel(),
+        }
+    ).sample(fraction=1.0, shuffle=True, seed=0)
+
+    screen = indicators.latest_indicators_frame(frame, ["rsi", "macd"])
+
+    assert screen.get_column("ticker").to_list() == ["AAPL", "MSFT", "NVDA"]
+    expected = indicators.latest_indicators(close[:, [1, 0, 2]], ["rsi", "macd"])
+    np.testing.assert_allclose(screen.get_column("rsi").to_numpy(), expected["rsi"])
+    np.testing.assert_allclose(screen.get_column("macd").to_numpy(), expected["macd"])
+
+
+def test_batch_tools_return_columns() -> None:
+    """Test the batch tools align ragged series and return JSON-friendly columns."""
+    long, short = random_walk(60, seed=6), random_walk(10, seed=7)
+
+    screen = invoke(
+        calculate_indicators_batch,
+        prices=[
+            {"ticker": "AAPL", "values": long.tolist()},
+            {"ticker": "NEW", "values": short.tolist()},
+            {"ticker": "NONE", "values": []},
+        ],
+        names=["rsi", "ema_20"],
+    )
+    ratios = invoke(
+        calculate_sharpe_ratio_batch,
+        returns=[
+            {"ticker": "A", "values": [0.01, -0.02, 0.03]},
+            {"ticker": "B", "values": [0.01]},
+        ],
+        risk_free_rate=0.02,
+    )
+
+    assert screen["ticker"] == ["AAPL", "NEW", "NONE"]
+    assert screen["rsi"][:2] == [pytest.approx(_latest_rsi(long)), 50.0]
+    assert screen["ema_20"][1] == pytest.approx(loop_ema(short, 20)[-1])
+    assert screen["rsi"][2] is None
+    returns = np.array([0.01, -0.02, 0.03])
+    expected = (returns.mean() * 252 - 0.02) / (returns.std() * np.sqrt(252))
+    assert ratios == {"A": pytest.approx(expected), "B": 0.0}
+
+
+def test_two_thousand_symbol_screen_is_one_fast_pass() -> None:
+    """Test a 2,000-symbol x 1-year screen of every indicator stays sub-second."""
+    rng = np.random.default_rng(8)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (252, 2_000)), axis=0))
+
+    start = time.perf_counter()
+    screen = indicators.latest_indicators(close)
+    elapsed = time.perf_counter() - start
+
+    assert all(values.shape == (2_000,) for values in screen.values())
+    assert elapsed < 1.0
@@ -0,0 +1,215 @@
+"""Unit tests for the local OHLCV store."""
+
+import asyncio
+import json
+
+import numpy as np
+import pytest
+from agents.tool_context import ToolContext
+
+from agent_kit.backtesting import BarSeries, MarketDataStore, set_market_store
+from agent_kit.tools.trading_tools import fetch_market_data
+
+
+def daily_bars(start: str, days: int, seed: int = 0) -> BarSeries:
+    """Business-day bars from ``start``."""
+    rng = np.random.default_rng(seed)
+    first = np.busday_offset(np.datetime64(start, "D"), 0, roll="forward")
+    timestamps = np.busday_offset(first, np.arange(days)).astype("datetime64[ns]")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, days)))
+    return BarSeries(
+        timestamps=timestamps,
+        close=close,
+        open=close * 0.999,
+        high=close * 1.01,
+        low=close * 0.99,
+        volume=rng.integers(1_000, 10_000, days).astype(float),
+    )
+
+
+def test_append_and_range_read_across_partitions(tmp_path) -> None:
+    """Test bars land in yearly files and range reads return exactly the range."""
+    store = MarketDataStore(tmp_path)
+    bars = daily_bars("2022-06-01", 600)
+
+    assert store.append("AAPL", bars) == 600
+    assert sorted(p.name for p in (tmp_path / "1day" / "AAPL").iterdir()) == [
+        "2022.parquet",
+        "2023.parquet",
+        "2024.parquet",
+    ]
+
+    series = store.read("AAPL", start="2023-03-01", end="2023-03-31")
+    expected = bars.between(np.datetime64("2023-03-01"), np.datetime64("2023-03-31"))
+    np.testing.assert_array_equal(series.timestamps, expected.timestamps)
+    np.testing.assert_array_equal(series.close, expected.close)
+    np.testing.assert_array_equal(store.read("AAPL").volume, bars.volume)
+    assert store.symbols() == ["AAPL"]
+    assert len(store.read("MSFT")) == 0
+
+
+def test_range_read_opens_only_overlapping_partitions(tmp_path, monkeypatch) -> None:
+    """Test a one-month read of a three-year history decodes a single file."""
+    store = MarketDataStore(tmp_path)
+    store.append("AAPL", daily_bars("2022-01-01", 750))
+    opened = []
+    read_file = MarketDataStore._read_file
+    monkeypatch.setattr(
+        MarketDataStore,
+        "_read_file",
+        staticmethod(lambda path: opened.append(path.name) or read_file(path)),
+    )
+
+    store.read("AAPL", start="2023-05-01", end="2023-05-31")
+
+    assert opened == ["2023.parquet"]
+
+
+def test_append_replaces_duplicates_and_invalidates_cache(tmp_path) -> None:
+    """Test re-appended timestamps overwrite stored bars and cached ranges."""
+    store = MarketDataStore(tmp_path)
+    bars = daily_bars("2024-01-01", 50)
+    store.append("AAPL", bars)
+    before = store.read("AAPL")
+
+    revised = bars.take(slice(40, 50))
+    revised = BarSeries(timestamps=revised.timestamps, close=revised.close + 1)
+    store.append("AAPL", revised)
+    after = store.read("AAPL")
+
+    assert len(after) == 50
+    np.testing.assert_array_equal(after.close[:40], before.close[:40])
+    np.testing.assert_array_equal(after.close[40:], bars.close[40:] + 1)
+    assert np.isnan(after.open[40:]).all()
+
+
+def test_lru_serves_hot_ranges_read_only(tmp_path) -> None:
+    """Test repeated reads hit the cache and the least recent range is evicted."""
+    store = MarketDataStore(tmp_path, cache_size=2)
+    store.append("AAPL", daily_bars("2024-01-01", 100))
+
+    first = store.read("AAPL", end="2024-02-01")
+    assert store.read("AAPL", end="2024-02-01") is first
+    store.read("AAPL", start="2024-03-01")
+    store.read("AAPL")
+
+    stats = store.get_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["cached_ranges"]) == (1, 3, 2)
+    assert store.read("AAPL", end="2024-02-01") is not first
+    with pytest.raises(ValueError):
+        first.close[0] = 0.0
+
+
+def test_gaps_skip_weekends_and_include_edges(tmp_path) -> None:
+    """Test missing business days and unfilled edges are reported as ranges."""
+    store = MarketDataStore(tmp_path)
+    bars = daily_bars("2024-01-08", 20)  # Mon 8 Jan .. Fri 2 Feb
+    keep = np.ones(20, dtype=bool)
+    keep[[5, 6, 7]] = False  # Mon 15 .. Wed 17 Jan
+    store.append("AAPL", bars.take(np.flatnonzero(keep)))
+
+    gaps = store.gaps("AAPL", start="2024-01-02", end="2024-02-09")
+
+    assert [(str(a)[:10], str(b)[:10]) for a, b in gaps] == [
+        ("2024-01-02", "2024-01-05"),
+        ("2024-01-15", "2024-01-17"),
+        ("2024-02-05", "2024-02-09"),
+    ]
+    assert store.gaps("AAPL", start="2024-01-08", end="2024-01-12") == []
+
+
+def test_intraday_gaps_and_panel_reads(tmp_path) -> None:
+    """Test minute bars partition by month, report missing minutes, and align."""
+    store = MarketDataStore(tmp_path)
+    timestamps = np.datetime64("2024-01-31T23:55", "ns") + np.arange(
+        10
+    ) * np.timedelta64(1, "m")
+    store.append(
+        "BTC",
+        BarSeries(timestamps=np.delete(timestamps, [3, 4]), close=np.arange(8.0)),
+        interval="1min",
+    )
+    store.append("ETH", BarSeries(timestamps=timestamps, close=np.arange(10.0)), "1min")
+
+    assert sorted(p.name for p in (tmp_path / "1min" / "BTC").iterdir()) == [
+        "2024-01.parquet",
+        "2024-02.parquet",
+    ]
+    assert store.gaps("BTC", interval="1min") == [(timestamps[3], timestamps[4])]
+    panel = store.read_panel(["BTC", "ETH"], interval="1min")
+    assert panel.close.shape == (10, 2)
+    assert np.isnan(panel.close[[3, 4], 0]).all()
+    with pytest.raises(ValueError, match="interval"):
+        store.read("BTC", interval="2min")
+
+
+def invoke_fetch(**arguments) -> list[dict]:
+    """Run the fetch_market_data tool the way the agent runtime does."""
+    payload = json.dumps(arguments)
+    context = ToolContext(
+        context=None,
+        tool_name=fetch_market_data.name,
+        tool_call_id="test",
+        tool_arguments=payload,
+    )
+    return asyncio.run(fetch_market_data.on_invoke_tool(context, payload))
+
+
+def test_fetch_market_data_reads_through_the_store(tmp_path) -> None:
+    """Test the tool persists its first fetch and serves the second from disk."""
+    store = MarketDataStore(tmp_path)
+    set_market_store(store)
+    try:
+        first = invoke_fetch(ticker="AAPL", interval="1hour", limit=30)
+        second = invoke_fetch(ticker="AAPL", interval="1hour", limit=30)
+    finally:
+        set_market_store(None)
+
+    assert len(store.read("AAPL", interval="1hour")) == 30
+    assert [bar["close"] for bar in second] == [bar["close"] for bar in first]
+    assert [bar["timestamp"] for bar in second] == [bar["timestamp"] for bar in first]
+
+
+def test_fetch_market_data_only_fills_gaps(tmp_path) -> None:
+    """Test stored bars are kept and only the missing days are generated."""
+    store = MarketDataStore(tmp_path)
+    set_market_store(store)
+    try:
+        full = invoke_fetch(ticker="AAPL", interval="1day", limit=40)
+        stored = store.read("AAPL")
+        keep = np.ones(40, dtype=bool)
+        keep[[10, 11, 12, 39]] = False  # A mid-series hole and the latest day
+        rebuilt = MarketDataStore(tmp_path / "rebuilt")
+        rebuilt.append("AAPL", stored.take(np.flatnonzero(keep)))
+        set_market_store(rebuilt)
+
+        refilled = invoke_fetch(ticker="AAPL", interval="1day", limit=40)
+    finally:
+        set_market_store(None)
+
+    assert [bar["timestamp"] for bar in refilled] == [bar["timestamp"] for bar in full]
+    closes = np.array([bar["close"] for bar in refilled])
+    np.testing.assert_array_equal(closes[keep], stored.close[keep])
+    assert (
+        rebuilt.gaps("AAPL", refilled[0]["timestamp"], refilled[-1]["timestamp"]) == []
+    )
+    assert invoke_fetch(ticker="AAPL", interval="1day", limit=0) == []
+
+
+@pytest.mark.parametrize(
+    "symbol", ["../../escaped", "..", ".", "a/b", "a\\b", "/etc", "", "AA PL"]
+)
+def test_unsafe_symbols_cannot_escape_the_root(tmp_path, symbol) -> None:
+    """Test path-like symbols are rejected before touching the filesystem."""
+    root = tmp_path / "store"
+    store = MarketDataStore(root)
+
+    with pytest.raises(ValueError, match="Invalid symbol"):
+        store.append(symbol, daily_bars("2024-01-01", 5))
+    with pytest.raises(ValueError, match="Invalid symbol"):
+        store.read(symbol)
+
+    assert list(tmp_path.rglob("*.parquet")) == []
+    for symbol in ("BTC-USD", "^GSPC", "EURUSD=X", "BRK.B"):
+        store.append(symbol, daily_bars("2024-01-01", 5))
+    assert store.symbols() == ["BRK.B", "BTC-USD", "EURUSD=X", "^GSPC"]
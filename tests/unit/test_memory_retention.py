@@ -0,0 +1,133 @@
+"""Unit tests for memory retention policies."""
+
+from pathlib import Path
+
+import pytest
+
+from agent_kit.memory import (
+    InMemoryBackend,
+    MemorySweeper,
+    OntologyMemoryService,
+    RetentionPolicy,
+)
+from agent_kit.memory.ontology_memory_service import MemoryEntry
+from agent_kit.ontology import OntologyLoader
+
+
+@pytest.fixture
+def ontology() -> OntologyLoader:
+    """Load core test ontology."""
+    path = Path(__file__).parent.parent.parent / "assets" / "ontologies" / "core.ttl"
+    loader = OntologyLoader(str(path))
+    loader.load()
+    return loader
+
+
+def make_entry(
+    memory_id: str, timestamp: float, content: str = "note", user_id: str = "u1"
+) -> MemoryEntry:
+    """Build a memory entry with a fixed timestamp."""
+    return MemoryEntry(
+        id=memory_id,
+        content=content,
+        user_id=user_id,
+        session_id="s1",
+        timestamp=timestamp,
+        domain="business",
+    )
+
+
+@pytest.mark.asyncio
+async def test_store_dedupes_identical_content(ontology: OntologyLoader) -> None:
+    """Test storing the same content twice keeps one entry."""
+    memory = OntologyMemoryService(ontology)
+
+    first = await memory.store("Revenue grew 10%", "u1", "s1")
+    second = await memory.store("Revenue grew 10%", "u1", "s2")
+
+    assert first.id == second.id
+    assert len(memory.backend) == 1
+
+
+@pytest.mark.asyncio
+async def test_dedupe_disabled_keeps_copies(ontology: OntologyLoader) -> None:
+    """Test dedup can be turned off."""
+    memory = OntologyMemoryService(ontology, retention=RetentionPolicy(dedupe=False))
+
+    await memory.store("Revenue grew 10%", "u1", "s1")
+    await memory.store("Revenue grew 10%", "u1", "s2")
+
+    assert len(memory.backend) == 2
+
+
+@pytest.mark.asyncio
+async def test_sweep_expires_by_ttl() -> None:
+    """Test entries older than the TTL are deleted."""
+    backend = InMemoryBackend()
+    await backend.store(make_entry("old", timestamp=0.0))
+    await backend.store(make_entry("new", timestamp=95.0))
+
+    sweeper = MemorySweeper(backend, RetentionPolicy(ttl_seconds=10))
+    stats = await sweeper.sweep(now=100.0)
+
+    assert stats.expired == 1
+    assert [e.id for e in await backend.list_entries()] == ["new"]
+
+
+@pytest.mark.asyncio
+async def test_sweep_enforces_quotas_per_user() -> None:
+    """Test quotas evict the oldest entries within each user scope."""
+    backend = InMemoryBackend()
+    for i in range(5):
+        await backend.store(make_entry(f"a{i}", timestamp=float(i)))
+    await backend.store(make_entry("b0", timestamp=0.0, user_id="u2"))
+
+    sweeper = MemorySweeper(backend, RetentionPolicy(max_entries=2))
+    stats = await sweeper.sweep(now=10.0)
+
+    assert stats.evicted == 3
+    remaining = {e.id for e in await backend.list_entries()}
+    assert remaining == {"a3", "a4", "b0"}
+
+
+@pytest.mark.asyncio
+async def test_sweep_enforces_byte_quota() -> None:
+    """Test byte quotas bound total content size."""
+    backend = InMemoryBackend()
+    for i in range(4):
+        await backend.store(make_entry(f"m{i}", timestamp=float(i), content="x" * 10))
+
+    sweeper = MemorySweeper(backend, RetentionPolicy(max_bytes=25))
+    await sweeper.sweep(now=10.0)
+
+    assert {e.id for e in await backend.list_entries()} == {"m2", "m3"}
+
+
+@pytest.mark.asyncio
+async def test_sweep_compacts_old_entries_into_digest() -> None:
+    """Test old entries are merged into a digest entry."""
+    backend = InMemoryBackend()
+    for i in range(3):
+        entry = make_entry(f"m{i}", timestamp=float(i), content=f"Fact {i}. Detail.")
+        entry.entities = ["Revenue"]
+        await backend.store(entry)
+    await backend.store(make_entry("fresh", timestamp=99.0))
+
+    sweeper = MemorySweeper(backend, RetentionPolicy(compact_after_seconds=50))
+    stats = await sweeper.sweep(now=100.0)
+
+    assert stats.compacted == 3
+    assert stats.digests_created == 1
+
+    entries = await backend.list_entries()
+    digests = [e for e in entries if e.metadata.get("digest")]
+    assert len(entries) == 2
+    assert digests[0].metadata["source_ids"] == ["m0", "m1", "m2"]
+    assert digests[0].entities == ["Revenue"]
+    assert "Fact 0" in digests[0].content
+
+
+def test_sweeper_requires_enumerable_backend() -> None:
+    """Test sweeper rejects backends without list_entries."""
+    with pytest.raises(TypeError):
+        MemorySweeper(object(), RetentionPolicy())
@@ -0,0 +1,118 @@
+"""Unit tests for the metrics registry and circuit breaker metrics."""
+
+import numpy as np
+import pytest
+
+from agent_kit.monitoring.circuit_breaker import (
+    CircuitOpenError,
+    FunctionCircuitBreaker,
+)
+from agent_kit.monitoring.metrics import (
+    HdrHistogram,
+    MetricsRegistry,
+    metrics_registry,
+)
+
+
+def sample(name: str, **labels: str) -> float | None:
+    """Current value of one exported sample of the default registry."""
+    return metrics_registry.sample(name, **labels)
+
+
+def test_hdr_histogram_quantiles_within_relative_error() -> None:
+    """Test quantiles stay within the sub-bucket relative error."""
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(mean=-4, sigma=1.5, size=20_000)
+    histogram = HdrHistogram()
+    for value in values:
+        histogram.record(float(value))
+
+    assert histogram.count == len(values)
+    for q in (0.5, 0.9, 0.99, 0.999):
+        exact = float(np.quantile(values, q, method="inverted_cdf"))
+        assert histogram.quantile(q) == pytest.approx(exact, rel=0.01, abs=2e-6)
+
+
+def test_hdr_histogram_cumulative_counts() -> None:
+    """Test exported boundaries count observations at or below them."""
+    histogram = HdrHistogram()
+    for value in (0.0005, 0.002, 0.002, 0.3, 7.0):
+        histogram.record(value)
+
+    assert histogram.cumulative_counts([0.001, 0.01, 1.0, 10.0]) == [1, 3, 4, 5]
+
+
+def test_render_prometheus_text_format() -> None:
+    """Test counters, gauges and histograms render as exposition text."""
+    registry = MetricsRegistry()
+    calls = registry.counter("demo_calls_total", "Demo calls", ["tool"])
+    calls.labels(tool='say "hi"').inc()
+    calls.labels(tool='say "hi"').inc(2)
+    registry.gauge("demo_up", "Up").set(1)
+    latency = registry.histogram(
+        "demo_latency_seconds", "Latency", buckets=(0.1, 1.0), quantiles=(0.5,)
+    )
+    latency.observe(0.05)
+    latency.observe(0.5)
+
+    lines = registry.render_prometheus().splitlines()
+
+    assert 'demo_calls_total{tool="say \\"hi\\""} 3.0' in lines
+    assert "demo_up 1.0" in lines
+    assert "# TYPE demo_latency_seconds histogram" in lines
+    assert 'demo_latency_seconds_bucket{le="0.1"} 1.0' in lines
+    assert 'demo_latency_seconds_bucket{le="+Inf"} 2.0' in lines
+    assert "demo_latency_seconds_count 2.0" in lines
+    assert registry.sample("demo_latency_seconds_sum") == pytest.approx(0.55)
+    assert registry.sample(
+        "demo_latency_seconds_quantile", quantile="0.5"
+    ) == pytest.approx(0.05, rel=0.01)
+
+
+def test_registry_rejects_conflicting_definitions() -> None:
+    """Test a name can't be re-registered as another type or label set."""
+    registry = MetricsRegistry()
+    registry.counter("things_total", "Things", ["kind"])
+
+    assert registry.counter("things_total", "Things", ["kind"]) is registry.get(
+        "things_total"
+    )
+    with pytest.raises(ValueError):
+        registry.gauge("things_total", "Things", ["kind"])
+    with pytest.raises(ValueError):
+        registry.counter("things_total", "Things", ["other"])
+
+
+def test_function_breaker_publishes_metrics() -> None:
+    """Test calls, failures, rejections, transitions and latency are counted."""
+    breaker = FunctionCircuitBreaker(
+        "metrics-test", max_failures=2, failure_threshold=1.1
+    )
+
+    breaker.call(lambda: None)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            breaker.call(_fail)
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: None)
+
+    name = "agent_kit_circuit_breaker"
+    assert sample(f"{name}_calls_total", breaker="metrics-test") == 3
+    assert sample(f"{name}_failures_total", breaker="metrics-test") == 2
+    assert sample(f"{name}_rejections_total", breaker="metrics-test") == 1
+    assert sample(f"{name}_state", breaker="metrics-test") == 2
+    assert (
+        sample(
+            f"{name}_transitions_total",
+            breaker="metrics-test",
+            from_state="CLOSED",
+            to_state="OPEN",
+        )
+        == 1
+    )
+    latency = metrics_registry.get(f"{name}_call_latency_seconds")
+    assert latency.labels(breaker="metrics-test").histogram.count == 3
+
+
+def _fail() -> None:
+    raise ValueError("boom")
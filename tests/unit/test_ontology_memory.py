@@ -0,0 +1,215 @@
+"""Unit tests for OntologyMemorySession semantic search and sidecar storage."""
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip("agents")
+
+from agent_kit.ontology_extensions.ontology_memory import (  # noqa: E402
+    OntologyMemorySession,
+)
+
+
+class StubEmbedder:
+    """Bag-of-words embedder that counts batch calls."""
+
+    def __init__(self, dim: int = 64) -> None:
+        self.dim = dim
+        self.batch_calls = 0
+        self.texts_embedded = 0
+
+    def embed_batch(self, texts: list[str], show_progress: bool = False) -> np.ndarray:
+        self.batch_calls += 1
+        self.texts_embedded += len(texts)
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for token in text.lower().split():
+                bucket = int(hashlib.md5(token.encode()).hexdigest(), 16) % self.dim
+                out[i, bucket] += 1.0
+        return out
+
+
+@pytest.fixture
+def session() -> OntologyMemorySession:
+    """Session over the core ontology with a stub embedder."""
+    path = Path(__file__).parent.parent.parent / "assets" / "ontologies" / "core.ttl"
+    memory = OntologyMemorySession("test", ontology_path=str(path))
+    memory._embedder = StubEmbedder()
+    return memory
+
+
+@pytest.mark.asyncio
+async def test_store_persists_sidecar_features(session: OntologyMemorySession) -> None:
+    """Test tags, relations and concepts are stored at write time."""
+    item = {"role": "user", "content": "Assign the Task to an Agent"}
+    await session.store_with_semantic_context(
+        [item], semantic_tags=["planning"], ontology_relations={"assignee": "Agent"}
+    )
+
+    features = await session.get_semantic_context(item)
+
+    assert features is not None
+    assert features.tags == ["planning"]
+    assert features.relations == {"assignee": "Agent"}
+    assert {"Task", "Agent"} <= set(features.concepts)
+    assert features.embedding is not None
+
+
+@pytest.mark.asyncio
+async def test_search_semantic_reads_precomputed_embeddings(
+    session: OntologyMemorySession,
+) -> None:
+    """Test search ranks by similarity without re-embedding stored items."""
+    items = [
+        {"role": "user", "content": "weather is sunny today"},
+        {"role": "user", "content": "configure the tool registry"},
+        {"role": "user", "content": "lunch plans"},
+    ]
+    await session.store_with_semantic_context(items)
+    session._embedding_cache.clear()
+    embedder = session._embedder
+    before = embedder.texts_embedded
+
+    results = await session.search_semantic("tool registry", limit=1)
+
+    assert results[0]["content"] == "configure the tool registry"
+    # Only the query needed embedding
+    assert embedder.texts_embedded - before == 1
+
+
+@pytest.mark.asyncio
+async def test_search_semantic_backfills_unindexed_items(
+    session: OntologyMemorySession,
+) -> None:
+    """Test items added without context are embedded in one batch and indexed."""
+    await session.add_items(
+        [{"role": "user", "content": f"note {i}"} for i in range(20)]
+    )
+
+    await session.search_semantic("note 3", limit=5, candidate_limit=20)
+
+    assert session._embedder.batch_calls == 2  # query, then all candidates
+    assert await session.get_semantic_context({"role": "user", "content": "note 3"})
+
+
+@pytest.mark.asyncio
+async def test_relevant_history_uses_tags(session: OntologyMemorySession) -> None:
+    """Test stored tags make items relevant to a concept."""
+    tagged = {"role": "user", "content": "see the attached plan"}
+    await session.store_with_semantic_context([tagged], semantic_tags=["Roadmap"])
+    await session.add_items([{"role": "user", "content": "unrelated chatter"}])
+
+    results = await session.get_ontology_relevant_history(["roadmap"], limit=5)
+
+    assert results == [tagged]
+
+
+@pytest.mark.asyncio
+async def test_clear_session_removes_sidecar(session: OntologyMemorySession) -> None:
+    """Test clearing the session also clears stored features."""
+    item = {"role": "user", "content": "Task"}
+    await session.store_with_semantic_context([item])
+
+    await session.clear_session()
+
+    assert await session.get_semantic_context(item) is None
+
+
+def test_embeddings_batch_cache_misses_once(session: OntologyMemorySession) -> None:
+    """Test one embedder call covers every distinct uncached text."""
+    embedder = session._embedder
+
+    first = session._get_embeddings(["alpha", "beta", "alpha", "gamma"])
+    again = session._get_embeddings(["gamma", "alpha"])
+
+    assert (embedder.batch_calls, embedder.texts_embedded) == (1, 3)
+    assert first.shape == (4, embedder.dim)
+    np.testing.assert_array_equal(first[0], first[2])
+    np.testing.assert_array_equal(again, first[[3, 0]])
+
+
+def test_embedding_cache_evicts_least_recently_used(
+    session: OntologyMemorySession,
+) -> None:
+    """Test the cache keeps the most recently used texts up to its capacity."""
+    session.embedding_cache_size = 3
+    embedder = session._embedder
+    session._get_embeddings(["a", "b", "c"])
+    session._get_embeddings(["a"])  # "b" is now least recently used
+    session._get_embeddings(["d"])
+
+    assert len(session._embedding_cache) == 3
+    session._get_embeddings(["a", "c", "d"])
+    assert embedder.texts_embedded == 4  # Still cached
+    session._get_embeddings(["b"])
+    assert embedder.texts_embedded == 5  # Was evicted
+
+    # A batch larger than the cache is still returned whole
+    assert session._get_embeddings([f"t{i}" for i in range(10)]).shape[0] == 10
+    assert len(session._embedding_cache) == 3
+
+
+@pytest.mark.asyncio
+async def test_candidate_pool_is_truncated(session: OntologyMemorySession) -> None:
+    """Test only the most recent candidate_limit (or limit * multiplier) items score."""
+    items = [{"role": "user", "content": f"note {i}"} for i in range(30)]
+    await session.add_items(items)
+    embedder = session._embedder
+
+    results = await session.search_semantic("note 3", limit=2, candidate_limit=5)
+
+    assert embedder.texts_embedded == 1 + 5
+    assert {r["content"] for r in results} <= {f"note {i}" for i in range(25, 30)}
+
+    session.candidate_multiplier = 4
+    session._embedding_cache.clear()
+    before = embedder.texts_embedded
+    await session.search_semantic("note 4", limit=2)
+    # Query, plus the 3 older items the first search didn't index
+    assert embedder.texts_embedded - before == 1 + 3
+
+
+@pytest.mark.asyncio
+async def test_scores_match_per_item_scoring(session: OntologyMemorySession) -> None:
+    """Test ranking equals the per-item cosine plus concept boost it replaced."""
+    texts = [
+        "assign the task to an agent",
+        "the agent finished",
+        "task backlog review",
+        "lunch plans",
+        "an agent and a task and a tool",
+        "",
+    ]
+    items = [{"role": "user", "content": text} for text in texts]
+    await session.store_with_semantic_context(items)
+    query = "which Agent owns the Task"
+
+    embeddings = session._get_embeddings([query, *texts])
+    concepts = session._extract_ontology_concepts(query)
+    assert {"Agent", "Task"} <= set(concepts)
+    expected = []
+    for text, embedding in zip(texts, embeddings[1:], strict=True):
+        norm = np.linalg.norm(embeddings[0]) * np.linalg.norm(embedding)
+        score = float(embeddings[0] @ embedding / norm) if norm else 0.0
+        score += 0.1 * sum(c.lower() in text.lower() for c in concepts)
+        expected.append((score, text))
+    expected.sort(key=lambda pair: pair[0], reverse=True)
+
+    results = await session.search_semantic(query, limit=len(texts))
+
+    assert [r["content"] for r in results] == [text for _, text in expected]
+    np.testing.assert_allclose(
+        session._cosine_scores(embeddings[0], embeddings[1:]),
+        [
+            (
+                embeddings[0] @ e / (np.linalg.norm(embeddings[0]) * np.linalg.norm(e))
+                if np.linalg.norm(e)
+                else 0.0
+            )
+            for e in embeddings[1:]
+        ],
+        rtol=1e-6,
+    )
@@ -0,0 +1,151 @@
+"""Unit tests for OntologySessionService."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from agent_kit.ontology import OntologyLoader
+from agent_kit.sessions import (
+    InMemorySessionBackend,
+    OntologySessionService,
+    SessionConflictError,
+    SessionMutation,
+    SqliteSessionBackend,
+)
+
+
+@pytest.fixture
+def ontology() -> OntologyLoader:
+    """Core test ontology."""
+    path = Path(__file__).parent.parent.parent / "assets" / "ontologies" / "core.ttl"
+    return OntologyLoader(str(path))
+
+
+@pytest.fixture
+def backend(tmp_path: Path):
+    """SQLite backend in a temporary directory."""
+    sqlite_backend = SqliteSessionBackend(tmp_path / "sessions.db")
+    yield sqlite_backend
+    sqlite_backend.close()
+
+
+@pytest.mark.asyncio
+async def test_context_updates_preserve_events(
+    ontology: OntologyLoader, backend: SqliteSessionBackend
+) -> None:
+    """Test entity and query updates don't touch the event log."""
+    service = OntologySessionService(backend, ontology)
+    for i in range(3):
+        await service.append_event("s1", {"id": f"e{i}"})
+
+    await service.add_entity_to_session("s1", "http://example.org#Revenue")
+    await service.add_query_to_session("s1", "SELECT * WHERE { ?s ?p ?o }")
+
+    session = await service.get_session("s1")
+    assert [e["id"] for e in session["events"]] == ["e0", "e1", "e2"]
+    assert session["ontology_context"]["entities"] == ["http://example.org#Revenue"]
+    assert len(session["ontology_context"]["queries"]) == 1
+    # Schema setup, three single-event appends, two header-only writes
+    assert backend.stats["writes"] == 1 + 3 + 2
+
+
+@pytest.mark.asyncio
+async def test_transaction_flushes_once(
+    ontology: OntologyLoader, backend: SqliteSessionBackend
+) -> None:
+    """Test a turn's buffered updates become a single backend write."""
+    service = OntologySessionService(backend, ontology)
+    await service.get_session("s1")
+    writes_before = backend.stats["writes"]
+
+    async with service.transaction("s1") as tx:
+        for i in range(10):
+            tx.add_entity(f"http://example.org#E{i}")
+        tx.add_query("SELECT * WHERE { ?s ?p ?o }")
+        tx.append_event({"id": "e0"})
+        tx.set_state("topic", "revenue")
+
+    assert backend.stats["writes"] - writes_before == 1
+    session = await service.get_session("s1")
+    assert len(session["ontology_context"]["entities"]) == 10
+    assert session["events"] == [{"id": "e0"}]
+    assert session["metadata"]["topic"] == "revenue"
+
+
+@pytest.mark.asyncio
+async def test_transaction_discarded_on_error(ontology: OntologyLoader) -> None:
+    """Test nothing is written when the transaction block raises."""
+    service = OntologySessionService(InMemorySessionBackend(), ontology)
+
+    with pytest.raises(RuntimeError):
+        async with service.transaction("s1") as tx:
+            tx.add_entity("http://example.org#Revenue")
+            raise RuntimeError("tool failed")
+
+    session = await service.get_session("s1")
+    assert session["ontology_context"]["entities"] == []
+
+
+@pytest.mark.asyncio
+async def test_commit_replays_after_conflict(
+    ontology: OntologyLoader, backend: SqliteSessionBackend
+) -> None:
+    """Test a concurrent write forces a replay instead of a lost update."""
+    service = OntologySessionService(backend, ontology)
+    original_get_header = service._get_header
+    interfered = False
+
+    async def racing_get_header(session_id: str) -> dict:
+        nonlocal interfered
+        session = await original_get_header(session_id)
+        if not interfered:
+            interfered = True
+            await backend.append_event(session_id, {"id": "concurrent"})
+        return session
+
+    service._get_header = racing_get_header
+    mutation = SessionMutation("s1")
+    mutation.append_event({"id": "mine"})
+
+    assert await service.commit(mutation) is True
+    session = await service.get_session("s1")
+    assert [e["id"] for e in session["events"]] == ["concurrent", "mine"]
+
+
+@pytest.mark.asyncio
+async def test_commit_raises_when_conflicts_persist(ontology: OntologyLoader) -> None:
+    """Test conflicts beyond max_retries surface to the caller."""
+    backend = InMemorySessionBackend()
+    service = OntologySessionService(backend, ontology)
+    original_get_header = service._get_header
+
+    async def always_stale(session_id: str) -> dict:
+        session = await original_get_header(session_id)
+        await backend.append_event(session_id, {"id": "other"})
+        return session
+
+    service._get_header = always_stale
+    mutation = SessionMutation("s1")
+    mutation.add_entity("http://example.org#Revenue")
+
+    with pytest.raises(SessionConflictError):
+        await service.commit(mutation, max_retries=2)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_context_updates_all_land(
+    ontology: OntologyLoader, backend: SqliteSessionBackend
+) -> None:
+    """Test many concurrent entity/query writers neither raise nor lose updates."""
+    service = OntologySessionService(backend, ontology)
+    await service.get_session("s1")
+
+    await asyncio.gather(
+        *(service.add_entity_to_session("s1", f"e{i}") for i in range(12)),
+        *(service.add_query_to_session("s1", f"q{i}") for i in range(4)),
+    )
+
+    context = (await service.get_session("s1"))["ontology_context"]
+    assert sorted(context["entities"]) == sorted(f"e{i}" for i in range(12))
+    assert sorted(context["queries"]) == [f"q{i}" for i in range(4)]
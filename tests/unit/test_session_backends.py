@@ -0,0 +1,402 @@
+"""Unit tests for session backends."""
+
+import asyncio
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from agent_kit.sessions import (
+    CachedSessionBackend,
+    InMemorySessionBackend,
+    SessionConflictError,
+    SqliteSessionBackend,
+    create_session_backend,
+)
+from agent_kit.sessions.sqlite_pool import SqliteConnectionPool
+
+
+@pytest.fixture
+def backend(tmp_path: Path):
+    """SQLite backend in a temporary directory."""
+    sqlite_backend = SqliteSessionBackend(tmp_path / "sessions.db")
+    yield sqlite_backend
+    sqlite_backend.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_get_creates_session(backend: SqliteSessionBackend) -> None:
+    """Test getting an unknown session creates it."""
+    session = await backend.get_session("s1")
+
+    assert session["id"] == "s1"
+    assert session["events"] == []
+    assert await backend.list_sessions() == ["s1"]
+
+
+@pytest.mark.asyncio
+async def test_sqlite_save_round_trip(backend: SqliteSessionBackend) -> None:
+    """Test saved data is returned and created_at is preserved."""
+    session = await backend.get_session("s1")
+    created_at = session["created_at"]
+    session["user_id"] = "u1"
+    session["events"].append({"id": "e1"})
+
+    await backend.save_session("s1", session)
+    loaded = await backend.get_session("s1")
+
+    assert loaded["events"] == [{"id": "e1"}]
+    assert loaded["created_at"] == created_at
+    assert await backend.list_sessions(user_id="u1") == ["s1"]
+
+
+@pytest.mark.asyncio
+async def test_sqlite_delete(backend: SqliteSessionBackend) -> None:
+    """Test deleting sessions."""
+    await backend.get_session("s1")
+
+    assert await backend.delete_session("s1") is True
+    assert await backend.delete_session("s1") is False
+
+
+@pytest.mark.asyncio
+async def test_sqlite_uses_wal(backend: SqliteSessionBackend) -> None:
+    """Test database runs in WAL mode."""
+    with sqlite3.connect(backend.db_path) as conn:
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+@pytest.mark.asyncio
+async def test_sqlite_concurrent_sessions(tmp_path: Path) -> None:
+    """Test concurrent writers are batched without losing updates."""
+    backend = SqliteSessionBackend(tmp_path / "sessions.db", group_commit_ms=1.0)
+
+    async def run(session_id: str) -> None:
+        for turn in range(10):
+            session = await backend.get_session(session_id)
+            session["events"].append({"turn": turn})
+            await backend.save_session(session_id, session)
+
+    await asyncio.gather(*(run(f"s{i}") for i in range(20)))
+
+    for i in range(20):
+        session = await backend.get_session(f"s{i}")
+        assert [e["turn"] for e in session["events"]] == list(range(10))
+    assert backend.stats["commits"] < backend.stats["writes"]
+    backend.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_persists_after_close(tmp_path: Path) -> None:
+    """Test pending writes are flushed on close."""
+    db_path = tmp_path / "sessions.db"
+    backend = SqliteSessionBackend(db_path)
+    await backend.save_session("s1", {"id": "s1", "events": [{"id": "e1"}]})
+    backend.close()
+
+    reopened = SqliteSessionBackend(db_path)
+    assert (await reopened.get_session("s1"))["events"] == [{"id": "e1"}]
+    reopened.close()
+
+
+def test_pool_isolates_failed_writes(tmp_path: Path) -> None:
+    """Test a failing write does not roll back others in the same batch."""
+    pool = SqliteConnectionPool(tmp_path / "pool.db", group_commit_ms=20)
+    pool.write_sync(lambda conn: conn.execute("CREATE TABLE t (x INTEGER)"))
+
+    def fail(conn: sqlite3.Connection) -> None:
+        conn.execute("INSERT INTO t VALUES (2)")
+        raise RuntimeError("boom")
+
+    ok = pool.submit_write(lambda conn: conn.execute("INSERT INTO t VALUES (1)"))
+    bad = pool.submit_write(fail)
+    ok.result()
+    with pytest.raises(RuntimeError):
+        bad.result()
+
+    rows = pool.read_sync(lambda conn: conn.execute("SELECT x FROM t").fetchall())
+    assert rows == [(1,)]
+    pool.close()
+
+
+@pytest.mark.parametrize("returns", [False, True])
+def test_pool_survives_transaction_failures(tmp_path: Path, returns: bool) -> None:
+    """Test a batch whose transaction dies fails its writes but not the writer."""
+    pool = SqliteConnectionPool(tmp_path / "pool.db", group_commit_ms=50)
+    pool.write_sync(lambda conn: conn.execute("CREATE TABLE t (x INTEGER)"))
+
+    def lose_transaction(conn: sqlite3.Connection) -> None:
+        # As if SQLite rolled back on its own (SQLITE_FULL, IOERR): the
+        # savepoint is gone, so the cleanup statements fail too
+        conn.execute("ROLLBACK")
+        if not returns:
+            raise sqlite3.OperationalError("database or disk is full")
+
+    ok = pool.submit_write(lambda conn: conn.execute("INSERT INTO t VALUES (1)"))
+    bad = pool.submit_write(lose_transaction)
+    for future in (ok, bad):
+        with pytest.raises(sqlite3.Error):
+            future.result(timeout=5)
+
+    pool.submit_write(lambda conn: conn.execute("INSERT INTO t VALUES (2)")).result(
+        timeout=5
+    )
+    rows = pool.read_sync(lambda conn: conn.execute("SELECT x FROM t").fetchall())
+    assert rows == [(2,)]
+    pool.close()
+
+
+def test_memory_pool_shares_writer_connection() -> None:
+    """Test in-memory databases route reads through the writer."""
+    pool = SqliteConnectionPool(":memory:")
+    pool.write_sync(lambda conn: conn.execute("CREATE TABLE t (x INTEGER)"))
+    pool.write_sync(lambda conn: conn.execute("INSERT INTO t VALUES (1)"))
+
+    assert pool.read_sync(lambda conn: conn.execute("SELECT x FROM t").fetchall()) == [
+        (1,)
+    ]
+    pool.close()
+
+
+def test_factory_passes_sqlite_options(tmp_path: Path) -> None:
+    """Test factory forwards pool configuration."""
+    backend = create_session_backend(
+        "sqlite", db_path=tmp_path / "s.db", pool_size=2, synchronous="FULL"
+    )
+
+    assert isinstance(backend, SqliteSessionBackend)
+    assert backend._pool.max_readers == 2
+    assert backend._pool.synchronous == "FULL"
+    backend.close()
+
+
+@pytest.fixture(params=["memory", "sqlite", "memory+cache", "sqlite+cache"])
+def event_backend(request, tmp_path: Path):
+    """Each backend that supports the append-only event log."""
+    backend_type, _, cached = request.param.partition("+")
+    backend = create_session_backend(
+        backend_type, db_path=tmp_path / "events.db", cache_size=8 if cached else 0
+    )
+    yield backend
+    inner = getattr(backend, "backend", backend)
+    if hasattr(inner, "close"):
+        inner.close()
+
+
+@pytest.mark.asyncio
+async def test_append_event_and_last_n(event_backend) -> None:
+    """Test events append in order and partial loads return the tail."""
+    for i in range(5):
+        count = await event_backend.append_event("s1", {"id": f"e{i}"})
+    assert count == 5
+
+    full = await event_backend.get_session("s1")
+    recent = await event_backend.get_session("s1", last_n_events=2)
+
+    assert [e["id"] for e in full["events"]] == ["e0", "e1", "e2", "e3", "e4"]
+    assert [e["id"] for e in recent["events"]] == ["e3", "e4"]
+    assert recent["events_offset"] == 3
+
+
+@pytest.mark.asyncio
+async def test_partial_save_keeps_older_events(event_backend) -> None:
+    """Test saving a partially loaded session appends without losing history."""
+    for i in range(3):
+        await event_backend.append_event("s1", {"id": f"e{i}"})
+
+    session = await event_backend.get_session("s1", last_n_events=1)
+    session["events"].append({"id": "e3"})
+    session["metadata"]["topic"] = "revenue"
+    await event_backend.save_session("s1", session)
+
+    loaded = await event_backend.get_session("s1")
+    assert [e["id"] for e in loaded["events"]] == ["e0", "e1", "e2", "e3"]
+    assert loaded["metadata"] == {"topic": "revenue"}
+    assert "events_offset" not in loaded
+
+
+@pytest.mark.asyncio
+async def test_save_truncates_shorter_event_list(event_backend) -> None:
+    """Test saving fewer events than stored truncates the log."""
+    for i in range(3):
+        await event_backend.append_event("s1", {"id": f"e{i}"})
+
+    session = await event_backend.get_session("s1")
+    session["events"].pop()
+    await event_backend.save_session("s1", session)
+
+    loaded = await event_backend.get_session("s1")
+    assert [e["id"] for e in loaded["events"]] == ["e0", "e1"]
+
+
+def test_sqlite_migrates_inline_events(tmp_path: Path) -> None:
+    """Test legacy session documents have their events moved to the log."""
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """CREATE TABLE sessions (
+                session_id TEXT PRIMARY KEY, user_id TEXT, data TEXT NOT NULL,
+                created_at REAL NOT NULL, updated_at REAL NOT NULL)"""
+        )
+        conn.execute(
+            "INSERT INTO sessions VALUES (?, ?, ?, ?, ?)",
+            ("s1", "u1", '{"id": "s1", "events": [{"id": "e0"}]}', 1.0, 1.0),
+        )
+
+    backend = SqliteSessionBackend(db_path)
+    session = asyncio.run(backend.get_session("s1"))
+    backend.close()
+
+    assert session["events"] == [{"id": "e0"}]
+    with sqlite3.connect(db_path) as conn:
+        data = conn.execute("SELECT data FROM sessions").fetchone()[0]
+    assert "events" not in data
+
+
+@pytest.mark.asyncio
+async def test_cache_serves_repeat_reads(backend: SqliteSessionBackend) -> None:
+    """Test repeat reads hit the cache and return independent copies."""
+    cached = CachedSessionBackend(backend)
+
+    first = await cached.get_session("s1")
+    first["metadata"]["scratch"] = True
+    second = await cached.get_session("s1")
+
+    assert "scratch" not in second["metadata"]
+    stats = cached.get_cache_stats()
+    assert (stats["cache_hits"], stats["cache_misses"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used() -> None:
+    """Test the cache stays within max_sessions."""
+    cached = CachedSessionBackend(InMemorySessionBackend(), max_sessions=2)
+
+    for session_id in ("a", "b", "a", "c"):
+        await cached.get_session(session_id)
+    await cached.get_session("a")
+
+    stats = cached.get_cache_stats()
+    assert stats["cache_size"] == 2
+    assert stats["evictions"] == 1
+    assert stats["cache_hits"] == 2  # "b" was evicted, "a" kept
+
+
+@pytest.mark.asyncio
+async def test_cache_lock_excludes_staggered_holders() -> None:
+    """Test an uncached session's lock is never held by two callers at once."""
+    cached = CachedSessionBackend(InMemorySessionBackend())
+    holders = 0
+    peak = 0
+
+    async def worker(delay: float) -> None:
+        nonlocal holders, peak
+        await asyncio.sleep(delay)
+        async with cached.lock("s"):
+            holders += 1
+            peak = max(peak, holders)
+            await asyncio.sleep(0.01)
+            holders -= 1
+
+    await asyncio.gather(worker(0), worker(0.001), worker(0.0105))
+
+    assert peak == 1
+    assert not cached._locks and not cached._lock_users
+
+
+@pytest.mark.asyncio
+async def test_cache_write_through_conflict_invalidates(
+    backend: SqliteSessionBackend,
+) -> None:
+    """Test a stale versioned save raises and drops the cached copy."""
+    cached = CachedSessionBackend(backend)
+    session = await cached.get_session("s1")
+    await backend.append_event("s1", {"id": "external"})
+
+    with pytest.raises(SessionConflictError):
+        await cached.save_session("s1", session, expected_version=session["version"])
+
+    reloaded = await cached.get_session("s1")
+    assert [e["id"] for e in reloaded["events"]] == ["external"]
+
+
+@pytest.mark.asyncio
+async def test_cache_write_behind_defers_and_flushes(
+    backend: SqliteSessionBackend,
+) -> None:
+    """Test write-behind batches saves until flushed."""
+    cached = CachedSessionBackend(backend, mode="write-behind", flush_interval=60)
+
+    for i in range(5):
+        await cached.append_event("s1", {"id": f"e{i}"})
+    assert (await backend.get_session("s1"))["events"] == []
+
+    await cached.close()
+
+    stored = await backend.get_session("s1")
+    assert [e["id"] for e in stored["events"]] == [f"e{i}" for i in range(5)]
+    assert cached.get_cache_stats()["backend_writes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_write_behind_flushes_on_eviction() -> None:
+    """Test dirty sessions are written back when evicted."""
+    inner = InMemorySessionBackend()
+    cached = CachedSessionBackend(inner, max_sessions=1, mode="write-behind")
+
+    await cached.append_event("a", {"id": "e0"})
+    await cached.get_session("b")
+
+    assert [e["id"] for e in (await inner.get_session("a"))["events"]] == ["e0"]
+    await cached.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_evicted_dirty_session_stays_visible_until_written() -> None:
+    """Test reads and saves between eviction and write-back see the dirty copy."""
+    inner = InMemorySessionBackend()
+    cached = CachedSessionBackend(inner, max_sessions=1, mode="write-behind")
+    await cached.append_event("a", {"id": "e0"})
+
+    # What get_session("b") does under its own lock, before writing "a" back
+    evicted = cached._store("b", await inner.get_session("b"))
+    assert evicted == ["a"]
+
+    session = await cached.get_session("a")
+    assert [e["id"] for e in session["events"]] == ["e0"]
+    session["events"].append({"id": "e1"})
+    await cached.save_session("a", session)
+    assert await cached._flush_evicted(evicted) == 0  # Taken back; nothing stale
+
+    await cached.close()
+    stored = await inner.get_session("a")
+    assert [e["id"] for e in stored["events"]] == ["e0", "e1"]
+
+
+@pytest.mark.asyncio
+async def test_cache_write_behind_versions_come_from_the_backend(
+    backend: SqliteSessionBackend,
+) -> None:
+    """Test deferred saves don't invent versions and versioned saves are checked."""
+    cached = CachedSessionBackend(backend, mode="write-behind", flush_interval=60)
+    start = (await cached.get_session("s1"))["version"]
+
+    for i in range(3):
+        await cached.append_event("s1", {"id": f"e{i}"})
+    assert (await cached.get_session("s1"))["version"] == start
+    await cached.flush()
+
+    session = await cached.get_session("s1")
+    assert session["version"] == (await backend.get_session("s1"))["version"]
+    stale = dict(session, version=session["version"] - 1)
+    with pytest.raises(SessionConflictError):
+        await cached.save_session("s1", stale, expected_version=stale["version"])
+
+    session["metadata"]["topic"] = "revenue"
+    await cached.save_session("s1", session, expected_version=session["version"])
+    stored = await backend.get_session("s1")
+    assert stored["metadata"]["topic"] == "revenue"
+    assert [e["id"] for e in stored["events"]] == ["e0", "e1", "e2"]
+    assert (await cached.get_session("s1"))["version"] == stored["version"]
+    await cached.close()
@@ -0,0 +1,178 @@
+"""Unit tests for session retention (TTL expiry, event rollover, listing)."""
+
+import asyncio
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+from agent_kit.sessions import (
+    SessionRetentionPolicy,
+    SessionSweeper,
+    SessionSweepStats,
+    SqliteSessionBackend,
+    create_session_backend,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite", "sqlite+cache"])
+def make_backend(request, tmp_path: Path):
+    """Factory for each backend type with a given retention policy."""
+    backend_type, _, cached = request.param.partition("+")
+    created = []
+
+    def _make(policy: SessionRetentionPolicy | None = None):
+        backend = create_session_backend(
+            backend_type,
+            db_path=tmp_path / f"sessions{len(created)}.db",
+            retention=policy,
+            cache_size=8 if cached else 0,
+        )
+        created.append(backend)
+        return backend
+
+    yield _make
+    for backend in created:
+        inner = getattr(backend, "backend", backend)
+        if hasattr(inner, "close"):
+            inner.close()
+
+
+@pytest.mark.asyncio
+async def test_sweep_expires_idle_sessions(make_backend) -> None:
+    """Test sessions idle longer than the TTL are deleted."""
+    backend = make_backend(SessionRetentionPolicy(ttl_seconds=60))
+    await backend.append_event("s1", {"id": "e0"})
+
+    stats = await SessionSweeper(backend).sweep(now=time.time() + 30)
+    assert stats.expired == 0
+
+    stats = await SessionSweeper(backend).sweep(now=time.time() + 120)
+    assert stats.expired == 1
+    assert await backend.list_sessions() == []
+
+
+@pytest.mark.asyncio
+async def test_expired_session_reads_as_new(make_backend) -> None:
+    """Test reads treat a session past its TTL as gone before any sweep."""
+    backend = make_backend(SessionRetentionPolicy(ttl_seconds=0.05))
+    await backend.append_event("s1", {"id": "e0"})
+
+    await asyncio.sleep(0.1)
+
+    assert await backend.list_sessions() == []
+    session = await backend.get_session("s1")
+    assert session["events"] == []
+
+
+@pytest.mark.asyncio
+async def test_rollover_archives_old_events(make_backend) -> None:
+    """Test events beyond max_events move to compressed archives."""
+    backend = make_backend(SessionRetentionPolicy(max_events=3))
+    for i in range(10):
+        await backend.append_event("s1", {"id": f"e{i}"})
+
+    stats = await SessionSweeper(backend).sweep()
+
+    assert stats.archived_events == 7
+    assert stats.archives_created == 1
+    session = await backend.get_session("s1")
+    assert [e["id"] for e in session["events"]] == ["e7", "e8", "e9"]
+    assert session["events_offset"] == 7
+    archived = await backend.get_archived_events("s1")
+    assert [e["id"] for e in archived] == [f"e{i}" for i in range(7)]
+
+
+@pytest.mark.asyncio
+async def test_save_after_rollover_appends(make_backend) -> None:
+    """Test saving a session loaded before or after rollover keeps history."""
+    backend = make_backend(SessionRetentionPolicy(max_events=2))
+    for i in range(4):
+        await backend.append_event("s1", {"id": f"e{i}"})
+    stale = await backend.get_session("s1")
+
+    await SessionSweeper(backend).sweep()
+    stale["events"].append({"id": "e4"})
+    await backend.save_session("s1", stale)
+
+    fresh = await backend.get_session("s1")
+    fresh["events"].append({"id": "e5"})
+    await backend.save_session("s1", fresh)
+
+    session = await backend.get_session("s1")
+    assert [e["id"] for e in session["events"]] == ["e2", "e3", "e4", "e5"]
+    assert len(await backend.get_archived_events("s1")) == 2
+
+
+@pytest.mark.asyncio
+async def test_list_sessions_paginates_and_filters(make_backend) -> None:
+    """Test listings are newest first and honour user and time filters."""
+    backend = make_backend()
+    for i in range(5):
+        session = await backend.get_session(f"s{i}")
+        session["user_id"] = "u1" if i % 2 == 0 else "u2"
+        await backend.save_session(f"s{i}", session)
+        await asyncio.sleep(0.002)
+    cutoff = (await backend.get_session("s2"))["updated_at"]
+
+    assert await backend.list_sessions(limit=2) == ["s4", "s3"]
+    assert await backend.list_sessions(limit=2, offset=2) == ["s2", "s1"]
+    assert await backend.list_sessions(user_id="u1") == ["s4", "s2", "s0"]
+    assert await backend.list_sessions(updated_after=cutoff) == ["s4", "s3"]
+    assert await backend.list_sessions(user_id="u1", updated_before=cutoff) == ["s0"]
+
+
+def test_user_listing_uses_index(tmp_path: Path) -> None:
+    """Test filtered listings are served by the (user_id, updated_at) index."""
+    backend = SqliteSessionBackend(tmp_path / "sessions.db")
+    backend.close()
+
+    with sqlite3.connect(tmp_path / "sessions.db") as conn:
+        plan = conn.execute(
+            """EXPLAIN QUERY PLAN SELECT session_id FROM sessions
+               WHERE user_id = ? ORDER BY updated_at DESC, session_id DESC""",
+            ("u1",),
+        ).fetchall()
+
+    details = " ".join(row[-1] for row in plan)
+    assert "idx_sessions_user_updated" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_sweeper_requires_retention_support() -> None:
+    """Test sweeper rejects backends without apply_retention."""
+    with pytest.raises(TypeError):
+        SessionSweeper(object(), SessionRetentionPolicy())
+
+
+@pytest.mark.asyncio
+async def test_background_sweeps_survive_failures() -> None:
+    """Test the periodic loop keeps sweeping after a failed pass and stops cleanly."""
+
+    class FlakyBackend:
+        def __init__(self) -> None:
+            self.calls = 0
+
+        async def apply_retention(self, policy, now) -> SessionSweepStats:
+            self.calls += 1
+            if self.calls == 1:
+                raise RuntimeError("database is locked")
+            return SessionSweepStats(expired=1)
+
+    backend = FlakyBackend()
+    sweeper = SessionSweeper(
+        backend, SessionRetentionPolicy(sweep_interval_seconds=0.01)
+    )
+
+    sweeper.start()
+    for _ in range(200):
+        if backend.calls >= 3:
+            break
+        await asyncio.sleep(0.01)
+    await sweeper.stop()
+
+    assert backend.calls >= 3
+    assert not sweeper.running
+    assert sweeper.last_stats.expired == 1
+    assert sweeper.last_stats.duration_seconds >= 0
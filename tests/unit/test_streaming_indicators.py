@@ -0,0 +1,141 @@
+"""Unit tests for the incremental streaming indicators."""
+
+import json
+import time
+
+import numpy as np
+import pytest
+
+from agent_kit.tools import indicators
+from agent_kit.tools.streaming_indicators import (
+    IndicatorSet,
+    RollingStats,
+    StreamingBollinger,
+    StreamingEMA,
+    StreamingIndicator,
+    StreamingMACD,
+    StreamingRSI,
+    StreamingVolatility,
+    restore_indicator,
+)
+
+
+def random_walk(n: int, seed: int = 0) -> np.ndarray:
+    """Positive price path with a drift."""
+    rng = np.random.default_rng(seed)
+    return 150 * np.exp(np.cumsum(rng.normal(0.0002, 0.01, n)))
+
+
+def stream(indicator, prices: np.ndarray) -> np.ndarray:
+    """Feed prices one bar at a time and stack each update's result."""
+    return np.array([indicator.update(price) for price in prices.tolist()])
+
+
+def test_streaming_series_match_batch_kernels() -> None:
+    """Test each incremental indicator equals its batch kernel bar for bar."""
+    prices = random_walk(5_000)
+
+    np.testing.assert_allclose(
+        stream(StreamingEMA(20), prices), indicators.ema(prices, 20), rtol=1e-10
+    )
+    for smoothing in ("simple", "wilder"):
+        np.testing.assert_allclose(
+            stream(StreamingRSI(14, smoothing), prices),
+            indicators.rsi(prices, 14, smoothing),
+            rtol=1e-8,
+        )
+    np.testing.assert_allclose(
+        stream(StreamingMACD(), prices).T,
+        indicators.macd(prices),
+        rtol=1e-8,
+        atol=1e-10,
+    )
+    np.testing.assert_allclose(
+        stream(StreamingBollinger(20), prices).T,
+        indicators.bollinger_bands(prices, 20),
+        rtol=1e-10,
+    )
+    np.testing.assert_allclose(
+        stream(StreamingVolatility(20), prices),
+        indicators.volatility(prices, 20),
+        rtol=1e-8,
+    )
+
+
+def test_rolling_stats_stay_accurate_over_long_streams() -> None:
+    """Test the sliding mean/std doesn't drift after many swaps."""
+    rng = np.random.default_rng(1)
+    values = 1e6 + rng.normal(0, 1e-3, 200_000)
+    stats = RollingStats(30)
+
+    for value in values.tolist():
+        mean, std = stats.update(value)
+
+    assert mean == pytest.approx(values[-30:].mean(), rel=1e-15)
+    assert std == pytest.approx(values[-30:].std(), rel=1e-6)
+
+
+def test_indicator_set_matches_latest_indicators_at_every_bar() -> None:
+    """Test the live bundle reproduces the batch screen (fallbacks included)."""
+    prices = random_walk(120, seed=2)
+    live = IndicatorSet()
+
+    for t, price in enumerate(prices.tolist()):
+        values = live.update(price)
+        expected = indicators.latest_indicators(prices[: t + 1, None])
+        for name in indicators.INDICATOR_NAMES:
+            assert values[name] == pytest.approx(
+                expected[name][0], rel=1e-8, abs=1e-10
+            ), (name, t)
+
+
+def test_snapshot_restore_resumes_mid_stream() -> None:
+    """Test a JSON round-tripped snapshot continues exactly like the original."""
+    prices = random_walk(300, seed=3).tolist()
+    for indicator in (
+        StreamingEMA(10),
+        StreamingRSI(14, "wilder"),
+        StreamingMACD(),
+        StreamingBollinger(20),
+        StreamingVolatility(20),
+        IndicatorSet(),
+    ):
+        for price in prices[:137]:
+            indicator.update(price)
+
+        resumed = restore_indicator(json.loads(json.dumps(indicator.snapshot())))
+
+        assert type(resumed) is type(indicator)
+        for price in prices[137:]:
+            assert resumed.update(price) == indicator.update(price)
+
+
+def test_restore_rejects_unknown_or_mismatched_state() -> None:
+    """Test restore validates the snapshot kind."""
+    with pytest.raises(ValueError, match="Unknown indicator kind"):
+        restore_indicator({"kind": "stochastic"})
+    with pytest.raises(ValueError, match="expected 'ema'"):
+        StreamingEMA.restore(StreamingRSI().snapshot())
+    with pytest.raises(ValueError, match="Unknown smoothing"):
+        StreamingRSI(smoothing="ema")
+    with pytest.raises(TypeError, match="abstract"):
+        StreamingIndicator()
+
+
+def test_update_cost_does_not_grow_with_history() -> None:
+    """Test per-tick cost after 50k bars is no higher than after 1k bars."""
+    prices = random_walk(51_000, seed=4).tolist()
+    live = IndicatorSet()
+
+    def time_ticks(ticks: list[float]) -> float:
+        start = time.perf_counter()
+        for price in ticks:
+            live.update(price)
+        return time.perf_counter() - start
+
+    early = time_ticks(prices[:1_000])
+    for price in prices[1_000:50_000]:
+        live.update(price)
+    late = time_ticks(prices[50_000:])
+
+    assert late < 3 * early + 0.01